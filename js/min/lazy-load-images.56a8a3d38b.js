@@ -0,0 +1,6 @@
+(function(){if(!('IntersectionObserver'in window)){console.warn('Intersection Observer not supported, falling back to native lazy loading');return;}
+const config={rootMargin:'200px 0px',threshold:0.01};let loadingCount=0;const MAX_CONCURRENT_LOADS=3;const loadQueue=[];function processQueue(){while(loadingCount<MAX_CONCURRENT_LOADS&&loadQueue.length>0){const img=loadQueue.shift();loadImage(img);}}
+function loadImage(img){const src=img.getAttribute('data-src');if(!src)return;loadingCount++;const tempImg=new Image();tempImg.decoding='async';tempImg.onload=()=>{requestAnimationFrame(()=>{img.src=src;img.removeAttribute('data-src');img.classList.add('lazy-loaded');setTimeout(()=>{img.style.willChange='auto';},400);loadingCount--;processQueue();});};tempImg.onerror=()=>{console.error(`Failed to load image: ${src}`);loadingCount--;processQueue();};tempImg.src=src;}
+const imageObserver=new IntersectionObserver((entries,observer)=>{entries.forEach(entry=>{if(entry.isIntersecting){const img=entry.target;if(img.getAttribute('data-src')){loadQueue.push(img);observer.unobserve(img);}}});processQueue();},config);function initLazyLoad(){const lazyImages=document.querySelectorAll('img[data-src]');lazyImages.forEach(img=>{imageObserver.observe(img);});console.log(`[Lazy Load] Initialized for ${lazyImages.length} images`);}
+if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',initLazyLoad);}else{initLazyLoad();}
+window.reinitLazyLoad=initLazyLoad;})();
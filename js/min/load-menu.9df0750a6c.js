@@ -0,0 +1,5 @@
+(function(){var docEl=document.documentElement;var vtNative=false;try{vtNative=sessionStorage.getItem('vt-native')==='1';}catch(e){}
+function markNative(e){if(e.viewTransition){try{sessionStorage.setItem('vt-native','1');}catch(err){}}}
+window.addEventListener('pageswap',markNative);window.addEventListener('pagereveal',markNative);window.addEventListener('pageshow',function(){docEl.style.opacity='1';});if(!vtNative){docEl.style.opacity='0';requestAnimationFrame(function(){docEl.style.transition='opacity 0.18s ease';docEl.style.opacity='1';setTimeout(function(){docEl.style.transition='';},300);});document.addEventListener('click',function(e){if(e.defaultPrevented||e.button!==0||e.metaKey||e.ctrlKey||e.shiftKey||e.altKey)return;var a=e.target&&e.target.closest?e.target.closest('#menu a[href]'):null;if(!a||a.origin!==window.location.origin)return;e.preventDefault();docEl.style.transition='opacity 0.15s ease';docEl.style.opacity='0';setTimeout(function(){window.location.href=a.href;},160);});}
+if(window.HTMLScriptElement&&HTMLScriptElement.supports&&HTMLScriptElement.supports('speculationrules')){const spec=document.createElement('script');spec.type='speculationrules';spec.textContent=JSON.stringify({prefetch:[{source:'document',where:{href_matches:'/*'},eagerness:'moderate'}]});document.head.appendChild(spec);}
+const menuDiv=document.getElementById('menu');if(menuDiv&&!menuDiv.hasAttribute('data-menu')){console.error('Menu markup missing - run scripts/inline_menu.py');}})();
@@ -0,0 +1,6 @@
+(function(){'use strict';function isMobile(){return window.innerWidth<=767;}
+function createMobileMenu(){if(!isMobile())return;if(document.getElementById('menu-toggle'))return;const checkbox=document.createElement('input');checkbox.type='checkbox';checkbox.id='menu-toggle';checkbox.setAttribute('aria-label','メニューを開閉');const hamburger=document.createElement('label');hamburger.className='hamburger-btn';hamburger.setAttribute('for','menu-toggle');hamburger.setAttribute('aria-label','メニューボタン');hamburger.setAttribute('role','button');hamburger.setAttribute('tabindex','0');hamburger.setAttribute('aria-controls','menu');hamburger.setAttribute('aria-expanded','false');hamburger.innerHTML='<span></span><span></span><span></span>';const overlay=document.createElement('div');overlay.className='menu-overlay';overlay.setAttribute('aria-hidden','true');overlay.addEventListener('click',function(){checkbox.checked=false;});document.body.insertBefore(checkbox,document.body.firstChild);document.body.insertBefore(hamburger,document.body.firstChild.nextSibling);document.body.insertBefore(overlay,document.body.firstChild.nextSibling.nextSibling);const menuDiv=document.getElementById('menu');if(menuDiv&&!menuDiv.dataset.closeBound){menuDiv.dataset.closeBound='1';menuDiv.addEventListener('click',function(e){if(e.target&&e.target.closest&&e.target.closest('a')){const toggle=document.getElementById('menu-toggle');if(toggle)toggle.checked=false;}});}
+checkbox.addEventListener('change',function(){document.body.style.overflow=this.checked?'hidden':'';hamburger.setAttribute('aria-expanded',String(this.checked));});function setOpen(open){if(checkbox.checked===open)return;checkbox.checked=open;checkbox.dispatchEvent(new Event('change'));}
+hamburger.addEventListener('keydown',function(e){if(e.key!=='Enter'&&e.key!==' '&&e.key!=='Spacebar')return;e.preventDefault();setOpen(!checkbox.checked);});document.addEventListener('keydown',function(e){if(e.key!=='Escape'||!checkbox.checked)return;setOpen(false);hamburger.focus();});}
+if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',createMobileMenu);}else{createMobileMenu();}
+let resizeTimer;window.addEventListener('resize',function(){clearTimeout(resizeTimer);resizeTimer=setTimeout(function(){if(!isMobile()){const toggle=document.getElementById('menu-toggle');const hamburger=document.querySelector('.hamburger-btn');const overlay=document.querySelector('.menu-overlay');if(toggle)toggle.remove();if(hamburger)hamburger.remove();if(overlay)overlay.remove();document.body.style.overflow='';}else{createMobileMenu();}},250);});})();
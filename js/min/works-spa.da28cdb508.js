@@ -0,0 +1,221 @@
+let worksData={};let worksOrder=[];let worksIndex=[];let worksById=new Map();let worksByFilename=new Map();let worksPosition=new Map();let bundleManifest=null;let detailManifest=null;let indexDirectory=null;let indexShards=null;let gridItems=[];let gridIds=new Set();const bundleRequests=new Map();const detailRequests=new Map();let lastWorkId=null;let currentSwiper=null;const PURIFY_OPTIONS={ADD_ATTR:['fetchpriority']};const GLITCH_CHARS='01@#$%&*[]{}01010101><~^+=?/\\|';const PREFERS_REDUCED_MOTION=window.matchMedia&&window.matchMedia('(prefers-reduced-motion: reduce)').matches;function animateTextGlitch(element,targetText,duration=800){if(!element)return;if(PREFERS_REDUCED_MOTION){element.textContent=targetText;return;}
+const originalText=element.textContent||'';const maxLength=Math.max(originalText.length,targetText.length);const startTime=performance.now();const charDelays=Array.from({length:maxLength},()=>Math.random()*0.5);function update(currentTime){const elapsed=currentTime-startTime;const progress=Math.min(elapsed/duration,1);let result='';for(let i=0;i<maxLength;i++){const charProgress=Math.min(Math.max((progress-charDelays[i])/0.5,0),1);if(charProgress<1){if(Math.random()>charProgress){result+=GLITCH_CHARS[Math.floor(Math.random()*GLITCH_CHARS.length)];}else{result+=targetText[i]||'';}}else{result+=targetText[i]||'';}}
+element.textContent=result;if(progress<1){requestAnimationFrame(update);}else{element.textContent=targetText;}}
+requestAnimationFrame(update);}
+function animateTextTypewriter(element,targetText,duration=800,preserveHTML=false){if(!element)return;if(PREFERS_REDUCED_MOTION){if(preserveHTML){element.innerHTML=targetText;}else{element.textContent=targetText.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim();}
+return;}
+const startTime=performance.now();const textToAnimate=preserveHTML?targetText:targetText.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim();function update(currentTime){const elapsed=currentTime-startTime;const progress=Math.min(elapsed/duration,1);const charsToShow=Math.floor(textToAnimate.length*progress);if(preserveHTML){element.innerHTML=textToAnimate.substring(0,charsToShow)+(progress<1?'<span class="typing-cursor">▌</span>':'');}else{element.textContent=textToAnimate.substring(0,charsToShow)+(progress<1?'▌':'');}
+if(progress<1){requestAnimationFrame(update);}else{if(preserveHTML){element.innerHTML=targetText;}else{element.textContent=textToAnimate;}}}
+requestAnimationFrame(update);}
+function animateTextTransition(element,targetText,animationType='glitch',duration=800){if(animationType==='typewriter'){animateTextTypewriter(element,targetText,duration);}else{animateTextGlitch(element,targetText,duration);}}
+let loadingBarDelayTimer=null;function showLoadingSpinner(){const bar=document.getElementById('loading-spinner');if(!bar)return;clearTimeout(loadingBarDelayTimer);loadingBarDelayTimer=setTimeout(()=>{bar.style.display='block';},300);}
+function hideLoadingSpinner(){clearTimeout(loadingBarDelayTimer);loadingBarDelayTimer=null;const bar=document.getElementById('loading-spinner');if(bar){bar.style.display='none';}}
+function updateMetaTags(work){document.title=`${work.title} - Ryo Simon`;let metaDescription=document.querySelector('meta[name="description"]');if(metaDescription&&work.description){const plainText=work.description.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim();const shortDesc=plainText.substring(0,155)+(plainText.length>155?'...':'');metaDescription.setAttribute('content',shortDesc);}
+let ogTitle=document.querySelector('meta[property="og:title"]');if(ogTitle){ogTitle.setAttribute('content',`${work.title} - Ryo Simon`);}
+let ogDescription=document.querySelector('meta[property="og:description"]');if(ogDescription&&work.description){const plainText=work.description.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim();const shortDesc=plainText.substring(0,155)+(plainText.length>155?'...':'');ogDescription.setAttribute('content',shortDesc);}
+let ogImage=document.querySelector('meta[property="og:image"]');if(ogImage&&work.thumbnail){const baseUrl='https://ryo-simon-mf.github.io';const imagePath=work.thumbnail.startsWith('http')?work.thumbnail:`${baseUrl}/works/${work.thumbnail}`;ogImage.setAttribute('content',imagePath);}
+let ogUrl=document.querySelector('meta[property="og:url"]');if(ogUrl){ogUrl.setAttribute('content',`https://ryo-simon-mf.github.io/works/works.html#${work.id}`);}
+addStructuredData(work);}
+function applyWorkHead(head){document.title=head.title;head.meta.forEach(([attr,key,content])=>{const meta=document.querySelector(`meta[${attr}="${key}"]`);if(meta)meta.setAttribute('content',content);});removeStructuredData();const script=document.createElement('script');script.type='application/ld+json';script.id='work-structured-data';script.text=head.jsonld;document.head.appendChild(script);}
+function addStructuredData(work){removeStructuredData();const structuredData={"@context":"https://schema.org","@type":"CreativeWork","name":work.title,"creator":{"@type":"Person","name":"Ryo Simon","alternateName":"Ryo Nishikado","url":"https://ryo-simon-mf.github.io"},"dateCreated":work.year,"description":work.description?work.description.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim():'',"image":work.thumbnail?`https://ryo-simon-mf.github.io/works/${work.thumbnail}`:'',"url":`https://ryo-simon-mf.github.io/works/works.html#${work.id}`,"keywords":[work.category,"interactive art","creative coding","media art"],"genre":work.category};if(work.tools){structuredData.tool=work.tools.replace(/<[^>]*>/g,' ').trim();}
+if(work.award){structuredData.award=work.award.replace(/<[^>]*>/g,' ').trim();}
+const script=document.createElement('script');script.type='application/ld+json';script.id='work-structured-data';script.text=JSON.stringify(structuredData,null,2);document.head.appendChild(script);}
+function removeStructuredData(){const existing=document.getElementById('work-structured-data');if(existing){existing.remove();}}
+function resetMetaTags(){document.title='Works - Ryo Simon';removeStructuredData();let metaDescription=document.querySelector('meta[name="description"]');if(metaDescription){metaDescription.setAttribute('content','Works project by Ryo Simon.');}
+let ogTitle=document.querySelector('meta[property="og:title"]');if(ogTitle){ogTitle.setAttribute('content','Works - Ryo Simon');}
+let ogDescription=document.querySelector('meta[property="og:description"]');if(ogDescription){ogDescription.setAttribute('content','Works project by Ryo Simon.');}
+let ogImage=document.querySelector('meta[property="og:image"]');if(ogImage){ogImage.setAttribute('content','https://ryo-simon-mf.github.io/image/profile/2025_icon_basic.webp');}
+let ogUrl=document.querySelector('meta[property="og:url"]');if(ogUrl){ogUrl.setAttribute('content','https://ryo-simon-mf.github.io/works/works.html');}}
+function unpackIndex(packed){const columns=Object.entries(packed.columns).map(([key,column])=>[key,Array.isArray(column)?column:column.codes.map(code=>column.values[code])]);return Array.from({length:packed.count},(_,i)=>{const work={};for(const[key,values]of columns){if(values[i]!==null&&values[i]!==undefined)work[key]=values[i];}
+return work;});}
+async function loadIndexHead(){const meta=document.querySelector('meta[name="works-index"]');if(!meta||meta.content!=='sharded')return null;try{const directoryResponse=await fetch('../works-data/index/directory.json');if(!directoryResponse.ok)return null;const directory=await directoryResponse.json();const headResponse=await fetch(`../works-data/${directory.head.file}`);if(!headResponse.ok)return null;indexDirectory=directory;return unpackIndex(await headResponse.json());}catch(error){return null;}}
+async function loadIndex(){const head=await loadIndexHead();if(head)return head;try{const packedResponse=await fetch('../works-data/index.columns.json');if(packedResponse.ok)return unpackIndex(await packedResponse.json());}catch(error){}
+const indexResponse=await fetch('../works-data/index.json');const indexData=await indexResponse.json();return indexData.works||indexData.order.map(id=>({id}));}
+async function loadBundleManifest(){try{const response=await fetch('../works-data/bundles/manifest.json');return response.ok?await response.json():null;}catch(error){return null;}}
+async function loadDetailManifest(){try{const response=await fetch('../works-data/detail/manifest.json');return response.ok?await response.json():null;}catch(error){return null;}}
+async function loadIndexShards(){const requested=new URLSearchParams(window.location.search).get('filter');const categories=Object.keys(indexDirectory.categories).sort((a,b)=>(b===requested)-(a===requested));const byPosition=[];worksIndex.forEach(w=>{byPosition[w.position]=w;});for(const category of categories){for(const file of indexDirectory.categories[category].shards){try{const response=await fetch(`../works-data/${file}`);if(!response.ok)throw new Error(`HTTP ${response.status}: ${response.statusText}`);const added=unpackIndex(await response.json()).filter(w=>!byPosition[w.position]);added.forEach(w=>{byPosition[w.position]=w;});setWorksIndex(byPosition.filter(Boolean));extendGrid(added);}catch(error){console.error(`Failed to load index shard ${file}:`,error);}}}}
+function extendGrid(works){const added=works.filter(w=>!gridIds.has(w.id)&&w.filename).sort((a,b)=>a.position-b.position).map(w=>({id:w.id,position:w.position,el:createGridItem(w)}));if(!added.length)return;const container=document.querySelector('.center-container');const merged=[];let i=0;for(const item of added){while(i<gridItems.length&&gridItems[i].position<item.position)merged.push(gridItems[i++]);container.insertBefore(item.el,i<gridItems.length?gridItems[i].el:null);merged.push(item);}
+gridItems=merged.concat(gridItems.slice(i));added.forEach(item=>gridIds.add(item.id));added.forEach(item=>interceptThumbnailClick(item.el.querySelector('a')));document.dispatchEvent(new CustomEvent('works:grid-extended',{detail:{items:added.map(item=>item.el)}}));}
+function createGridItem(work){const item=document.createElement('div');item.className='img_wrap';item.setAttribute('data-category',work.category);item.setAttribute('data-year',work.year);item.setAttribute('data-title',work.title);const size=work.width&&work.height?` width="${work.width}" height="${work.height}"`:'';item.innerHTML=`<a href="./${work.filename}">
+                        <img src="data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 4 3'%3E%3C/svg%3E" data-src="${work.thumbnail || ''}" alt="${work.title}"${size} decoding="async">
+                    </a>`;return item;}
+function interceptThumbnailClick(link){link.addEventListener('click',function(e){if(e.metaKey||e.ctrlKey||e.shiftKey||e.altKey||e.button!==0)return;e.preventDefault();const href=this.getAttribute('href');const workId=extractWorkId(href);window.location.hash=workId;});}
+function setWorksIndex(works){worksIndex=works;worksOrder=works.map(w=>w.id);worksById=new Map(works.map(w=>[w.id,w]));worksByFilename=new Map(works.filter(w=>w.filename).map(w=>[w.filename,w]));worksPosition=new Map(worksOrder.map((id,i)=>[id,i]));}
+async function initWorksSPA(){try{const[works,manifest,details]=await Promise.all([loadIndex(),loadBundleManifest(),loadDetailManifest()]);setWorksIndex(works);bundleManifest=manifest;detailManifest=details;collectGridItems();document.querySelectorAll('.img_wrap a').forEach(interceptThumbnailClick);if(indexDirectory){extendGrid(worksIndex);const counts={all:indexDirectory.count};Object.entries(indexDirectory.categories).forEach(([category,entry])=>{counts[category]=entry.count;});document.dispatchEvent(new CustomEvent('works:index-directory',{detail:{counts}}));}
+window.addEventListener('hashchange',handleHashChange);if(indexDirectory)indexShards=loadIndexShards();await handleHashChange();}catch(error){console.error('Failed to initialize Works SPA:',error);}}
+function collectGridItems(){gridItems=[];gridIds=new Set();document.querySelectorAll('.img_wrap a').forEach(link=>{const workId=extractWorkId(link.getAttribute('href'));const work=worksById.get(workId);const imgWrap=link.closest('.img_wrap');gridIds.add(workId);if(work&&imgWrap){gridItems.push({id:work.id,position:work.position??worksPosition.get(work.id),el:imgWrap});}});}
+function fetchBundle(url){if(!bundleRequests.has(url)){const request=fetch(`../works-data/${url}`).then(response=>{if(!response.ok)throw new Error(`HTTP ${response.status}: ${response.statusText}`);return response.json();}).then(bundle=>{Object.assign(worksData,bundle);}).catch(error=>{bundleRequests.delete(url);throw error;});bundleRequests.set(url,request);}
+return bundleRequests.get(url);}
+function fetchDetail(url){if(!detailRequests.has(url)){const request=fetch(`../works-data/${url}`).then(response=>{if(!response.ok)throw new Error(`HTTP ${response.status}: ${response.statusText}`);return response.text();}).catch(error=>{detailRequests.delete(url);throw error;});detailRequests.set(url,request);}
+return detailRequests.get(url);}
+async function loadPrerenderedView(workId){const url=detailManifest?.works[workId];if(!url)return null;try{const template=document.createElement('template');template.innerHTML=await fetchDetail(url);const view=template.content.firstElementChild;if(!view||view.id!=='work-detail-view')return null;const headScript=view.querySelector('script.work-head');headScript?.remove();view.innerHTML=DOMPurify.sanitize(view.innerHTML,PURIFY_OPTIONS);if(headScript)view.prepend(headScript);return view;}catch(error){console.warn(`Failed to load prerendered view ${url}:`,error);return null;}}
+function workFromView(view,workId){const data=view.dataset;const headScript=view.querySelector('script.work-head');let head=null;if(headScript){try{head=JSON.parse(headScript.textContent);}catch(error){console.warn(`Invalid head in prerendered view of ${workId}:`,error);}
+headScript.remove();}
+return{id:workId,title:data.title,year:data.year,category:data.category,thumbnail:thumbnailForWork(workId),head};}
+function prefetchNeighbours(workId){const{prev,next}=neighboursOf(workId);[prev,next].forEach(w=>{const detailUrl=w&&detailManifest?.works[w.id];if(detailUrl){fetchDetail(detailUrl).catch(()=>{});return;}
+const url=w&&bundleManifest?.works[w.id];if(url&&!worksData[w.id])fetchBundle(url).catch(()=>{});});}
+async function loadWork(workId){if(worksData[workId]){return worksData[workId];}
+const bundleUrl=bundleManifest?.works[workId];if(bundleUrl){try{await fetchBundle(bundleUrl);if(worksData[workId])return worksData[workId];}catch(error){console.warn(`Failed to load bundle ${bundleUrl}:`,error);}}
+try{const response=await fetch(`../works-data/${workId}.json`);if(!response.ok){throw new Error(`HTTP ${response.status}: ${response.statusText}`);}
+const workData=await response.json();worksData[workId]=workData;return workData;}catch(error){console.error(`Failed to load ${workId}.json:`,error);return null;}}
+function announce(message){let region=document.getElementById('spa-live-region');if(!region){region=document.createElement('div');region.id='spa-live-region';region.setAttribute('role','status');region.setAttribute('aria-live','polite');region.style.cssText='position:absolute;width:1px;height:1px;margin:-1px;'+
+'padding:0;border:0;overflow:hidden;clip:rect(0 0 0 0);clip-path:inset(50%);white-space:nowrap';document.body.appendChild(region);}
+region.textContent=message;}
+function focusQuietly(el){if(!el)return;if(!el.hasAttribute('tabindex'))el.setAttribute('tabindex','-1');el.focus({preventScroll:true});}
+function thumbnailForWork(workId){return worksById.get(workId)?.thumbnail||null;}
+function relatedWorksFor(work,limit=3){const picked=[];const take=(id)=>{if(id===work.id||picked.some(w=>w.id===id))return;const meta=worksById.get(id);if(meta)picked.push(meta);};const{prev,next}=neighboursOf(work.id);const isNeighbour=(id)=>id===prev?.id||id===next?.id;if(Array.isArray(work.related))work.related.forEach(take);const here=worksPosition.get(work.id)??-1;const sameCategory=worksIndex.filter(w=>w.category===work.category&&w.id!==work.id).sort((a,b)=>Math.abs(worksPosition.get(a.id)-here)-Math.abs(worksPosition.get(b.id)-here));for(const candidate of sameCategory){if(picked.length>=limit)break;if(!isNeighbour(candidate.id))take(candidate.id);}
+for(const candidate of sameCategory){if(picked.length>=limit)break;take(candidate.id);}
+return picked.slice(0,limit);}
+function neighboursOf(workId){const i=worksPosition.get(workId)??-1;const at=(n)=>(n>=0&&n<worksOrder.length?worksIndex[n]:null);return{prev:i>0?at(i-1):null,next:i>=0?at(i+1):null};}
+function browseStripHtml(work){const{prev,next}=neighboursOf(work.id);const related=relatedWorksFor(work);const arrow=(w,dir)=>{if(!w)return'<span class="work-nav-slot"></span>';const label=dir==='prev'?`← ${w.title}`:`${w.title} →`;return`<a class="work-nav-link work-nav-${dir}" href="#${w.id}" data-work-id="${w.id}">
+              <span class="work-nav-title">${label}</span>
+              <span class="work-nav-year">${w.year}</span>
+            </a>`;};const card=(w)=>{const thumb=thumbnailForWork(w.id);const size=w.width&&w.height?` width="${w.width}" height="${w.height}"`:'';return`<a class="related-card" href="#${w.id}" data-work-id="${w.id}">
+              ${thumb ? `<img src="${thumb}" alt="${w.title}"${size} loading="lazy" decoding="async">` : '<span class="related-card-noimg"></span>'}
+              <span class="related-card-year">${w.year}</span>
+              <span class="related-card-title">${w.title}</span>
+            </a>`;};return`
+            <nav class="work-nav" aria-label="Previous and next work">
+                ${arrow(prev, 'prev')}
+                ${arrow(next, 'next')}
+            </nav>
+            ${related.length ? `<section class="related-works" aria-label="Related works">
+                <h2 class="related-works-heading">Related</h2>
+                <div class="related-works-grid">
+                    ${related.map(card).join('')}
+                </div>
+            </section>` : ''}`;}
+function extractWorkId(href){const filename=href.replace('./','');const match=worksByFilename.get(filename);if(match)return match.id;return filename.replace('.html','');}
+async function handleHashChange(){const hash=window.location.hash.slice(1);if(hash){showLoadingSpinner();if(indexShards&&!worksById.has(hash))await indexShards;const prerendered=await loadPrerenderedView(hash);const workData=prerendered?workFromView(prerendered,hash):await loadWork(hash);hideLoadingSpinner();if(workData){showWorkDetail(hash,workData,prerendered);prefetchNeighbours(hash);}else{showWorksList();}}else{showWorksList();}}
+function showWorksList(){const centerContainer=document.querySelector('.center-container');const contentDiv=document.getElementById('content');const detailView=document.getElementById('work-detail-view');if(detailView){const swiperContainer=detailView.querySelector('.swiper-container');const contentInDiv=detailView.querySelector('#content_in');const h3Element=detailView.querySelector('h3');const fixedHeaderArea=detailView.querySelector('.fixed-header-area');const hrs=Array.from(detailView.querySelectorAll('hr')).filter(hr=>!fixedHeaderArea||!fixedHeaderArea.contains(hr));if(swiperContainer){swiperContainer.style.transition='opacity 0.4s ease';swiperContainer.style.opacity='0';}
+if(contentInDiv){contentInDiv.style.transition='opacity 0.4s ease';contentInDiv.style.opacity='0';}
+if(h3Element){h3Element.style.transition='opacity 0.4s ease';h3Element.style.opacity='0';}
+hrs.forEach(hr=>{hr.style.transition='opacity 0.4s ease';hr.style.opacity='0';});setTimeout(()=>{showWorksListAfterFadeOut();},400);}else{showWorksListAfterFadeOut();}
+function showWorksListAfterFadeOut(){resetMetaTags();if(detailView){detailView.remove();}
+const elementsToShow=contentDiv.querySelectorAll(':scope > br, :scope > h1, :scope > hr, :scope > p');elementsToShow.forEach(el=>{el.style.display='block';});const h1=contentDiv.querySelector('h1');if(h1){animateTextTransition(h1,'Works','glitch',600);}
+const filterP=contentDiv.querySelector('p');if(filterP){const filterButtons=filterP.querySelectorAll('.filter-btn');const filterTexts=['All','Code','Object','Design'];filterButtons.forEach((btn,index)=>{const targetText=filterTexts[index];const glitchChars='01@#$%&*[]{}><~^+=?/\\|';let initialText='';for(let i=0;i<targetText.length;i++){initialText+=glitchChars[Math.floor(Math.random()*glitchChars.length)];}
+btn.textContent=initialText;setTimeout(()=>{animateTextGlitch(btn,targetText,400);},100+index*50);});}
+const filterCount=contentDiv.querySelector('#filter-count');if(filterCount){const activeFilter=document.querySelector('.filter-btn.active');const filterValue=activeFilter?activeFilter.getAttribute('data-filter'):'all';const imgWraps=document.querySelectorAll('.img_wrap');let workCount=0;if(filterValue==='all'){workCount=imgWraps.length;}else{imgWraps.forEach(item=>{if(item.getAttribute('data-category')===filterValue){workCount++;}});}
+const workText=workCount===1?'work':'works';const targetText=` [${workCount} ${workText}]`;const glitchChars='01@#$%&*[]{}><~^+=?/\\|';let initialText='';for(let i=0;i<targetText.length;i++){initialText+=glitchChars[Math.floor(Math.random()*glitchChars.length)];}
+filterCount.textContent=initialText;setTimeout(()=>{animateTextTransition(filterCount,targetText,'glitch',400);},300);}
+if(centerContainer){centerContainer.style.display='block';}
+const activeFilter=document.querySelector('.filter-btn.active');const filterValue=activeFilter?activeFilter.getAttribute('data-filter'):'all';const visibleItems=[];document.querySelectorAll('.img_wrap').forEach(item=>{if(filterValue==='all'){item.style.display='inline-block';visibleItems.push(item);}else{const itemCategory=item.getAttribute('data-category');if(itemCategory===filterValue){item.style.display='inline-block';visibleItems.push(item);}else{item.style.display='none';}}
+item.style.opacity='0';item.style.transition='opacity 0.4s ease';item.style.willChange='opacity';});if(window.reinitLazyLoad){window.reinitLazyLoad();}
+visibleItems.forEach((item,index)=>{setTimeout(()=>{item.style.opacity='1';setTimeout(()=>{item.style.willChange='auto';},400);},PREFERS_REDUCED_MOTION?0:100+index*30);});if(currentSwiper){currentSwiper.destroy(true,true);currentSwiper=null;}
+const origin=lastWorkId&&Array.from(document.querySelectorAll('.img_wrap a')).find(a=>extractWorkId(a.getAttribute('href'))===lastWorkId);if(origin)origin.focus({preventScroll:true});lastWorkId=null;announce('作品一覧に戻りました');}}
+function showWorkDetail(workId,work,prerendered=null){const contentDiv=document.getElementById('content');const centerContainer=document.querySelector('.center-container');if(work.head){applyWorkHead(work.head);}else{updateMetaTags(work);}
+const thumbnails=document.querySelectorAll('.img_wrap');thumbnails.forEach(item=>{item.style.transition='opacity 0.4s ease';item.style.opacity='0';});setTimeout(()=>{const elementsToHide=contentDiv.querySelectorAll(':scope > br, :scope > h1, :scope > hr, :scope > p');elementsToHide.forEach(el=>{el.style.display='none';});if(centerContainer){centerContainer.style.display='none';}
+thumbnails.forEach(item=>{item.style.display='none';});if(prerendered){hydrateDetailView(prerendered,work,workId);}else{createDetailView(work,workId);}},400);}
+function createDetailView(work,workId){const detailView=document.createElement('div');detailView.id='work-detail-view';const slidePriority=(i)=>(i===0?'loading="eager" fetchpriority="high"':'loading="lazy"');const swiperSlides=work.images.map((img,i)=>`
+                    <div class="swiper-slide">
+                        <div class="img_w2">
+                            <img src="${img}" alt="${work.title} ${i + 1}" ${slidePriority(i)} decoding="async">
+                        </div>
+                    </div>`).join('');detailView.innerHTML=DOMPurify.sanitize(`
+            <!-- Fixed Header Area -->
+            <div class="fixed-header-area">
+                <h1>
+                    <!-- Breadcrumb heading: Works / <title> -->
+                    <a href="#" class="breadcrumb-works">Works</a><span class="breadcrumb-sep"> / </span><span class="work-title-animated"></span>
+                </h1>
+                <hr>
+                <p class="work-header-metadata">
+                    <span class="list work-year-animated">----</span> | <span class="list work-category-animated">----</span>
+                </p>
+            </div>
+
+            <div class="swiper-container" style="opacity: 0;">
+                <div class="swiper-wrapper">
+${swiperSlides}
+                </div>
+                <div class="swiper-button-prev"></div>
+                <div class="swiper-button-next"></div>
+            </div>
+            <hr>
+
+            <!-- Subheading　-->
+            <h3>
+                ${work.title}${work.reading ? ` [${work.reading}]` : ''}
+            </h3>
+            <div id="content_in" class="work-content-animated">
+                ${work.description ? `<p>
+                    ${work.description}
+                </p>` : ''}
+
+                <dl>
+                ${work.performers ? `
+                <dt>Performers</dt>
+                <dd>
+                    ${work.performers}
+                </dd>
+                <br>` : ''}
+                ${work.credit ? `<dt>Credit</dt>
+                <dd>
+                    ${work.credit}
+                </dd>
+                <br>` : ''}
+                ${work.tools ? `<dt>Tool</dt>
+                <dd>
+                    ${work.tools}
+                </dd>
+                <br>` : ''}
+                ${work.exhibition ? `<dt>Exhibition</dt>
+                <dd>
+                    ${work.exhibition}
+                </dd>
+                <br>` : ''}
+                ${work.award ? `<dt>Award</dt>
+                <dd>
+                    ${work.award}
+                </dd>
+                <br>` : ''}
+                ${work.paper ? `<dt>Paper</dt>
+                <dd>
+                    ${work.paper}
+                </dd>
+                <br>` : ''}
+                ${work.grants ? `<dt>Grants</dt>
+                <dd>
+                    ${work.grants}
+                </dd>
+                <br>` : ''}
+                ${work.collaborators ? `<dt>Co-create with</dt>
+                <dd>
+                    ${work.collaborators}
+                </dd>
+                <br>` : ''}
+                ${work.download ? `<dt>Download</dt>
+                <dd>
+                    ${work.download}
+                </dd>
+                <br>` : ''}
+                ${work.citation ? `<dt>Citation</dt>
+                <dd>
+                    ${work.citation}
+                </dd>
+                <br>` : ''}
+                ${work.link ? `<dt>Link</dt>
+                <dd>
+                    ${work.link}
+                </dd>
+                <br>` : ''}
+                </dl>
+
+            </div>
+            <hr class="final-hr-1" style="opacity: 0;">
+            ${browseStripHtml(work)}
+            <hr class="final-hr-2" style="opacity: 0;">
+            <br>
+  `,PURIFY_OPTIONS);hydrateDetailView(detailView,work,workId);}
+function hydrateDetailView(detailView,work,workId){const contentDiv=document.getElementById('content');const existingDetail=document.getElementById('work-detail-view');if(existingDetail)existingDetail.remove();contentDiv.appendChild(detailView);const animationType='glitch';const titleSpan=detailView.querySelector('.work-title-animated');const yearSpan=detailView.querySelector('.work-year-animated');const categorySpan=detailView.querySelector('.work-category-animated');if(titleSpan){setTimeout(()=>{animateTextTransition(titleSpan,work.title,animationType,800);},100);}
+if(yearSpan){setTimeout(()=>{animateTextTransition(yearSpan,work.year,animationType,600);},150);}
+if(categorySpan){const categoryText=work.category.charAt(0).toUpperCase()+work.category.slice(1);setTimeout(()=>{animateTextTransition(categorySpan,categoryText,animationType,600);},200);}
+const swiperContainer=detailView.querySelector('.swiper-container');if(swiperContainer){swiperContainer.style.transition='opacity 0.8s ease';setTimeout(()=>{swiperContainer.style.opacity='1';},100);}
+const contentInDiv=detailView.querySelector('.work-content-animated');const h3Element=detailView.querySelector('h3');if(contentInDiv){contentInDiv.style.opacity='0';if(h3Element){h3Element.style.opacity='0';}
+setTimeout(()=>{contentInDiv.style.transition='opacity 0.3s ease';contentInDiv.style.opacity='1';const descriptionP=contentInDiv.querySelector('p');const dlElement=contentInDiv.querySelector('dl');const elementsToAnimate=[];if(descriptionP)elementsToAnimate.push({element:descriptionP,type:'p'});if(dlElement){const children=Array.from(dlElement.children);children.forEach(child=>{if(child.tagName==='DT'||child.tagName==='DD'){elementsToAnimate.push({element:child,type:child.tagName.toLowerCase()});}});}
+if(h3Element){const h3Text=h3Element.textContent;h3Element.style.opacity='1';if(PREFERS_REDUCED_MOTION){h3Element.textContent=h3Text;}else{h3Element.textContent='';const startTime=performance.now();const duration=1000;function typeH3(currentTime){const elapsed=currentTime-startTime;const progress=Math.min(elapsed/duration,1);const charsToShow=Math.floor(h3Text.length*progress);if(progress<1){h3Element.textContent=h3Text.substring(0,charsToShow)+'▌';requestAnimationFrame(typeH3);}else{h3Element.textContent=h3Text;}}
+requestAnimationFrame(typeH3);}}
+if(PREFERS_REDUCED_MOTION){elementsToAnimate.forEach(({element})=>{element.style.opacity='1';});}else{elementsToAnimate.forEach(({element})=>{element.style.opacity='0';element.style.transform='translateY(10px)';element.style.transition='opacity 0.4s ease, transform 0.4s ease';});elementsToAnimate.forEach(({element,type},index)=>{setTimeout(()=>{const cursor=document.createElement('span');cursor.className='typing-cursor-before';cursor.textContent='▌';cursor.style.cssText='opacity: 0; margin-right: 5px; color: #006DD9; animation: blink 0.8s step-start infinite;';element.parentNode.insertBefore(cursor,element);setTimeout(()=>{cursor.style.opacity='1';},50);setTimeout(()=>{element.style.opacity='1';element.style.transform='translateY(0)';setTimeout(()=>{cursor.style.opacity='0';setTimeout(()=>cursor.remove(),300);},400);},200);},index*150);});}
+const finalHr1=detailView.querySelector('.final-hr-1');const finalHr2=detailView.querySelector('.final-hr-2');if(finalHr1&&finalHr2){finalHr1 .style.opacity='0';finalHr2 .style.opacity='0';finalHr1 .style.transition='opacity 0.6s ease';finalHr2 .style.transition='opacity 0.6s ease';const h3Duration=1000;const lastCascadeDelay=elementsToAnimate.length>0?(elementsToAnimate.length-1)*150+600:0;const totalAnimationTime=PREFERS_REDUCED_MOTION?0:Math.max(h3Duration,lastCascadeDelay);setTimeout(()=>{finalHr1 .style.opacity='1';setTimeout(()=>{finalHr2 .style.opacity='1';},200);},totalAnimationTime+300);}},PREFERS_REDUCED_MOTION?0:900);}
+setTimeout(()=>{currentSwiper=new Swiper('.swiper-container',{loop:detailView.querySelectorAll('.swiper-slide').length>1,navigation:{nextEl:'.swiper-button-next',prevEl:'.swiper-button-prev',},keyboard:{enabled:true,}});},50);detailView.querySelector('.breadcrumb-works').addEventListener('click',(e)=>{e.preventDefault();window.location.hash='';});window.scrollTo({top:0,behavior:'smooth'});lastWorkId=workId;focusQuietly(detailView.querySelector('.fixed-header-area h1'));announce(`${work.title} の詳細を表示しました`);}
+if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',initWorksSPA);}else{initWorksSPA();}
@@ -1,501 +1,80 @@
-// Works SPA (Single Page Application) with Hash Routing
-// V3: Individual JSON files for each work
-
-let worksData = {}; // Will be populated from JSON files
-let worksOrder = []; // Display order
-let worksIndex = []; // id/title/year/category straight from index.json
-let lastWorkId = null; // which work the grid was left from, to restore focus to
-let currentSwiper = null;
-
-// Hacker-style text animation
-// Characters for glitch effect (binary + symbols)
-const GLITCH_CHARS = '01@#$%&*[]{}01010101><~^+=?/\\|';
-
-// Respect the user's motion preference (text effects and cascades are
-// skipped; final content is shown immediately)
-const PREFERS_REDUCED_MOTION = window.matchMedia &&
-  window.matchMedia('(prefers-reduced-motion: reduce)').matches;
-
-/**
- * Animate text transition with hacker/glitch effect
- * Type 1: Binary/Glitch (random characters converging to target)
- * @param {HTMLElement} element - Target element
- * @param {string} targetText - Text to transition to
- * @param {number} duration - Animation duration in ms (default: 800)
- */
-function animateTextGlitch(element, targetText, duration = 800) {
-  if (!element) return;
-
-  if (PREFERS_REDUCED_MOTION) {
-    element.textContent = targetText;
-    return;
-  }
-
-  const originalText = element.textContent || '';
-  const maxLength = Math.max(originalText.length, targetText.length);
-  const startTime = performance.now();
-
-  // Generate random delays for each character position (staggered effect)
-  const charDelays = Array.from({ length: maxLength }, () => Math.random() * 0.5);
-
-  function update(currentTime) {
-    const elapsed = currentTime - startTime;
-    const progress = Math.min(elapsed / duration, 1);
-
-    let result = '';
-
-    for (let i = 0; i < maxLength; i++) {
-      const charProgress = Math.min(Math.max((progress - charDelays[i]) / 0.5, 0), 1);
-
-      if (charProgress < 1) {
-        // Still transitioning - show random glitch character
-        if (Math.random() > charProgress) {
-          result += GLITCH_CHARS[Math.floor(Math.random() * GLITCH_CHARS.length)];
-        } else {
-          // Occasionally show the target character early
-          result += targetText[i] || '';
-        }
-      } else {
-        // Transition complete for this character
-        result += targetText[i] || '';
-      }
-    }
-
-    element.textContent = result;
-
-    if (progress < 1) {
-      requestAnimationFrame(update);
-    } else {
-      // Ensure final text is exact
-      element.textContent = targetText;
-    }
-  }
-
-  requestAnimationFrame(update);
-}
-
-/**
- * Animate text transition with typewriter effect
- * Type 2: Typewriter (no delete, just type from empty)
- * @param {HTMLElement} element - Target element
- * @param {string} targetText - Text to transition to (can include HTML)
- * @param {number} duration - Animation duration in ms (default: 800)
- * @param {boolean} preserveHTML - If true, preserve HTML tags; if false, strip to plain text
- */
-function animateTextTypewriter(element, targetText, duration = 800, preserveHTML = false) {
-  if (!element) return;
-
-  if (PREFERS_REDUCED_MOTION) {
-    if (preserveHTML) {
-      element.innerHTML = targetText;
-    } else {
-      element.textContent = targetText.replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim();
-    }
-    return;
-  }
-
-  const startTime = performance.now();
-
-  // If preserveHTML is false, strip HTML tags for plain text animation
-  const textToAnimate = preserveHTML ? targetText : targetText.replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim();
-
-  function update(currentTime) {
-    const elapsed = currentTime - startTime;
-    const progress = Math.min(elapsed / duration, 1);
-
-    // Calculate characters to show based on progress
-    const charsToShow = Math.floor(textToAnimate.length * progress);
-
-    if (preserveHTML) {
-      // For HTML content, use innerHTML
-      element.innerHTML = textToAnimate.substring(0, charsToShow) + (progress < 1 ? '<span class="typing-cursor">▌</span>' : '');
-    } else {
-      // For plain text, use textContent
-      element.textContent = textToAnimate.substring(0, charsToShow) + (progress < 1 ? '▌' : '');
-    }
-
-    if (progress < 1) {
-      requestAnimationFrame(update);
-    } else {
-      // Ensure final content is exact
-      if (preserveHTML) {
-        element.innerHTML = targetText; // Original HTML with tags
-      } else {
-        element.textContent = textToAnimate;
-      }
-    }
-  }
-
-  requestAnimationFrame(update);
-}
-
-/**
- * Main animation dispatcher
- * @param {HTMLElement} element - Target element
- * @param {string} targetText - Text to transition to
- * @param {string} animationType - 'glitch' or 'typewriter'
- * @param {number} duration - Animation duration in ms
- */
-function animateTextTransition(element, targetText, animationType = 'glitch', duration = 800) {
-  if (animationType === 'typewriter') {
-    animateTextTypewriter(element, targetText, duration);
-  } else {
-    animateTextGlitch(element, targetText, duration);
-  }
-}
-
-// Loading indicator helpers (hairline bar).
-// Delay gate: the bar only appears if loading takes longer than 300ms,
-// so fast loads show nothing at all instead of a flash
-let loadingBarDelayTimer = null;
-
-function showLoadingSpinner() {
-  const bar = document.getElementById('loading-spinner');
-  if (!bar) return;
-  clearTimeout(loadingBarDelayTimer);
-  loadingBarDelayTimer = setTimeout(() => {
-    bar.style.display = 'block';
-  }, 300);
-}
-
-function hideLoadingSpinner() {
-  clearTimeout(loadingBarDelayTimer);
-  loadingBarDelayTimer = null;
-  const bar = document.getElementById('loading-spinner');
-  if (bar) {
-    bar.style.display = 'none';
-  }
-}
-
-// SEO meta tag helpers
-function updateMetaTags(work) {
-  // Update page title
-  document.title = `${work.title} - Ryo Simon`;
-
-  // Update meta description
-  let metaDescription = document.querySelector('meta[name="description"]');
-  if (metaDescription && work.description) {
-    // Strip HTML tags and limit to 155 characters for SEO
-    const plainText = work.description.replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim();
-    const shortDesc = plainText.substring(0, 155) + (plainText.length > 155 ? '...' : '');
-    metaDescription.setAttribute('content', shortDesc);
-  }
-
-  // Update OGP title
-  let ogTitle = document.querySelector('meta[property="og:title"]');
-  if (ogTitle) {
-    ogTitle.setAttribute('content', `${work.title} - Ryo Simon`);
-  }
-
-  // Update OGP description
-  let ogDescription = document.querySelector('meta[property="og:description"]');
-  if (ogDescription && work.description) {
-    const plainText = work.description.replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim();
-    const shortDesc = plainText.substring(0, 155) + (plainText.length > 155 ? '...' : '');
-    ogDescription.setAttribute('content', shortDesc);
-  }
-
-  // Update OGP image
-  let ogImage = document.querySelector('meta[property="og:image"]');
-  if (ogImage && work.thumbnail) {
-    // Convert relative path to absolute URL
-    const baseUrl = 'https://ryo-simon-mf.github.io';
-    const imagePath = work.thumbnail.startsWith('http') ? work.thumbnail : `${baseUrl}/works/${work.thumbnail}`;
-    ogImage.setAttribute('content', imagePath);
-  }
-
-  // Update OGP URL
-  let ogUrl = document.querySelector('meta[property="og:url"]');
-  if (ogUrl) {
-    ogUrl.setAttribute('content', `https://ryo-simon-mf.github.io/works/works.html#${work.id}`);
-  }
-
-  // Add JSON-LD structured data
-  addStructuredData(work);
-}
-
-function addStructuredData(work) {
-  // Remove existing structured data if present
-  removeStructuredData();
-
-  // Create JSON-LD structured data for the work
-  const structuredData = {
-    "@context": "https://schema.org",
-    "@type": "CreativeWork",
-    "name": work.title,
-    "creator": {
-      "@type": "Person",
-      "name": "Ryo Simon",
-      "alternateName": "Ryo Nishikado",
-      "url": "https://ryo-simon-mf.github.io"
-    },
-    "dateCreated": work.year,
-    "description": work.description ? work.description.replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim() : '',
-    "image": work.thumbnail ? `https://ryo-simon-mf.github.io/works/${work.thumbnail}` : '',
-    "url": `https://ryo-simon-mf.github.io/works/works.html#${work.id}`,
-    "keywords": [work.category, "interactive art", "creative coding", "media art"],
-    "genre": work.category
-  };
-
-  // Add tools if available
-  if (work.tools) {
-    structuredData.tool = work.tools.replace(/<[^>]*>/g, ' ').trim();
-  }
-
-  // Add award if available
-  if (work.award) {
-    structuredData.award = work.award.replace(/<[^>]*>/g, ' ').trim();
-  }
-
-  // Create script element and append to head
-  const script = document.createElement('script');
-  script.type = 'application/ld+json';
-  script.id = 'work-structured-data';
-  script.text = JSON.stringify(structuredData, null, 2);
-  document.head.appendChild(script);
-}
-
-function removeStructuredData() {
-  // Remove existing structured data script
-  const existing = document.getElementById('work-structured-data');
-  if (existing) {
-    existing.remove();
-  }
-}
-
-function resetMetaTags() {
-  // Reset to default values
-  document.title = 'Works - Ryo Simon';
-
-  // Remove structured data when returning to list view
-  removeStructuredData();
-
-  let metaDescription = document.querySelector('meta[name="description"]');
-  if (metaDescription) {
-    metaDescription.setAttribute('content', 'Works project by Ryo Simon.');
-  }
-
-  let ogTitle = document.querySelector('meta[property="og:title"]');
-  if (ogTitle) {
-    ogTitle.setAttribute('content', 'Works - Ryo Simon');
-  }
-
-  let ogDescription = document.querySelector('meta[property="og:description"]');
-  if (ogDescription) {
-    ogDescription.setAttribute('content', 'Works project by Ryo Simon.');
-  }
-
-  let ogImage = document.querySelector('meta[property="og:image"]');
-  if (ogImage) {
-    ogImage.setAttribute('content', 'https://ryo-simon-mf.github.io/image/profile/2025_icon_basic.webp');
-  }
-
-  let ogUrl = document.querySelector('meta[property="og:url"]');
-  if (ogUrl) {
-    ogUrl.setAttribute('content', 'https://ryo-simon-mf.github.io/works/works.html');
-  }
-}
-
-// Initialize SPA functionality
-async function initWorksSPA() {
-  try {
-    // Load index.json to get work order and metadata
-    const indexResponse = await fetch('../works-data/index.json');
-    const indexData = await indexResponse.json();
-
-    // Handle both old and new index.json formats
-    if (indexData.works) {
-      // New format with metadata
-      worksIndex = indexData.works;
-      worksOrder = indexData.works.map(w => w.id);
-      // Add year and category to thumbnails
-      addMetadataToThumbnails(indexData.works);
-    } else {
-      // Old format (fallback)
-      worksOrder = indexData.order;
-    }
-
-    // Note: JSON files are now loaded on-demand (lazy loading)
-    // This reduces initial page load from 45KB to just index.json (~3KB)
-
-    // Handle hash changes
-    window.addEventListener('hashchange', handleHashChange);
-
-    // Handle initial load
-    await handleHashChange();
-
-    // Intercept thumbnail clicks
-    document.querySelectorAll('.img_wrap a').forEach(link => {
-      link.addEventListener('click', function(e) {
-        // Let modifier-key clicks (new tab/window) fall through to the browser
-        if (e.metaKey || e.ctrlKey || e.shiftKey || e.altKey || e.button !== 0) return;
-        e.preventDefault();
-        const href = this.getAttribute('href');
-        const workId = extractWorkId(href);
-        window.location.hash = workId;
-      });
-    });
-  } catch (error) {
-    console.error('Failed to initialize Works SPA:', error);
-  }
-}
-
-// Add year and category metadata to thumbnail elements
-function addMetadataToThumbnails(worksMetadata) {
-  worksMetadata.forEach(work => {
-    // Find thumbnail by matching href
-    const thumbnails = document.querySelectorAll('.img_wrap a');
-    thumbnails.forEach(link => {
-      const href = link.getAttribute('href');
-      const workId = extractWorkId(href);
-      if (workId === work.id) {
-        const imgWrap = link.closest('.img_wrap');
-        if (imgWrap) {
-          imgWrap.setAttribute('data-year', work.year);
-          imgWrap.setAttribute('data-title', work.title);
-          // Category already exists, but ensure it matches
-          imgWrap.setAttribute('data-category', work.category);
-        }
-      }
-    });
-  });
-}
-
-// Load a single work JSON file (lazy loading with cache)
-async function loadWork(workId) {
-  // Return cached data if already loaded
-  if (worksData[workId]) {
-    return worksData[workId];
-  }
-
-  try {
-    const response = await fetch(`../works-data/${workId}.json`);
-    if (!response.ok) {
-      throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-    }
-    const workData = await response.json();
-    worksData[workId] = workData; // Cache for future use
-    return workData;
-  } catch (error) {
-    console.error(`Failed to load ${workId}.json:`, error);
-    return null;
-  }
-}
-
-/**
- * Announce a view change to screen readers. Swapping the grid for a detail view
- * changes the whole page without a navigation, so nothing would otherwise be
- * read out. The region is clipped rather than display:none -- hidden regions are
- * not announced -- so it occupies no pixels.
- */
-function announce(message) {
-  let region = document.getElementById('spa-live-region');
-  if (!region) {
-    region = document.createElement('div');
-    region.id = 'spa-live-region';
-    region.setAttribute('role', 'status');
-    region.setAttribute('aria-live', 'polite');
-    region.style.cssText = 'position:absolute;width:1px;height:1px;margin:-1px;' +
-      'padding:0;border:0;overflow:hidden;clip:rect(0 0 0 0);clip-path:inset(50%);white-space:nowrap';
-    document.body.appendChild(region);
-  }
-  region.textContent = message;
-}
-
-/**
- * Move focus without scrolling. preventScroll matters because the caller also
- * runs its own smooth scroll to the top, and the two would fight.
- */
-function focusQuietly(el) {
-  if (!el) return;
-  if (!el.hasAttribute('tabindex')) el.setAttribute('tabindex', '-1');
-  el.focus({ preventScroll: true });
-}
-
-/**
- * Thumbnail URL for a work id, read out of the grid that is already in the DOM.
- * Avoids fetching each related work's JSON just to learn its thumbnail.
- */
-function thumbnailForWork(workId) {
-  for (const link of document.querySelectorAll('.img_wrap a')) {
-    if (extractWorkId(link.getAttribute('href')) !== workId) continue;
-    const img = link.querySelector('img');
-    // Before lazy-load swaps it in, the real URL still lives on data-src.
-    if (img) return img.dataset.src || img.getAttribute('src');
-  }
-  return null;
-}
-
-/**
- * Up to `limit` works to show in the Related band: the author's own
- * cross-references first, then same-category works to fill the row.
- */
-function relatedWorksFor(work, limit = 3) {
-  const picked = [];
-  const take = (id) => {
-    if (id === work.id || picked.some(w => w.id === id)) return;
-    const meta = worksIndex.find(w => w.id === id);
-    if (meta) picked.push(meta);
-  };
-  // The prev/next arrows sit directly above the band, so a neighbour appearing
-  // as a card too just repeats itself. Author-written picks still win.
-  const { prev, next } = neighboursOf(work.id);
-  const isNeighbour = (id) => id === prev?.id || id === next?.id;
-
-  // work.related is a list of work ids. Older data used an HTML string; ignore
-  // that shape rather than injecting it into a thumbnail card.
-  if (Array.isArray(work.related)) work.related.forEach(take);
-
-  // Fill from the same category, nearest in display order first. Display order
-  // is roughly chronological, so neighbours come from the same period — and each
-  // work gets a different set, instead of every code work listing the same three.
-  const here = worksOrder.indexOf(work.id);
-  const sameCategory = worksIndex
-    .filter(w => w.category === work.category && w.id !== work.id)
-    .sort((a, b) => Math.abs(worksOrder.indexOf(a.id) - here) - Math.abs(worksOrder.indexOf(b.id) - here));
-  for (const candidate of sameCategory) {
-    if (picked.length >= limit) break;
-    if (!isNeighbour(candidate.id)) take(candidate.id);
-  }
-  // If skipping neighbours left the row short (tiny categories), allow them back.
-  for (const candidate of sameCategory) {
-    if (picked.length >= limit) break;
-    take(candidate.id);
-  }
-  return picked.slice(0, limit);
-}
-
-/** Prev/next neighbours in display order. Ends of the list simply have none. */
-function neighboursOf(workId) {
-  const i = worksOrder.indexOf(workId);
-  const at = (n) => (n >= 0 && n < worksOrder.length ? worksIndex.find(w => w.id === worksOrder[n]) : null);
-  return { prev: i > 0 ? at(i - 1) : null, next: i >= 0 ? at(i + 1) : null };
-}
-
-/** Markup for the browse strip at the foot of a work: prev/next + Related band. */
-function browseStripHtml(work) {
-  const { prev, next } = neighboursOf(work.id);
-  const related = relatedWorksFor(work);
-
-  const arrow = (w, dir) => {
-    if (!w) return '<span class="work-nav-slot"></span>';
-    const label = dir === 'prev' ? `← ${w.title}` : `${w.title} →`;
-    return `<a class="work-nav-link work-nav-${dir}" href="#${w.id}" data-work-id="${w.id}">
+let worksData={};let worksOrder=[];let worksIndex=[];let worksById=new Map();let worksByFilename=new Map();let worksPosition=new Map();let bundleManifest=null;let detailManifest=null;let indexDirectory=null;let indexShards=null;let gridItems=[];let gridIds=new Set();const bundleRequests=new Map();const detailRequests=new Map();let lastWorkId=null;let currentSwiper=null;const PURIFY_OPTIONS={ADD_ATTR:['fetchpriority']};const GLITCH_CHARS='01@#$%&*[]{}01010101><~^+=?/\\|';const PREFERS_REDUCED_MOTION=window.matchMedia&&window.matchMedia('(prefers-reduced-motion: reduce)').matches;function animateTextGlitch(element,targetText,duration=800){if(!element)return;if(PREFERS_REDUCED_MOTION){element.textContent=targetText;return;}
+const originalText=element.textContent||'';const maxLength=Math.max(originalText.length,targetText.length);const startTime=performance.now();const charDelays=Array.from({length:maxLength},()=>Math.random()*0.5);function update(currentTime){const elapsed=currentTime-startTime;const progress=Math.min(elapsed/duration,1);let result='';for(let i=0;i<maxLength;i++){const charProgress=Math.min(Math.max((progress-charDelays[i])/0.5,0),1);if(charProgress<1){if(Math.random()>charProgress){result+=GLITCH_CHARS[Math.floor(Math.random()*GLITCH_CHARS.length)];}else{result+=targetText[i]||'';}}else{result+=targetText[i]||'';}}
+element.textContent=result;if(progress<1){requestAnimationFrame(update);}else{element.textContent=targetText;}}
+requestAnimationFrame(update);}
+function animateTextTypewriter(element,targetText,duration=800,preserveHTML=false){if(!element)return;if(PREFERS_REDUCED_MOTION){if(preserveHTML){element.innerHTML=targetText;}else{element.textContent=targetText.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim();}
+return;}
+const startTime=performance.now();const textToAnimate=preserveHTML?targetText:targetText.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim();function update(currentTime){const elapsed=currentTime-startTime;const progress=Math.min(elapsed/duration,1);const charsToShow=Math.floor(textToAnimate.length*progress);if(preserveHTML){element.innerHTML=textToAnimate.substring(0,charsToShow)+(progress<1?'<span class="typing-cursor">▌</span>':'');}else{element.textContent=textToAnimate.substring(0,charsToShow)+(progress<1?'▌':'');}
+if(progress<1){requestAnimationFrame(update);}else{if(preserveHTML){element.innerHTML=targetText;}else{element.textContent=textToAnimate;}}}
+requestAnimationFrame(update);}
+function animateTextTransition(element,targetText,animationType='glitch',duration=800){if(animationType==='typewriter'){animateTextTypewriter(element,targetText,duration);}else{animateTextGlitch(element,targetText,duration);}}
+let loadingBarDelayTimer=null;function showLoadingSpinner(){const bar=document.getElementById('loading-spinner');if(!bar)return;clearTimeout(loadingBarDelayTimer);loadingBarDelayTimer=setTimeout(()=>{bar.style.display='block';},300);}
+function hideLoadingSpinner(){clearTimeout(loadingBarDelayTimer);loadingBarDelayTimer=null;const bar=document.getElementById('loading-spinner');if(bar){bar.style.display='none';}}
+function updateMetaTags(work){document.title=`${work.title} - Ryo Simon`;let metaDescription=document.querySelector('meta[name="description"]');if(metaDescription&&work.description){const plainText=work.description.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim();const shortDesc=plainText.substring(0,155)+(plainText.length>155?'...':'');metaDescription.setAttribute('content',shortDesc);}
+let ogTitle=document.querySelector('meta[property="og:title"]');if(ogTitle){ogTitle.setAttribute('content',`${work.title} - Ryo Simon`);}
+let ogDescription=document.querySelector('meta[property="og:description"]');if(ogDescription&&work.description){const plainText=work.description.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim();const shortDesc=plainText.substring(0,155)+(plainText.length>155?'...':'');ogDescription.setAttribute('content',shortDesc);}
+let ogImage=document.querySelector('meta[property="og:image"]');if(ogImage&&work.thumbnail){const baseUrl='https://ryo-simon-mf.github.io';const imagePath=work.thumbnail.startsWith('http')?work.thumbnail:`${baseUrl}/works/${work.thumbnail}`;ogImage.setAttribute('content',imagePath);}
+let ogUrl=document.querySelector('meta[property="og:url"]');if(ogUrl){ogUrl.setAttribute('content',`https://ryo-simon-mf.github.io/works/works.html#${work.id}`);}
+addStructuredData(work);}
+function applyWorkHead(head){document.title=head.title;head.meta.forEach(([attr,key,content])=>{const meta=document.querySelector(`meta[${attr}="${key}"]`);if(meta)meta.setAttribute('content',content);});removeStructuredData();const script=document.createElement('script');script.type='application/ld+json';script.id='work-structured-data';script.text=head.jsonld;document.head.appendChild(script);}
+function addStructuredData(work){removeStructuredData();const structuredData={"@context":"https://schema.org","@type":"CreativeWork","name":work.title,"creator":{"@type":"Person","name":"Ryo Simon","alternateName":"Ryo Nishikado","url":"https://ryo-simon-mf.github.io"},"dateCreated":work.year,"description":work.description?work.description.replace(/<[^>]*>/g,' ').replace(/\s+/g,' ').trim():'',"image":work.thumbnail?`https://ryo-simon-mf.github.io/works/${work.thumbnail}`:'',"url":`https://ryo-simon-mf.github.io/works/works.html#${work.id}`,"keywords":[work.category,"interactive art","creative coding","media art"],"genre":work.category};if(work.tools){structuredData.tool=work.tools.replace(/<[^>]*>/g,' ').trim();}
+if(work.award){structuredData.award=work.award.replace(/<[^>]*>/g,' ').trim();}
+const script=document.createElement('script');script.type='application/ld+json';script.id='work-structured-data';script.text=JSON.stringify(structuredData,null,2);document.head.appendChild(script);}
+function removeStructuredData(){const existing=document.getElementById('work-structured-data');if(existing){existing.remove();}}
+function resetMetaTags(){document.title='Works - Ryo Simon';removeStructuredData();let metaDescription=document.querySelector('meta[name="description"]');if(metaDescription){metaDescription.setAttribute('content','Works project by Ryo Simon.');}
+let ogTitle=document.querySelector('meta[property="og:title"]');if(ogTitle){ogTitle.setAttribute('content','Works - Ryo Simon');}
+let ogDescription=document.querySelector('meta[property="og:description"]');if(ogDescription){ogDescription.setAttribute('content','Works project by Ryo Simon.');}
+let ogImage=document.querySelector('meta[property="og:image"]');if(ogImage){ogImage.setAttribute('content','https://ryo-simon-mf.github.io/image/profile/2025_icon_basic.webp');}
+let ogUrl=document.querySelector('meta[property="og:url"]');if(ogUrl){ogUrl.setAttribute('content','https://ryo-simon-mf.github.io/works/works.html');}}
+function unpackIndex(packed){const columns=Object.entries(packed.columns).map(([key,column])=>[key,Array.isArray(column)?column:column.codes.map(code=>column.values[code])]);return Array.from({length:packed.count},(_,i)=>{const work={};for(const[key,values]of columns){if(values[i]!==null&&values[i]!==undefined)work[key]=values[i];}
+return work;});}
+async function loadIndexHead(){const meta=document.querySelector('meta[name="works-index"]');if(!meta||meta.content!=='sharded')return null;try{const directoryResponse=await fetch('../works-data/index/directory.json');if(!directoryResponse.ok)return null;const directory=await directoryResponse.json();const headResponse=await fetch(`../works-data/${directory.head.file}`);if(!headResponse.ok)return null;indexDirectory=directory;return unpackIndex(await headResponse.json());}catch(error){return null;}}
+async function loadIndex(){const head=await loadIndexHead();if(head)return head;try{const packedResponse=await fetch('../works-data/index.columns.json');if(packedResponse.ok)return unpackIndex(await packedResponse.json());}catch(error){}
+const indexResponse=await fetch('../works-data/index.json');const indexData=await indexResponse.json();return indexData.works||indexData.order.map(id=>({id}));}
+async function loadBundleManifest(){try{const response=await fetch('../works-data/bundles/manifest.json');return response.ok?await response.json():null;}catch(error){return null;}}
+async function loadDetailManifest(){try{const response=await fetch('../works-data/detail/manifest.json');return response.ok?await response.json():null;}catch(error){return null;}}
+async function loadIndexShards(){const requested=new URLSearchParams(window.location.search).get('filter');const categories=Object.keys(indexDirectory.categories).sort((a,b)=>(b===requested)-(a===requested));const byPosition=[];worksIndex.forEach(w=>{byPosition[w.position]=w;});for(const category of categories){for(const file of indexDirectory.categories[category].shards){try{const response=await fetch(`../works-data/${file}`);if(!response.ok)throw new Error(`HTTP ${response.status}: ${response.statusText}`);const added=unpackIndex(await response.json()).filter(w=>!byPosition[w.position]);added.forEach(w=>{byPosition[w.position]=w;});setWorksIndex(byPosition.filter(Boolean));extendGrid(added);}catch(error){console.error(`Failed to load index shard ${file}:`,error);}}}}
+function extendGrid(works){const added=works.filter(w=>!gridIds.has(w.id)&&w.filename).sort((a,b)=>a.position-b.position).map(w=>({id:w.id,position:w.position,el:createGridItem(w)}));if(!added.length)return;const container=document.querySelector('.center-container');const merged=[];let i=0;for(const item of added){while(i<gridItems.length&&gridItems[i].position<item.position)merged.push(gridItems[i++]);container.insertBefore(item.el,i<gridItems.length?gridItems[i].el:null);merged.push(item);}
+gridItems=merged.concat(gridItems.slice(i));added.forEach(item=>gridIds.add(item.id));added.forEach(item=>interceptThumbnailClick(item.el.querySelector('a')));document.dispatchEvent(new CustomEvent('works:grid-extended',{detail:{items:added.map(item=>item.el)}}));}
+function createGridItem(work){const item=document.createElement('div');item.className='img_wrap';item.setAttribute('data-category',work.category);item.setAttribute('data-year',work.year);item.setAttribute('data-title',work.title);const size=work.width&&work.height?` width="${work.width}" height="${work.height}"`:'';item.innerHTML=`<a href="./${work.filename}">
+                        <img src="data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 4 3'%3E%3C/svg%3E" data-src="${work.thumbnail || ''}" alt="${work.title}"${size} decoding="async">
+                    </a>`;return item;}
+function interceptThumbnailClick(link){link.addEventListener('click',function(e){if(e.metaKey||e.ctrlKey||e.shiftKey||e.altKey||e.button!==0)return;e.preventDefault();const href=this.getAttribute('href');const workId=extractWorkId(href);window.location.hash=workId;});}
+function setWorksIndex(works){worksIndex=works;worksOrder=works.map(w=>w.id);worksById=new Map(works.map(w=>[w.id,w]));worksByFilename=new Map(works.filter(w=>w.filename).map(w=>[w.filename,w]));worksPosition=new Map(worksOrder.map((id,i)=>[id,i]));}
+async function initWorksSPA(){try{const[works,manifest,details]=await Promise.all([loadIndex(),loadBundleManifest(),loadDetailManifest()]);setWorksIndex(works);bundleManifest=manifest;detailManifest=details;collectGridItems();document.querySelectorAll('.img_wrap a').forEach(interceptThumbnailClick);if(indexDirectory){extendGrid(worksIndex);const counts={all:indexDirectory.count};Object.entries(indexDirectory.categories).forEach(([category,entry])=>{counts[category]=entry.count;});document.dispatchEvent(new CustomEvent('works:index-directory',{detail:{counts}}));}
+window.addEventListener('hashchange',handleHashChange);if(indexDirectory)indexShards=loadIndexShards();await handleHashChange();}catch(error){console.error('Failed to initialize Works SPA:',error);}}
+function collectGridItems(){gridItems=[];gridIds=new Set();document.querySelectorAll('.img_wrap a').forEach(link=>{const workId=extractWorkId(link.getAttribute('href'));const work=worksById.get(workId);const imgWrap=link.closest('.img_wrap');gridIds.add(workId);if(work&&imgWrap){gridItems.push({id:work.id,position:work.position??worksPosition.get(work.id),el:imgWrap});}});}
+function fetchBundle(url){if(!bundleRequests.has(url)){const request=fetch(`../works-data/${url}`).then(response=>{if(!response.ok)throw new Error(`HTTP ${response.status}: ${response.statusText}`);return response.json();}).then(bundle=>{Object.assign(worksData,bundle);}).catch(error=>{bundleRequests.delete(url);throw error;});bundleRequests.set(url,request);}
+return bundleRequests.get(url);}
+function fetchDetail(url){if(!detailRequests.has(url)){const request=fetch(`../works-data/${url}`).then(response=>{if(!response.ok)throw new Error(`HTTP ${response.status}: ${response.statusText}`);return response.text();}).catch(error=>{detailRequests.delete(url);throw error;});detailRequests.set(url,request);}
+return detailRequests.get(url);}
+async function loadPrerenderedView(workId){const url=detailManifest?.works[workId];if(!url)return null;try{const template=document.createElement('template');template.innerHTML=await fetchDetail(url);const view=template.content.firstElementChild;if(!view||view.id!=='work-detail-view')return null;const headScript=view.querySelector('script.work-head');headScript?.remove();view.innerHTML=DOMPurify.sanitize(view.innerHTML,PURIFY_OPTIONS);if(headScript)view.prepend(headScript);return view;}catch(error){console.warn(`Failed to load prerendered view ${url}:`,error);return null;}}
+function workFromView(view,workId){const data=view.dataset;const headScript=view.querySelector('script.work-head');let head=null;if(headScript){try{head=JSON.parse(headScript.textContent);}catch(error){console.warn(`Invalid head in prerendered view of ${workId}:`,error);}
+headScript.remove();}
+return{id:workId,title:data.title,year:data.year,category:data.category,thumbnail:thumbnailForWork(workId),head};}
+function prefetchNeighbours(workId){const{prev,next}=neighboursOf(workId);[prev,next].forEach(w=>{const detailUrl=w&&detailManifest?.works[w.id];if(detailUrl){fetchDetail(detailUrl).catch(()=>{});return;}
+const url=w&&bundleManifest?.works[w.id];if(url&&!worksData[w.id])fetchBundle(url).catch(()=>{});});}
+async function loadWork(workId){if(worksData[workId]){return worksData[workId];}
+const bundleUrl=bundleManifest?.works[workId];if(bundleUrl){try{await fetchBundle(bundleUrl);if(worksData[workId])return worksData[workId];}catch(error){console.warn(`Failed to load bundle ${bundleUrl}:`,error);}}
+try{const response=await fetch(`../works-data/${workId}.json`);if(!response.ok){throw new Error(`HTTP ${response.status}: ${response.statusText}`);}
+const workData=await response.json();worksData[workId]=workData;return workData;}catch(error){console.error(`Failed to load ${workId}.json:`,error);return null;}}
+function announce(message){let region=document.getElementById('spa-live-region');if(!region){region=document.createElement('div');region.id='spa-live-region';region.setAttribute('role','status');region.setAttribute('aria-live','polite');region.style.cssText='position:absolute;width:1px;height:1px;margin:-1px;'+
+'padding:0;border:0;overflow:hidden;clip:rect(0 0 0 0);clip-path:inset(50%);white-space:nowrap';document.body.appendChild(region);}
+region.textContent=message;}
+function focusQuietly(el){if(!el)return;if(!el.hasAttribute('tabindex'))el.setAttribute('tabindex','-1');el.focus({preventScroll:true});}
+function thumbnailForWork(workId){return worksById.get(workId)?.thumbnail||null;}
+function relatedWorksFor(work,limit=3){const picked=[];const take=(id)=>{if(id===work.id||picked.some(w=>w.id===id))return;const meta=worksById.get(id);if(meta)picked.push(meta);};const{prev,next}=neighboursOf(work.id);const isNeighbour=(id)=>id===prev?.id||id===next?.id;if(Array.isArray(work.related))work.related.forEach(take);const here=worksPosition.get(work.id)??-1;const sameCategory=worksIndex.filter(w=>w.category===work.category&&w.id!==work.id).sort((a,b)=>Math.abs(worksPosition.get(a.id)-here)-Math.abs(worksPosition.get(b.id)-here));for(const candidate of sameCategory){if(picked.length>=limit)break;if(!isNeighbour(candidate.id))take(candidate.id);}
+for(const candidate of sameCategory){if(picked.length>=limit)break;take(candidate.id);}
+return picked.slice(0,limit);}
+function neighboursOf(workId){const i=worksPosition.get(workId)??-1;const at=(n)=>(n>=0&&n<worksOrder.length?worksIndex[n]:null);return{prev:i>0?at(i-1):null,next:i>=0?at(i+1):null};}
+function browseStripHtml(work){const{prev,next}=neighboursOf(work.id);const related=relatedWorksFor(work);const arrow=(w,dir)=>{if(!w)return'<span class="work-nav-slot"></span>';const label=dir==='prev'?`← ${w.title}`:`${w.title} →`;return`<a class="work-nav-link work-nav-${dir}" href="#${w.id}" data-work-id="${w.id}">
               <span class="work-nav-title">${label}</span>
               <span class="work-nav-year">${w.year}</span>
-            </a>`;
-  };
-
-  const card = (w) => {
-    const thumb = thumbnailForWork(w.id);
-    return `<a class="related-card" href="#${w.id}" data-work-id="${w.id}">
-              ${thumb ? `<img src="${thumb}" alt="${w.title}" loading="lazy">` : '<span class="related-card-noimg"></span>'}
+            </a>`;};const card=(w)=>{const thumb=thumbnailForWork(w.id);const size=w.width&&w.height?` width="${w.width}" height="${w.height}"`:'';return`<a class="related-card" href="#${w.id}" data-work-id="${w.id}">
+              ${thumb ? `<img src="${thumb}" alt="${w.title}"${size} loading="lazy" decoding="async">` : '<span class="related-card-noimg"></span>'}
               <span class="related-card-year">${w.year}</span>
               <span class="related-card-title">${w.title}</span>
-            </a>`;
-  };
-
-  return `
+            </a>`;};return`
             <nav class="work-nav" aria-label="Previous and next work">
                 ${arrow(prev, 'prev')}
                 ${arrow(next, 'next')}
@@ -505,302 +84,34 @@ function browseStripHtml(work) {
                 <div class="related-works-grid">
                     ${related.map(card).join('')}
                 </div>
-            </section>` : ''}`;
-}
-
-/**
- * Work id for a thumbnail href, resolved from the `filename` field in
- * index.json. Filenames and ids differ in inconsistent ways (tSA.html ->
- * t-s-a, muses_ex_echoes.html -> muses-ex-echoes), so the pairing has to be
- * declared somewhere; index.json keeps it next to the work it describes
- * instead of in a table here that had to be edited for every new work.
- */
-function extractWorkId(href) {
-  const filename = href.replace('./', '');
-  const match = worksIndex.find(w => w.filename === filename);
-  if (match) return match.id;
-  // Before index.json resolves, or for a page not listed in it, fall back to
-  // the filename stem. Correct whenever the two already agree.
-  return filename.replace('.html', '');
-}
-
-// Handle hash change events (async to support lazy loading)
-async function handleHashChange() {
-  const hash = window.location.hash.slice(1); // Remove #
-
-  if (hash) {
-    // Show loading spinner while fetching data
-    showLoadingSpinner();
-
-    // Lazy load work data if not already cached
-    const workData = await loadWork(hash);
-
-    // Hide spinner after data is loaded
-    hideLoadingSpinner();
-
-    if (workData) {
-      showWorkDetail(hash);
-    } else {
-      // Work not found, show list
-      showWorksList();
-    }
-  } else {
-    showWorksList();
-  }
-}
-
-// Show works list (grid view)
-function showWorksList() {
-  const centerContainer = document.querySelector('.center-container');
-  const contentDiv = document.getElementById('content');
-  const detailView = document.getElementById('work-detail-view');
-
-  // If detail view exists, fade out images and content only (keep title/year/genre visible)
-  if (detailView) {
-    const swiperContainer = detailView.querySelector('.swiper-container');
-    const contentInDiv = detailView.querySelector('#content_in');
-    const h3Element = detailView.querySelector('h3');
-    const fixedHeaderArea = detailView.querySelector('.fixed-header-area');
-    // Get hrs outside fixed header only
-    const hrs = Array.from(detailView.querySelectorAll('hr')).filter(hr =>
-      !fixedHeaderArea || !fixedHeaderArea.contains(hr)
-    );
-
-    // Fade out images, content, and h3
-    if (swiperContainer) {
-      swiperContainer.style.transition = 'opacity 0.4s ease';
-      swiperContainer.style.opacity = '0';
-    }
-    if (contentInDiv) {
-      contentInDiv.style.transition = 'opacity 0.4s ease';
-      contentInDiv.style.opacity = '0';
-    }
-    if (h3Element) {
-      h3Element.style.transition = 'opacity 0.4s ease';
-      h3Element.style.opacity = '0';
-    }
-    hrs.forEach(hr => {
-      hr.style.transition = 'opacity 0.4s ease';
-      hr.style.opacity = '0';
-    });
-
-    // Wait for fade out, then show list
-    setTimeout(() => {
-      showWorksListAfterFadeOut();
-    }, 400);
-  } else {
-    // No detail view, show list immediately
-    showWorksListAfterFadeOut();
-  }
-
-  function showWorksListAfterFadeOut() {
-    // Reset meta tags to default
-    resetMetaTags();
-
-    // Remove detail view if exists
-    if (detailView) {
-      detailView.remove();
-    }
-
-    // Show ALL original content elements
-    const elementsToShow = contentDiv.querySelectorAll(':scope > br, :scope > h1, :scope > hr, :scope > p');
-    elementsToShow.forEach(el => {
-      el.style.display = 'block';
-    });
-
-    // Animate h1 back to "Works" with glitch effect
-    const h1 = contentDiv.querySelector('h1');
-    if (h1) {
-      animateTextTransition(h1, 'Works', 'glitch', 600);
-    }
-
-    // Animate filter buttons with glitch effect
-    const filterP = contentDiv.querySelector('p');
-    if (filterP) {
-      const filterButtons = filterP.querySelectorAll('.filter-btn');
-      const filterTexts = ['All', 'Code', 'Object', 'Design'];
-
-      filterButtons.forEach((btn, index) => {
-        const targetText = filterTexts[index];
-
-        // Set initial random glitch text to make animation visible
-        const glitchChars = '01@#$%&*[]{}><~^+=?/\\|';
-        let initialText = '';
-        for (let i = 0; i < targetText.length; i++) {
-          initialText += glitchChars[Math.floor(Math.random() * glitchChars.length)];
-        }
-        btn.textContent = initialText;
-
-        // Animate to target text with glitch effect
-        setTimeout(() => {
-          animateTextGlitch(btn, targetText, 400);
-        }, 100 + index * 50);
-      });
-    }
-
-    // Animate filter count (with badge)
-    const filterCount = contentDiv.querySelector('#filter-count');
-    if (filterCount) {
-      // Recalculate work count based on active filter
-      const activeFilter = document.querySelector('.filter-btn.active');
-      const filterValue = activeFilter ? activeFilter.getAttribute('data-filter') : 'all';
-      const imgWraps = document.querySelectorAll('.img_wrap');
-
-      let workCount = 0;
-      if (filterValue === 'all') {
-        workCount = imgWraps.length;
-      } else {
-        imgWraps.forEach(item => {
-          if (item.getAttribute('data-category') === filterValue) {
-            workCount++;
-          }
-        });
-      }
-
-      const workText = workCount === 1 ? 'work' : 'works';
-      const targetText = ` [${workCount} ${workText}]`;
-
-      // Set initial random glitch text
-      const glitchChars = '01@#$%&*[]{}><~^+=?/\\|';
-      let initialText = '';
-      for (let i = 0; i < targetText.length; i++) {
-        initialText += glitchChars[Math.floor(Math.random() * glitchChars.length)];
-      }
-      filterCount.textContent = initialText;
-
-      setTimeout(() => {
-        animateTextTransition(filterCount, targetText, 'glitch', 400);
-      }, 300);
-    }
-
-    // Show center-container
-    if (centerContainer) {
-      centerContainer.style.display = 'block';
-    }
-
-    // Restore filter state - check which filter button is active
-    const activeFilter = document.querySelector('.filter-btn.active');
-    const filterValue = activeFilter ? activeFilter.getAttribute('data-filter') : 'all';
-
-    // Apply filter based on active button
-    const visibleItems = [];
-    document.querySelectorAll('.img_wrap').forEach(item => {
-      if (filterValue === 'all') {
-        // Show all thumbnails
-        item.style.display = 'inline-block';
-        visibleItems.push(item);
-      } else {
-        // Show only matching category
-        const itemCategory = item.getAttribute('data-category');
-        if (itemCategory === filterValue) {
-          item.style.display = 'inline-block';
-          visibleItems.push(item);
-        } else {
-          item.style.display = 'none';
-        }
-      }
-
-      // Prepare for fade in
-      item.style.opacity = '0';
-      item.style.transition = 'opacity 0.4s ease';
-      item.style.willChange = 'opacity'; // Hint to browser for optimization
-    });
-
-    // Reinitialize lazy loading for visible images
-    if (window.reinitLazyLoad) {
-      window.reinitLazyLoad();
-    }
-
-    // Cascade fade in (staggered) to prevent main thread blocking
-    visibleItems.forEach((item, index) => {
-      setTimeout(() => {
-        item.style.opacity = '1';
-        // Remove will-change after animation
-        setTimeout(() => {
-          item.style.willChange = 'auto';
-        }, 400);
-      }, PREFERS_REDUCED_MOTION ? 0 : 100 + index * 30); // 30ms delay between each thumbnail
-    });
-
-    // Destroy swiper if exists
-    if (currentSwiper) {
-      currentSwiper.destroy(true, true);
-      currentSwiper = null;
-    }
-
-    // Put focus back on the thumbnail the visitor left from, so returning to the
-    // grid resumes where they were rather than at the top of the document.
-    const origin = lastWorkId && Array.from(document.querySelectorAll('.img_wrap a'))
-      .find(a => extractWorkId(a.getAttribute('href')) === lastWorkId);
-    if (origin) origin.focus({ preventScroll: true });
-    lastWorkId = null;
-    announce('作品一覧に戻りました');
-  }
-}
-
-// Show work detail view
-function showWorkDetail(workId) {
-  const work = worksData[workId];
-  const contentDiv = document.getElementById('content');
-  const centerContainer = document.querySelector('.center-container');
-
-  // Update meta tags for SEO
-  updateMetaTags(work);
-
-  // Fade out all thumbnails first
-  const thumbnails = document.querySelectorAll('.img_wrap');
-  thumbnails.forEach(item => {
-    item.style.transition = 'opacity 0.4s ease';
-    item.style.opacity = '0';
-  });
-
-  // Wait for fade out animation to complete
-  setTimeout(() => {
-    // Hide ALL original content elements
-    const elementsToHide = contentDiv.querySelectorAll(':scope > br, :scope > h1, :scope > hr, :scope > p');
-    elementsToHide.forEach(el => {
-      el.style.display = 'none';
-    });
-
-    // Hide center-container
-    if (centerContainer) {
-      centerContainer.style.display = 'none';
-    }
-
-    // Hide all thumbnails
-    thumbnails.forEach(item => {
-      item.style.display = 'none';
-    });
-
-    // Create detail view after fade out
-    createDetailView(work, workId);
-  }, 400);
-}
-
-// Create detail view HTML - EXACT copy of original structure
-function createDetailView(work, workId) {
-  const contentDiv = document.getElementById('content');
-
-  // Remove existing detail view
-  const existingDetail = document.getElementById('work-detail-view');
-  if (existingDetail) existingDetail.remove();
-
-  // Create detail view container
-  const detailView = document.createElement('div');
-  detailView.id = 'work-detail-view';
-
-  // Build images HTML for Swiper
-  const swiperSlides = work.images.map((img, i) => `
+            </section>` : ''}`;}
+function extractWorkId(href){const filename=href.replace('./','');const match=worksByFilename.get(filename);if(match)return match.id;return filename.replace('.html','');}
+async function handleHashChange(){const hash=window.location.hash.slice(1);if(hash){showLoadingSpinner();if(indexShards&&!worksById.has(hash))await indexShards;const prerendered=await loadPrerenderedView(hash);const workData=prerendered?workFromView(prerendered,hash):await loadWork(hash);hideLoadingSpinner();if(workData){showWorkDetail(hash,workData,prerendered);prefetchNeighbours(hash);}else{showWorksList();}}else{showWorksList();}}
+function showWorksList(){const centerContainer=document.querySelector('.center-container');const contentDiv=document.getElementById('content');const detailView=document.getElementById('work-detail-view');if(detailView){const swiperContainer=detailView.querySelector('.swiper-container');const contentInDiv=detailView.querySelector('#content_in');const h3Element=detailView.querySelector('h3');const fixedHeaderArea=detailView.querySelector('.fixed-header-area');const hrs=Array.from(detailView.querySelectorAll('hr')).filter(hr=>!fixedHeaderArea||!fixedHeaderArea.contains(hr));if(swiperContainer){swiperContainer.style.transition='opacity 0.4s ease';swiperContainer.style.opacity='0';}
+if(contentInDiv){contentInDiv.style.transition='opacity 0.4s ease';contentInDiv.style.opacity='0';}
+if(h3Element){h3Element.style.transition='opacity 0.4s ease';h3Element.style.opacity='0';}
+hrs.forEach(hr=>{hr.style.transition='opacity 0.4s ease';hr.style.opacity='0';});setTimeout(()=>{showWorksListAfterFadeOut();},400);}else{showWorksListAfterFadeOut();}
+function showWorksListAfterFadeOut(){resetMetaTags();if(detailView){detailView.remove();}
+const elementsToShow=contentDiv.querySelectorAll(':scope > br, :scope > h1, :scope > hr, :scope > p');elementsToShow.forEach(el=>{el.style.display='block';});const h1=contentDiv.querySelector('h1');if(h1){animateTextTransition(h1,'Works','glitch',600);}
+const filterP=contentDiv.querySelector('p');if(filterP){const filterButtons=filterP.querySelectorAll('.filter-btn');const filterTexts=['All','Code','Object','Design'];filterButtons.forEach((btn,index)=>{const targetText=filterTexts[index];const glitchChars='01@#$%&*[]{}><~^+=?/\\|';let initialText='';for(let i=0;i<targetText.length;i++){initialText+=glitchChars[Math.floor(Math.random()*glitchChars.length)];}
+btn.textContent=initialText;setTimeout(()=>{animateTextGlitch(btn,targetText,400);},100+index*50);});}
+const filterCount=contentDiv.querySelector('#filter-count');if(filterCount){const activeFilter=document.querySelector('.filter-btn.active');const filterValue=activeFilter?activeFilter.getAttribute('data-filter'):'all';const imgWraps=document.querySelectorAll('.img_wrap');let workCount=0;if(filterValue==='all'){workCount=imgWraps.length;}else{imgWraps.forEach(item=>{if(item.getAttribute('data-category')===filterValue){workCount++;}});}
+const workText=workCount===1?'work':'works';const targetText=` [${workCount} ${workText}]`;const glitchChars='01@#$%&*[]{}><~^+=?/\\|';let initialText='';for(let i=0;i<targetText.length;i++){initialText+=glitchChars[Math.floor(Math.random()*glitchChars.length)];}
+filterCount.textContent=initialText;setTimeout(()=>{animateTextTransition(filterCount,targetText,'glitch',400);},300);}
+if(centerContainer){centerContainer.style.display='block';}
+const activeFilter=document.querySelector('.filter-btn.active');const filterValue=activeFilter?activeFilter.getAttribute('data-filter'):'all';const visibleItems=[];document.querySelectorAll('.img_wrap').forEach(item=>{if(filterValue==='all'){item.style.display='inline-block';visibleItems.push(item);}else{const itemCategory=item.getAttribute('data-category');if(itemCategory===filterValue){item.style.display='inline-block';visibleItems.push(item);}else{item.style.display='none';}}
+item.style.opacity='0';item.style.transition='opacity 0.4s ease';item.style.willChange='opacity';});if(window.reinitLazyLoad){window.reinitLazyLoad();}
+visibleItems.forEach((item,index)=>{setTimeout(()=>{item.style.opacity='1';setTimeout(()=>{item.style.willChange='auto';},400);},PREFERS_REDUCED_MOTION?0:100+index*30);});if(currentSwiper){currentSwiper.destroy(true,true);currentSwiper=null;}
+const origin=lastWorkId&&Array.from(document.querySelectorAll('.img_wrap a')).find(a=>extractWorkId(a.getAttribute('href'))===lastWorkId);if(origin)origin.focus({preventScroll:true});lastWorkId=null;announce('作品一覧に戻りました');}}
+function showWorkDetail(workId,work,prerendered=null){const contentDiv=document.getElementById('content');const centerContainer=document.querySelector('.center-container');if(work.head){applyWorkHead(work.head);}else{updateMetaTags(work);}
+const thumbnails=document.querySelectorAll('.img_wrap');thumbnails.forEach(item=>{item.style.transition='opacity 0.4s ease';item.style.opacity='0';});setTimeout(()=>{const elementsToHide=contentDiv.querySelectorAll(':scope > br, :scope > h1, :scope > hr, :scope > p');elementsToHide.forEach(el=>{el.style.display='none';});if(centerContainer){centerContainer.style.display='none';}
+thumbnails.forEach(item=>{item.style.display='none';});if(prerendered){hydrateDetailView(prerendered,work,workId);}else{createDetailView(work,workId);}},400);}
+function createDetailView(work,workId){const detailView=document.createElement('div');detailView.id='work-detail-view';const slidePriority=(i)=>(i===0?'loading="eager" fetchpriority="high"':'loading="lazy"');const swiperSlides=work.images.map((img,i)=>`
                     <div class="swiper-slide">
                         <div class="img_w2">
-                            <img src="${img}" alt="${work.title} ${i + 1}" loading="lazy">
+                            <img src="${img}" alt="${work.title} ${i + 1}" ${slidePriority(i)} decoding="async">
                         </div>
-                    </div>`).join('');
-
-  // EXACT structure from toki-shirube.html with back button added
-  // Use DOMPurify to sanitize HTML and prevent XSS attacks
-  // Initial values set to placeholder for animation (Works → work.title)
-  detailView.innerHTML = DOMPurify.sanitize(`
+                    </div>`).join('');detailView.innerHTML=DOMPurify.sanitize(`
             <!-- Fixed Header Area -->
             <div class="fixed-header-area">
                 <h1>
@@ -895,230 +206,16 @@ ${swiperSlides}
             ${browseStripHtml(work)}
             <hr class="final-hr-2" style="opacity: 0;">
             <br>
-  `);
-
-  contentDiv.appendChild(detailView);
-
-  // Use glitch effect for all works (toki-shirube pattern)
-  const animationType = 'glitch';
-
-  // Animate text transitions: Works → work.title
-  const titleSpan = detailView.querySelector('.work-title-animated');
-  const yearSpan = detailView.querySelector('.work-year-animated');
-  const categorySpan = detailView.querySelector('.work-category-animated');
-
-  // Animate title: "Works" → work.title
-  if (titleSpan) {
-    setTimeout(() => {
-      animateTextTransition(titleSpan, work.title, animationType, 800);
-    }, 100);
-  }
-
-  // Animate year: "----" → work.year
-  if (yearSpan) {
-    setTimeout(() => {
-      animateTextTransition(yearSpan, work.year, animationType, 600);
-    }, 150);
-  }
-
-  // Animate category: "----" → work.category
-  if (categorySpan) {
-    const categoryText = work.category.charAt(0).toUpperCase() + work.category.slice(1);
-    setTimeout(() => {
-      animateTextTransition(categorySpan, categoryText, animationType, 600);
-    }, 200);
-  }
-
-  // Fade in Swiper container (images) simultaneously with title animation
-  const swiperContainer = detailView.querySelector('.swiper-container');
-  if (swiperContainer) {
-    swiperContainer.style.transition = 'opacity 0.8s ease';
-    setTimeout(() => {
-      swiperContainer.style.opacity = '1';
-    }, 100);
-  }
-
-  // Animate content_in section: h3 with real typewriter, others with cascade reveal
-  const contentInDiv = detailView.querySelector('.work-content-animated');
-  const h3Element = detailView.querySelector('h3'); // h3 is outside content_in
-
-  if (contentInDiv) {
-    // Set initial state: invisible but layout is preserved
-    contentInDiv.style.opacity = '0';
-    if (h3Element) {
-      h3Element.style.opacity = '0';
-    }
-
-    setTimeout(() => {
-      // Fade in sections
-      contentInDiv.style.transition = 'opacity 0.3s ease';
-      contentInDiv.style.opacity = '1';
-
-      // Get all elements to animate in order
-      const descriptionP = contentInDiv.querySelector('p');
-      const dlElement = contentInDiv.querySelector('dl');
-
-      // Create array of elements (excluding h3 for now)
-      const elementsToAnimate = [];
-
-      if (descriptionP) elementsToAnimate.push({ element: descriptionP, type: 'p' });
-
-      // Add dt/dd pairs in order
-      if (dlElement) {
-        const children = Array.from(dlElement.children);
-        children.forEach(child => {
-          if (child.tagName === 'DT' || child.tagName === 'DD') {
-            elementsToAnimate.push({ element: child, type: child.tagName.toLowerCase() });
-          }
-        });
-      }
-
-      // === h3: Real typewriter animation (character by character) ===
-      if (h3Element) {
-        const h3Text = h3Element.textContent;
-        h3Element.style.opacity = '1'; // Make h3 visible immediately
-
-        if (PREFERS_REDUCED_MOTION) {
-          h3Element.textContent = h3Text;
-        } else {
-          h3Element.textContent = '';
-
-          // Typewriter animation for h3
-          const startTime = performance.now();
-          const duration = 1000; // 1 second to type h3
-
-          function typeH3(currentTime) {
-            const elapsed = currentTime - startTime;
-            const progress = Math.min(elapsed / duration, 1);
-            const charsToShow = Math.floor(h3Text.length * progress);
-
-            if (progress < 1) {
-              h3Element.textContent = h3Text.substring(0, charsToShow) + '▌';
-              requestAnimationFrame(typeH3);
-            } else {
-              h3Element.textContent = h3Text; // Complete
-            }
-          }
-
-          requestAnimationFrame(typeH3);
-        }
-      }
-
-      // === Other elements: Cascade reveal with cursor effect ===
-      if (PREFERS_REDUCED_MOTION) {
-        // Show everything immediately - no cascade, no cursors
-        elementsToAnimate.forEach(({ element }) => {
-          element.style.opacity = '1';
-        });
-      } else {
-      // Hide all elements initially
-      elementsToAnimate.forEach(({ element }) => {
-        element.style.opacity = '0';
-        element.style.transform = 'translateY(10px)';
-        element.style.transition = 'opacity 0.4s ease, transform 0.4s ease';
-      });
-
-      // Reveal elements sequentially (starts at same time as h3 typewriter)
-      elementsToAnimate.forEach(({ element, type }, index) => {
-        setTimeout(() => {
-          // Add typing cursor before reveal
-          const cursor = document.createElement('span');
-          cursor.className = 'typing-cursor-before';
-          cursor.textContent = '▌';
-          cursor.style.cssText = 'opacity: 0; margin-right: 5px; color: #006DD9; animation: blink 0.8s step-start infinite;';
-
-          element.parentNode.insertBefore(cursor, element);
-
-          // Fade in cursor
-          setTimeout(() => {
-            cursor.style.opacity = '1';
-          }, 50);
-
-          // Reveal element after brief cursor display
-          setTimeout(() => {
-            element.style.opacity = '1';
-            element.style.transform = 'translateY(0)';
-
-            // Remove cursor after element is revealed
-            setTimeout(() => {
-              cursor.style.opacity = '0';
-              setTimeout(() => cursor.remove(), 300);
-            }, 400);
-          }, 200);
-
-        }, index * 150); // Stagger delay: 150ms between elements
-      });
-      }
-
-      // === Final HRs: Fade in after all animations complete ===
-      const finalHr1 = detailView.querySelector('.final-hr-1');
-      const finalHr2 = detailView.querySelector('.final-hr-2');
-
-      if (finalHr1 && finalHr2) {
-        // Hide initially
-        finalHr1.style.opacity = '0';
-        finalHr2.style.opacity = '0';
-        finalHr1.style.transition = 'opacity 0.6s ease';
-        finalHr2.style.transition = 'opacity 0.6s ease';
-
-        // Calculate when all animations finish
-        // h3 typewriter: 1000ms
-        // Last cascade element: (elementsToAnimate.length - 1) * 150 + 200 (cursor) + 400 (reveal)
-        const h3Duration = 1000;
-        const lastCascadeDelay = elementsToAnimate.length > 0
-          ? (elementsToAnimate.length - 1) * 150 + 600
-          : 0;
-        const totalAnimationTime = PREFERS_REDUCED_MOTION
-          ? 0
-          : Math.max(h3Duration, lastCascadeDelay);
-
-        // Fade in final HRs after all animations complete
-        setTimeout(() => {
-          finalHr1.style.opacity = '1';
-
-          // Second HR appears slightly after first
-          setTimeout(() => {
-            finalHr2.style.opacity = '1';
-          }, 200);
-        }, totalAnimationTime + 300); // 300ms buffer after animations
-      }
-
-    }, PREFERS_REDUCED_MOTION ? 0 : 900); // Start after title/year/category animations
-  }
-
-  // Initialize Swiper for detail view
-  setTimeout(() => {
-    currentSwiper = new Swiper('.swiper-container', {
-      loop: work.images.length > 1,
-      navigation: {
-        nextEl: '.swiper-button-next',
-        prevEl: '.swiper-button-prev',
-      },
-      keyboard: {
-        enabled: true,
-      }
-    });
-  }, 50);
-
-  // Breadcrumb "Works" link returns to the grid
-  detailView.querySelector('.breadcrumb-works').addEventListener('click', (e) => {
-    e.preventDefault();
-    window.location.hash = '';
-  });
-
-  // Scroll to top
-  window.scrollTo({ top: 0, behavior: 'smooth' });
-
-  // Land keyboard focus on the heading of the view that just replaced the grid,
-  // so tabbing continues from here instead of restarting at the top of the page.
-  lastWorkId = workId;
-  focusQuietly(detailView.querySelector('.fixed-header-area h1'));
-  announce(`${work.title} の詳細を表示しました`);
-}
-
-// Initialize when DOM is ready
-if (document.readyState === 'loading') {
-  document.addEventListener('DOMContentLoaded', initWorksSPA);
-} else {
-  initWorksSPA();
-}
+  `,PURIFY_OPTIONS);hydrateDetailView(detailView,work,workId);}
+function hydrateDetailView(detailView,work,workId){const contentDiv=document.getElementById('content');const existingDetail=document.getElementById('work-detail-view');if(existingDetail)existingDetail.remove();contentDiv.appendChild(detailView);const animationType='glitch';const titleSpan=detailView.querySelector('.work-title-animated');const yearSpan=detailView.querySelector('.work-year-animated');const categorySpan=detailView.querySelector('.work-category-animated');if(titleSpan){setTimeout(()=>{animateTextTransition(titleSpan,work.title,animationType,800);},100);}
+if(yearSpan){setTimeout(()=>{animateTextTransition(yearSpan,work.year,animationType,600);},150);}
+if(categorySpan){const categoryText=work.category.charAt(0).toUpperCase()+work.category.slice(1);setTimeout(()=>{animateTextTransition(categorySpan,categoryText,animationType,600);},200);}
+const swiperContainer=detailView.querySelector('.swiper-container');if(swiperContainer){swiperContainer.style.transition='opacity 0.8s ease';setTimeout(()=>{swiperContainer.style.opacity='1';},100);}
+const contentInDiv=detailView.querySelector('.work-content-animated');const h3Element=detailView.querySelector('h3');if(contentInDiv){contentInDiv.style.opacity='0';if(h3Element){h3Element.style.opacity='0';}
+setTimeout(()=>{contentInDiv.style.transition='opacity 0.3s ease';contentInDiv.style.opacity='1';const descriptionP=contentInDiv.querySelector('p');const dlElement=contentInDiv.querySelector('dl');const elementsToAnimate=[];if(descriptionP)elementsToAnimate.push({element:descriptionP,type:'p'});if(dlElement){const children=Array.from(dlElement.children);children.forEach(child=>{if(child.tagName==='DT'||child.tagName==='DD'){elementsToAnimate.push({element:child,type:child.tagName.toLowerCase()});}});}
+if(h3Element){const h3Text=h3Element.textContent;h3Element.style.opacity='1';if(PREFERS_REDUCED_MOTION){h3Element.textContent=h3Text;}else{h3Element.textContent='';const startTime=performance.now();const duration=1000;function typeH3(currentTime){const elapsed=currentTime-startTime;const progress=Math.min(elapsed/duration,1);const charsToShow=Math.floor(h3Text.length*progress);if(progress<1){h3Element.textContent=h3Text.substring(0,charsToShow)+'▌';requestAnimationFrame(typeH3);}else{h3Element.textContent=h3Text;}}
+requestAnimationFrame(typeH3);}}
+if(PREFERS_REDUCED_MOTION){elementsToAnimate.forEach(({element})=>{element.style.opacity='1';});}else{elementsToAnimate.forEach(({element})=>{element.style.opacity='0';element.style.transform='translateY(10px)';element.style.transition='opacity 0.4s ease, transform 0.4s ease';});elementsToAnimate.forEach(({element,type},index)=>{setTimeout(()=>{const cursor=document.createElement('span');cursor.className='typing-cursor-before';cursor.textContent='▌';cursor.style.cssText='opacity: 0; margin-right: 5px; color: #006DD9; animation: blink 0.8s step-start infinite;';element.parentNode.insertBefore(cursor,element);setTimeout(()=>{cursor.style.opacity='1';},50);setTimeout(()=>{element.style.opacity='1';element.style.transform='translateY(0)';setTimeout(()=>{cursor.style.opacity='0';setTimeout(()=>cursor.remove(),300);},400);},200);},index*150);});}
+const finalHr1=detailView.querySelector('.final-hr-1');const finalHr2=detailView.querySelector('.final-hr-2');if(finalHr1&&finalHr2){finalHr1 .style.opacity='0';finalHr2 .style.opacity='0';finalHr1 .style.transition='opacity 0.6s ease';finalHr2 .style.transition='opacity 0.6s ease';const h3Duration=1000;const lastCascadeDelay=elementsToAnimate.length>0?(elementsToAnimate.length-1)*150+600:0;const totalAnimationTime=PREFERS_REDUCED_MOTION?0:Math.max(h3Duration,lastCascadeDelay);setTimeout(()=>{finalHr1 .style.opacity='1';setTimeout(()=>{finalHr2 .style.opacity='1';},200);},totalAnimationTime+300);}},PREFERS_REDUCED_MOTION?0:900);}
+setTimeout(()=>{currentSwiper=new Swiper('.swiper-container',{loop:detailView.querySelectorAll('.swiper-slide').length>1,navigation:{nextEl:'.swiper-button-next',prevEl:'.swiper-button-prev',},keyboard:{enabled:true,}});},50);detailView.querySelector('.breadcrumb-works').addEventListener('click',(e)=>{e.preventDefault();window.location.hash='';});window.scrollTo({top:0,behavior:'smooth'});lastWorkId=workId;focusQuietly(detailView.querySelector('.fixed-header-area h1'));announce(`${work.title} の詳細を表示しました`);}
+if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',initWorksSPA);}else{initWorksSPA();}
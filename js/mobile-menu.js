@@ -55,9 +55,7 @@
         document.body.insertBefore(overlay, document.body.firstChild.nextSibling.nextSibling);
 
         // Close menu when a menu link is clicked. Delegated to #menu
-        // because the menu content is injected asynchronously by
-        // load-menu.js on the first page of a session - direct listeners
-        // bound at DOMContentLoaded would find no links yet.
+        // (one listener for every link, whatever the menu contains).
         const menuDiv = document.getElementById('menu');
         if (menuDiv && !menuDiv.dataset.closeBound) {
             menuDiv.dataset.closeBound = '1';
@@ -14,10 +14,15 @@
 
 document.addEventListener('DOMContentLoaded', function() {
     const filterButtons = document.querySelectorAll('.filter-btn');
-    const imgWraps = document.querySelectorAll('.img_wrap');
+    let imgWraps = document.querySelectorAll('.img_wrap');
     const filterCount = document.getElementById('filter-count');
     const container = document.querySelector('.center-container');
     let currentCount = 0;
+    let activeFilter = 'all';
+
+    // Category totals of a sharded index (sent by works-spa.js), known
+    // before every item has been added to the grid
+    let catalogueCounts = null;
 
     if (container) {
         container.style.position = 'relative';
@@ -42,6 +47,9 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Count works by category
     function countWorksByCategory(category) {
+        if (catalogueCounts) {
+            return catalogueCounts[category] || 0;
+        }
         if (category === 'all') {
             return imgWraps.length;
         } else {
@@ -361,6 +369,7 @@ document.addEventListener('DOMContentLoaded', function() {
     filterButtons.forEach(button => {
         button.addEventListener('click', function() {
             const filterValue = this.getAttribute('data-filter');
+            activeFilter = filterValue;
             setActiveButton(filterValue);
             applyFilter(filterValue);
             updateFilterCount(filterValue);
@@ -373,6 +382,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // playing a switch animation against the page's own reveal cascade.
     const requested = new URLSearchParams(window.location.search).get('filter');
     if (requested && FILTERS.includes(requested) && requested !== 'all') {
+        activeFilter = requested;
         setActiveButton(requested);
         imgWraps.forEach(item => {
             const shown = item.getAttribute('data-category') === requested;
@@ -384,4 +394,24 @@ document.addEventListener('DOMContentLoaded', function() {
     } else {
         updateFilterCount('all');
     }
+
+    // A sharded index (works-spa.js) knows the totals up front...
+    document.addEventListener('works:index-directory', function(e) {
+        catalogueCounts = e.detail.counts;
+        updateFilterCount(activeFilter);
+    });
+
+    // ...and adds grid items as its shards arrive: they join in the state of
+    // the current filter, without a switch animation
+    document.addEventListener('works:grid-extended', function(e) {
+        imgWraps = document.querySelectorAll('.img_wrap');
+        e.detail.items.forEach(item => {
+            const shown = activeFilter === 'all' ||
+                item.getAttribute('data-category') === activeFilter;
+            item.dataset.state = shown ? 'in' : 'out';
+            item.style.display = shown ? 'inline-block' : 'none';
+            item.style.opacity = shown ? '1' : '0';
+        });
+        if (window.reinitLazyLoad) window.reinitLazyLoad();
+    });
 });
@@ -3,10 +3,24 @@
 
 let worksData = {}; // Will be populated from JSON files
 let worksOrder = []; // Display order
-let worksIndex = []; // id/title/year/category straight from index.json
+let worksIndex = []; // per-work card metadata straight from index.json
+let worksById = new Map(); // id -> worksIndex entry
+let worksByFilename = new Map(); // page filename -> worksIndex entry
+let worksPosition = new Map(); // id -> position in worksOrder
+let bundleManifest = null; // works-data/bundles/manifest.json, when it has been built
+let detailManifest = null; // works-data/detail/manifest.json, when the views have been prerendered
+let indexDirectory = null; // works-data/index/directory.json, when the index is sharded
+let indexShards = null; // loadIndexShards() of a sharded index, settled once every shard is in
+let gridItems = []; // [{ id, position, el }] of the grid, in display order
+let gridIds = new Set(); // ids of every work in the grid
+const bundleRequests = new Map(); // bundle URL -> its fetch, so each is requested once
+const detailRequests = new Map(); // fragment URL -> its fetch (markup text)
 let lastWorkId = null; // which work the grid was left from, to restore focus to
 let currentSwiper = null;
 
+// DOMPurify options for detail views: keep the image policy's fetchpriority
+const PURIFY_OPTIONS = { ADD_ATTR: ['fetchpriority'] };
+
 // Hacker-style text animation
 // Characters for glitch effect (binary + symbols)
 const GLITCH_CHARS = '01@#$%&*[]{}01010101><~^+=?/\\|';
@@ -214,6 +228,25 @@ function updateMetaTags(work) {
   addStructuredData(work);
 }
 
+/**
+ * Apply a head built by scripts/prerender_works.py: the page title, the
+ * content of each [attribute, key, content] meta tag the page has, and the
+ * serialized JSON-LD.
+ */
+function applyWorkHead(head) {
+  document.title = head.title;
+  head.meta.forEach(([attr, key, content]) => {
+    const meta = document.querySelector(`meta[${attr}="${key}"]`);
+    if (meta) meta.setAttribute('content', content);
+  });
+  removeStructuredData();
+  const script = document.createElement('script');
+  script.type = 'application/ld+json';
+  script.id = 'work-structured-data';
+  script.text = head.jsonld;
+  document.head.appendChild(script);
+}
+
 function addStructuredData(work) {
   // Remove existing structured data if present
   removeStructuredData();
@@ -296,23 +329,200 @@ function resetMetaTags() {
   }
 }
 
+/**
+ * Rows of the packed index (index.columns.json). Every column is an array in
+ * display order, or {values, codes} for low-cardinality ones (year, category).
+ */
+function unpackIndex(packed) {
+  const columns = Object.entries(packed.columns).map(([key, column]) =>
+    [key, Array.isArray(column) ? column : column.codes.map(code => column.values[code])]);
+  return Array.from({ length: packed.count }, (_, i) => {
+    const work = {};
+    for (const [key, values] of columns) {
+      if (values[i] !== null && values[i] !== undefined) work[key] = values[i];
+    }
+    return work;
+  });
+}
+
+/**
+ * Head page of a sharded index, for pages that opt in with
+ * <meta name="works-index" content="sharded">; null when there is none.
+ */
+async function loadIndexHead() {
+  const meta = document.querySelector('meta[name="works-index"]');
+  if (!meta || meta.content !== 'sharded') return null;
+  try {
+    const directoryResponse = await fetch('../works-data/index/directory.json');
+    if (!directoryResponse.ok) return null;
+    const directory = await directoryResponse.json();
+    const headResponse = await fetch(`../works-data/${directory.head.file}`);
+    if (!headResponse.ok) return null;
+    indexDirectory = directory;
+    return unpackIndex(await headResponse.json());
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * Work metadata in display order: the head of the sharded index when the page
+ * uses one (shards follow in loadIndexShards), else the packed index, else
+ * index.json (either its `works` or its old `order` format).
+ */
+async function loadIndex() {
+  const head = await loadIndexHead();
+  if (head) return head;
+  try {
+    const packedResponse = await fetch('../works-data/index.columns.json');
+    if (packedResponse.ok) return unpackIndex(await packedResponse.json());
+  } catch (error) {
+    // Fall through to index.json
+  }
+  const indexResponse = await fetch('../works-data/index.json');
+  const indexData = await indexResponse.json();
+  return indexData.works || indexData.order.map(id => ({ id }));
+}
+
+/**
+ * The bundle manifest written by scripts/bundle_works_data.py, or null when
+ * there is none (work JSON is then fetched one file per work).
+ */
+async function loadBundleManifest() {
+  try {
+    const response = await fetch('../works-data/bundles/manifest.json');
+    return response.ok ? await response.json() : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * The manifest of prerendered detail views written by
+ * scripts/prerender_works.py, or null when there is none (views are then
+ * built here from the work JSON).
+ */
+async function loadDetailManifest() {
+  try {
+    const response = await fetch('../works-data/detail/manifest.json');
+    return response.ok ? await response.json() : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * Pull the shards of a sharded index in the background, the category of a
+ * ?filter= link first. Each shard's works join the index and the grid as soon
+ * as it arrives, so the first thumbnails never wait for the whole catalogue.
+ */
+async function loadIndexShards() {
+  const requested = new URLSearchParams(window.location.search).get('filter');
+  const categories = Object.keys(indexDirectory.categories)
+    .sort((a, b) => (b === requested) - (a === requested));
+  const byPosition = [];
+  worksIndex.forEach(w => { byPosition[w.position] = w; });
+
+  for (const category of categories) {
+    for (const file of indexDirectory.categories[category].shards) {
+      try {
+        const response = await fetch(`../works-data/${file}`);
+        if (!response.ok) throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        const added = unpackIndex(await response.json()).filter(w => !byPosition[w.position]);
+        added.forEach(w => { byPosition[w.position] = w; });
+        setWorksIndex(byPosition.filter(Boolean));
+        extendGrid(added);
+      } catch (error) {
+        console.error(`Failed to load index shard ${file}:`, error);
+      }
+    }
+  }
+}
+
+/**
+ * Add grid items for works that are not in works.html yet (a sharded index
+ * lists more works than the page ships), merged in at their display position.
+ */
+function extendGrid(works) {
+  const added = works
+    .filter(w => !gridIds.has(w.id) && w.filename)
+    .sort((a, b) => a.position - b.position)
+    .map(w => ({ id: w.id, position: w.position, el: createGridItem(w) }));
+  if (!added.length) return;
+
+  const container = document.querySelector('.center-container');
+  const merged = [];
+  let i = 0;
+  for (const item of added) {
+    while (i < gridItems.length && gridItems[i].position < item.position) merged.push(gridItems[i++]);
+    container.insertBefore(item.el, i < gridItems.length ? gridItems[i].el : null);
+    merged.push(item);
+  }
+  gridItems = merged.concat(gridItems.slice(i));
+  added.forEach(item => gridIds.add(item.id));
+
+  added.forEach(item => interceptThumbnailClick(item.el.querySelector('a')));
+  document.dispatchEvent(new CustomEvent('works:grid-extended', {
+    detail: { items: added.map(item => item.el) }
+  }));
+}
+
+// Grid item markup, as scripts/generate_works_grid.py writes it into works.html
+function createGridItem(work) {
+  const item = document.createElement('div');
+  item.className = 'img_wrap';
+  item.setAttribute('data-category', work.category);
+  item.setAttribute('data-year', work.year);
+  item.setAttribute('data-title', work.title);
+  const size = work.width && work.height ? ` width="${work.width}" height="${work.height}"` : '';
+  item.innerHTML = `<a href="./${work.filename}">
+                        <img src="data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 4 3'%3E%3C/svg%3E" data-src="${work.thumbnail || ''}" alt="${work.title}"${size} decoding="async">
+                    </a>`;
+  return item;
+}
+
+// Open a grid thumbnail in the SPA instead of following its link
+function interceptThumbnailClick(link) {
+  link.addEventListener('click', function(e) {
+    // Let modifier-key clicks (new tab/window) fall through to the browser
+    if (e.metaKey || e.ctrlKey || e.shiftKey || e.altKey || e.button !== 0) return;
+    e.preventDefault();
+    const href = this.getAttribute('href');
+    const workId = extractWorkId(href);
+    window.location.hash = workId;
+  });
+}
+
+function setWorksIndex(works) {
+  worksIndex = works;
+  worksOrder = works.map(w => w.id);
+  worksById = new Map(works.map(w => [w.id, w]));
+  worksByFilename = new Map(works.filter(w => w.filename).map(w => [w.filename, w]));
+  worksPosition = new Map(worksOrder.map((id, i) => [id, i]));
+}
+
 // Initialize SPA functionality
 async function initWorksSPA() {
   try {
-    // Load index.json to get work order and metadata
-    const indexResponse = await fetch('../works-data/index.json');
-    const indexData = await indexResponse.json();
-
-    // Handle both old and new index.json formats
-    if (indexData.works) {
-      // New format with metadata
-      worksIndex = indexData.works;
-      worksOrder = indexData.works.map(w => w.id);
-      // Add year and category to thumbnails
-      addMetadataToThumbnails(indexData.works);
-    } else {
-      // Old format (fallback)
-      worksOrder = indexData.order;
+    // Work order plus everything the cards need (title, year, category,
+    // thumbnail and its size), so cards never scan the DOM or fetch work JSON
+    const [works, manifest, details] = await Promise.all([loadIndex(), loadBundleManifest(), loadDetailManifest()]);
+    setWorksIndex(works);
+    bundleManifest = manifest;
+    detailManifest = details;
+    // Grid blocks come from scripts/generate_works_grid.py with their metadata
+    collectGridItems();
+
+    // Intercept thumbnail clicks (extendGrid does the same for the items it adds)
+    document.querySelectorAll('.img_wrap a').forEach(interceptThumbnailClick);
+
+    if (indexDirectory) {
+      // Head works works.html doesn't ship yet
+      extendGrid(worksIndex);
+      // Totals are known before the shards arrive, so the filter count is right at once
+      const counts = { all: indexDirectory.count };
+      Object.entries(indexDirectory.categories).forEach(([category, entry]) => { counts[category] = entry.count; });
+      document.dispatchEvent(new CustomEvent('works:index-directory', { detail: { counts } }));
     }
 
     // Note: JSON files are now loaded on-demand (lazy loading)
@@ -321,43 +531,136 @@ async function initWorksSPA() {
     // Handle hash changes
     window.addEventListener('hashchange', handleHashChange);
 
+    // Shards start before the initial view, which waits for them only when
+    // its work is outside the head
+    if (indexDirectory) indexShards = loadIndexShards();
+
     // Handle initial load
     await handleHashChange();
+  } catch (error) {
+    console.error('Failed to initialize Works SPA:', error);
+  }
+}
+
+// Note where each grid block of works.html sits in the display order (one pass over the grid)
+function collectGridItems() {
+  gridItems = [];
+  gridIds = new Set();
+  document.querySelectorAll('.img_wrap a').forEach(link => {
+    const workId = extractWorkId(link.getAttribute('href'));
+    const work = worksById.get(workId);
+    const imgWrap = link.closest('.img_wrap');
+    gridIds.add(workId);
+    // Items the index doesn't place yet stay where works.html put them
+    if (work && imgWrap) {
+      gridItems.push({ id: work.id, position: work.position ?? worksPosition.get(work.id), el: imgWrap });
+    }
+  });
+}
 
-    // Intercept thumbnail clicks
-    document.querySelectorAll('.img_wrap a').forEach(link => {
-      link.addEventListener('click', function(e) {
-        // Let modifier-key clicks (new tab/window) fall through to the browser
-        if (e.metaKey || e.ctrlKey || e.shiftKey || e.altKey || e.button !== 0) return;
-        e.preventDefault();
-        const href = this.getAttribute('href');
-        const workId = extractWorkId(href);
-        window.location.hash = workId;
+/**
+ * Fetch a content-hashed bundle once and cache every work in it. Bundle names
+ * change with their content, so the browser may keep them indefinitely.
+ */
+function fetchBundle(url) {
+  if (!bundleRequests.has(url)) {
+    const request = fetch(`../works-data/${url}`)
+      .then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        return response.json();
+      })
+      .then(bundle => { Object.assign(worksData, bundle); })
+      .catch(error => {
+        bundleRequests.delete(url); // Let a later navigation retry
+        throw error;
       });
-    });
+    bundleRequests.set(url, request);
+  }
+  return bundleRequests.get(url);
+}
+
+/**
+ * Fetch a prerendered detail view once. Fragment names change with their
+ * content, like bundles, so the markup text is kept for later visits.
+ */
+function fetchDetail(url) {
+  if (!detailRequests.has(url)) {
+    const request = fetch(`../works-data/${url}`)
+      .then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        return response.text();
+      })
+      .catch(error => {
+        detailRequests.delete(url); // Let a later navigation retry
+        throw error;
+      });
+    detailRequests.set(url, request);
+  }
+  return detailRequests.get(url);
+}
+
+/**
+ * The prerendered <div id="work-detail-view"> of a work, or null when it has
+ * none or it failed to load (the caller then builds the view from JSON).
+ * The markup was cleaned at build time and goes through DOMPurify all the
+ * same; its work-head JSON is set aside first, as DOMPurify drops <script>.
+ */
+async function loadPrerenderedView(workId) {
+  const url = detailManifest?.works[workId];
+  if (!url) return null;
+  try {
+    const template = document.createElement('template');
+    template.innerHTML = await fetchDetail(url);
+    const view = template.content.firstElementChild;
+    if (!view || view.id !== 'work-detail-view') return null;
+    const headScript = view.querySelector('script.work-head');
+    headScript?.remove();
+    view.innerHTML = DOMPurify.sanitize(view.innerHTML, PURIFY_OPTIONS);
+    if (headScript) view.prepend(headScript);
+    return view;
   } catch (error) {
-    console.error('Failed to initialize Works SPA:', error);
+    console.warn(`Failed to load prerendered view ${url}:`, error);
+    return null;
   }
 }
 
-// Add year and category metadata to thumbnail elements
-function addMetadataToThumbnails(worksMetadata) {
-  worksMetadata.forEach(work => {
-    // Find thumbnail by matching href
-    const thumbnails = document.querySelectorAll('.img_wrap a');
-    thumbnails.forEach(link => {
-      const href = link.getAttribute('href');
-      const workId = extractWorkId(href);
-      if (workId === work.id) {
-        const imgWrap = link.closest('.img_wrap');
-        if (imgWrap) {
-          imgWrap.setAttribute('data-year', work.year);
-          imgWrap.setAttribute('data-title', work.title);
-          // Category already exists, but ensure it matches
-          imgWrap.setAttribute('data-category', work.category);
-        }
-      }
-    });
+/**
+ * What the animations need from a work, read off its prerendered view
+ * (data-* attributes), plus its ready-made head (title, meta tags, JSON-LD).
+ */
+function workFromView(view, workId) {
+  const data = view.dataset;
+  const headScript = view.querySelector('script.work-head');
+  let head = null;
+  if (headScript) {
+    try {
+      head = JSON.parse(headScript.textContent);
+    } catch (error) {
+      console.warn(`Invalid head in prerendered view of ${workId}:`, error);
+    }
+    headScript.remove();
+  }
+  return {
+    id: workId,
+    title: data.title,
+    year: data.year,
+    category: data.category,
+    thumbnail: thumbnailForWork(workId),
+    head
+  };
+}
+
+// Start loading the prev/next works, so the arrows open instantly
+function prefetchNeighbours(workId) {
+  const { prev, next } = neighboursOf(workId);
+  [prev, next].forEach(w => {
+    const detailUrl = w && detailManifest?.works[w.id];
+    if (detailUrl) {
+      fetchDetail(detailUrl).catch(() => {});
+      return;
+    }
+    const url = w && bundleManifest?.works[w.id];
+    if (url && !worksData[w.id]) fetchBundle(url).catch(() => {});
   });
 }
 
@@ -368,6 +671,17 @@ async function loadWork(workId) {
     return worksData[workId];
   }
 
+  // Prefer the work's bundle; fall back to its own file if that fails
+  const bundleUrl = bundleManifest?.works[workId];
+  if (bundleUrl) {
+    try {
+      await fetchBundle(bundleUrl);
+      if (worksData[workId]) return worksData[workId];
+    } catch (error) {
+      console.warn(`Failed to load bundle ${bundleUrl}:`, error);
+    }
+  }
+
   try {
     const response = await fetch(`../works-data/${workId}.json`);
     if (!response.ok) {
@@ -413,17 +727,11 @@ function focusQuietly(el) {
 }
 
 /**
- * Thumbnail URL for a work id, read out of the grid that is already in the DOM.
+ * Thumbnail URL for a work id, straight from index.json.
  * Avoids fetching each related work's JSON just to learn its thumbnail.
  */
 function thumbnailForWork(workId) {
-  for (const link of document.querySelectorAll('.img_wrap a')) {
-    if (extractWorkId(link.getAttribute('href')) !== workId) continue;
-    const img = link.querySelector('img');
-    // Before lazy-load swaps it in, the real URL still lives on data-src.
-    if (img) return img.dataset.src || img.getAttribute('src');
-  }
-  return null;
+  return worksById.get(workId)?.thumbnail || null;
 }
 
 /**
@@ -434,7 +742,7 @@ function relatedWorksFor(work, limit = 3) {
   const picked = [];
   const take = (id) => {
     if (id === work.id || picked.some(w => w.id === id)) return;
-    const meta = worksIndex.find(w => w.id === id);
+    const meta = worksById.get(id);
     if (meta) picked.push(meta);
   };
   // The prev/next arrows sit directly above the band, so a neighbour appearing
@@ -449,10 +757,10 @@ function relatedWorksFor(work, limit = 3) {
   // Fill from the same category, nearest in display order first. Display order
   // is roughly chronological, so neighbours come from the same period — and each
   // work gets a different set, instead of every code work listing the same three.
-  const here = worksOrder.indexOf(work.id);
+  const here = worksPosition.get(work.id) ?? -1;
   const sameCategory = worksIndex
     .filter(w => w.category === work.category && w.id !== work.id)
-    .sort((a, b) => Math.abs(worksOrder.indexOf(a.id) - here) - Math.abs(worksOrder.indexOf(b.id) - here));
+    .sort((a, b) => Math.abs(worksPosition.get(a.id) - here) - Math.abs(worksPosition.get(b.id) - here));
   for (const candidate of sameCategory) {
     if (picked.length >= limit) break;
     if (!isNeighbour(candidate.id)) take(candidate.id);
@@ -467,8 +775,8 @@ function relatedWorksFor(work, limit = 3) {
 
 /** Prev/next neighbours in display order. Ends of the list simply have none. */
 function neighboursOf(workId) {
-  const i = worksOrder.indexOf(workId);
-  const at = (n) => (n >= 0 && n < worksOrder.length ? worksIndex.find(w => w.id === worksOrder[n]) : null);
+  const i = worksPosition.get(workId) ?? -1;
+  const at = (n) => (n >= 0 && n < worksOrder.length ? worksIndex[n] : null);
   return { prev: i > 0 ? at(i - 1) : null, next: i >= 0 ? at(i + 1) : null };
 }
 
@@ -488,8 +796,9 @@ function browseStripHtml(work) {
 
   const card = (w) => {
     const thumb = thumbnailForWork(w.id);
+    const size = w.width && w.height ? ` width="${w.width}" height="${w.height}"` : '';
     return `<a class="related-card" href="#${w.id}" data-work-id="${w.id}">
-              ${thumb ? `<img src="${thumb}" alt="${w.title}" loading="lazy">` : '<span class="related-card-noimg"></span>'}
+              ${thumb ? `<img src="${thumb}" alt="${w.title}"${size} loading="lazy" decoding="async">` : '<span class="related-card-noimg"></span>'}
               <span class="related-card-year">${w.year}</span>
               <span class="related-card-title">${w.title}</span>
             </a>`;
@@ -517,7 +826,7 @@ function browseStripHtml(work) {
  */
 function extractWorkId(href) {
   const filename = href.replace('./', '');
-  const match = worksIndex.find(w => w.filename === filename);
+  const match = worksByFilename.get(filename);
   if (match) return match.id;
   // Before index.json resolves, or for a page not listed in it, fall back to
   // the filename stem. Correct whenever the two already agree.
@@ -532,14 +841,20 @@ async function handleHashChange() {
     // Show loading spinner while fetching data
     showLoadingSpinner();
 
-    // Lazy load work data if not already cached
-    const workData = await loadWork(hash);
+    // A work outside the head of a sharded index has no neighbours or
+    // related cards until the shards are in
+    if (indexShards && !worksById.has(hash)) await indexShards;
+
+    // A prerendered view needs no work JSON; otherwise lazy load the data
+    const prerendered = await loadPrerenderedView(hash);
+    const workData = prerendered ? workFromView(prerendered, hash) : await loadWork(hash);
 
     // Hide spinner after data is loaded
     hideLoadingSpinner();
 
     if (workData) {
-      showWorkDetail(hash);
+      showWorkDetail(hash, workData, prerendered);
+      prefetchNeighbours(hash);
     } else {
       // Work not found, show list
       showWorksList();
@@ -738,14 +1053,17 @@ function showWorksList() {
   }
 }
 
-// Show work detail view
-function showWorkDetail(workId) {
-  const work = worksData[workId];
+// Show work detail view (prerendered: its static view, when there is one)
+function showWorkDetail(workId, work, prerendered = null) {
   const contentDiv = document.getElementById('content');
   const centerContainer = document.querySelector('.center-container');
 
-  // Update meta tags for SEO
-  updateMetaTags(work);
+  // Update meta tags for SEO (prerendered views bring them ready-made)
+  if (work.head) {
+    applyWorkHead(work.head);
+  } else {
+    updateMetaTags(work);
+  }
 
   // Fade out all thumbnails first
   const thumbnails = document.querySelectorAll('.img_wrap');
@@ -773,27 +1091,28 @@ function showWorkDetail(workId) {
     });
 
     // Create detail view after fade out
-    createDetailView(work, workId);
+    if (prerendered) {
+      hydrateDetailView(prerendered, work, workId);
+    } else {
+      createDetailView(work, workId);
+    }
   }, 400);
 }
 
 // Create detail view HTML - EXACT copy of original structure
+// (scripts/prerender_works.py builds the same markup; keep the two in step)
 function createDetailView(work, workId) {
-  const contentDiv = document.getElementById('content');
-
-  // Remove existing detail view
-  const existingDetail = document.getElementById('work-detail-view');
-  if (existingDetail) existingDetail.remove();
-
   // Create detail view container
   const detailView = document.createElement('div');
   detailView.id = 'work-detail-view';
 
-  // Build images HTML for Swiper
+  // Build images HTML for Swiper. The first slide is the view's LCP image
+  // (the same policy prerender_works.py applies to the fragments)
+  const slidePriority = (i) => (i === 0 ? 'loading="eager" fetchpriority="high"' : 'loading="lazy"');
   const swiperSlides = work.images.map((img, i) => `
                     <div class="swiper-slide">
                         <div class="img_w2">
-                            <img src="${img}" alt="${work.title} ${i + 1}" loading="lazy">
+                            <img src="${img}" alt="${work.title} ${i + 1}" ${slidePriority(i)} decoding="async">
                         </div>
                     </div>`).join('');
 
@@ -895,7 +1214,18 @@ ${swiperSlides}
             ${browseStripHtml(work)}
             <hr class="final-hr-2" style="opacity: 0;">
             <br>
-  `);
+  `, PURIFY_OPTIONS);
+
+  hydrateDetailView(detailView, work, workId);
+}
+
+// Mount a detail view and bring it to life: animations, Swiper, breadcrumb, focus
+function hydrateDetailView(detailView, work, workId) {
+  const contentDiv = document.getElementById('content');
+
+  // Remove existing detail view
+  const existingDetail = document.getElementById('work-detail-view');
+  if (existingDetail) existingDetail.remove();
 
   contentDiv.appendChild(detailView);
 
@@ -1089,7 +1419,7 @@ ${swiperSlides}
   // Initialize Swiper for detail view
   setTimeout(() => {
     currentSwiper = new Swiper('.swiper-container', {
-      loop: work.images.length > 1,
+      loop: detailView.querySelectorAll('.swiper-slide').length > 1,
       navigation: {
         nextEl: '.swiper-button-next',
         prevEl: '.swiper-button-prev',
@@ -3,22 +3,36 @@
 Add common.css to all HTML files that use style_2.css
 """
 
-import os
 import re
 from pathlib import Path
 
-def add_common_css_to_file(file_path):
-    """Add common.css link before style_2.css in an HTML file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from sitetools.doccache import DocCache
+from sitetools.inventory import site_files
+from sitetools.writer import ChangeAwareWriter
+
+DOCS = DocCache()
+
+WRITER = ChangeAwareWriter('add_common_css')
+
+def add_common_css(content, doc=None):
+    """
+    Add common.css link before style_2.css in HTML content.
+
+    Returns:
+        tuple: (new_content, message); new_content equals content when
+        nothing was added
+    """
+    if doc is None:
+        doc = DOCS.parse(content)
+    stylesheets = [link.get('href') or '' for link in doc.tags('link')]
 
     # Check if the file uses style_2.css
-    if 'style_2.css' not in content:
-        return False, "Does not use style_2.css"
+    if not any(href.endswith('style_2.css') for href in stylesheets):
+        return content, "Does not use style_2.css"
 
     # Check if common.css is already included
-    if 'common.css' in content:
-        return False, "Already has common.css"
+    if any('common.css' in href for href in stylesheets):
+        return content, "Already has common.css"
 
     # Pattern to find style_2.css link and add common.css before it
     pattern = r'(<link rel="stylesheet" href="[^"]*style_2\.css"[^>]*>)'
@@ -29,27 +43,32 @@ def add_common_css_to_file(file_path):
     new_content = re.sub(pattern, replacement, content)
 
     if new_content == content:
-        return False, "Pattern not found"
+        return content, "Pattern not found"
+
+    return new_content, "Updated"
+
+def add_common_css_to_file(file_path):
+    """Add common.css link before style_2.css in an HTML file"""
+    doc = DOCS.load(file_path)
+    new_content, message = add_common_css(doc.text, doc)
+
+    if new_content == doc.text:
+        return False, message
 
     # Write the updated content
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    WRITER.write_text(file_path, new_content)
 
-    return True, "Updated"
+    return True, message
 
 def main():
     base_dir = Path.cwd()
 
-    # Find all HTML files (excluding index.html)
-    html_files = []
-    for root, dirs, files in os.walk(base_dir):
-        # Skip certain directories
-        if any(skip in root for skip in ['.git', 'node_modules', 'scripts', '.claude']):
-            continue
-
-        for file in files:
-            if file.endswith('.html') and file != 'index.html':
-                html_files.append(Path(root) / file)
+    # Find all HTML files (excluding index.html and anything under scripts/);
+    # the site inventory already skips .git, node_modules and .claude
+    html_files = [
+        f for f in site_files('html', base_dir)
+        if f.name != 'index.html' and f.relative_to(base_dir).parts[0] != 'scripts'
+    ]
 
     print(f"Found {len(html_files)} HTML files to process\n")
 
@@ -71,7 +90,10 @@ def main():
     print(f"\n{'='*50}")
     print(f"Updated: {updated_count} files")
     print(f"Skipped: {skipped_count} files")
+    print(f"Parse cache: {DOCS.summary()}")
     print(f"{'='*50}")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
@@ -5,7 +5,11 @@ Add common.css to all HTML files that use style_2.css
 
 import re
 from pathlib import Path
-import glob
+
+from sitetools.inventory import site_files
+from sitetools.writer import ChangeAwareWriter
+
+WRITER = ChangeAwareWriter('add_common_css_v2')
 
 def add_common_css_to_file(file_path):
     """Add common.css link before style_2.css in an HTML file"""
@@ -32,8 +36,7 @@ def add_common_css_to_file(file_path):
         return False, "Pattern not found"
 
     # Write the updated content
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    WRITER.write_text(file_path, new_content)
 
     return True, "Updated"
 
@@ -41,8 +44,7 @@ def main():
     base_dir = Path('/Users/ryosimon/Documents/Homepage/ryo-simon-mf.github.io')
 
     # Find all HTML files (excluding index.html)
-    html_files = glob.glob(str(base_dir / '**' / '*.html'), recursive=True)
-    html_files = [Path(f) for f in html_files if 'index.html' not in f and '.git' not in f]
+    html_files = [f for f in site_files('html', base_dir) if f.name != 'index.html']
 
     print(f"Found {len(html_files)} HTML files to check\n")
 
@@ -64,5 +66,7 @@ def main():
     print(f"Skipped: {skipped_count} files")
     print(f"{'='*50}")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
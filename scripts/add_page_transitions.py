@@ -5,16 +5,24 @@ Provides smooth fade animations when navigating between pages.
 """
 
 import os
-import re
 from pathlib import Path
 
-def add_page_transitions(html_content, file_path):
+from sitetools.doccache import DocCache
+from sitetools.inventory import site_files
+from sitetools.writer import ChangeAwareWriter
+
+DOCS = DocCache()
+
+WRITER = ChangeAwareWriter('add_page_transitions')
+
+def add_page_transitions(html_content, file_path, doc=None):
     """
     Add page transition CSS and JS to HTML file if not already present.
 
     Args:
         html_content (str): HTML content
         file_path (Path): Path to the HTML file (for determining relative paths)
+        doc (ParsedDoc): Parsed page from the shared cache, if already loaded
 
     Returns:
         tuple: (modified_content, changes_made)
@@ -43,25 +51,31 @@ def add_page_transitions(html_content, file_path):
     css_link = f'<link rel="stylesheet" href="{prefix}css/page-transitions.css">'
     js_script = f'<script src="{prefix}js/page-transitions.js"></script>'
 
+    if doc is None:
+        doc = DOCS.parse(html_content)
+
+    edits = []
+
     # Check if CSS link already exists
-    if 'page-transitions.css' not in html_content:
-        # Find </head> and insert CSS link before it
-        if '</head>' in html_content:
-            html_content = html_content.replace(
-                '</head>',
-                f'    {css_link}\n</head>'
-            )
-            changes.append('Added page-transitions.css')
+    has_css = any('page-transitions.css' in (link.get('href') or '')
+                  for link in doc.tags('link'))
+    head_end = doc.first('head', closing=True)
+    if not has_css and head_end is not None:
+        # Insert CSS link before </head>
+        edits.append((head_end.start, head_end.start, f'    {css_link}\n'))
+        changes.append('Added page-transitions.css')
 
     # Check if JS script already exists
-    if 'page-transitions.js' not in html_content:
-        # Find </body> and insert JS script before it
-        if '</body>' in html_content:
-            html_content = html_content.replace(
-                '</body>',
-                f'    {js_script}\n</body>'
-            )
-            changes.append('Added page-transitions.js')
+    has_js = any('page-transitions.js' in (script.get('src') or '')
+                 for script in doc.tags('script'))
+    body_end = doc.first('body', closing=True)
+    if not has_js and body_end is not None:
+        # Insert JS script before </body>
+        edits.append((body_end.start, body_end.start, f'    {js_script}\n'))
+        changes.append('Added page-transitions.js')
+
+    if edits:
+        html_content = doc.splice(edits)
 
     return html_content, changes
 
@@ -76,14 +90,11 @@ def process_html_file(file_path):
         int: Number of changes made
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        modified_content, changes = add_page_transitions(content, file_path)
+        doc = DOCS.load(file_path)
+        modified_content, changes = add_page_transitions(doc.text, file_path, doc)
 
         if changes:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(modified_content)
+            WRITER.write_text(file_path, modified_content)
             print(f"✓ {file_path}: {', '.join(changes)}")
             return len(changes)
         else:
@@ -101,18 +112,12 @@ def main():
     # Get current directory
     root_dir = Path('.')
 
-    # Find all HTML files
-    html_files = list(root_dir.rglob('*.html'))
+    # Find all HTML files (the site inventory already skips .git, node_modules, ...)
+    html_files = site_files('html', root_dir)
 
-    # Exclude certain directories and files
-    excluded_dirs = {'.git', 'node_modules', 'Conversation_Summary'}
+    # Exclude certain files
     excluded_files = {'menu-content.html'}  # Menu is loaded dynamically, skip it
-
-    html_files = [
-        f for f in html_files
-        if not any(excluded in f.parts for excluded in excluded_dirs)
-        and f.name not in excluded_files
-    ]
+    html_files = [f for f in html_files if f.name not in excluded_files]
 
     print(f"Found {len(html_files)} HTML files\n")
 
@@ -130,6 +135,7 @@ def main():
     print(f"  Total files processed: {len(html_files)}")
     print(f"  Files modified: {modified_files}")
     print(f"  Total changes: {total_changes}")
+    print(f"  Parse cache: {DOCS.summary()}")
     print(f"{'='*60}")
 
     print(f"\nPage transitions added:")
@@ -137,5 +143,7 @@ def main():
     print(f"  - Fade-out effect on link click (0.3s)")
     print(f"  - Smooth navigation between pages")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
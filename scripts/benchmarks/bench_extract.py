@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming work-page extractor against the regex extractor.
+
+Runs both extract_work_data() and extract_work_data_regex() on:
+- every works/*.html page
+- the archived pre-SPA detail page (scripts/archived/backups/)
+- synthetic detail pages of roughly 1 MB and 4 MB built in the same shape
+
+For every page the two JSON outputs must be byte-identical; the script exits
+with status 1 if any page differs. All of these pages are well-formed; on
+malformed markup the extractors are not expected to agree (see
+sitetools/workpage.py).
+
+Usage:
+    python3 scripts/benchmarks/bench_extract.py [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from extract_works_to_json import (  # noqa: E402
+    WORKS_DIR,
+    extract_work_data,
+    extract_work_data_regex,
+)
+
+ARCHIVED_PAGE = SCRIPTS_DIR / 'archived' / 'backups' / 'toki-shirube.html.backup'
+
+SLIDE = '''                    <div class="swiper-slide">
+                        <div class="img_w2">
+                            <!-- slide {n} -->
+                            <img src="../image/synthetic/img{n:05d}.webp" alt="" loading="lazy">
+                        </div>
+                    </div>
+'''
+
+SECTION = '''                <dt>{label}</dt>
+                <dd>
+                    {label} entry {n} <a>plain</a>
+                    <a class="list" href="https://example.com/{n}">[LINK]</a>
+                    <br>
+                </dd>
+                <dd>
+                    second line {n}
+                </dd>
+'''
+
+SECTION_LABELS = ['Exhibition', 'Award', 'Paper', 'Grants', 'Co-create with',
+                  'Performers', 'Download', 'Citation', 'Related', 'Link']
+
+
+def build_synthetic_page(target_bytes):
+    """Build a detail page in the pre-SPA layout of at least target_bytes"""
+    slide_count = max(1, target_bytes // 3 // len(SLIDE))
+    section_count = max(1, target_bytes // 3 // len(SECTION))
+    paragraph = ('作品の説明文 2024 description text with <a>plain anchors</a> '
+                 'and <a class="list" href="https://example.com">links</a>.\n<br>')
+    paragraph_count = max(1, target_bytes // 3 // len(paragraph.encode('utf-8')))
+
+    parts = ['<!DOCTYPE html>\n<html lang="ja">\n<head>\n<title>Synthetic</title>\n',
+             '<!-- <h1>commented out title</h1> -->\n</head>\n<body>\n<div id="content">\n',
+             '<h1>\n<!-- Heading -->\nSynthetic <span>Work</span>\n</h1>\n<hr>\n',
+             '<div class="swiper-container">\n<div class="swiper-wrapper">\n']
+    parts.extend(SLIDE.format(n=n) for n in range(slide_count))
+    parts.append('</div>\n<div class="swiper-button-prev"></div>\n'
+                 '<div class="swiper-button-next"></div>\n</div>\n')
+    parts.append('<div id="content_in">\n<p>\n')
+    parts.extend(paragraph for _ in range(paragraph_count))
+    parts.append('<dd>\n</dd>\n</p>\n<dt>Credit</dt>\n<dd>\nSynthetic Studio\n<br>\n</dd>\n')
+    parts.append('<dt>Tool</a></dt>\n<dd><span>Max8</span>, TouchDesigner</dd>\n')
+    parts.extend(SECTION.format(label=SECTION_LABELS[n % len(SECTION_LABELS)], n=n)
+                 for n in range(section_count))
+    parts.append('</div>\n<hr>\n</div>\n</body>\n</html>\n')
+    return ''.join(parts)
+
+
+def time_call(func, args, repeat):
+    """Return (best seconds, result) over `repeat` calls"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def dump(work_data):
+    return json.dumps(work_data, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per page; the best time is reported (default 3)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        pages = [(path.name, path) for path in sorted(WORKS_DIR.glob('*.html'))]
+        if ARCHIVED_PAGE.exists():
+            pages.append((ARCHIVED_PAGE.name, ARCHIVED_PAGE))
+        for label, size in (('synthetic-1MB', 1_000_000), ('synthetic-4MB', 4_000_000)):
+            path = tmp_dir / f'{label}.html'
+            path.write_text(build_synthetic_page(size), encoding='utf-8')
+            pages.append((label, path))
+
+        print(f"{'page':<40} {'size':>10} {'regex ms':>10} {'stream ms':>10} {'speedup':>8}")
+        print('-' * 82)
+
+        mismatches = []
+        regex_total = 0.0
+        stream_total = 0.0
+
+        for label, path in pages:
+            # An absolute path overrides WORKS_DIR inside both extractors
+            regex_time, regex_data = time_call(
+                extract_work_data_regex, (path.resolve(), 'bench', 'code'), args.repeat)
+            stream_time, stream_data = time_call(
+                extract_work_data, (path.resolve(), 'bench', 'code'), args.repeat)
+            regex_total += regex_time
+            stream_total += stream_time
+
+            identical = dump(regex_data) == dump(stream_data)
+            if not identical:
+                mismatches.append(label)
+
+            size = path.stat().st_size
+            speedup = regex_time / stream_time if stream_time else float('inf')
+            marker = '' if identical else '  ✗ output differs'
+            print(f"{label:<40} {size:>10,} {regex_time * 1000:>10.2f} "
+                  f"{stream_time * 1000:>10.2f} {speedup:>7.2f}x{marker}")
+
+    print('-' * 82)
+    print(f"{'total':<40} {'':>10} {regex_total * 1000:>10.2f} {stream_total * 1000:>10.2f} "
+          f"{regex_total / stream_total if stream_total else float('inf'):>7.2f}x")
+    print()
+
+    if mismatches:
+        print(f"✗ {len(mismatches)} page(s) produced different JSON: {', '.join(mismatches)}")
+        sys.exit(1)
+    print(f"✓ All {len(pages)} pages produced byte-identical JSON")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scripts/ toolchain on a synthetic catalogue of N works.
+
+A site is generated with synth_site.py (including a copy of scripts/), and
+each step below runs as a separate process inside it, cold and then warm
+where the tool keeps a cache:
+
+    extract_works_to_json --grid, update_index_with_metadata,
+    sitemap/generate_sitemap, validation/validate_works_data,
+    validation/verify_works, transform_html
+
+For every step the wall time, throughput (works/s) and peak RSS are
+recorded. The whole run is repeated --repeat times on fresh sites and the
+best time (and highest RSS) of each step is kept. Results are written as
+JSON; with --baseline, any step that is slower (or uses more memory) than
+the baseline by more than --tolerance fails the run with exit status 1.
+
+Usage:
+    python3 scripts/benchmarks/bench_toolchain.py --works 10000 --jobs 0
+    python3 scripts/benchmarks/bench_toolchain.py --works 1000 --save-baseline base.json
+    python3 scripts/benchmarks/bench_toolchain.py --works 1000 --baseline base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from benchmarks.synth_site import generate_site  # noqa: E402
+
+BASE_DIR = SCRIPTS_DIR.parent
+RESULTS_DIR = BASE_DIR / '.cache' / 'bench'
+
+# Bump when steps or the generated site change, so old baselines are rejected
+BENCH_VERSION = 3
+
+# (name, script relative to scripts/, arguments, takes --jobs); every step
+# must exit 0, so a step that only reports errors is never what gets timed
+STEPS = [
+    ('extract_works_to_json', 'extract_works_to_json.py', ['--grid'], True),
+    ('extract_works_to_json:warm', 'extract_works_to_json.py', ['--grid'], True),
+    ('update_index_with_metadata', 'update_index_with_metadata.py', [], False),
+    ('bundle_works_data', 'bundle_works_data.py', [], False),
+    ('generate_sitemap', 'sitemap/generate_sitemap.py', [], False),
+    ('validate_works_data', 'validation/validate_works_data.py', [], False),
+    ('verify_works', 'validation/verify_works.py', [], True),
+    ('verify_works:changed', 'validation/verify_works.py', ['--changed'], True),
+    ('transform_html', 'transform_html.py', [], True),
+    ('transform_html:warm', 'transform_html.py', [], True),
+    ('precompress', 'precompress.py', [], True),
+    ('precompress:warm', 'precompress.py', [], True),
+]
+
+# Steps this fast are within timer/scheduler noise; --min-delta covers them
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_DELTA = 0.05
+
+
+def run_step(command, cwd, log_path):
+    """
+    Run one step and measure it.
+
+    Returns:
+        tuple: (seconds, peak RSS in bytes or None, exit code)
+    """
+    with open(log_path, 'wb') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, 'wait4'):
+            # wait4 reports the child's own peak RSS, including the worker
+            # processes it has reaped
+            _, status, usage = os.wait4(proc.pid, 0)
+            seconds = time.perf_counter() - start
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+            peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+        else:
+            proc.wait()
+            seconds = time.perf_counter() - start
+            peak_rss = None
+    return seconds, peak_rss, proc.returncode
+
+
+def run_benchmark(site_dir, work_count, jobs):
+    """Generate the site and run every step once; returns the results dict"""
+    start = time.perf_counter()
+    stats = generate_site(site_dir, work_count)
+    generate_seconds = time.perf_counter() - start
+
+    log_dir = site_dir / '.cache' / 'bench-logs'
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    steps = {}
+    for name, script, arguments, takes_jobs in STEPS:
+        command = [sys.executable, str(Path('scripts') / script), *arguments]
+        if takes_jobs:
+            command += ['--jobs', str(jobs)]
+        log_path = log_dir / f"{name.replace(':', '-')}.log"
+        seconds, peak_rss, returncode = run_step(command, site_dir, log_path)
+
+        steps[name] = {
+            'seconds': round(seconds, 4),
+            'works_per_second': round(work_count / seconds, 1) if seconds else None,
+            'peak_rss_mb': round(peak_rss / 2**20, 1) if peak_rss else None,
+            'returncode': returncode,
+            'ok': returncode == 0,
+        }
+        if not steps[name]['ok']:
+            print(f"✗ {name}: exit {returncode}, see {log_path}")
+
+    return {
+        'version': BENCH_VERSION,
+        'works': work_count,
+        'jobs': jobs,
+        'site': stats,
+        'generate_seconds': round(generate_seconds, 4),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'steps': steps,
+    }
+
+
+def merge_runs(runs):
+    """Best time and highest peak RSS of each step over several runs"""
+    results = runs[0]
+    for run in runs[1:]:
+        for name, step in run['steps'].items():
+            best = results['steps'][name]
+            if step['seconds'] < best['seconds']:
+                best['seconds'] = step['seconds']
+                best['works_per_second'] = step['works_per_second']
+            if (step['peak_rss_mb'] or 0) > (best['peak_rss_mb'] or 0):
+                best['peak_rss_mb'] = step['peak_rss_mb']
+            if not step['ok']:
+                best['ok'] = False
+                best['returncode'] = step['returncode']
+        results['generate_seconds'] = min(results['generate_seconds'], run['generate_seconds'])
+    results['repeat'] = len(runs)
+    return results
+
+
+def print_results(results):
+    print(f"{'step':<30} {'seconds':>9} {'works/s':>12} {'RSS (MB)':>8}")
+    print('-' * 62)
+    for name, step in results['steps'].items():
+        rss = f"{step['peak_rss_mb']:>8.1f}" if step['peak_rss_mb'] else f"{'-':>8}"
+        marker = '' if step['ok'] else f"  ✗ exit {step['returncode']}"
+        print(f"{name:<30} {step['seconds']:>9.3f} {step['works_per_second'] or 0:>12,.0f} {rss}{marker}")
+    print('-' * 62)
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """Regression messages for results against baseline (empty when none)"""
+    if baseline.get('version') != BENCH_VERSION:
+        return [f"baseline is from benchmark version {baseline.get('version')}, not {BENCH_VERSION}"]
+    if baseline.get('works') != results['works'] or baseline.get('jobs') != results['jobs']:
+        return [f"baseline was recorded with {baseline.get('works')} works / --jobs {baseline.get('jobs')}, "
+                f"not {results['works']} / --jobs {results['jobs']}"]
+
+    regressions = []
+    for name, step in results['steps'].items():
+        base = baseline.get('steps', {}).get(name)
+        if not base:
+            continue
+        limit = base['seconds'] * (1 + tolerance) + min_delta
+        if step['seconds'] > limit:
+            regressions.append(f"{name}: {step['seconds']:.3f}s vs baseline {base['seconds']:.3f}s "
+                               f"(limit {limit:.3f}s)")
+        if step['peak_rss_mb'] and base.get('peak_rss_mb'):
+            rss_limit = base['peak_rss_mb'] * (1 + tolerance)
+            if step['peak_rss_mb'] > rss_limit:
+                regressions.append(f"{name}: peak RSS {step['peak_rss_mb']:.1f} MB vs baseline "
+                                   f"{base['peak_rss_mb']:.1f} MB (limit {rss_limit:.1f} MB)")
+    return regressions
+
+
+def write_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--works', type=int, default=1000,
+                        help='number of synthetic works (default 1000)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='--jobs passed to the tools that take it (0 = one per CPU core, default 1)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs on fresh sites; the best time per step is kept (default 3)')
+    parser.add_argument('--output', type=Path,
+                        help='results file (default .cache/bench/toolchain-<N>.json)')
+    parser.add_argument('--baseline', type=Path,
+                        help='fail if any step regressed against this results file')
+    parser.add_argument('--save-baseline', type=Path, metavar='PATH',
+                        help='also write the results to PATH for later --baseline runs')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'allowed slowdown / memory growth as a fraction (default {DEFAULT_TOLERANCE})')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help=f'seconds every step may exceed its limit by (default {DEFAULT_MIN_DELTA})')
+    parser.add_argument('--keep', type=Path, metavar='DIR',
+                        help='generate the site in DIR (must not exist) and keep it')
+    args = parser.parse_args()
+
+    if args.works < 1 or args.repeat < 1:
+        parser.error('--works and --repeat must be at least 1')
+    if args.keep and args.keep.exists():
+        parser.error(f'{args.keep} already exists')
+
+    print(f"Benchmarking {len(STEPS)} steps on {args.works:,} synthetic works "
+          f"(--jobs {args.jobs}, best of {args.repeat})\n")
+
+    runs = []
+    for repetition in range(args.repeat):
+        if args.keep and repetition == args.repeat - 1:
+            # The last run's site is the one kept
+            args.keep.mkdir(parents=True)
+            runs.append(run_benchmark(args.keep.resolve(), args.works, args.jobs))
+            continue
+        with tempfile.TemporaryDirectory(prefix='bench-toolchain-') as tmp:
+            runs.append(run_benchmark(Path(tmp), args.works, args.jobs))
+    results = merge_runs(runs)
+
+    print_results(results)
+    print(f"Site generated in {results['generate_seconds']:.2f}s "
+          f"({results['site']['pages']:,} pages, {results['site']['images']:,} images)")
+
+    output = args.output or RESULTS_DIR / f'toolchain-{args.works}.json'
+    write_json(output, results)
+    print(f"Results: {output}")
+    if args.save_baseline:
+        write_json(args.save_baseline, results)
+        print(f"Baseline saved: {args.save_baseline}")
+
+    failed = [name for name, step in results['steps'].items() if not step['ok']]
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta)
+
+    if failed:
+        print(f"\n✗ {len(failed)} step(s) failed: {', '.join(failed)}")
+    if regressions:
+        print(f"\n✗ REGRESSION against {args.baseline}:")
+        for message in regressions:
+            print(f"  - {message}")
+    if failed or regressions:
+        sys.exit(1)
+    if args.baseline:
+        print(f"\n✓ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
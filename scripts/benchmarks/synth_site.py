@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic site with N works for benchmarking the toolchain.
+
+The generated tree has the layout the scripts expect:
+- works/<id>.html      detail pages in the pre-SPA layout (h1, swiper,
+                       description, Credit/Tool/Link/... sections)
+- works/works.html     the real works.html with its grid replaced by N items
+- works-data/<id>.json what extract_works_to_json.py produces for each page
+- works-data/index.json in the "works" format, plus a copy of SCHEMA.md
+- image/<id>/*.webp    placeholders (a valid WebP header with the size, no pixels)
+- scripts/             a copy of this scripts/ directory, so every script that
+                       finds the site from its own location works on the copy
+
+Content is derived from the work number only, so the same N always gives
+byte-identical files.
+
+Usage:
+    python3 scripts/benchmarks/synth_site.py OUT_DIR --works 10000
+"""
+
+import argparse
+import json
+import re
+import shutil
+import struct
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = SCRIPTS_DIR.parent
+
+CATEGORIES = ['code', 'object', 'design']
+TOOLS = ['TouchDesigner, Max8', 'p5.js, Arduino', 'Unity, C#', 'Illustrator, Processing']
+
+# Placeholder dimensions, cycled per work
+IMAGE_SIZES = [(1600, 1200), (1200, 1600), (1920, 1080), (1000, 1000)]
+
+GRID_ITEM_RE = re.compile(r'<div class="img_wrap".*?</a>\s*</div>', re.DOTALL)
+
+GRID_ITEM = '''<div class="img_wrap" style="opacity: 0;" data-category="{category}">
+                    <a href="./{id}.html">
+                        <img src="data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 4 3'%3E%3C/svg%3E" data-src="{thumbnail}" alt="{title}">
+                    </a>
+                </div>'''
+
+PAGE_HEAD = '''<!DOCTYPE html>
+<html lang="ja">
+
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+
+    <title>{title} - Ryo Simon</title>
+
+    <!-- SEO Meta Tags -->
+    <meta name="description" content="{title} project by Ryo Simon.">
+    <meta name="author" content="Ryo Nishikado">
+
+    <link rel="stylesheet" href="../css/style_2.css" type="text/css">
+    <link rel="stylesheet" href="../css/images.css" type="text/css">
+    <link rel="stylesheet" href="../css/swiper/swiper.css">
+    <!-- swiper-->
+    <script src="../js/swiper/swiper.js"></script>
+    <script src="../js/jquery-3.6.0.min.js"></script>
+</head>
+
+<body>
+    <div id="zentai">
+
+        <!-- content  -->
+        <div id="content">
+            <br>
+            <h1>
+                <!-- Heading　-->
+                {title}
+            </h1>
+            <hr>
+            <div class="swiper-container">
+                <div class="swiper-wrapper">
+'''
+
+SLIDE = '''                    <div class="swiper-slide">
+                        <div class="img_w2">
+                            <img src="{src}" alt="">
+                        </div>
+                    </div>
+'''
+
+PAGE_BODY = '''                </div>
+                <div class="swiper-button-prev"></div>
+                <div class="swiper-button-next"></div>
+            </div>
+
+            <!-- Subheading　-->
+            <h3>
+                {title}
+            </h3>
+            <div id="content_in">
+                <p>
+                    {paragraph1}
+                    <br>{paragraph2}
+                    <dd>
+                    </dd>
+                    <!-- <p>old description</p> -->
+                </p>
+                <dt>Credit</dt>
+                <dd>
+                    Synthetic Studio
+                    <br>
+                    <ul class="list-style-none">
+                        <li>Member {n}(Designer)</li>
+                        <li>Ryo Nishikado(Creative Technologist/Artist)</li>
+                    </ul>
+                    <br>
+                </dd>
+'''
+
+TOOL_SECTION = '''                <dt>Tool</dt>
+                <dd>
+                    <span>{tools}</span>
+                </dd>
+'''
+
+EXHIBITION_SECTION = '''                <dt>Exhibition</dt>
+                <dd>
+                    Synthetic Exhibition {year}, Tokyo
+                </dd>
+                <dd>
+                    Synthetic Festival {year}, Kyoto
+                </dd>
+'''
+
+PAGE_TAIL = '''                <br>
+                <dt>Link</dt>
+                <dd>
+                    <a class="list"
+                        href="{link}">
+                        LINK
+                    </a>
+                </dd>
+                <br>
+            </div>
+            <hr>
+            <br>
+        </div>
+
+        <!-- menu -->
+    <div id="menu">
+        <!-- Menu content loaded dynamically via load-menu.js -->
+    </div>
+    <!-- Dynamic Menu Loader -->
+    <script src="../js/load-menu.js"></script>
+    </div>
+</body>
+
+</html>
+'''
+
+
+def webp_placeholder(width, height):
+    """A 26-byte lossless WebP header: enough for tools that read dimensions"""
+    bits = (width - 1) | ((height - 1) << 14)
+    chunk = b'\x2f' + struct.pack('<I', bits)
+    body = b'WEBP' + b'VP8L' + struct.pack('<I', len(chunk)) + chunk + b'\x00'
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def synthetic_work(n):
+    """Page fields of work number n (the JSON of that work, minus page-only markup)"""
+    work_id = f'synthetic-{n:06d}'
+    category = CATEGORIES[n % len(CATEGORIES)]
+    year = str(2015 + n % 10)
+    title = f'合成作品 {n:06d}'
+    images = [f'../image/{work_id}/{work_id}-{i:02d}.webp' for i in range(1, 2 + n % 4)]
+    paragraph1 = (f'{year}年制作。{title} は、ツールチェーンのベンチマーク用に生成された作品です。'
+                  f'Synthetic catalogue entry for load testing.')
+    paragraph2 = f'Second paragraph with a <a class="list" href="https://example.com/notes/{n}">note</a>.'
+    tools = TOOLS[n % len(TOOLS)] if n % 2 == 0 else None
+
+    return {
+        "id": work_id,
+        "title": title,
+        "category": category,
+        "year": year,
+        "thumbnail": images[0],
+        "images": images,
+        "description": f'{paragraph1}<br>{paragraph2}',
+        "credit": (f'Synthetic Studio<br><ul class="list-style-none"> <li>Member {n}(Designer)</li> '
+                   '<li>Ryo Nishikado(Creative Technologist/Artist)</li> </ul>'),
+        "tools": tools,
+        "link": f'<a class="list" href="https://example.com/works/{work_id}"> LINK </a>',
+        "exhibition": (f'Synthetic Exhibition {year}, Tokyo<br>Synthetic Festival {year}, Kyoto'
+                       if n % 3 == 0 else None),
+        "award": None,
+        "paper": None,
+        "grants": None,
+        "collaborators": None,
+        "performers": None,
+        "download": None,
+        "citation": None,
+        "related": None
+    }, paragraph1, paragraph2
+
+
+def build_page(n, work, paragraph1, paragraph2):
+    parts = [PAGE_HEAD.format(title=work['title'])]
+    parts.extend(SLIDE.format(src=src) for src in work['images'])
+    parts.append(PAGE_BODY.format(title=work['title'], n=n,
+                                  paragraph1=paragraph1, paragraph2=paragraph2))
+    if work['tools']:
+        parts.append(TOOL_SECTION.format(tools=work['tools']))
+    if work['exhibition']:
+        parts.append(EXHIBITION_SECTION.format(year=work['year']))
+    parts.append(PAGE_TAIL.format(link=f"https://example.com/works/{work['id']}"))
+    return ''.join(parts)
+
+
+def build_works_html(works):
+    """The real works.html with its grid items replaced by the synthetic works"""
+    with open(BASE_DIR / 'works' / 'works.html', 'r', encoding='utf-8') as f:
+        template = f.read()
+
+    items = list(GRID_ITEM_RE.finditer(template))
+    if not items:
+        raise ValueError('works/works.html has no img_wrap grid items to replace')
+
+    grid = '\n\n                '.join(
+        GRID_ITEM.format(id=work['id'], category=work['category'],
+                         thumbnail=work['thumbnail'], title=work['title'])
+        for work in works)
+    return template[:items[0].start()] + grid + template[items[-1].end():]
+
+
+def generate_site(out_dir, work_count, copy_scripts=True):
+    """
+    Write a synthetic site with work_count works to out_dir.
+
+    Returns:
+        dict: counts of works, pages, images and bytes written
+    """
+    out_dir = Path(out_dir)
+    works_dir = out_dir / 'works'
+    data_dir = out_dir / 'works-data'
+    image_dir = out_dir / 'image'
+    for directory in (works_dir, data_dir, image_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    placeholders = {size: webp_placeholder(*size) for size in IMAGE_SIZES}
+    works = []
+    image_count = 0
+    total_bytes = 0
+
+    for n in range(1, work_count + 1):
+        work, paragraph1, paragraph2 = synthetic_work(n)
+        works.append(work)
+
+        page = build_page(n, work, paragraph1, paragraph2).encode('utf-8')
+        (works_dir / f"{work['id']}.html").write_bytes(page)
+        data = json.dumps(work, ensure_ascii=False, indent=2).encode('utf-8')
+        (data_dir / f"{work['id']}.json").write_bytes(data)
+        total_bytes += len(page) + len(data)
+
+        work_images = image_dir / work['id']
+        work_images.mkdir(exist_ok=True)
+        placeholder = placeholders[IMAGE_SIZES[n % len(IMAGE_SIZES)]]
+        for src in work['images']:
+            (work_images / src.rsplit('/', 1)[1]).write_bytes(placeholder)
+            image_count += 1
+            total_bytes += len(placeholder)
+
+    index = {
+        'works': [{'id': w['id'], 'title': w['title'], 'year': w['year'],
+                   'category': w['category'], 'filename': f"{w['id']}.html"} for w in works],
+        'description': 'Synthetic catalogue generated by scripts/benchmarks/synth_site.py.'
+    }
+    for path, text in ((data_dir / 'index.json', json.dumps(index, indent=2, ensure_ascii=False) + '\n'),
+                       (works_dir / 'works.html', build_works_html(works))):
+        data = text.encode('utf-8')
+        path.write_bytes(data)
+        total_bytes += len(data)
+
+    shutil.copy2(BASE_DIR / 'works-data' / 'SCHEMA.md', data_dir / 'SCHEMA.md')
+
+    if copy_scripts:
+        shutil.copytree(SCRIPTS_DIR, out_dir / 'scripts', dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns('__pycache__', 'archived'))
+
+    return {'works': work_count, 'pages': work_count + 1,
+            'images': image_count, 'bytes': total_bytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('out_dir', type=Path, help='directory to create (must be empty or missing)')
+    parser.add_argument('-n', '--works', type=int, default=1000,
+                        help='number of works to generate (default 1000)')
+    parser.add_argument('--no-scripts', action='store_true',
+                        help='do not copy scripts/ into the generated site')
+    args = parser.parse_args()
+
+    if args.works < 1:
+        parser.error('--works must be at least 1')
+    if args.out_dir.exists() and any(args.out_dir.iterdir()):
+        print(f"✗ {args.out_dir} is not empty")
+        sys.exit(1)
+
+    stats = generate_site(args.out_dir, args.works, copy_scripts=not args.no_scripts)
+    print(f"✓ Generated {stats['works']} works in {args.out_dir}")
+    print(f"  Pages: {stats['pages']}, images: {stats['images']}, "
+          f"bytes: {stats['bytes']:,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Load each page's stylesheets as one request: a content-hashed bundle per stylesheet set.
+
+works/works.html links seven stylesheets (six from css/min plus
+css/swiper/swiper.min.css), every one a separate render-blocking request.
+This stage reads the local <link rel="stylesheet"> tags of each page's
+<head> in order, concatenates the files they point at and replaces the
+links with a single one:
+
+    <link rel="stylesheet" href="../css/bundle/bundle.1a2b3c4d5e.css"
+          data-bundle="css/min/common.css css/min/style_2.css ...">
+
+- the bundle is named after a hash of its content, so pages linking the
+  same stylesheets in the same order share one file (and one cache entry)
+  and a bundle only gets a new name when one of its parts changed
+- data-bundle lists the parts under their plain names, so the next run
+  rebuilds the bundle from the current files even though the page no
+  longer links them; fingerprinted names (common.1a2b3c4d5e.css) are mapped
+  back through asset-manifest.json
+- a part from css/ or css/min/ is read from css/pruned/ when prune_css.py
+  wrote it (--no-prune reads the linked file); relative url()s are rebased
+  to css/bundle/ and @charset rules dropped
+- only consecutive links are merged: a <style> block, a link with another
+  media or a remote stylesheet between two links ends a bundle, so the
+  cascade order is kept; a part with @import is never merged after another
+
+Output of critical_css.py is removed before a page is bundled, and a page
+whose bundle links are already current is left untouched; run
+critical_css.py after this stage. Bundles no page links any more are
+deleted. The report gives each page's stylesheet requests before and after.
+
+Usage:
+    python3 bundle_css.py [--no-prune] [--remove] [--check] [--json PATH]
+
+--remove puts the plain links back (under their fingerprinted names);
+--check writes nothing and exits with 1 when a page or bundle is out of date.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+from pathlib import Path
+
+from critical_css import restore
+from sitetools.cssrules import rebase_urls, strip_comments
+from sitetools.doccache import DocCache
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+BUNDLE_DIR = 'css/bundle'
+PRUNED_DIR = 'css/pruned'
+MANIFEST_NAME = 'asset-manifest.json'
+MARKER = 'data-bundle'
+
+# Hex digits of the SHA-256 kept in bundle names
+HASH_LENGTH = 10
+
+BUNDLE_NAME_RE = re.compile(r'^bundle\.[0-9a-f]{%d}\.css$' % HASH_LENGTH)
+CHARSET_RE = re.compile(r'@charset\s+"[^"]*"\s*;', re.IGNORECASE)
+IMPORT_RE = re.compile(r'@import\b', re.IGNORECASE)
+
+# Top-level directories that are in the repository but not part of the site
+NOT_SHIPPED = ('scripts/', 'docs/', 'dev/', '.vscode/')
+
+
+def load_manifest(root):
+    """Plain path -> fingerprinted path, from fingerprint_assets.py"""
+    try:
+        with open(root / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f).get('assets', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _resolve(page_rel, href):
+    path = href.split('#', 1)[0].split('?', 1)[0]
+    if path.startswith('/'):
+        return posixpath.normpath(path.lstrip('/'))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(page_rel), path))
+
+
+def stylesheet_runs(doc, page_rel, inventory, plain_names):
+    """
+    Runs of consecutive bundleable links in the page's <head>.
+
+    Returns ([[(tag, [part, ...]), ...], ...], other) where each part is the
+    plain site-relative path of a stylesheet and other counts the
+    stylesheet links that are not bundled (remote, other media, ...).
+    """
+    runs = []
+    current = []
+    other = 0
+    head_end = doc.first('head', closing=True)
+    for tag in doc.all_tags:
+        if head_end is not None and tag.start > head_end.start:
+            break
+        if tag.closing or tag.name not in ('link', 'style'):
+            continue
+        if tag.name == 'style':
+            if current:
+                runs.append(current)
+                current = []
+            continue
+        if 'stylesheet' not in (tag.get('rel') or '').lower().split():
+            continue
+        href = tag.get('href')
+        parts = None
+        if tag.has(MARKER):
+            parts = (tag.get(MARKER) or '').split()
+        elif href and '://' not in href and not href.startswith('//') and \
+                tag.get('media') in (None, 'all', 'screen'):
+            target = _resolve(page_rel, href)
+            if target in inventory.entries:
+                parts = [plain_names.get(target, target)]
+        if not parts:
+            other += 1
+            if current:
+                runs.append(current)
+                current = []
+            continue
+        current.append((tag, parts))
+    if current:
+        runs.append(current)
+    return runs, other
+
+
+def part_source(root, part, prune):
+    """Path of the file read for a bundle part"""
+    directory, name = posixpath.split(part)
+    if prune and directory in ('css', 'css/min') and (root / PRUNED_DIR / name).is_file():
+        return f'{PRUNED_DIR}/{name}'
+    return part
+
+
+def build_bundle(root, parts, prune):
+    """Bundle CSS text of a list of parts; None when an @import cannot be kept in place"""
+    pieces = []
+    for index, part in enumerate(parts):
+        source = part_source(root, part, prune)
+        css = CHARSET_RE.sub('', (root / source).read_text(encoding='utf-8'))
+        if index and IMPORT_RE.search(strip_comments(css)):
+            return None
+        pieces.append(rebase_urls(css, posixpath.dirname(source), BUNDLE_DIR).strip())
+    return '\n'.join(pieces) + '\n'
+
+
+def bundle_path(css):
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    return f'{BUNDLE_DIR}/bundle.{digest}.css'
+
+
+def _line_span(text, tag):
+    """(start, end) of a tag together with the whitespace before it"""
+    start = tag.start
+    while start > 0 and text[start - 1] in ' \t\r\n':
+        start -= 1
+    return start, tag.end
+
+
+def rewrite(text, doc, page_rel, runs, bundles):
+    """Page text with each run replaced by a link to its bundle (bundles: run index -> path)"""
+    edits = []
+    for index, run in enumerate(runs):
+        if index not in bundles:
+            continue
+        parts = [part for tag, run_parts in run for part in run_parts]
+        href = posixpath.relpath(bundles[index], posixpath.dirname(page_rel) or '.')
+        first = run[0][0]
+        edits.append((first.start, first.end,
+                      f'<link rel="stylesheet" href="{href}" {MARKER}="{" ".join(parts)}">'))
+        for tag, run_parts in run[1:]:
+            start, end = _line_span(text, tag)
+            edits.append((start, end, ''))
+    return doc.splice(edits) if edits else text
+
+
+def unbundle(text, doc, page_rel, manifest):
+    """Page text with every bundle link replaced by links to its parts"""
+    edits = []
+    for tag in doc.tags('link'):
+        if not tag.has(MARKER):
+            continue
+        line_start = text.rfind('\n', 0, tag.start) + 1
+        indent = text[line_start:tag.start]
+        indent = indent if not indent.strip() else ''
+        links = []
+        for part in (tag.get(MARKER) or '').split():
+            target = manifest.get(part, part)
+            links.append(f'<link rel="stylesheet" href="{posixpath.relpath(target, posixpath.dirname(page_rel) or ".")}">')
+        edits.append((tag.start, tag.end, f'\n{indent}'.join(links)))
+    return doc.splice(edits) if edits else text
+
+
+def stale_bundles(root, keep):
+    """Bundles in BUNDLE_DIR that are not in keep"""
+    stale = []
+    path = root / BUNDLE_DIR
+    if not path.is_dir():
+        return stale
+    with os.scandir(path) as it:
+        for entry in it:
+            rel = f'{BUNDLE_DIR}/{entry.name}'
+            if BUNDLE_NAME_RE.match(entry.name) and rel not in keep and entry.is_file():
+                stale.append(rel)
+    return sorted(stale)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bundle each page's stylesheets into one content-hashed file")
+    parser.add_argument('--no-prune', dest='prune', action='store_false',
+                        help='bundle css/min/ as is instead of the css/pruned/ output of prune_css.py')
+    parser.add_argument('--remove', action='store_true', help='undo: link the bundled stylesheets again')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if a page or bundle is not up to date')
+    parser.add_argument('--json', metavar='PATH', help='write the per-page report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    manifest = load_manifest(root)
+    plain_names = {hashed: plain for plain, hashed in manifest.items()}
+    docs = DocCache()
+    pages = [rel for rel in inventory.rel_paths('html') if not rel.startswith(NOT_SHIPPED)]
+
+    rows = []
+    pending = {}
+    bundles = {}        # bundle path -> CSS text
+    for page_rel in pages:
+        path = root / page_rel
+        current = path.read_text(encoding='utf-8')
+        text = restore(current)
+        doc = docs.parse(text, path)
+        if args.remove:
+            new_text = unbundle(text, doc, page_rel, manifest)
+            if new_text != text:
+                pending[page_rel] = new_text
+            continue
+
+        runs, other = stylesheet_runs(doc, page_rel, inventory, plain_names)
+        if not runs:
+            continue
+        targets = {}
+        skipped = []
+        for index, run in enumerate(runs):
+            parts = [part for tag, run_parts in run for part in run_parts]
+            css = build_bundle(root, parts, args.prune)
+            if css is None:
+                skipped.append(parts)
+                continue
+            targets[index] = bundle_path(css)
+            bundles[targets[index]] = css
+        new_text = rewrite(text, doc, page_rel, runs, targets)
+        if new_text != text:
+            # Only now is the critical CSS dropped; it is rebuilt for the new links
+            pending[page_rel] = new_text
+
+        before = other + sum(len(run_parts) for run in runs for tag, run_parts in run)
+        after = other + len(targets) + sum(len(parts) for parts in skipped)
+        rows.append({'page': page_rel, 'requests_before': before, 'requests_after': after,
+                     'bundles': [targets[index] for index in sorted(targets)],
+                     'skipped': skipped, 'status': 'stale' if page_rel in pending else 'unchanged'})
+
+    stale = [] if args.check else stale_bundles(root, set(bundles))
+    if args.check:
+        missing = [rel for rel, css in sorted(bundles.items())
+                   if not (root / rel).is_file() or (root / rel).read_text(encoding='utf-8') != css]
+        for rel in missing:
+            print(f"✗ {rel} missing or out of date")
+        for rel in sorted(pending):
+            print(f"✗ {rel} does not link its current bundle")
+        outdated = bool(missing or pending)
+        print(f"\n{'✗ CSS bundles out of date (run bundle_css.py)' if outdated else '✓ CSS bundles up to date'}")
+        sys.exit(1 if outdated else 0)
+
+    written = {}
+    with ChangeAwareWriter('bundle_css') as writer:
+        if bundles:
+            (root / BUNDLE_DIR).mkdir(parents=True, exist_ok=True)
+        for rel, css in sorted(bundles.items()):
+            written[rel] = writer.write_text(root / rel, css)
+        for page_rel, text in sorted(pending.items()):
+            writer.write_text(root / page_rel, text)
+        summary = writer.summary()
+    if args.remove:
+        stale = stale_bundles(root, set())
+    for rel in stale:
+        (root / rel).unlink()
+    inventory.save()
+    seconds = time.perf_counter() - start
+
+    if args.remove:
+        for page_rel in sorted(pending):
+            print(f"✓ {page_rel}: stylesheets unbundled")
+    for row in rows:
+        mark = '✓' if row['status'] == 'stale' else '-'
+        status = 'rewritten' if row['status'] == 'stale' else 'unchanged'
+        names = ', '.join(posixpath.basename(rel) for rel in row['bundles'])
+        print(f"{mark} {row['page']}: {row['requests_before']} → {row['requests_after']} stylesheet "
+              f"request(s) ({names}) {status}")
+        for parts in row['skipped']:
+            print(f"  ⚠ not bundled (@import after the first part): {' '.join(parts)}")
+    for rel in sorted(written):
+        users = sum(1 for row in rows if rel in row['bundles'])
+        mark = '-' if written[rel] == 'unchanged' else '✓'
+        print(f"{mark} {rel}: {len(bundles[rel].encode('utf-8')):,} bytes, {users} page(s) {written[rel]}")
+    for rel in stale:
+        print(f"✗ removed stale {rel}")
+
+    before = sum(row['requests_before'] for row in rows)
+    after = sum(row['requests_after'] for row in rows)
+    print(f"\nSUMMARY:")
+    if args.remove:
+        print(f"  Pages unbundled: {len(pending)}")
+    else:
+        print(f"  Pages: {len(rows)} ({len(pending)} rewritten)")
+        print(f"  Bundles: {len(bundles)}")
+        print(f"  Stylesheet requests: {before} → {after}")
+    print(f"  Stale bundles removed: {len(stale)}")
+    print(f"  Files: {summary}")
+    print(f"  Time: {seconds:.2f}s")
+    if pending:
+        print(f"\nRun critical_css.py next: the rewritten pages no longer inline their critical CSS.")
+
+    if args.json:
+        report = {'pages': rows, 'bundles': {rel: len(css.encode('utf-8')) for rel, css in sorted(bundles.items())},
+                  'requests_before': before, 'requests_after': after, 'removed': stale,
+                  'seconds': round(seconds, 4)}
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Bundle works-data/*.json into minified, content-hashed files for the SPA.
+
+The SPA used to fetch ../works-data/<id>.json once per work it opened. This
+stage writes the same data, minified, into works-data/bundles/ under names
+that carry a hash of their content (window-003.1a2b3c4d5e.json), grouped in
+one of three ways:
+
+- work      one bundle per work
+- category  one bundle per category (everything a filtered visitor can reach)
+- window    consecutive works in display order, --window at a time, so a
+            work, its prev/next and nearby works arrive in one request
+
+Each bundle is a JSON object of id -> work data. works-data/bundles/
+manifest.json maps every id to its bundle and lists each bundle's ids, so
+the SPA can prefetch the bundle of the next/previous work. Bundles never
+change under the same name and may be served with
+"Cache-Control: public, max-age=31536000, immutable"; only the manifest has
+to be revalidated.
+
+Bundles whose bytes are unchanged are not rewritten; bundles the new
+manifest no longer lists are deleted. The report gives each bundle's size
+(raw and gzip) and the requests and bytes a few navigation paths cost.
+
+Usage:
+    python3 bundle_works_data.py [--group work|category|window] [--window N] [--json PATH]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+GROUPS = ('work', 'category', 'window')
+DEFAULT_WINDOW = 6
+
+BUNDLE_DIR_NAME = 'bundles'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Hex digits of the SHA-256 kept in bundle names
+HASH_LENGTH = 10
+
+
+def load_index(data_dir):
+    """Index entries (dicts with at least 'id') in display order"""
+    with open(data_dir / 'index.json', 'r', encoding='utf-8') as f:
+        index_data = json.load(f)
+    if 'works' in index_data:
+        return index_data['works']
+    return [{'id': work_id} for work_id in index_data['order']]
+
+
+def group_works(entries, group, window):
+    """
+    Split the display order into bundles.
+
+    Returns:
+        list: (bundle name, [work ids]) in order of first appearance
+    """
+    if group == 'work':
+        return [(entry['id'], [entry['id']]) for entry in entries]
+    if group == 'category':
+        groups = {}
+        for entry in entries:
+            groups.setdefault(f"category-{entry.get('category') or 'none'}", []).append(entry['id'])
+        return list(groups.items())
+    ids = [entry['id'] for entry in entries]
+    return [(f'window-{start // window:03d}', ids[start:start + window])
+            for start in range(0, len(ids), window)]
+
+
+def build_bundle(data_dir, ids):
+    """Minified bundle bytes for ids; missing work files are skipped"""
+    bundle = {}
+    for work_id in ids:
+        try:
+            with open(data_dir / f'{work_id}.json', 'r', encoding='utf-8') as f:
+                bundle[work_id] = json.load(f)
+        except FileNotFoundError:
+            continue
+    return json.dumps(bundle, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), list(bundle)
+
+
+def navigation_report(entries, bundle_of, sizes, related):
+    """
+    Requests and bytes for typical navigation paths.
+
+    A bundle is fetched the first time a path needs one of its works and is
+    reused afterwards (the SPA keeps every work it has loaded).
+    """
+    def walk(ids):
+        fetched = set()
+        for work_id in ids:
+            fetched.add(bundle_of[work_id])
+        return len(fetched), sum(sizes[url] for url in fetched)
+
+    order = [entry['id'] for entry in entries if entry['id'] in bundle_of]
+    categories = {}
+    for entry in entries:
+        if entry['id'] in bundle_of:
+            categories.setdefault(entry.get('category') or 'none', []).append(entry['id'])
+
+    paths = []
+    deep_link_bytes = sum(sizes[bundle_of[work_id]] for work_id in order)
+    paths.append({'path': 'open one work (deep link)', 'steps': 1, 'requests': 1,
+                  'bytes': round(deep_link_bytes / len(order)) if order else 0})
+
+    requests, nbytes = walk(order)
+    paths.append({'path': 'prev/next through every work', 'steps': len(order),
+                  'requests': requests, 'bytes': nbytes})
+
+    category_requests = category_bytes = 0
+    for ids in categories.values():
+        requests, nbytes = walk(ids)
+        category_requests += requests
+        category_bytes += nbytes
+    paths.append({'path': 'prev/next within each category', 'steps': len(order),
+                  'requests': category_requests, 'bytes': category_bytes})
+
+    hops = [(work_id, ref) for work_id, refs in related.items() for ref in refs if ref in bundle_of]
+    extra = sum(1 for work_id, ref in hops if bundle_of[ref] != bundle_of[work_id])
+    paths.append({'path': 'related card from an open work', 'steps': len(hops),
+                  'requests': extra, 'bytes': sum(sizes[bundle_of[ref]] for work_id, ref in hops
+                                                  if bundle_of[ref] != bundle_of[work_id])})
+    return paths
+
+
+def remove_stale_bundles(bundle_dir, keep):
+    """Delete bundle files that are not in keep; returns their names"""
+    removed = []
+    with os.scandir(bundle_dir) as it:
+        for entry in it:
+            if (entry.name.endswith('.json') and entry.name != MANIFEST_NAME
+                    and entry.name not in keep and entry.is_file()):
+                os.unlink(entry.path)
+                removed.append(entry.name)
+    return sorted(removed)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Bundle works-data/*.json into content-hashed files')
+    parser.add_argument('--group', choices=GROUPS, default='window',
+                        help='one bundle per work, per category, or per display-order window (default)')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help=f'works per bundle with --group window (default {DEFAULT_WINDOW})')
+    parser.add_argument('--json', metavar='PATH', help='write the size and request report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root containing works-data/ (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.window < 1:
+        print('✗ --window must be at least 1')
+        sys.exit(1)
+
+    data_dir = args.root.resolve() / 'works-data'
+    bundle_dir = data_dir / BUNDLE_DIR_NAME
+    bundle_dir.mkdir(exist_ok=True)
+
+    entries = load_index(data_dir)
+    manifest = {'version': MANIFEST_VERSION, 'group': args.group, 'works': {}, 'bundles': {}}
+    if args.group == 'window':
+        manifest['window'] = args.window
+
+    sizes = {}
+    gzip_sizes = {}
+    related = {}
+    rows = []
+
+    with ChangeAwareWriter('bundle_works_data') as writer:
+        for name, ids in group_works(entries, args.group, args.window):
+            data, present = build_bundle(data_dir, ids)
+            for work_id in ids:
+                if work_id not in present:
+                    print(f"⚠ Warning: {work_id}.json not found, skipping")
+            if not present:
+                continue
+
+            digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+            file_name = f'{name}.{digest}.json'
+            url = f'{BUNDLE_DIR_NAME}/{file_name}'
+            status = writer.write_bytes(bundle_dir / file_name, data)
+
+            for work_id, work in json.loads(data).items():
+                manifest['works'][work_id] = url
+                if isinstance(work.get('related'), list):
+                    related[work_id] = work['related']
+            manifest['bundles'][url] = present
+            sizes[url] = len(data)
+            gzip_sizes[url] = len(gzip.compress(data, compresslevel=9, mtime=0))
+            rows.append((file_name, len(present), sizes[url], gzip_sizes[url], status))
+
+        manifest_status = writer.write_text(
+            bundle_dir / MANIFEST_NAME,
+            json.dumps(manifest, ensure_ascii=False, separators=(',', ':')) + '\n')
+        summary = writer.summary()
+
+    removed = remove_stale_bundles(bundle_dir, {url.rsplit('/', 1)[1] for url in sizes})
+    paths = navigation_report(entries, manifest['works'], sizes, related)
+
+    for file_name, count, raw, gz, status in rows:
+        mark = '-' if status == 'unchanged' else '✓'
+        print(f"{mark} {file_name}: {count} works, {raw:,} bytes ({gz:,} gzip) {status}")
+    for file_name in removed:
+        print(f"✗ removed stale {file_name}")
+
+    print(f"\nNAVIGATION:")
+    for path in paths:
+        print(f"  {path['path']}: {path['requests']} request(s) for {path['steps']} step(s), "
+              f"{path['bytes']:,} bytes")
+
+    print(f"\nSUMMARY:")
+    print(f"  Group: {args.group}" + (f" ({args.window} works)" if args.group == 'window' else ''))
+    print(f"  Bundles: {len(sizes)} for {len(manifest['works'])} works")
+    print(f"  Total: {sum(sizes.values()):,} bytes ({sum(gzip_sizes.values()):,} gzip)")
+    print(f"  Manifest: {manifest_status}")
+    print(f"  Files: {summary}, {len(removed)} removed")
+
+    if args.json:
+        report = {
+            'group': args.group,
+            'window': args.window if args.group == 'window' else None,
+            'bundles': [{'file': file_name, 'works': count, 'bytes': raw, 'gzip': gz}
+                        for file_name, count, raw, gz, status in rows],
+            'navigation': paths,
+        }
+        data = json.dumps(report, ensure_ascii=False, indent=2)
+        atomic_write_bytes(Path(args.json), (data + '\n').encode('utf-8'))
+
+
+if __name__ == '__main__':
+    main()
@@ -60,10 +60,10 @@ function processJsonFile(filePath) {
   return false;
 }
 
-// Get all JSON files except index.json and _template.json
+// Get all JSON files except index.json, index.columns.json and _template.json
 const files = fs.readdirSync(worksDataDir)
   .filter(file => file.endsWith('.json'))
-  .filter(file => file !== 'index.json' && file !== '_template.json')
+  .filter(file => file !== 'index.json' && file !== 'index.columns.json' && file !== '_template.json')
   .map(file => path.join(worksDataDir, file));
 
 console.log(`Processing ${files.length} JSON files...\n`);
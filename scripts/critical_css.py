@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Inline each page's above-the-fold CSS and load its stylesheets without blocking.
+
+works/works.html waits for seven stylesheets before it paints anything.
+This stage parses every local stylesheet a page links in its <head>
+(sitetools.cssrules), matches each rule's selectors against the page's
+static markup (sitetools.selectors) and keeps the rules that apply to an
+element above the fold:
+
+- the fold is the first --fold elements of <body> in document order
+  (default 150), or everything before an element marked data-critical-fold
+- state selectors (:hover, :focus, ...) only match what the markup says,
+  as on first paint; selectors the matcher does not understand are kept
+- @media/@supports blocks keep their matching rules; @keyframes and
+  @font-face are kept when a kept rule names them
+- relative url()s are rebased from the stylesheet to the page
+
+The rules go into <style data-critical="<hash>"> ahead of the first
+stylesheet link. Each link is switched to media="print" with an onload
+that restores media="all", so it downloads without blocking rendering, and
+a <noscript> block keeps the plain links for browsers without JavaScript.
+Running again first undoes all of that, so the output depends only on the
+page and its stylesheets.
+
+Output is deterministic and cached: .cache/critical-css.json keeps the
+inline CSS under a hash of the page (with earlier output removed), the
+SHA-256 of every stylesheet and the fold; a page whose hash is unchanged is
+not parsed again.
+
+Usage:
+    python3 critical_css.py [PAGE ...] [--fold N] [--remove] [--check] [--json PATH]
+
+PAGEs are HTML files relative to the site root; the default is every page
+that links a local stylesheet. --remove restores the plain blocking links.
+"""
+
+import argparse
+import hashlib
+import json
+import posixpath
+import sys
+import time
+from pathlib import Path
+
+from sitetools.cssrules import (AtRule, Rule, drop_unreferenced, parse_stylesheet, rebase_urls, serialize,
+                                split_selectors)
+from sitetools.doccache import DocCache
+from sitetools.inventory import load_inventory
+from sitetools.minify import minify_css
+from sitetools.selectors import Selector, build_tree
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_FILE = Path('.cache') / 'critical-css.json'
+
+# Bump when the extraction changes, so cached results are recomputed
+CRITICAL_VERSION = 1
+
+DEFAULT_FOLD = 150
+FOLD_ATTRIBUTE = 'data-critical-fold'
+MARKER = 'data-critical'
+
+# Inserted into each stylesheet link; removing it restores the original tag
+DEFER_ATTRS = f' media="print" onload="this.media=\'all\'" {MARKER}'
+
+# Top-level directories that are in the repository but not part of the site
+NOT_SHIPPED = ('scripts/', 'docs/', 'dev/', '.vscode/')
+
+
+def restore(text):
+    """Page text with any earlier output of this stage removed"""
+    doc = DocCache().parse(text)
+    edits = []
+    tags = doc.all_tags
+    for index, tag in enumerate(tags):
+        if tag.closing or tag.name not in ('style', 'noscript', 'link') or not tag.has(MARKER):
+            continue
+        if tag.name == 'link':
+            raw = doc.raw(tag)
+            edits.append((tag.start, tag.end, raw.replace(DEFER_ATTRS, '', 1)))
+            continue
+        close = next((t for t in tags[index + 1:] if t.closing and t.name == tag.name), None)
+        end = close.end if close else tag.end
+        if tag.name == 'style':
+            # The block was inserted together with the line break after it
+            while end < len(text) and text[end] in ' \t\r\n':
+                end += 1
+            edits.append((tag.start, end, ''))
+        else:
+            start = tag.start
+            while start > 0 and text[start - 1] in ' \t\r\n':
+                start -= 1
+            edits.append((start, end, ''))
+    return doc.splice(edits) if edits else text
+
+
+def stylesheet_links(doc, page_rel, inventory):
+    """[(tag, site-relative path)] of the page's local blocking stylesheets, in order"""
+    links = []
+    head_end = doc.first('head', closing=True)
+    for tag in doc.tags('link'):
+        if head_end is not None and tag.start > head_end.start:
+            break
+        rel = (tag.get('rel') or '').lower().split()
+        href = tag.get('href')
+        if 'stylesheet' not in rel or not href or tag.get('media') not in (None, 'all', 'screen'):
+            continue
+        if '://' in href or href.startswith('//'):
+            continue
+        path = href.split('#', 1)[0].split('?', 1)[0]
+        if path.startswith('/'):
+            target = posixpath.normpath(path.lstrip('/'))
+        else:
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(page_rel), path))
+        if target in inventory.entries:
+            links.append((tag, target))
+    return links
+
+
+def above_fold(root, fold):
+    """Elements rendered above the fold (plus <html> and <body>)"""
+    body = next((el for el in root.iter() if el.name == 'body'), None)
+    if body is None:
+        return [el for el in root.iter() if el.name != '#document']
+    elements = [el for el in root.iter() if el.name in ('html', 'body')]
+    for count, element in enumerate(body.iter()):
+        if element is body:
+            continue
+        if FOLD_ATTRIBUTE in element.attrs or count > fold:
+            break
+        elements.append(element)
+    return elements
+
+
+def _selector_applies(prelude, elements):
+    for text in split_selectors(prelude):
+        try:
+            selector = Selector(text)
+        except ValueError:
+            return True
+        if any(selector.matches(element, dynamic=False) for element in elements):
+            return True
+    return False
+
+
+def critical_rules(nodes, elements, counts):
+    """
+    Nodes of a stylesheet that apply above the fold.
+
+    @keyframes and @font-face are resolved later, once every kept rule is
+    known; here they are kept as candidates.
+    """
+    kept = []
+    for node in nodes:
+        if isinstance(node, Rule):
+            counts['total'] += 1
+            if _selector_applies(node.prelude, elements):
+                counts['kept'] += 1
+                kept.append(node)
+        elif node.children is not None:
+            children = critical_rules(node.children, elements, counts)
+            if children:
+                kept.append(AtRule(node.name, node.prelude, children, None))
+        elif node.name.endswith('keyframes') or node.name == '@font-face':
+            kept.append(node)
+    return kept
+
+
+def extract(page_rel, doc, links, root, fold):
+    """(critical CSS, rules kept, rules total) for a page"""
+    elements = above_fold(build_tree(doc), fold)
+    counts = {'kept': 0, 'total': 0}
+    kept = []
+    page_dir = posixpath.dirname(page_rel)
+    for tag, target in links:
+        css = (root / target).read_text(encoding='utf-8')
+        nodes = critical_rules(parse_stylesheet(css), elements, counts)
+        if nodes:
+            css = serialize(nodes)
+            kept.extend(parse_stylesheet(rebase_urls(css, posixpath.dirname(target), page_dir)))
+    kept = drop_unreferenced(kept)
+    return minify_css(serialize(kept)), counts['kept'], counts['total']
+
+
+def apply(text, doc, links, css, key):
+    """Page text with css inlined and the links deferred"""
+    first = links[0][0]
+    line_start = text.rfind('\n', 0, first.start) + 1
+    indent = text[line_start:first.start]
+    indent = indent if not indent.strip() else ''
+
+    edits = []
+    for tag, target in links:
+        raw = doc.raw(tag)
+        end = len(raw) - (2 if raw.endswith('/>') else 1)
+        edits.append((tag.start, tag.end, raw[:end].rstrip() + DEFER_ATTRS + raw[end:]))
+    style = f'<style {MARKER}="{key}">{css}</style>\n{indent}'
+    edits[0] = (edits[0][0], edits[0][1], style + edits[0][2])
+    fallback = ''.join(doc.raw(tag) for tag, target in links)
+    edits[-1] = (edits[-1][0], edits[-1][1],
+                 edits[-1][2] + f'\n{indent}<noscript {MARKER}>{fallback}</noscript>')
+    return doc.splice(edits)
+
+
+def page_key(text, links, inventory, fold):
+    digest = hashlib.sha256()
+    digest.update(f'{CRITICAL_VERSION}\0{fold}\0'.encode('utf-8'))
+    digest.update(text.encode('utf-8'))
+    for tag, target in links:
+        digest.update(f'\0{target}\0{inventory.sha256(target)}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CRITICAL_VERSION:
+        return {}
+    return cache.get('pages', {})
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Inline each page's critical CSS and defer its stylesheets")
+    parser.add_argument('pages', nargs='*', help='HTML files to process (default: every page with local stylesheets)')
+    parser.add_argument('--fold', type=int, default=DEFAULT_FOLD,
+                        help=f'elements of <body> counted as above the fold (default {DEFAULT_FOLD})')
+    parser.add_argument('--remove', action='store_true', help='undo: restore the plain stylesheet links')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if a page is not up to date')
+    parser.add_argument('--json', metavar='PATH', help='write the per-page report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    args = parser.parse_args()
+    if args.fold < 1:
+        parser.error('--fold must be at least 1')
+    return args
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    cache_path = root / CACHE_FILE
+    cache = load_cache(cache_path)
+    docs = DocCache()
+
+    if args.pages:
+        pages = [Path(page).as_posix() for page in args.pages]
+    else:
+        pages = [rel for rel in inventory.rel_paths('html') if not rel.startswith(NOT_SHIPPED)]
+
+    rows = []
+    stale = []
+    with ChangeAwareWriter('critical_css') as writer:
+        for page_rel in pages:
+            path = root / page_rel
+            current = path.read_text(encoding='utf-8')
+            text = restore(current)
+            doc = docs.parse(text, path)
+            links = stylesheet_links(doc, page_rel, inventory)
+            if not links:
+                continue
+
+            blocking = sum(inventory.size(target) for tag, target in links)
+            if args.remove:
+                new_text, css, cached = text, '', False
+                kept = total = 0
+            else:
+                key = page_key(text, links, inventory, args.fold)
+                entry = cache.get(page_rel)
+                cached = bool(entry and entry['key'] == key)
+                if not cached:
+                    css, kept, total = extract(page_rel, doc, links, root, args.fold)
+                    entry = {'key': key, 'css': css, 'kept': kept, 'total': total}
+                    cache[page_rel] = entry
+                css, kept, total = entry['css'], entry['kept'], entry['total']
+                new_text = apply(text, doc, links, css, key[:10])
+
+            if args.check:
+                status = 'unchanged' if new_text == current else 'stale'
+                if status == 'stale':
+                    stale.append(page_rel)
+            else:
+                status = writer.write_text(path, new_text)
+            rows.append({'page': page_rel, 'stylesheets': len(links), 'blocking_bytes': blocking,
+                         'inline_bytes': len(css.encode('utf-8')), 'rules_kept': kept, 'rules_total': total,
+                         'cached': cached, 'status': status})
+        summary = writer.summary()
+
+    if not args.check and not args.remove:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(cache_path, json.dumps(
+                {'version': CRITICAL_VERSION, 'pages': cache},
+                ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        except OSError:
+            pass
+    inventory.save()
+    seconds = time.perf_counter() - start
+
+    for row in rows:
+        mark = '✗' if row['status'] == 'stale' else '-' if row['status'] == 'unchanged' else '✓'
+        if args.remove:
+            print(f"{mark} {row['page']}: {row['stylesheets']} stylesheet(s) blocking again {row['status']}")
+            continue
+        print(f"{mark} {row['page']}: {row['stylesheets']} stylesheet(s), {row['blocking_bytes']:,} bytes "
+              f"blocking → {row['inline_bytes']:,} bytes inline ({row['rules_kept']}/{row['rules_total']} rules)"
+              f"{' cached' if row['cached'] else ''} {row['status']}")
+
+    print(f"\nSUMMARY:")
+    print(f"  Pages: {len(rows)}")
+    if not args.remove:
+        print(f"  Fold: {args.fold} elements")
+        print(f"  Render-blocking CSS: {sum(r['blocking_bytes'] for r in rows):,} → 0 bytes "
+              f"({sum(r['inline_bytes'] for r in rows):,} bytes inline)")
+        print(f"  Cached: {sum(1 for r in rows if r['cached'])}")
+    if args.check:
+        print(f"  Out of date: {len(stale)}")
+    else:
+        print(f"  Files: {summary}")
+    print(f"  Time: {seconds:.2f}s")
+    if args.check:
+        print(f"\n{'✗ Critical CSS out of date (run critical_css.py)' if stale else '✓ Critical CSS up to date'}")
+
+    if args.json:
+        report = {'fold': args.fold, 'pages': rows, 'seconds': round(seconds, 4)}
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+    sys.exit(1 if stale else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,15 +6,51 @@ browsers may reuse a stale copy without revalidating. That bites hardest on
 works-data/*.json: a cached pre-WebP copy points at image paths that no longer
 exist, and the page shows broken images while the code itself is current.
 
+The exceptions are works-data/bundles/<name>.<hash>.json and the fingerprinted
+css/min/<name>.<hash>.css and js/min/<name>.<hash>.js: their names change with
+their content, so they are sent as immutable, the way a production host should
+serve them.
+
+It also speaks Compression Dictionary Transport for works-data: the dictionary
+from scripts/works_dictionary.py is offered with Use-As-Dictionary, and a
+browser that announces it (Available-Dictionary, Accept-Encoding: dcz) gets
+the .dcz sibling of a work file or bundle instead of the plain JSON. The
+<link rel="compression-dictionary"> that makes the browser fetch the
+dictionary is added to works/works.html here, as it is served, and not in
+the committed page: GitHub Pages cannot send .dcz responses, so there the
+dictionary would be downloaded for nothing.
+
 Usage:  python3 scripts/dev/serve.py [port]     (default 8000)
 """
+import base64
 import functools
 import http.server
+import io
+import re
 import sys
 from pathlib import Path
+from urllib.parse import urlsplit
 
 ROOT = Path(__file__).resolve().parents[2]
 
+# works-data/bundles/<name>.<hash>.json, written by scripts/bundle_works_data.py,
+# css/min, js/min copies written by scripts/fingerprint_assets.py,
+# css/bundle/bundle.<hash>.css, written by scripts/bundle_css.py, and
+# works-data/detail/<id>.<hash>.html, written by scripts/prerender_works.py
+HASHED_FILE = re.compile(r"^/(works-data/bundles/[^/?]+\.[0-9a-f]{10}\.json"
+                         r"|(css|js)/min/[^/?]+\.[0-9a-f]{10}\.(css|js)"
+                         r"|css/bundle/bundle\.[0-9a-f]{10}\.css"
+                         r"|works-data/detail/[^/?]+\.[0-9a-f]{10}\.html)(\?|$)")
+
+# Shared dictionary for works-data JSON, written by scripts/works_dictionary.py
+DICTIONARY_URL = "/works-data/dictionary/works.dict"
+DCZ_HEADER_BYTES = 40   # 8-byte magic, then the dictionary's SHA-256
+
+# Pages that fetch works-data, and the hint that makes the browser fetch the
+# dictionary when idle; only this server adds it (see above)
+DICTIONARY_PAGES = ("/works/works.html",)
+DICTIONARY_LINK = f'<link rel="compression-dictionary" href="{DICTIONARY_URL}">\n'
+
 
 class NoCacheHandler(http.server.SimpleHTTPRequestHandler):
     def send_head(self):
@@ -24,12 +60,60 @@ class NoCacheHandler(http.server.SimpleHTTPRequestHandler):
         for header in ("If-Modified-Since", "If-None-Match"):
             if header in self.headers:
                 del self.headers[header]
-        return super().send_head()
+        return (self.send_dictionary_compressed() or self.send_with_dictionary_link()
+                or super().send_head())
+
+    def send_dictionary_compressed(self):
+        """Reply with file.dcz when the browser holds the dictionary it was made with."""
+        available = self.headers.get("Available-Dictionary", "").strip()
+        if not available or "dcz" not in self.headers.get("Accept-Encoding", ""):
+            return None
+        path = Path(self.translate_path(self.path))
+        sibling = path.with_name(path.name + ".dcz")
+        if not sibling.is_file():
+            return None
+        data = sibling.read_bytes()
+        if available != ":" + base64.b64encode(data[8:DCZ_HEADER_BYTES]).decode() + ":":
+            return None
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(str(path)))
+        self.send_header("Content-Encoding", "dcz")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Vary", "Accept-Encoding, Available-Dictionary")
+        self.end_headers()
+        return io.BytesIO(data)
+
+    def send_with_dictionary_link(self):
+        """Reply with a DICTIONARY_PAGES page that offers the dictionary, once it exists."""
+        if urlsplit(self.path).path not in DICTIONARY_PAGES:
+            return None
+        path = Path(self.translate_path(self.path))
+        if not path.is_file() or not Path(self.translate_path(DICTIONARY_URL)).is_file():
+            return None
+        data = path.read_bytes()
+        head_end = data.find(b"</head>")
+        if head_end < 0:
+            return None
+        data = data[:head_end] + DICTIONARY_LINK.encode() + data[head_end:]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        return io.BytesIO(data)
 
     def end_headers(self):
-        self.send_header("Cache-Control", "no-store, must-revalidate")
-        self.send_header("Pragma", "no-cache")
-        self.send_header("Expires", "0")
+        path = urlsplit(self.path).path
+        if HASHED_FILE.search(self.path):
+            # Content-hashed: a new version always has a new name.
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        elif path == DICTIONARY_URL:
+            # A dictionary only counts while it is fresh in the HTTP cache.
+            self.send_header("Use-As-Dictionary", 'match="/works-data/*"')
+            self.send_header("Cache-Control", "max-age=3600")
+        else:
+            self.send_header("Cache-Control", "no-store, must-revalidate")
+            self.send_header("Pragma", "no-cache")
+            self.send_header("Expires", "0")
         super().end_headers()
 
     def send_header(self, keyword, value):
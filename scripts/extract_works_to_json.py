@@ -1,19 +1,54 @@
 #!/usr/bin/env python3
 """
-Extract work information from HTML files and generate JSON files using regex
+Extract work information from HTML files and generate JSON files
 Categories are extracted from works.html data-category attributes
+
+Pages are read in a single pass by sitetools.workpage. The original
+per-field regex extractor is kept as extract_work_data_regex() and serves as
+the reference that benchmarks/bench_extract.py compares against.
+
+Usage:
+    python3 extract_works_to_json.py [--jobs N] [--force] [--fsync MODE] [--grid]
+
+--jobs N fans the extraction out over N worker processes (0 = one per core).
+JSON files and index.json are still written by the main process, in
+WORKS_ORDER, and errors are reported together at the end of the run.
+
+--grid takes the work list from the works.html grid instead (in grid order,
+with the page's file name minus .html as the id). It is meant for generated
+catalogues such as the one benchmarks/synth_site.py builds.
+
+Runs are incremental: works-data/.extract-cache.json records the SHA-256 of
+each source page and of the JSON written for it. A work whose page, category
+and JSON file are all unchanged since the last run is skipped. Files are
+only rewritten when their bytes actually change, so mtimes (and any cached
+copies) of untouched works survive a regeneration. --force ignores the cache.
+Writes go through sitetools.writer: each file is replaced atomically, and
+the files written are appended to the run journal in .cache/.
 """
 
+import argparse
+import hashlib
 import os
 import re
 import json
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from sitetools.workpage import extract_work
+from sitetools.writer import FSYNC_MODES, ChangeAwareWriter
+
 # Base directory
 BASE_DIR = Path(__file__).parent.parent
 WORKS_DIR = BASE_DIR / 'works'
 WORKS_HTML = WORKS_DIR / 'works.html'
 OUTPUT_DIR = BASE_DIR / 'works-data'
+CACHE_PATH = OUTPUT_DIR / '.extract-cache.json'
+
+# Bump whenever the same HTML would extract to different JSON, so every
+# cached entry from older runs is treated as a miss
+EXTRACTOR_VERSION = 2
 
 def extract_categories_from_works_html():
     """Extract category mapping from works.html data-category attributes"""
@@ -21,11 +56,12 @@ def extract_categories_from_works_html():
         html = f.read()
 
     # Find all img_wrap divs with data-category and their links
-    # Pattern handles both "./filename.html" and "filename.html"
-    pattern = r'<div class="img_wrap" data-category="(\w+)">\s*<a href="(?:\./)?([^"]+)">'
+    # Pattern handles both "./filename.html" and "filename.html", and other
+    # attributes on the div (e.g. style="opacity: 0;")
+    pattern = r'<div class="img_wrap"[^>]*?\sdata-category="(\w+)"[^>]*>\s*<a href="(?:\./)?([^"]+)">'
     matches = re.findall(pattern, html)
 
-    # Create mapping of HTML filename to category
+    # Create mapping of HTML filename to category, in grid order
     category_map = {}
     for category, filename in matches:
         category_map[filename] = category
@@ -118,7 +154,20 @@ def clean_html_whitespace(html_content):
     return cleaned.strip()
 
 def extract_work_data(html_file, work_id, category):
-    """Extract work data from HTML file using regex"""
+    """Extract work data from HTML file in a single streaming pass"""
+    html_path = WORKS_DIR / html_file
+
+    if not html_path.exists():
+        print(f"⚠️  {html_file} not found")
+        return None
+
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    return extract_work(html, work_id, category)
+
+def extract_work_data_regex(html_file, work_id, category):
+    """Extract work data from HTML file using regex (reference implementation)"""
     html_path = WORKS_DIR / html_file
 
     if not html_path.exists():
@@ -298,66 +347,209 @@ def extract_work_data(html_file, work_id, category):
 
     return work_data
 
+def extract_job(job):
+    """
+    Extract one work; runs in a worker process when --jobs > 1.
+
+    Args:
+        job (tuple): (work_id, html_file, category)
+
+    Returns:
+        tuple: (work_id, work_data or None, error message or None, seconds)
+    """
+    work_id, html_file, category = job
+
+    if not (WORKS_DIR / html_file).exists():
+        return work_id, None, f"{html_file} not found", 0.0
+
+    start = time.perf_counter()
+    try:
+        work_data = extract_work_data(html_file, work_id, category)
+    except Exception as e:
+        return work_id, None, f"{type(e).__name__}: {e}", 0.0
+    return work_id, work_data, None, time.perf_counter() - start
+
+def run_jobs(jobs, workers):
+    """
+    Run extract_job over jobs, in parallel when workers > 1.
+
+    Results always come back in the order of jobs, so output files and the
+    log are the same whatever the worker count.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        return [extract_job(job) for job in jobs]
+
+    # Hand each worker a few large batches instead of one pickle round-trip per work
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(extract_job, jobs, chunksize=chunksize))
+
+def file_sha256(path):
+    """SHA-256 of a file's bytes, or None if it does not exist"""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def load_cache():
+    """Load per-work cache entries; a missing, broken or outdated cache is empty"""
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+    if cache.get('extractor_version') != EXTRACTOR_VERSION:
+        return {}
+    return cache.get('works', {})
+
+def save_cache(writer, entries, work_order):
+    """Write the cache, in display order, only if its content changed"""
+    cache = {
+        'extractor_version': EXTRACTOR_VERSION,
+        'works': {work_id: entries[work_id] for work_id in work_order if work_id in entries},
+    }
+    writer.write_text(CACHE_PATH, json.dumps(cache, ensure_ascii=False, indent=2) + '\n')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Generate works-data/*.json from works/*.html')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes (0 = one per CPU core, default 1)')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore .extract-cache.json and re-extract every work')
+    parser.add_argument('--fsync', choices=FSYNC_MODES, default='none',
+                        help="sync written files to disk: after 'each' write, once in a 'batch' at the end, or 'none' (default)")
+    parser.add_argument('--grid', action='store_true',
+                        help='take the work list and ids from the works.html grid instead of WORKS_ORDER')
+    return parser.parse_args()
+
 def main():
     """Main execution"""
+    args = parse_args()
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
     OUTPUT_DIR.mkdir(exist_ok=True)
 
     # Extract categories from works.html
     category_map = extract_categories_from_works_html()
-    id_map = extract_work_id_mapping()
 
-    # Create reverse mapping: work_id -> html_filename
-    id_to_html = {v: k for k, v in id_map.items()}
+    if args.grid:
+        # Grid order, id = file name without .html
+        id_to_html = {Path(html_file).stem: html_file for html_file in category_map}
+        work_order = list(id_to_html)
+    else:
+        id_map = extract_work_id_mapping()
+        # Create reverse mapping: work_id -> html_filename
+        id_to_html = {v: k for k, v in id_map.items()}
+        work_order = WORKS_ORDER
 
-    created_count = 0
-    updated_count = 0
-    error_count = 0
+    writer = ChangeAwareWriter('extract_works_to_json', fsync=args.fsync)
 
-    for work_id in WORKS_ORDER:
-        json_path = OUTPUT_DIR / f"{work_id}.json"
+    cache = {} if args.force else load_cache()
+    new_cache = {}
 
+    created_count = 0
+    updated_count = 0
+    unchanged_count = 0
+    hit_count = 0
+    saved_seconds = 0.0
+    errors = []  # (work_id, message) in display order
+
+    jobs = []
+    html_hashes = {}
+    for work_id in work_order:
         # Get HTML filename and category
         html_file = id_to_html.get(work_id)
         if not html_file:
-            print(f"✗ No HTML mapping for {work_id}")
-            error_count += 1
+            errors.append((work_id, "No HTML mapping"))
             continue
 
         category = category_map.get(html_file, 'code')  # Default to 'code' if not found
+        html_hash = file_sha256(WORKS_DIR / html_file)
+
+        # Cache hit: same page, same category, and the JSON we wrote is still there
+        entry = cache.get(work_id)
+        if (html_hash and entry
+                and entry.get('html') == html_file
+                and entry.get('category') == category
+                and entry.get('html_sha256') == html_hash
+                and file_sha256(OUTPUT_DIR / f"{work_id}.json") == entry.get('json_sha256')):
+            new_cache[work_id] = entry
+            hit_count += 1
+            saved_seconds += entry.get('extract_seconds', 0.0)
+            continue
 
-        # Always regenerate (overwrite existing)
-        work_data = extract_work_data(html_file, work_id, category)
+        html_hashes[work_id] = html_hash
+        jobs.append((work_id, html_file, category))
+
+    if workers > 1 and len(jobs) > 1:
+        print(f"Extracting {len(jobs)} works with {workers} worker processes...\n")
 
-        if work_data:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(work_data, f, ensure_ascii=False, indent=2)
+    # Writes happen here, in order, and only when the bytes changed
+    for work_id, work_data, error, seconds in run_jobs(jobs, workers):
+        if error:
+            errors.append((work_id, error))
+            continue
+        if not work_data:
+            errors.append((work_id, "Failed to extract"))
+            continue
 
-            if json_path.exists():
-                print(f"✓ Updated {work_id}.json (category: {category})")
-                updated_count += 1
-            else:
-                print(f"✓ Created {work_id}.json (category: {category})")
-                created_count += 1
+        text = json.dumps(work_data, ensure_ascii=False, indent=2)
+        json_path = OUTPUT_DIR / f"{work_id}.json"
+        status = writer.write_text(json_path, text)
+
+        if status == 'created':
+            print(f"✓ Created {work_id}.json (category: {work_data['category']})")
+            created_count += 1
+        elif status == 'updated':
+            print(f"✓ Updated {work_id}.json (category: {work_data['category']})")
+            updated_count += 1
         else:
-            print(f"✗ Failed to extract {work_id}.json")
-            error_count += 1
+            print(f"- {work_id}.json unchanged")
+            unchanged_count += 1
+
+        new_cache[work_id] = {
+            'html': id_to_html[work_id],
+            'category': work_data['category'],
+            'html_sha256': html_hashes[work_id],
+            'json_sha256': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            'extract_seconds': round(seconds, 6),
+        }
+
+    save_cache(writer, new_cache, work_order)
 
     # Update index.json
     index_path = OUTPUT_DIR / 'index.json'
     index_data = {
-        "order": WORKS_ORDER,
+        "order": work_order,
         "description": "Work order for portfolio display. Add new works here to control their position in the gallery."
     }
 
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump(index_data, f, ensure_ascii=False, indent=2)
+    if writer.write_text(index_path, json.dumps(index_data, ensure_ascii=False, indent=2)) == 'unchanged':
+        print(f"\n- index.json unchanged ({len(work_order)} works)")
+    else:
+        print(f"\n✓ Updated index.json with {len(work_order)} works")
+
+    if errors:
+        # Sorted back into display order, so the report is stable across runs
+        position = {work_id: i for i, work_id in enumerate(work_order)}
+        errors.sort(key=lambda error: position.get(error[0], len(position)))
+        print(f"\nErrors:")
+        for work_id, message in errors:
+            print(f"  ✗ {work_id}: {message}")
 
-    print(f"\n✓ Updated index.json with {len(WORKS_ORDER)} works")
     print(f"\nSummary:")
     print(f"  Created: {created_count} files")
     print(f"  Updated: {updated_count} files")
-    print(f"  Errors: {error_count} files")
-    print(f"  Total: {len(WORKS_ORDER)} works")
+    print(f"  Unchanged: {unchanged_count} files (re-extracted, same bytes)")
+    print(f"  Cached: {hit_count} works (source unchanged, skipped)")
+    print(f"  Errors: {len(errors)} files")
+    print(f"  Total: {len(work_order)} works")
+    print(f"\nCache: {hit_count} hits / {len(jobs)} misses, "
+          f"~{saved_seconds * 1000:.1f} ms of extraction skipped")
+
+    writer.close()
+    print(f"Writes: {writer.summary()}")
 
 if __name__ == '__main__':
     main()
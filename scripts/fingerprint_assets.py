@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Give css/min and js/min assets content-hashed names and point every page at them.
+
+Pages load ../css/min/common.css, ../js/min/works-spa.js, ... under fixed
+names, so a browser can only be told to revalidate them on every visit
+(dev/serve.py disables caching outright). This stage copies each asset to a
+name that carries a hash of its content:
+
+    css/min/common.css      -> css/min/common.1a2b3c4d5e.css
+    js/min/works-spa.js     -> js/min/works-spa.5e4d3c2b1a.js
+
+and rewrites every reference to it in the site's HTML (href/src/content
+attributes of any tag), JavaScript and JSON, whether the page still uses the
+plain name or the hashed name of an earlier build. The copies sit next to
+the originals, so relative url()s inside the CSS keep resolving.
+
+The hash depends only on the asset's bytes: an asset that did not change
+keeps its hashed name from build to build and a returning visitor's cached
+copy stays valid; only changed assets get a new name. Hashed copies may be
+served with "Cache-Control: public, max-age=31536000, immutable".
+
+Stylesheets that no page, script or data file links directly are left
+alone: bundle_css.py serves them as parts of css/bundle/ bundles, which are
+content-hashed themselves, so a hashed copy of a bundled part would be
+shipped but never loaded. Once a page links a css/min file again (e.g.
+after bundle_css.py --remove) it is fingerprinted on the next run.
+
+asset-manifest.json (site root) maps each plain name to its hashed name.
+Hashed copies that the manifest no longer lists are deleted. Sources are
+hashed through the site inventory and pages are parsed through the shared
+document cache, so an asset is only copied when its content changed.
+
+Usage:
+    python3 fingerprint_assets.py [--check] [--json PATH]
+
+--check writes nothing and exits with 1 when a hashed copy is missing or a
+page still points at a plain or outdated name.
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+from pathlib import Path
+
+from sitetools.doccache import DocCache
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+ASSET_DIRS = ('css/min', 'js/min')
+MANIFEST_NAME = 'asset-manifest.json'
+MANIFEST_VERSION = 1
+
+# Hex digits of the SHA-256 kept in hashed names
+HASH_LENGTH = 10
+
+HASHED_NAME_RE = re.compile(r'^(?P<stem>.+)\.[0-9a-f]{%d}(?P<suffix>\.(?:css|js))$' % HASH_LENGTH)
+
+# A reference to an asset: optional prefix, dir, plain or hashed name, suffix
+REFERENCE_RE = re.compile(
+    r'(?P<dir>(?:css|js)/min)/(?P<stem>[A-Za-z0-9_.-]+?)(?:\.[0-9a-f]{%d})?(?P<suffix>\.(?:css|js))'
+    r'(?=[?#"\'`\s)]|$)' % HASH_LENGTH)
+
+# Attributes whose value may point at an asset
+URL_ATTRIBUTES = ('href', 'src', 'content', 'data-src')
+
+# Top-level directories that are in the repository but not part of the site
+NOT_SHIPPED = ('scripts/', 'docs/', 'dev/', '.vscode/')
+
+
+def source_assets(inventory):
+    """Sorted rel paths of the assets to fingerprint (not the hashed copies)"""
+    rels = []
+    for kind in ('css', 'js'):
+        for rel in inventory.rel_paths(kind):
+            directory, name = posixpath.split(rel)
+            if directory in ASSET_DIRS and not HASHED_NAME_RE.match(name):
+                rels.append(rel)
+    return sorted(rels)
+
+
+def hashed_path(rel, sha256):
+    stem, suffix = posixpath.splitext(rel)
+    return f'{stem}.{sha256[:HASH_LENGTH]}{suffix}'
+
+
+def resolve(page_rel, url):
+    """Site-relative path a URL on page_rel points at, or None for other hosts"""
+    if '://' in url or url.startswith(('//', 'data:')):
+        return None
+    path = url.split('#', 1)[0].split('?', 1)[0]
+    if path.startswith('/'):
+        return posixpath.normpath(path.lstrip('/'))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(page_rel), path))
+
+
+def rewrite_value(page_rel, value, manifest, referenced):
+    """value with every asset reference replaced by its hashed name; referenced gets the assets found"""
+    def replace(match):
+        logical = f"{match.group('dir')}/{match.group('stem')}{match.group('suffix')}"
+        target = manifest.get(logical)
+        if target is None:
+            return match.group(0)
+        # Only rewrite URLs that really lead to this site's asset
+        start = value.rfind(' ', 0, match.start()) + 1
+        for quote in '"\'`(':
+            start = max(start, value.rfind(quote, 0, match.start()) + 1)
+        prefix = value[start:match.start()]
+        if resolve(page_rel, prefix + logical) != logical:
+            return match.group(0)
+        referenced.add(logical)
+        return match.group('dir') + '/' + posixpath.basename(target)
+
+    return REFERENCE_RE.sub(replace, value)
+
+
+def rewrite_html(doc, page_rel, manifest, referenced):
+    """New page text, or None when no reference changes"""
+    edits = []
+    for tag in doc.tags():
+        if not tag.attrs:
+            continue
+        raw = doc.raw(tag)
+        if '/min/' not in raw:
+            continue
+        new_raw = raw
+        for name, value in tag.attrs:
+            if name in URL_ATTRIBUTES and value and '/min/' in value:
+                new_value = rewrite_value(page_rel, value, manifest, referenced)
+                if new_value != value:
+                    new_raw = new_raw.replace(value, new_value, 1)
+        if new_raw != raw:
+            edits.append((tag.start, tag.end, new_raw))
+    return doc.splice(edits) if edits else None
+
+
+def rewrite_text(text, page_rel, manifest, referenced):
+    """New JS/JSON text, or None when no reference changes"""
+    if '/min/' not in text:
+        return None
+    new_text = rewrite_value(page_rel, text, manifest, referenced)
+    return new_text if new_text != text else None
+
+
+def referencing_files(inventory):
+    """Sorted rel paths of the pages, scripts and data that may reference assets"""
+    rels = []
+    for kind in ('html', 'js', 'json'):
+        for rel in inventory.rel_paths(kind):
+            if rel.startswith(NOT_SHIPPED) or rel == MANIFEST_NAME:
+                continue
+            if posixpath.dirname(rel) in ASSET_DIRS and kind == 'js':
+                continue
+            if any(part.startswith('.') for part in rel.split('/')):
+                continue
+            rels.append(rel)
+    return sorted(rels)
+
+
+def stale_copies(root, keep):
+    """Hashed copies in the asset directories that are not in keep"""
+    stale = []
+    for directory in ASSET_DIRS:
+        path = root / directory
+        if not path.is_dir():
+            continue
+        with os.scandir(path) as it:
+            for entry in it:
+                rel = f'{directory}/{entry.name}'
+                if HASHED_NAME_RE.match(entry.name) and rel not in keep and entry.is_file():
+                    stale.append(rel)
+    return sorted(stale)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Fingerprint css/min and js/min and rewrite references')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if a copy is missing or a reference is outdated')
+    parser.add_argument('--json', metavar='PATH', help='write the report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    candidates = source_assets(inventory)
+    manifest = {rel: hashed_path(rel, inventory.sha256(rel)) for rel in candidates}
+
+    docs = DocCache()
+    pending = {}
+    referenced = set()
+    for rel in referencing_files(inventory):
+        path = root / rel
+        if rel.endswith('.html'):
+            doc = docs.load(path)
+            new_text = rewrite_html(doc, rel, manifest, referenced)
+        else:
+            text = path.read_text(encoding='utf-8')
+            new_text = rewrite_text(text, rel, manifest, referenced)
+        if new_text is not None:
+            pending[rel] = new_text
+
+    # Stylesheets only reached through css/bundle/ need no hashed copy
+    bundled = [rel for rel in candidates if rel.endswith('.css') and rel not in referenced]
+    assets = [rel for rel in candidates if rel not in bundled]
+    manifest = {rel: manifest[rel] for rel in assets}
+
+    missing = [rel for rel in assets if not (root / manifest[rel]).is_file()]
+    stale = stale_copies(root, set(manifest.values()))
+    manifest_text = json.dumps({'version': MANIFEST_VERSION, 'assets': manifest},
+                               ensure_ascii=False, indent=2) + '\n'
+
+    if args.check:
+        for rel in missing:
+            print(f"✗ {manifest[rel]} missing (copy of {rel})")
+        for rel in sorted(pending):
+            print(f"✗ {rel} references outdated asset names")
+        outdated = bool(missing or pending)
+        manifest_path = root / MANIFEST_NAME
+        if not manifest_path.is_file() or manifest_path.read_text(encoding='utf-8') != manifest_text:
+            print(f"✗ {MANIFEST_NAME} out of date")
+            outdated = True
+        print(f"\n{'✗ Fingerprints out of date (run fingerprint_assets.py)' if outdated else '✓ Fingerprints up to date'}")
+        sys.exit(1 if outdated else 0)
+
+    copies = {}
+    with ChangeAwareWriter('fingerprint_assets') as writer:
+        for rel in assets:
+            target = root / manifest[rel]
+            if target.is_file() and target.stat().st_size == inventory.size(rel):
+                copies[rel] = 'unchanged'
+                continue
+            copies[rel] = writer.write_bytes(target, (root / rel).read_bytes())
+
+        pages = {}
+        for rel, text in sorted(pending.items()):
+            pages[rel] = writer.write_text(root / rel, text)
+        manifest_status = writer.write_text(root / MANIFEST_NAME, manifest_text)
+        summary = writer.summary()
+
+    for rel in stale:
+        (root / rel).unlink()
+    inventory.save()
+    seconds = time.perf_counter() - start
+
+    for rel in assets:
+        mark = '-' if copies[rel] == 'unchanged' else '✓'
+        print(f"{mark} {rel} → {posixpath.basename(manifest[rel])} {copies[rel]}")
+    for rel, status in pages.items():
+        print(f"✓ {rel}: references {status}")
+    for rel in stale:
+        print(f"✗ removed stale {rel}")
+
+    print(f"\nSUMMARY:")
+    print(f"  Assets: {len(assets)} ({sum(1 for s in copies.values() if s != 'unchanged')} new hashed names)")
+    print(f"  Stylesheets only linked through bundles: {len(bundled)}")
+    print(f"  Files rewritten: {len(pages)}")
+    print(f"  Stale copies removed: {len(stale)}")
+    print(f"  Manifest: {manifest_status}")
+    print(f"  Files: {summary}")
+    print(f"  Time: {seconds:.2f}s")
+
+    if args.json:
+        report = {
+            'assets': [{'path': rel, 'hashed': manifest[rel], 'status': copies[rel]} for rel in assets],
+            'rewritten': sorted(pages),
+            'removed': stale,
+            'bundled': bundled,
+            'seconds': round(seconds, 4),
+        }
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+
+if __name__ == '__main__':
+    main()
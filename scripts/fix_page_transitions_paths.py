@@ -7,6 +7,11 @@ Remove old incorrect paths and add correct ones.
 import re
 from pathlib import Path
 
+from sitetools.inventory import site_files
+from sitetools.writer import ChangeAwareWriter
+
+WRITER = ChangeAwareWriter('fix_page_transitions_paths')
+
 def fix_paths(html_content, file_path):
     """Fix page transition paths."""
 
@@ -38,16 +43,10 @@ def fix_paths(html_content, file_path):
 
 def main():
     root_dir = Path('.')
-    html_files = list(root_dir.rglob('*.html'))
+    html_files = site_files('html', root_dir)
 
-    excluded_dirs = {'.git', 'node_modules', 'Conversation_Summary'}
     excluded_files = {'menu-content.html'}
-
-    html_files = [
-        f for f in html_files
-        if not any(excluded in f.parts for excluded in excluded_dirs)
-        and f.name not in excluded_files
-    ]
+    html_files = [f for f in html_files if f.name not in excluded_files]
 
     print(f"Fixing {len(html_files)} HTML files...\n")
 
@@ -57,12 +56,13 @@ def main():
 
         fixed_content = fix_paths(content, html_file)
 
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(fixed_content)
+        WRITER.write_text(html_file, fixed_content)
 
         print(f"✓ {html_file}")
 
     print(f"\n✅ Done! All paths fixed.")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
@@ -6,6 +6,11 @@ Changes src="js/sample.js" to src="../js/sample.js" for files in subdirectories.
 
 from pathlib import Path
 
+from sitetools.inventory import site_files
+from sitetools.writer import ChangeAwareWriter
+
+WRITER = ChangeAwareWriter('fix_sample_js_paths')
+
 def fix_sample_js_path(html_content, file_path):
     """Fix sample.js path if file is in a subdirectory."""
 
@@ -24,13 +29,7 @@ def fix_sample_js_path(html_content, file_path):
 
 def main():
     root_dir = Path('.')
-    html_files = list(root_dir.rglob('*.html'))
-
-    excluded_dirs = {'.git', 'node_modules', 'Conversation_Summary'}
-    html_files = [
-        f for f in html_files
-        if not any(excluded in f.parts for excluded in excluded_dirs)
-    ]
+    html_files = site_files('html', root_dir)
 
     print(f"Fixing sample.js paths in {len(html_files)} HTML files...\n")
 
@@ -43,12 +42,13 @@ def main():
         fixed_content, was_fixed = fix_sample_js_path(content, html_file)
 
         if was_fixed:
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(fixed_content)
+            WRITER.write_text(html_file, fixed_content)
             print(f"✓ {html_file}")
             fixed_count += 1
 
     print(f"\n✅ Fixed {fixed_count} files")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Generate the thumbnail grid of works/works.html from works-data/index.json.
+
+The grid used to be a hand-maintained list of img_wrap blocks that
+js/works-spa.js completed at runtime (data-year, data-title, width/height
+from index.json). This stage writes every block from the index instead, in
+display order:
+
+- data-category, data-year and data-title on the img_wrap (the filter and
+  the year/title overlay read them)
+- the thumbnail's intrinsic width/height, so each box is sized before its
+  image arrives
+- a loading priority by position: the first --eager blocks (the first row
+  at desktop width) get their real src, loading="eager" and, for the very
+  first, fetchpriority="high"; the rest keep the placeholder + data-src
+  that js/lazy-load-images.js fills in as they scroll into view
+
+When the index is sharded (works-data/index/directory.json, written by
+update_index_with_metadata.py --shard), only the works of its head page are
+written into the page, so works.html stays the same size however long the
+catalogue is. The page then also gets <meta name="works-index"
+content="sharded">, and js/works-spa.js appends the other works as their
+shards load. Without a sharded index every work is written and the meta
+is removed.
+
+The .center-container carries data-grid="<hash of index.json>". The output
+depends only on the index, its sharding and the options, so the same index
+always gives the same page. Nothing is rendered when neither index.json nor
+works.html changed since the last run (.cache/works-grid.json). The cache
+also keeps each block's markup with the entry and priority it was rendered
+from: when the index changes, only the blocks whose entry was added,
+changed or removed are rendered and spliced into the page, so that work
+grows with the change, not with the catalogue. A page whose blocks no
+longer match the cache gets its whole grid replaced (still from the cached
+markup).
+
+Usage:
+    python3 generate_works_grid.py [--eager N] [--force] [--check] [--json PATH]
+
+--check writes nothing and exits with 1 when the grid does not match the
+index.
+"""
+
+import argparse
+import difflib
+import html
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from bundle_works_data import load_index
+from sitetools.doccache import DocCache
+from sitetools.imagepolicy import GRID_ROW
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_FILE = Path('.cache') / 'works-grid.json'
+
+INDEX_SOURCE = 'works-data/index.json'
+SHARD_DIRECTORY = 'works-data/index/directory.json'
+PAGE = 'works/works.html'
+GRID_CLASS = 'center-container'
+MARKER = 'data-grid'
+
+# Opt-in of js/works-spa.js to the sharded index (update_index_with_metadata.py --shard)
+INDEX_META = 'works-index'
+INDEX_META_CONTENT = 'sharded'
+
+# Bump when the markup changes, so the grid is rendered again
+GRID_VERSION = 2
+
+# Blocks in the first row at desktop width; the image policy expects the same
+DEFAULT_EAGER = GRID_ROW
+
+# Transparent 4:3 stand-in shown until lazy-load-images.js sets the real src
+PLACEHOLDER = "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 4 3'%3E%3C/svg%3E"
+
+BLOCK_INDENT = ' ' * 16
+
+# What follows the last block: the container's closing tag
+GRID_END_RE = re.compile(r'\s*</div>')
+
+
+def start_tag(name, attrs):
+    """A start tag; values keep their quotes readable (the placeholder URL has ')"""
+    pieces = [f'<{name}']
+    for attr, value in attrs:
+        value = html.escape(value, quote=False).replace('"', '&quot;')
+        pieces.append(f' {attr}="{value}"')
+    return ''.join(pieces) + '>'
+
+
+def priority(position, eager):
+    """Loading priority of the block at a position: 'high', 'eager' or 'lazy'"""
+    if position >= eager:
+        return 'lazy'
+    return 'high' if position == 0 else 'eager'
+
+
+def grid_block(entry, level):
+    """One img_wrap block, as written into works.html"""
+    title = entry.get('title') or entry['id']
+    wrap_attrs = [('class', 'img_wrap'), ('style', 'opacity: 0;'), ('data-category', entry.get('category') or '')]
+    if entry.get('year') is not None:
+        wrap_attrs.append(('data-year', str(entry['year'])))
+    wrap_attrs.append(('data-title', title))
+
+    thumbnail = entry.get('thumbnail') or ''
+    if level == 'lazy':
+        img_attrs = [('src', PLACEHOLDER), ('data-src', thumbnail)]
+    else:
+        img_attrs = [('src', thumbnail), ('class', 'lazy-loaded')]
+    img_attrs.append(('alt', title))
+    if entry.get('width') and entry.get('height'):
+        img_attrs += [('width', str(entry['width'])), ('height', str(entry['height']))]
+    if level != 'lazy':
+        img_attrs.append(('loading', 'eager'))
+    if level == 'high':
+        img_attrs.append(('fetchpriority', 'high'))
+    img_attrs.append(('decoding', 'async'))
+
+    href = f"./{entry.get('filename') or entry['id'] + '.html'}"
+    return (f'{BLOCK_INDENT}{start_tag("div", wrap_attrs)}\n'
+            f'{BLOCK_INDENT}    <a href="{html.escape(href, quote=True)}">\n'
+            f'{BLOCK_INDENT}        {start_tag("img", img_attrs)}\n'
+            f'{BLOCK_INDENT}    </a>\n'
+            f'{BLOCK_INDENT}</div>')
+
+
+def block_key(entry, level):
+    """Everything a block is rendered from, as a hashable key"""
+    key = (level, *entry.items())
+    try:
+        hash(key)
+    except TypeError:
+        # Entries written by hand may hold lists or objects
+        key = (level, json.dumps(entry, ensure_ascii=False, sort_keys=True))
+    return key
+
+
+def plan_blocks(entries, eager):
+    """(key, entry, level) of every block in display order"""
+    plan = []
+    for position, entry in enumerate(entries):
+        level = priority(position, eager)
+        plan.append((block_key(entry, level), entry, level))
+    return plan
+
+
+def cached_blocks(cache):
+    """(block keys in page order, {key: markup}) of the last run"""
+    keys = []
+    markup = {}
+    for level, entry, block in cache.get('blocks', []):
+        key = block_key(entry, level)
+        keys.append(key)
+        markup[key] = block
+    return keys, markup
+
+
+def render_blocks(plan, markup):
+    """
+    Markup of the planned blocks; blocks missing from markup are rendered
+    and added to it.
+
+    Returns:
+        int: the number of blocks rendered
+    """
+    rendered = 0
+    for key, entry, level in plan:
+        if key not in markup:
+            markup[key] = grid_block(entry, level)
+            rendered += 1
+    return rendered
+
+
+def render_grid(keys, markup):
+    """Content of the .center-container: every block in display order"""
+    return ''.join(f'\n\n{markup[key]}' for key in keys)
+
+
+def grid_open(doc):
+    """Index in doc.all_tags of the page's .center-container open tag, or None"""
+    for index, tag in enumerate(doc.all_tags):
+        if not tag.closing and GRID_CLASS in (tag.get('class') or '').split():
+            return index
+    return None
+
+
+def grid_span(doc):
+    """(open tag, closing tag) of the page's .center-container, or None"""
+    index = grid_open(doc)
+    if index is None:
+        return None
+    tags = doc.all_tags
+    tag = tags[index]
+    depth = 0
+    for other in tags[index + 1:]:
+        if other.name != tag.name:
+            continue
+        if not other.closing:
+            depth += 1
+        elif depth:
+            depth -= 1
+        else:
+            return tag, other
+    return None
+
+
+def grid_open_tag(open_tag, key):
+    attrs = [(attr, value) for attr, value in open_tag.attrs if attr != MARKER] + [(MARKER, key)]
+    return start_tag(open_tag.name, attrs)
+
+
+def replace_grid(doc, grid, key):
+    """Edits replacing the whole grid; None when the page has no .center-container"""
+    span = grid_span(doc)
+    if span is None:
+        return None
+    open_tag, close_tag = span
+    text = doc.text
+    line_start = text.rfind('\n', 0, open_tag.start) + 1
+    indent = text[line_start:open_tag.start]
+    indent = indent if not indent.strip() else ''
+    return [(open_tag.start, close_tag.start, f'{grid_open_tag(open_tag, key)}{grid}\n{indent}')]
+
+
+def index_meta_edits(doc, sharded):
+    """
+    Edits adding <meta name="works-index" content="sharded"> (after the
+    viewport meta) when the index is sharded, or removing it when it is not.
+    """
+    text = doc.text
+    present = [tag for tag in doc.tags('meta') if tag.get('name') == INDEX_META]
+    if not sharded:
+        edits = []
+        for tag in present:
+            line_start = text.rfind('\n', 0, tag.start) + 1
+            if text[line_start:tag.start].strip() or not text.startswith('\n', tag.end):
+                edits.append((tag.start, tag.end, ''))
+            else:
+                edits.append((line_start, tag.end + 1, ''))
+        return edits
+    if any(tag.get('content') == INDEX_META_CONTENT for tag in present):
+        return []
+    edits = [(tag.start, tag.end, '') for tag in present]
+    anchor = next((tag for tag in doc.tags('meta') if tag.get('name') == 'viewport'), None) or doc.first('head')
+    if anchor is None:
+        return edits
+    line_start = text.rfind('\n', 0, anchor.start) + 1
+    indent = text[line_start:anchor.start]
+    indent = indent if not indent.strip() else ''
+    if anchor.name == 'head':
+        indent += '    '
+    edits.append((anchor.end, anchor.end, f'\n{indent}<meta name="{INDEX_META}" content="{INDEX_META_CONTENT}">'))
+    return edits
+
+
+def page_blocks(doc, open_tag, keys, markup):
+    """
+    (start, end) of each block when the grid holds exactly the blocks of
+    keys, as render_grid() wrote them; None otherwise.
+    """
+    text = doc.text
+    pos = open_tag.end
+    blocks = []
+    for key in keys:
+        block = markup.get(key)
+        if block is None or not text.startswith('\n\n', pos) or not text.startswith(block, pos + 2):
+            return None
+        blocks.append((pos + 2, pos + 2 + len(block)))
+        pos += 2 + len(block)
+    if not GRID_END_RE.match(text, pos):
+        return None
+    return blocks
+
+
+def update_grid(doc, keys, markup, previous, key):
+    """
+    Edits bringing the grid up to keys.
+
+    previous holds the block keys of the last run. When the page still has
+    exactly those blocks, only the runs of blocks that differ are spliced;
+    otherwise the whole grid is replaced.
+
+    Returns:
+        tuple: (edits or None without a .center-container, blocks spliced)
+    """
+    index = grid_open(doc)
+    if index is None:
+        return None, 0
+    open_tag = doc.all_tags[index]
+    blocks = page_blocks(doc, open_tag, previous, markup) if previous else None
+    if blocks is None:
+        return replace_grid(doc, render_grid(keys, markup), key), len(keys)
+
+    edits = []
+    new_open = grid_open_tag(open_tag, key)
+    if new_open != doc.raw(open_tag):
+        edits.append((open_tag.start, open_tag.end, new_open))
+    spliced = 0
+    # Unchanged blocks at both ends are skipped before diffing the rest
+    head = 0
+    limit = min(len(previous), len(keys))
+    while head < limit and previous[head] == keys[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and previous[-1 - tail] == keys[-1 - tail]:
+        tail += 1
+    matcher = difflib.SequenceMatcher(None, previous[head:len(previous) - tail],
+                                      keys[head:len(keys) - tail], autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            continue
+        i1, i2, j1, j2 = i1 + head, i2 + head, j1 + head, j2 + head
+        # From the end of the block before the run, so its '\n\n' goes with it
+        anchor = blocks[i1 - 1][1] if i1 else open_tag.end
+        end = blocks[i2 - 1][1] if i2 > i1 else anchor
+        edits.append((anchor, end, render_grid(keys[j1:j2], markup)))
+        spliced += max(i2 - i1, j2 - j1)
+    return edits, spliced
+
+
+def sharded_head(path):
+    """Works in the head page of the sharded index (directory.json), or None when it is not sharded"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return int(json.load(f)['head']['count'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != GRID_VERSION:
+        return {}
+    return cache
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Generate the works.html thumbnail grid from index.json')
+    parser.add_argument('--eager', type=int, default=DEFAULT_EAGER,
+                        help=f'blocks loaded eagerly, the first with high priority (default: {DEFAULT_EAGER})')
+    parser.add_argument('--force', action='store_true', help='render the grid even if nothing changed')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if the grid does not match the index')
+    parser.add_argument('--json', metavar='PATH', help='write the report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    for rel in (INDEX_SOURCE, PAGE):
+        if rel not in inventory.entries:
+            print(f"✗ {rel} not found")
+            sys.exit(1)
+    index_sha = inventory.sha256(INDEX_SOURCE)
+    key = index_sha[:10]
+    head = sharded_head(root / SHARD_DIRECTORY)
+
+    cache_path = root / CACHE_FILE
+    cache = {} if args.force else load_cache(cache_path)
+    previous, markup = cached_blocks(cache)
+    rendered = spliced = 0
+    if (cache.get('index') == index_sha and cache.get('page') == inventory.sha256(PAGE)
+            and cache.get('eager') == args.eager and cache.get('head') == head):
+        status = 'cached'
+        plan = None
+        keys = previous
+        total = cache.get('works', len(keys))
+    else:
+        entries = load_index(root / INDEX_SOURCE.rsplit('/', 1)[0])
+        total = len(entries)
+        plan = plan_blocks(entries if head is None else entries[:head], args.eager)
+        keys = [block_key for block_key, _, _ in plan]
+        rendered = render_blocks(plan, markup)
+        doc = DocCache().load(root / PAGE)
+        edits, spliced = update_grid(doc, keys, markup, previous, key)
+        if edits is None:
+            print(f"✗ {PAGE} has no .{GRID_CLASS}")
+            sys.exit(1)
+        edits += index_meta_edits(doc, head is not None)
+        new_text = doc.splice(edits) if edits else doc.text
+        if args.check:
+            status = 'unchanged' if new_text == doc.text else 'stale'
+        else:
+            with ChangeAwareWriter('generate_works_grid') as writer:
+                status = writer.write_text(root / PAGE, new_text)
+            inventory = load_inventory(root)
+            inventory.save()
+            # Not sort_keys: block keys follow the key order of each entry
+            cache_text = json.dumps({'version': GRID_VERSION, 'index': index_sha,
+                                     'page': inventory.sha256(PAGE), 'eager': args.eager,
+                                     'head': head, 'works': total,
+                                     'blocks': [[level, entry, markup[block_key]] for block_key, entry, level in plan]},
+                                    ensure_ascii=False) + '\n'
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(cache_path, cache_text.encode('utf-8'))
+    seconds = time.perf_counter() - start
+
+    mark = '✗' if status == 'stale' else '✓' if status in ('created', 'updated') else '-'
+    print(f"{mark} {PAGE}: grid {status}")
+    print(f"\nSUMMARY:")
+    print(f"  Index: {INDEX_SOURCE} ({key})")
+    eager = min(args.eager, len(keys))
+    print(f"  Works: {len(keys)} ({eager} eager, {len(keys) - eager} lazy)"
+          + ('' if head is None else f", the head of a sharded index of {total}"))
+    print(f"  Blocks: {rendered} rendered, {spliced} spliced")
+    print(f"  Time: {seconds:.2f}s")
+    if args.check:
+        print(f"\n{'✗ Grid out of date (run generate_works_grid.py)' if status == 'stale' else '✓ Grid up to date'}")
+
+    if args.json:
+        report = {'page': PAGE, 'index': INDEX_SOURCE, 'key': key, 'status': status,
+                  'works': len(keys), 'total': total, 'sharded': head is not None, 'eager': args.eager, 'rendered': rendered, 'spliced': spliced,
+                  'seconds': round(seconds, 4)}
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+    sys.exit(1 if status == 'stale' else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Apply the image loading policy to every page and report its decisions.
+
+add_lazy_loading.py marked every <img> loading="lazy", including the first
+portrait of the About page and the first row of the works grid, which are
+what the visitor sees first. This stage places each image by its position in
+the page instead (see sitetools/imagepolicy.py for the rules):
+
+- the first slide, the first grid block, or the first image of any other
+  page: loading="eager" fetchpriority="high", and a
+  <link rel="preload" as="image"> in the <head> so it is requested before
+  the stylesheets
+- the rest of the first grid row: loading="eager"
+- everything below the fold: loading="lazy", or no loading attribute when
+  js/lazy-load-images.js loads the image from data-src
+- decoding="async" on every image
+
+Prerendered work views (works-data/detail/) are handled by
+prerender_works.py, which applies the same policy when it renders them. A
+page is parsed again only when it changed since the last run
+(.cache/image-policy.json); the report of unchanged pages comes from the
+cache.
+
+Usage:
+    python3 image_policy.py [--force] [--check] [--quiet] [--json PATH]
+
+--check writes nothing and exits with 1 when a page does not follow the
+policy.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from sitetools.doccache import DocCache
+from sitetools.imagepolicy import apply_policy
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_FILE = Path('.cache') / 'image-policy.json'
+
+# Bump when the rules change, so every page is placed again
+POLICY_VERSION = 1
+
+# Top-level directories that are in the repository but not part of the site
+NOT_SHIPPED = ('scripts/', 'docs/', 'dev/', '.vscode/')
+
+# Rendered (and placed) by prerender_works.py
+PRERENDERED = 'works-data/detail/'
+
+
+def decision_rows(decisions, preload):
+    """Report rows of a page's decisions"""
+    return [{'rule': decision.rule, 'position': decision.position, 'src': decision.src,
+             'level': decision.level, 'policy': decision.summary(),
+             'preload': decision is preload}
+            for decision in decisions]
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != POLICY_VERSION:
+        return {}
+    return cache
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Set loading/decoding/fetchpriority of every image by its position')
+    parser.add_argument('--force', action='store_true', help='place the images of every page again')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if a page does not follow the policy')
+    parser.add_argument('--quiet', action='store_true', help='print one line per page, not per image')
+    parser.add_argument('--json', metavar='PATH', help='write the per-page report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    cache_path = root / CACHE_FILE
+    cache = {} if args.force else load_cache(cache_path)
+    seen = cache.get('pages', {})
+    docs = DocCache()
+
+    rows = []
+    pages = {}
+    stale = []
+    with ChangeAwareWriter('image_policy') as writer:
+        for page_rel in inventory.rel_paths('html'):
+            if page_rel.startswith(NOT_SHIPPED) or page_rel.startswith(PRERENDERED):
+                continue
+            entry = seen.get(page_rel)
+            if entry and entry['sha256'] == inventory.sha256(page_rel):
+                pages[page_rel] = entry
+                if entry['images']:
+                    rows.append({'page': page_rel, 'status': 'cached', 'images': entry['images']})
+                continue
+            doc = docs.load(root / page_rel)
+            new_text, decisions, preload = apply_policy(doc, page_rel)
+            images = decision_rows(decisions, preload)
+            if not decisions:
+                pages[page_rel] = {'sha256': doc.sha256, 'images': []}
+                continue
+            if args.check:
+                status = 'unchanged' if new_text == doc.text else 'stale'
+                if status == 'stale':
+                    stale.append(page_rel)
+            else:
+                status = writer.write_text(root / page_rel, new_text)
+            # Rewritten pages are hashed after the write
+            pages[page_rel] = {'sha256': doc.sha256 if status == 'unchanged' else None, 'images': images}
+            rows.append({'page': page_rel, 'status': status, 'images': images})
+        summary = writer.summary()
+
+    if not args.check:
+        inventory = load_inventory(root)
+        for page_rel, entry in pages.items():
+            if entry['sha256'] is None:
+                entry['sha256'] = inventory.sha256(page_rel)
+        inventory.save()
+        cache_text = json.dumps({'version': POLICY_VERSION, 'pages': pages},
+                                ensure_ascii=False, indent=2, sort_keys=True) + '\n'
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(cache_path, cache_text.encode('utf-8'))
+    seconds = time.perf_counter() - start
+
+    levels = {}
+    for row in rows:
+        mark = '✗' if row['status'] == 'stale' else '✓' if row['status'] in ('created', 'updated') else '-'
+        print(f"{mark} {row['page']}: {len(row['images'])} images, {row['status']}")
+        for image in row['images']:
+            levels[image['level']] = levels.get(image['level'], 0) + 1
+            if args.quiet:
+                continue
+            lcp = '  [LCP, preloaded]' if image['preload'] else ''
+            print(f"    {image['rule']:<8} #{image['position']:<3} {image['policy']:<38} {image['src']}{lcp}")
+
+    print(f"\nSUMMARY:")
+    print(f"  Pages with images: {len(rows)} ({sum(1 for row in rows if row['status'] == 'cached')} cached)")
+    print(f"  Images: {sum(levels.values())} "
+          f"({', '.join(f'{count} {level}' for level, count in sorted(levels.items()))})")
+    print(f"  Preloaded: {sum(1 for row in rows for image in row['images'] if image['preload'])}")
+    if args.check:
+        print(f"  Out of date: {len(stale)}")
+    else:
+        print(f"  Files: {summary}")
+    print(f"  Time: {seconds:.2f}s")
+    if args.check:
+        print(f"\n{'✗ Image policy not applied (run image_policy.py)' if stale else '✓ Image policy applied'}")
+
+    if args.json:
+        report = {'version': POLICY_VERSION, 'pages': rows, 'seconds': round(seconds, 4)}
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+    sys.exit(1 if stale else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Inline includes/menu-content.html into the #menu container of every page.
+
+js/load-menu.js used to fetch the menu on the first page of each session
+and keep it in sessionStorage, so a cold page view showed an empty sidebar
+until that request finished. This stage writes the markup into each page
+instead, the way load-menu.js rendered it:
+
+- links get the href for the page's level: data-href-root on pages at the
+  site root (depth 0), '../' * depth + the same path below it (the depth
+  logic of add_page_transitions.py), so data-href-sub on depth-1 pages
+- the link of the current section (about/, works/, contact/, portfolio/,
+  index otherwise) has no href, gets class="current" and
+  aria-current="page"
+- comments of the include are left out
+
+The container carries data-menu="<hash of the include>". A page is parsed
+again only when it or the include changed since the last run
+(.cache/menu-inline.json); when only the include changed, each page gets
+just its #menu content replaced. load-menu.js only wires up behaviour.
+
+Usage:
+    python3 inline_menu.py [--force] [--check] [--json PATH]
+
+--check writes nothing and exits with 1 when a page does not contain the
+current menu.
+"""
+
+import argparse
+import html
+import json
+import sys
+import time
+from pathlib import Path
+
+from sitetools.doccache import DocCache
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_FILE = Path('.cache') / 'menu-inline.json'
+
+MENU_SOURCE = 'includes/menu-content.html'
+MENU_ID = 'menu'
+MARKER = 'data-menu'
+
+# Bump when the rendering changes, so every page is rendered again
+MENU_VERSION = 1
+
+# Section directory -> data-page of its menu link (as in load-menu.js)
+SECTIONS = ('about', 'works', 'contact', 'portfolio')
+
+# Top-level directories that are in the repository but not part of the site
+NOT_SHIPPED = ('scripts/', 'docs/', 'dev/', '.vscode/')
+
+
+def root_prefix(page_rel):
+    """Relative path from a page to the site root ('' at the root, '../' one level down)"""
+    # Count how many directories deep the file is from the root:
+    # index.html is at root (depth 0), about/about.html is 1 level deep
+    depth = len(Path(page_rel).parts) - 1
+    if depth == 0:
+        return ''
+    return '../' * depth
+
+
+def current_page(page_rel):
+    """data-page of the menu link for the page's section"""
+    section = page_rel.split('/', 1)[0] if '/' in page_rel else ''
+    return section if section in SECTIONS else 'index'
+
+
+def _start_tag(name, attrs):
+    pieces = [f'<{name}']
+    for attr, value in attrs:
+        pieces.append(f' {attr}' if value is None else f' {attr}="{html.escape(value, quote=True)}"')
+    return ''.join(pieces) + '>'
+
+
+def render_menu(menu_text, page_rel, docs):
+    """Menu markup for one page: hrefs resolved, current link marked, comments dropped"""
+    doc = docs.parse(docs.parse(menu_text).without_comments())
+    prefix = root_prefix(page_rel)
+    current = current_page(page_rel)
+    edits = []
+    for tag in doc.all_tags:
+        if tag.closing or not (tag.has('data-href-root') or tag.has('data-href-sub')):
+            continue
+        root_href = tag.get('data-href-root')
+        if prefix and root_href is not None:
+            href = prefix + (root_href[2:] if root_href.startswith('./') else root_href)
+        else:
+            href = root_href if root_href is not None else tag.get('data-href-sub')
+        is_current = tag.get('data-page') == current
+        attrs = []
+        for attr, value in tag.attrs:
+            if attr == 'data-href-root' or (attr == 'data-href-sub' and root_href is None):
+                if not is_current:
+                    attrs.append(('href', href))
+            elif attr == 'data-href-sub':
+                continue
+            elif attr == 'class' and is_current:
+                attrs.append((attr, f'{value} current'.strip()))
+            else:
+                attrs.append((attr, value))
+        if is_current:
+            if not tag.has('class'):
+                attrs.append(('class', 'current'))
+            attrs.append(('aria-current', 'page'))
+        edits.append((tag.start, tag.end, _start_tag(tag.name, attrs)))
+    text = doc.splice(edits) if edits else doc.text
+    return [line.rstrip() for line in text.splitlines() if line.strip()]
+
+
+def menu_span(doc):
+    """(open tag, closing tag) of the page's #menu container, or None"""
+    tags = doc.all_tags
+    for index, tag in enumerate(tags):
+        if tag.closing or tag.get('id') != MENU_ID:
+            continue
+        depth = 0
+        for other in tags[index + 1:]:
+            if other.name != tag.name:
+                continue
+            if not other.closing:
+                depth += 1
+            elif depth:
+                depth -= 1
+            else:
+                return tag, other
+        return None
+    return None
+
+
+def inline(doc, lines, key):
+    """Page text with the #menu content replaced; None when the page has no #menu"""
+    span = menu_span(doc)
+    if span is None:
+        return None
+    open_tag, close_tag = span
+    text = doc.text
+    line_start = text.rfind('\n', 0, open_tag.start) + 1
+    indent = text[line_start:open_tag.start]
+    indent = indent if not indent.strip() else ''
+    attrs = [(attr, value) for attr, value in open_tag.attrs if attr != MARKER] + [(MARKER, key)]
+    body = ''.join(f'\n{indent}    {line}' for line in lines)
+    return doc.splice([(open_tag.start, close_tag.start,
+                        f'{_start_tag(open_tag.name, attrs)}{body}\n{indent}')])
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != MENU_VERSION:
+        return {}
+    return cache
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Inline the shared menu into every page')
+    parser.add_argument('--force', action='store_true', help='render every page again')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if a page does not contain the current menu')
+    parser.add_argument('--json', metavar='PATH', help='write the per-page report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    if MENU_SOURCE not in inventory.entries:
+        print(f"✗ {MENU_SOURCE} not found")
+        sys.exit(1)
+    menu_text = (root / MENU_SOURCE).read_text(encoding='utf-8')
+    menu_sha = inventory.sha256(MENU_SOURCE)
+    key = menu_sha[:10]
+
+    cache_path = root / CACHE_FILE
+    cache = {} if args.force else load_cache(cache_path)
+    seen = cache.get('pages', {}) if cache.get('menu') == menu_sha else {}
+    docs = DocCache()
+    rendered = {}
+
+    rows = []
+    pages = {}
+    stale = []
+    with ChangeAwareWriter('inline_menu') as writer:
+        for page_rel in inventory.rel_paths('html'):
+            if page_rel.startswith(NOT_SHIPPED):
+                continue
+            entry = seen.get(page_rel)
+            if entry and entry[0] == inventory.sha256(page_rel):
+                pages[page_rel] = entry
+                if entry[1]:
+                    rows.append({'page': page_rel, 'status': 'cached'})
+                continue
+            doc = docs.load(root / page_rel)
+            variant = (root_prefix(page_rel), current_page(page_rel))
+            if variant not in rendered:
+                rendered[variant] = render_menu(menu_text, page_rel, docs)
+            new_text = inline(doc, rendered[variant], key)
+            if new_text is None:
+                pages[page_rel] = [doc.sha256, False]
+                continue
+            if args.check:
+                status = 'unchanged' if new_text == doc.text else 'stale'
+                if status == 'stale':
+                    stale.append(page_rel)
+            else:
+                status = writer.write_text(root / page_rel, new_text)
+            # [page hash, has a menu]; rewritten pages are hashed after the write
+            pages[page_rel] = [doc.sha256 if status == 'unchanged' else None, True]
+            rows.append({'page': page_rel, 'status': status})
+        summary = writer.summary()
+
+    if not args.check:
+        # Hashes of rewritten pages are taken after the write
+        inventory = load_inventory(root)
+        for page_rel, entry in pages.items():
+            if entry[0] is None:
+                entry[0] = inventory.sha256(page_rel)
+        inventory.save()
+        cache_text = json.dumps({'version': MENU_VERSION, 'menu': menu_sha, 'pages': pages},
+                                indent=2, sort_keys=True) + '\n'
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(cache_path, cache_text.encode('utf-8'))
+    seconds = time.perf_counter() - start
+
+    for row in rows:
+        mark = '✗' if row['status'] == 'stale' else '✓' if row['status'] in ('created', 'updated') else '-'
+        print(f"{mark} {row['page']}: menu {row['status']}")
+
+    print(f"\nSUMMARY:")
+    print(f"  Menu: {MENU_SOURCE} ({key})")
+    print(f"  Pages with a menu: {len(rows)} ({sum(1 for row in rows if row['status'] == 'cached')} cached)")
+    if args.check:
+        print(f"  Out of date: {len(stale)}")
+    else:
+        print(f"  Files: {summary}")
+    print(f"  Time: {seconds:.2f}s")
+    if args.check:
+        print(f"\n{'✗ Menus out of date (run inline_menu.py)' if stale else '✓ Menus up to date'}")
+
+    if args.json:
+        report = {'menu': MENU_SOURCE, 'key': key, 'pages': rows, 'seconds': round(seconds, 4)}
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+    sys.exit(1 if stale else 0)
+
+
+if __name__ == '__main__':
+    main()
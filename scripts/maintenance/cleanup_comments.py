@@ -13,10 +13,21 @@ Preserves:
 - Functional comments
 """
 
-import re
 import os
+import sys
 from pathlib import Path
 
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from sitetools.doccache import DocCache  # noqa: E402
+from sitetools.inventory import site_files  # noqa: E402
+from sitetools.writer import ChangeAwareWriter  # noqa: E402
+
+DOCS = DocCache()
+
+WRITER = ChangeAwareWriter('cleanup_comments')
+
 def should_keep_comment(comment_content):
     """
     Determine if a comment should be kept.
@@ -58,29 +69,27 @@ def should_keep_comment(comment_content):
     # Keep everything else (descriptive text)
     return True
 
-def clean_html_file(filepath):
-    """Clean unnecessary comments from a single HTML file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
-
-    # Find all HTML comments
-    # Pattern: <!-- ... --> (non-greedy, multiline)
-    pattern = r'<!--(.*?)-->'
+def clean_comments(html_content, doc=None):
+    """
+    Remove unnecessary comments from HTML content.
 
-    def replace_comment(match):
-        comment_content = match.group(1)
-        if should_keep_comment(comment_content):
-            return match.group(0)  # Keep original comment
-        else:
-            # Check if comment is on its own line
-            # If so, remove the entire line including leading whitespace
-            full_match = match.group(0)
-            return ''  # Remove comment
+    Returns:
+        tuple: (cleaned_content, removed_count, original_count)
+    """
+    if doc is None:
+        doc = DOCS.parse(html_content)
+
+    # Comments come straight from the parse cache: <!-- ... --> spans
+    comment_bodies = doc.comment_texts()
+    original_count = len(comment_bodies)
+    removals = [
+        (start, end, '')
+        for (start, end), body in zip(doc.comments, comment_bodies)
+        if not should_keep_comment(body)
+    ]
 
-    # Replace comments
-    cleaned_content = re.sub(pattern, replace_comment, content, flags=re.DOTALL)
+    # Remove comments
+    cleaned_content = doc.splice(removals)
 
     # Remove lines that contain only whitespace after comment removal
     lines = cleaned_content.split('\n')
@@ -97,15 +106,16 @@ def clean_html_file(filepath):
 
     cleaned_content = '\n'.join(cleaned_lines)
 
-    # Count removed comments
-    original_count = len(re.findall(pattern, content, flags=re.DOTALL))
-    cleaned_count = len(re.findall(pattern, cleaned_content, flags=re.DOTALL))
-    removed_count = original_count - cleaned_count
+    return cleaned_content, len(removals), original_count
+
+def clean_html_file(filepath):
+    """Clean unnecessary comments from a single HTML file."""
+    doc = DOCS.load(filepath)
+    cleaned_content, removed_count, original_count = clean_comments(doc.text, doc)
 
     # Only write if changes were made
-    if content != cleaned_content:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(cleaned_content)
+    if doc.text != cleaned_content:
+        WRITER.write_text(filepath, cleaned_content)
         return removed_count, original_count
 
     return 0, original_count
@@ -113,11 +123,8 @@ def clean_html_file(filepath):
 def main():
     """Clean comments from all HTML files in the project."""
     base_dir = Path('.')
-    html_files = list(base_dir.rglob('*.html'))
-
-    # Exclude certain directories
-    exclude_dirs = {'.git', 'node_modules', '.claude', 'Conversation_Summary'}
-    html_files = [f for f in html_files if not any(ex in f.parts for ex in exclude_dirs)]
+    # The site inventory already skips .git, node_modules, .claude, ...
+    html_files = site_files('html', base_dir)
 
     total_removed = 0
     total_comments = 0
@@ -139,7 +146,10 @@ def main():
     print(f"  Files modified: {files_modified}")
     print(f"  Total comments removed: {total_removed}/{total_comments}")
     print(f"  Comments kept: {total_comments - total_removed}")
+    print(f"  Parse cache: {DOCS.summary()}")
     print(f"{'='*60}")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
@@ -41,9 +41,16 @@ fi
 # プロジェクトルートに移動
 cd "$(dirname "$0")/../.."
 
-# works.htmlからサムネイル画像のパスを抽出
-echo -e "${YELLOW}works.htmlからサムネイル画像を抽出中...${NC}"
-THUMBNAIL_IMAGES=$(grep -o 'data-src="../image/[^"]*"' works/works.html | sed 's/data-src="\.\.\/image\///' | sed 's/"//' | sort)
+# works-data/index.jsonからサムネイル画像のパスを取得
+# （works.htmlのグリッドはgenerate_works_grid.pyがindex.jsonから生成する）
+echo -e "${YELLOW}index.jsonからサムネイル画像を取得中...${NC}"
+THUMBNAIL_IMAGES=$(python3 -c '
+import json
+for work in json.load(open("works-data/index.json"))["works"]:
+    thumbnail = work.get("thumbnail") or ""
+    if thumbnail.startswith("../image/"):
+        print(thumbnail[len("../image/"):])
+' | sort)
 
 # 配列に変換
 IFS=$'\n' read -r -d '' -a IMAGE_ARRAY <<< "$THUMBNAIL_IMAGES" || true
@@ -169,7 +176,7 @@ fi
 
 echo ""
 echo -e "${YELLOW}次のステップ：${NC}"
-echo "  1. works/works.htmlの画像パスを更新（.png/.jpg → .webp）"
+echo "  1. works-data/*.jsonの画像パスを更新（.png/.jpg → .webp）し、update_index_with_metadata.py と generate_works_grid.py を実行"
 echo "  2. ブラウザで動作確認"
 echo "  3. 問題なければ、オリジナルファイルを削除可能"
 echo ""
@@ -9,8 +9,20 @@ Improve accessibility of HTML files.
 
 import re
 import os
+import sys
 from pathlib import Path
 
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from sitetools.doccache import DocCache  # noqa: E402
+from sitetools.inventory import site_files  # noqa: E402
+from sitetools.writer import ChangeAwareWriter  # noqa: E402
+
+DOCS = DocCache()
+
+WRITER = ChangeAwareWriter('improve_accessibility')
+
 def generate_alt_text(img_src):
     """Generate meaningful alt text from image source."""
     # Extract filename without extension
@@ -25,89 +37,109 @@ def generate_alt_text(img_src):
 
     return alt_text
 
-def add_alt_attributes(content):
-    """Add alt attributes to images that don't have them."""
-    # Pattern: <img ... > without alt=
-    pattern = r'<img\s+([^>]*?)(?<!alt=")>'
-
-    def replace_img(match):
-        attrs = match.group(1)
+def add_alt_attributes(doc):
+    """Return edits adding alt attributes to images that don't have them."""
+    edits = []
 
+    for img in doc.tags('img'):
         # Check if alt attribute already exists
-        if 'alt=' in attrs:
-            return match.group(0)
+        if img.has('alt'):
+            continue
 
-        # Extract src for generating alt text
-        src_match = re.search(r'src=["\']([^"\']+)["\']', attrs)
-        if src_match:
-            src = src_match.group(1)
-            alt_text = generate_alt_text(src)
-        else:
-            alt_text = "Image"
+        # Same shape as before: <img ATTRS>, where ATTRS keeps its own spacing
+        match = re.match(r'<img\s+([^>]*?)>', doc.raw(img))
+        if not match:
+            continue
+        attrs = match.group(1)
+
+        # Use src for generating alt text
+        src = img.get('src')
+        alt_text = generate_alt_text(src) if src else "Image"
 
         # Add alt attribute before closing >
-        return f'<img {attrs.rstrip()} alt="{alt_text}">'
+        edits.append((img.start, img.end, f'<img {attrs.rstrip()} alt="{alt_text}">'))
+
+    return edits
 
-    return re.sub(pattern, replace_img, content)
+def replace_s_tags(doc):
+    """Return edits replacing deprecated <s> tags with <span class='strikethrough'>."""
+    edits = []
 
-def replace_s_tags(content):
-    """Replace deprecated <s> tags with <span class='strikethrough'>."""
-    # Replace opening tags
-    content = re.sub(r'<s>', '<span class="strikethrough">', content)
-    # Replace closing tags
-    content = re.sub(r'</s>', '</span>', content)
+    for tag in doc.all_tags:
+        raw = doc.raw(tag)
+        # Replace opening tags
+        if raw == '<s>':
+            edits.append((tag.start, tag.end, '<span class="strikethrough">'))
+        # Replace closing tags
+        elif raw == '</s>':
+            edits.append((tag.start, tag.end, '</span>'))
 
-    return content
+    return edits
 
-def add_aria_labels(content):
-    """Add aria labels to navigation elements."""
+def add_aria_labels(doc):
+    """Return edits adding aria labels to navigation elements."""
     # Add aria-label to navigation links if not present
     # This is a simple implementation - can be expanded
-
-    # Add role="navigation" to menu divs
-    content = re.sub(
-        r'<div\s+id="menu"([^>]*)>',
-        r'<div id="menu" role="navigation"\1>',
-        content
-    )
-
-    return content
-
-def process_html_file(filepath):
-    """Process a single HTML file for accessibility improvements."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
-
-    # Apply improvements
-    content = add_alt_attributes(content)
-    content = replace_s_tags(content)
-    content = add_aria_labels(content)
+    edits = []
+
+    # Add role="navigation" to menu divs that don't have a role yet
+    for div in doc.tags('div'):
+        if div.get('id') != 'menu' or div.has('role'):
+            continue
+        modified = re.sub(
+            r'<div\s+id="menu"([^>]*)>',
+            r'<div id="menu" role="navigation"\1>',
+            doc.raw(div)
+        )
+        if modified != doc.raw(div):
+            edits.append((div.start, div.end, modified))
+
+    return edits
+
+def improve_accessibility(html_content, doc=None):
+    """
+    Apply every accessibility improvement to HTML content.
+
+    Returns:
+        tuple: (modified_content, list_of_change_descriptions)
+    """
+    if doc is None:
+        doc = DOCS.parse(html_content)
+
+    # Collect improvements; each one rewrites different tags of the same parse
+    alt_edits = add_alt_attributes(doc)
+    s_edits = replace_s_tags(doc)
+    aria_edits = add_aria_labels(doc)
 
     # Track changes
     changes = []
 
     # Count added alt attributes
-    original_imgs_no_alt = len(re.findall(r'<img\s+[^>]*?(?<!alt=")>', original_content))
-    new_imgs_no_alt = len(re.findall(r'<img\s+[^>]*?(?<!alt=")>', content))
-    alts_added = original_imgs_no_alt - new_imgs_no_alt
-    if alts_added > 0:
-        changes.append(f"{alts_added} alt attributes")
+    if alt_edits:
+        changes.append(f"{len(alt_edits)} alt attributes")
 
     # Count replaced <s> tags
-    s_tags = original_content.count('<s>')
+    s_tags = sum(1 for _, _, replacement in s_edits if replacement != '</span>')
     if s_tags > 0:
         changes.append(f"{s_tags} <s> tags replaced")
 
     # Check if navigation role was added
-    if 'role="navigation"' in content and 'role="navigation"' not in original_content:
+    if aria_edits:
         changes.append("navigation role added")
 
+    edits = alt_edits + s_edits + aria_edits
+    if not edits:
+        return html_content, []
+    return doc.splice(edits), changes
+
+def process_html_file(filepath):
+    """Process a single HTML file for accessibility improvements."""
+    doc = DOCS.load(filepath)
+    content, changes = improve_accessibility(doc.text, doc)
+
     # Only write if changes were made
-    if content != original_content:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    if changes:
+        WRITER.write_text(filepath, content)
         return changes
 
     return []
@@ -115,11 +147,8 @@ def process_html_file(filepath):
 def main():
     """Process all HTML files for accessibility improvements."""
     base_dir = Path('.')
-    html_files = list(base_dir.rglob('*.html'))
-
-    # Exclude certain directories
-    exclude_dirs = {'.git', 'node_modules', '.claude', 'Conversation_Summary'}
-    html_files = [f for f in html_files if not any(ex in f.parts for ex in exclude_dirs)]
+    # The site inventory already skips .git, node_modules, .claude, ...
+    html_files = site_files('html', base_dir)
 
     total_alt_added = 0
     total_s_replaced = 0
@@ -149,11 +178,14 @@ def main():
     print(f"  Alt attributes added: {total_alt_added}")
     print(f"  <s> tags replaced: {total_s_replaced}")
     print(f"  Navigation roles added: {total_aria_added}")
+    print(f"  Parse cache: {DOCS.summary()}")
     print(f"{'='*60}")
 
     # Add CSS for strikethrough class
     print(f"\nNote: Add this CSS rule to style_2.css:")
     print(f"  .strikethrough {{ text-decoration: line-through; }}")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
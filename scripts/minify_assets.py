@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Regenerate css/min/*.css and js/min/*.js from css/*.css and js/*.js.
+
+The minified copies are committed, and nothing used to check that they
+still matched their sources. This stage minifies each source with the pure
+Python minifiers in sitetools.minify and writes the result to the min/
+directory under the same name:
+
+    css/style_2.css    -> css/min/style_2.css
+    js/works-spa.js    -> js/min/works-spa.js
+
+Third-party files (*.min.js) and subdirectories (swiper/, p5.js/) are left
+alone.
+
+Runs are incremental: .cache/minify.json records, for each source, its
+SHA-256 and the SHA-256 of the output written for it, together with a hash
+of the minifier itself. A source whose hash is unchanged and whose output
+is still the recorded one is not minified again.
+
+With --check nothing is written: every output is compared with what the
+source minifies to, and the run fails (exit status 1) on any drift. Run
+fingerprint_assets.py afterwards so the pages load the new copies.
+
+Usage:
+    python3 minify_assets.py [--check] [--force] [--json PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import posixpath
+import sys
+import time
+from pathlib import Path
+
+from sitetools import minify
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+STATE_FILE = Path('.cache') / 'minify.json'
+STATE_VERSION = 1
+
+# Source directory -> minifier; outputs go to <directory>/min/
+SOURCE_DIRS = {
+    'css': minify.minify_css,
+    'js': minify.minify_js,
+}
+
+# Already minified third-party files
+SKIP_SUFFIXES = ('.min.js', '.min.css')
+
+
+def source_files(inventory):
+    """Sorted (source rel, output rel) pairs"""
+    pairs = []
+    for directory in SOURCE_DIRS:
+        for rel in inventory.rel_paths(directory):
+            parent, name = posixpath.split(rel)
+            if parent == directory and not name.endswith(SKIP_SUFFIXES):
+                pairs.append((rel, f'{directory}/min/{name}'))
+    return sorted(pairs)
+
+
+def minifier_hash():
+    """SHA-256 of sitetools/minify.py: a changed minifier redoes every file"""
+    return hashlib.sha256(Path(minify.__file__).read_bytes()).hexdigest()
+
+
+def load_state(path, tool_hash):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != STATE_VERSION or state.get('minifier') != tool_hash:
+        return {}
+    return state.get('files', {})
+
+
+def percent(saved, total):
+    return f"{saved / total * 100:.0f}%" if total else '0%'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Regenerate css/min and js/min from their sources')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if a minified file differs from its source')
+    parser.add_argument('--force', action='store_true', help='ignore the state file and minify everything')
+    parser.add_argument('--json', metavar='PATH', help='write the per-file report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    tool_hash = minifier_hash()
+    state_path = root / STATE_FILE
+    state = {} if args.force else load_state(state_path, tool_hash)
+
+    new_state = {}
+    rows = []
+    errors = []
+    drift = []
+    with ChangeAwareWriter('minify_assets') as writer:
+        for source, output in source_files(inventory):
+            sha = inventory.sha256(source)
+            entry = state.get(source)
+            if (entry and entry['sha256'] == sha and output in inventory.entries
+                    and inventory.sha256(output) == entry['output_sha256']):
+                new_state[source] = entry
+                rows.append((source, output, inventory.size(source), inventory.size(output), 'unchanged'))
+                continue
+
+            text = (root / source).read_text(encoding='utf-8')
+            try:
+                data = SOURCE_DIRS[source.split('/', 1)[0]](text).encode('utf-8')
+            except minify.JSMinifyError as e:
+                errors.append((source, str(e)))
+                continue
+
+            if args.check:
+                current = (root / output).read_bytes() if output in inventory.entries else None
+                status = 'unchanged' if current == data else ('missing' if current is None else 'drift')
+                if status != 'unchanged':
+                    drift.append(output)
+            else:
+                status = writer.write_bytes(root / output, data)
+            new_state[source] = {'sha256': sha, 'output_sha256': hashlib.sha256(data).hexdigest()}
+            rows.append((source, output, len(text.encode('utf-8')), len(data), status))
+        summary = writer.summary()
+
+    if not args.check:
+        try:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(state_path, json.dumps(
+                {'version': STATE_VERSION, 'minifier': tool_hash, 'files': new_state},
+                separators=(',', ':')).encode('utf-8'))
+        except OSError:
+            pass
+    inventory.save()
+    seconds = time.perf_counter() - start
+
+    for source, output, size, nbytes, status in rows:
+        mark = {'unchanged': '-', 'drift': '✗', 'missing': '✗'}.get(status, '✓')
+        print(f"{mark} {source} → {output}: {size:,} → {nbytes:,} bytes "
+              f"(-{percent(size - nbytes, size)}) {status}")
+    for source, error in errors:
+        print(f"✗ {source}: {error}")
+
+    source_bytes = sum(row[2] for row in rows)
+    output_bytes = sum(row[3] for row in rows)
+    written = sum(1 for row in rows if row[4] in ('created', 'updated'))
+    print(f"\nSUMMARY:")
+    print(f"  Sources: {len(rows) + len(errors)}")
+    print(f"  Size: {source_bytes:,} → {output_bytes:,} bytes (saves {percent(source_bytes - output_bytes, source_bytes)})")
+    if args.check:
+        print(f"  Out of date: {len(drift)}")
+    else:
+        print(f"  Files: {summary}")
+    print(f"  Errors: {len(errors)}")
+    print(f"  Time: {seconds:.2f}s")
+    if args.check:
+        print(f"\n{'✗ Minified files out of date (run minify_assets.py)' if drift or errors else '✓ Minified files up to date'}")
+    elif written:
+        print(f"\nRun fingerprint_assets.py to give the new files their hashed names.")
+
+    if args.json:
+        report = {
+            'files': [{'source': source, 'output': output, 'bytes': size, 'minified': nbytes, 'status': status}
+                      for source, output, size, nbytes, status in rows],
+            'errors': [{'source': source, 'error': error} for source, error in errors],
+            'seconds': round(seconds, 4),
+        }
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+    sys.exit(1 if errors or drift else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Write precompressed .gz / .br (and optionally .zst) siblings of every text asset.
+
+Hosts that serve precompressed files (nginx gzip_static/brotli_static, most
+CDNs, Netlify, ...) can then send css/min, js/min, works-data JSON,
+sitemap.xml and the HTML pages compressed at the highest levels without
+compressing on every request. Each file gets:
+
+- file.gz   gzip level 9, mtime 0 (byte-identical across runs)
+- file.br   brotli quality 11, via the `brotli` module or the `brotli` CLI
+- file.zst  zstd level 19 with --zstd, via `zstandard` or the `zstd` CLI
+
+Brotli and zstd are optional: when neither the module nor the command is
+available the format is skipped with a warning, and gzip (standard library)
+is always written. A source that is compressed again loses its siblings in
+the formats this run does not write (.zst after a run without --zstd, .br
+once brotli is missing), so a host never serves an outdated one.
+
+A compressed file that would not be smaller than its source is not written
+(and an older one is removed). Runs are incremental: .cache/precompress.json
+records each source's SHA-256 (from the site inventory) and the outputs
+written for it, so unchanged files with their outputs in place are skipped.
+Siblings of sources that were deleted are removed too.
+
+Usage:
+    python3 precompress.py [PATH ...] [--zstd] [--jobs N] [--min-size BYTES] [--force] [--json PATH]
+
+PATHs (files or directories, relative to the site root) limit the run;
+the default is every text asset of the site.
+"""
+
+import argparse
+import gzip
+import importlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+STATE_FILE = Path('.cache') / 'precompress.json'
+STATE_VERSION = 1
+
+TEXT_SUFFIXES = ('.html', '.css', '.js', '.json', '.xml', '.svg', '.txt', '.webmanifest')
+
+# Top-level directories that are in the repository but not part of the site
+NOT_SHIPPED = ('scripts/', 'docs/', 'dev/', '.vscode/')
+
+DEFAULT_MIN_SIZE = 256
+
+# format -> (suffix, module candidates, command)
+FORMATS = {
+    'gz': ('.gz', (), None),
+    'br': ('.br', ('brotli', 'brotlicffi'), ['brotli', '--quality=11', '--stdout', '-']),
+    'zst': ('.zst', ('zstandard',), ['zstd', '-19', '--stdout', '--quiet', '-']),
+}
+
+
+def find_backend(fmt):
+    """'module:<name>', 'cli' or None for a format"""
+    if fmt == 'gz':
+        return 'stdlib'
+    suffix, modules, command = FORMATS[fmt]
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            return f'module:{name}'
+        except ImportError:
+            continue
+    if shutil.which(command[0]):
+        return 'cli'
+    return None
+
+
+def compress(data, fmt, backend):
+    if fmt == 'gz':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if backend.startswith('module:'):
+        module = importlib.import_module(backend.split(':', 1)[1])
+        if fmt == 'br':
+            return module.compress(data, quality=11)
+        return module.ZstdCompressor(level=19).compress(data)
+    result = subprocess.run(FORMATS[fmt][2], input=data, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, check=True)
+    return result.stdout
+
+
+def _compress_job(job):
+    """
+    Compress one source into every format (runs in a worker process).
+
+    Returns:
+        tuple: (rel, source size, {fmt: (status, bytes)}, stale, error)
+        where status is 'created', 'updated', 'unchanged' or 'larger' and
+        stale counts the removed siblings in formats not written
+    """
+    rel, path, backends = job
+    try:
+        data = Path(path).read_bytes()
+    except OSError as e:
+        return rel, 0, {}, 0, str(e)
+
+    outputs = {}
+    stale = 0
+    try:
+        stale = remove_outputs(Path(path).parent, Path(path).name,
+                               [fmt for fmt in FORMATS if fmt not in backends])
+        for fmt, backend in backends.items():
+            target = Path(path + FORMATS[fmt][0])
+            compressed = compress(data, fmt, backend)
+            if len(compressed) >= len(data):
+                if target.exists():
+                    target.unlink()
+                outputs[fmt] = ('larger', len(compressed))
+                continue
+            if target.exists() and target.read_bytes() == compressed:
+                outputs[fmt] = ('unchanged', len(compressed))
+                continue
+            status = 'updated' if target.exists() else 'created'
+            atomic_write_bytes(target, compressed)
+            outputs[fmt] = (status, len(compressed))
+    except (OSError, subprocess.CalledProcessError) as e:
+        return rel, len(data), outputs, stale, str(e)
+    return rel, len(data), outputs, stale, None
+
+
+def run_jobs(jobs, workers):
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield _compress_job(job)
+        return
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_compress_job, jobs, chunksize=chunksize)
+
+
+def text_assets(inventory, selectors):
+    """Sorted rel paths of the text assets to compress"""
+    rels = []
+    for rel in inventory.rel_paths():
+        if not rel.endswith(TEXT_SUFFIXES) or rel.startswith(NOT_SHIPPED):
+            continue
+        if any(part.startswith('.') for part in rel.split('/')):
+            continue
+        if selectors and not any(rel == s or rel.startswith(s.rstrip('/') + '/') for s in selectors):
+            continue
+        rels.append(rel)
+    return rels
+
+
+def load_state(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != STATE_VERSION:
+        return {}
+    return state.get('files', {})
+
+
+def outputs_in_place(root, rel, entry, formats):
+    """True when every format recorded for rel is still on disk at its size"""
+    for fmt in formats:
+        recorded = entry['outputs'].get(fmt)
+        if recorded is None:
+            return False
+        status, size = recorded
+        target = root / (rel + FORMATS[fmt][0])
+        if status == 'larger':
+            if target.exists():
+                return False
+        elif not target.is_file() or target.stat().st_size != size:
+            return False
+    return True
+
+
+def remove_outputs(root, rel, formats=FORMATS):
+    """Delete the compressed siblings of rel in formats; returns how many existed"""
+    removed = 0
+    for fmt in formats:
+        target = root / (rel + FORMATS[fmt][0])
+        if target.is_file():
+            target.unlink()
+            removed += 1
+    return removed
+
+
+def percent(saved, total):
+    return f"{saved / total * 100:.0f}%" if total else '0%'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Write precompressed siblings of the site text assets')
+    parser.add_argument('paths', nargs='*', help='files or directories to compress (default: the whole site)')
+    parser.add_argument('--zstd', action='store_true', help='also write .zst files')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='number of worker processes (0 = one per CPU core, default)')
+    parser.add_argument('--min-size', type=int, default=DEFAULT_MIN_SIZE,
+                        help=f'leave files smaller than this alone (default {DEFAULT_MIN_SIZE} bytes)')
+    parser.add_argument('--force', action='store_true', help='ignore the state file and recompress everything')
+    parser.add_argument('--json', metavar='PATH', help='write the per-file report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    start = time.perf_counter()
+
+    formats = ['gz', 'br'] + (['zst'] if args.zstd else [])
+    backends = {}
+    for fmt in formats:
+        backend = find_backend(fmt)
+        if backend:
+            backends[fmt] = backend
+        else:
+            print(f"⚠ No {fmt} compressor (install the Python module or the command line tool); "
+                  f"skipping .{fmt}")
+
+    inventory = load_inventory(root)
+    state_path = root / STATE_FILE
+    state = {} if args.force else load_state(state_path)
+    selectors = [Path(p).as_posix() for p in args.paths if Path(p).as_posix() != '.']
+    rels = [rel for rel in text_assets(inventory, selectors) if inventory.size(rel) >= args.min_size]
+
+    new_state = {}
+    jobs = []
+    for rel in rels:
+        sha = inventory.sha256(rel)
+        entry = state.get(rel)
+        if entry and entry['sha256'] == sha and outputs_in_place(root, rel, entry, backends):
+            new_state[rel] = entry
+            continue
+        new_state[rel] = {'sha256': sha, 'size': inventory.size(rel), 'outputs': {}}
+        jobs.append((rel, str(root / rel), backends))
+
+    # Sources that are gone (or out of scope now) lose their siblings
+    orphans = 0
+    for rel, entry in state.items():
+        if rel in new_state:
+            continue
+        if selectors and not any(rel == s or rel.startswith(s.rstrip('/') + '/') for s in selectors):
+            new_state[rel] = entry
+            continue
+        orphans += remove_outputs(root, rel)
+
+    errors = []
+    rows = []
+    stale = 0
+    with ChangeAwareWriter('precompress') as writer:
+        for rel, size, outputs, dropped, error in run_jobs(jobs, workers):
+            stale += dropped
+            if error:
+                errors.append((rel, error))
+                new_state.pop(rel, None)
+                continue
+            new_state[rel]['outputs'] = {fmt: list(result) for fmt, result in outputs.items()}
+            for fmt, (status, nbytes) in outputs.items():
+                if status != 'larger':
+                    writer.record(root / (rel + FORMATS[fmt][0]), status, nbytes)
+            rows.append((rel, size, outputs))
+        summary = writer.summary()
+
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(state_path, json.dumps(
+            {'version': STATE_VERSION, 'files': new_state}, separators=(',', ':')).encode('utf-8'))
+    except OSError:
+        pass
+    inventory.save()
+    seconds = time.perf_counter() - start
+
+    for rel, size, outputs in rows:
+        parts = []
+        for fmt in formats:
+            if fmt not in outputs:
+                continue
+            status, nbytes = outputs[fmt]
+            if status == 'larger':
+                parts.append(f"{fmt} skipped (would be {nbytes:,})")
+            else:
+                parts.append(f"{fmt} {nbytes:,} (-{percent(size - nbytes, size)})")
+        print(f"✓ {rel}: {size:,} → {', '.join(parts)}")
+    for rel, error in errors:
+        print(f"✗ {rel}: {error}")
+
+    # Totals cover every tracked file, including the ones skipped as unchanged
+    totals = {fmt: [0, 0, 0] for fmt in backends}   # source bytes, output bytes, files
+    for rel in rels:
+        entry = new_state.get(rel)
+        if not entry:
+            continue
+        for fmt, (status, nbytes) in entry['outputs'].items():
+            if fmt in totals and status != 'larger':
+                totals[fmt][0] += entry['size']
+                totals[fmt][1] += nbytes
+                totals[fmt][2] += 1
+
+    print(f"\nSUMMARY:")
+    print(f"  Text assets: {len(rels)} ({len(jobs)} compressed, {len(rels) - len(jobs)} unchanged)")
+    for fmt, (source_bytes, output_bytes, count) in totals.items():
+        print(f"  .{fmt} ({backends[fmt]}): {count} files, {source_bytes:,} → {output_bytes:,} bytes "
+              f"(saves {percent(source_bytes - output_bytes, source_bytes)})")
+    larger = sum(1 for rel, size, outputs in rows for status, n in outputs.values() if status == 'larger')
+    print(f"  Skipped as larger: {larger}")
+    print(f"  Orphaned outputs removed: {orphans}")
+    print(f"  Outputs in formats not written removed: {stale}")
+    print(f"  Files: {summary}")
+    print(f"  Time: {seconds:.2f}s with {workers} worker(s)")
+
+    if args.json:
+        report = {
+            'formats': backends,
+            'files': [{'path': rel, 'bytes': size,
+                       **{fmt: {'status': status, 'bytes': nbytes} for fmt, (status, nbytes) in outputs.items()}}
+                      for rel, size, outputs in rows],
+            'totals': {fmt: {'source_bytes': t[0], 'bytes': t[1], 'files': t[2]} for fmt, t in totals.items()},
+            'errors': [{'path': rel, 'error': error} for rel, error in errors],
+            'seconds': round(seconds, 4),
+        }
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,667 @@
+#!/usr/bin/env python3
+"""
+Prerender the detail view of every work in the Works SPA as a static HTML fragment.
+
+Opening works.html#<id> used to cost three steps in a row before anything
+showed: fetch the index, fetch the work's JSON, then build the view from a
+template in js/works-spa.js and run it through DOMPurify. This stage builds
+the same markup here, once per work, including the parts that need the
+whole index:
+
+- prev/next links: the neighbours in display order (works-data/index.json)
+- the Related band: the work's own `related` ids first, then works of the
+  same category nearest in display order, skipping the prev/next works
+  unless the row would stay short (relatedWorksFor() in works-spa.js)
+
+Each fragment is the complete <div id="work-detail-view"> element. Its
+data-* attributes carry what the SPA still needs at runtime (title, year,
+category, image count), so the SPA mounts the fragment and only hydrates
+it: text animations, Swiper, the breadcrumb link and focus. Markup from the
+work JSON is cleaned here against an allowlist (sanitize()): only the
+elements and attributes the view uses are kept, every kept tag is written
+out again from its parsed attributes, comments go, and href/src must be
+relative, #, http(s) or mailto once their entities are decoded. The SPA
+still passes the mounted fragment through DOMPurify. Images get their loading, decoding and fetchpriority from the
+image policy (sitetools.imagepolicy): the first slide is loaded eagerly with
+high priority, the other slides and the Related cards lazily.
+
+The work's page title, meta tags (description, og:*, twitter:*) and JSON-LD
+(sitetools.workmeta) are built here too. The fragment carries them ready to
+apply in a <script type="application/json" class="work-head">, and they are
+written into the work's page under works/ (the redirect that link
+unfurlers and crawlers read), so nothing is assembled on navigation.
+
+Fragments are written to works-data/detail/<id>.<hash>.html, named after a
+hash of their content, and works-data/detail/manifest.json maps each id to
+its fragment; fragments the manifest no longer lists are deleted. A work is
+rendered again only when its JSON, the index entries it shows (itself,
+prev/next, related cards) or its page changed since the last run
+(.cache/prerender-works.json); works to render are spread over worker
+processes.
+
+Usage:
+    python3 prerender_works.py [--jobs N] [--force] [--check] [--json PATH]
+
+--check writes nothing and exits with 1 when a fragment, a work page or the
+manifest is out of date.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bundle_works_data import load_index
+from sitetools.doccache import DocCache
+from sitetools.imagepolicy import apply_policy
+from sitetools.inventory import load_inventory
+from sitetools.workmeta import work_head
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR_NAME = 'works-data'
+PAGES_DIR_NAME = 'works'
+DETAIL_DIR_NAME = 'detail'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+CACHE_FILE = Path('.cache') / 'prerender-works.json'
+
+# Bump when the markup changes, so every work is rendered again
+RENDER_VERSION = 5
+
+# Hex digits of the SHA-256 kept in fragment names
+HASH_LENGTH = 10
+
+# id of the JSON-LD <script> (the one works-spa.js replaces on navigation)
+JSONLD_ID = 'work-structured-data'
+
+# Cards in the Related band (relatedWorksFor(work, limit = 3))
+RELATED_LIMIT = 3
+
+FRAGMENT_NAME_RE = re.compile(r'^.+\.[0-9a-f]{%d}\.html$' % HASH_LENGTH)
+
+# Detail-list rows in display order: (work field, <dt> label)
+DETAIL_ROWS = (
+    ('performers', 'Performers'),
+    ('credit', 'Credit'),
+    ('tools', 'Tool'),
+    ('exhibition', 'Exhibition'),
+    ('award', 'Award'),
+    ('paper', 'Paper'),
+    ('grants', 'Grants'),
+    ('collaborators', 'Co-create with'),
+    ('download', 'Download'),
+    ('citation', 'Citation'),
+    ('link', 'Link'),
+)
+
+# Elements kept by sanitize(): the view's own markup and the formatting the
+# work JSON uses. Other elements lose their tags but keep their text, except
+# DROPPED_ELEMENTS, which go with everything up to their closing tag (or the
+# end of the markup when it has none).
+ALLOWED_ELEMENTS = frozenset({
+    'a', 'b', 'br', 'code', 'dd', 'div', 'dl', 'dt', 'em', 'h1', 'h2', 'h3', 'hr', 'i', 'img',
+    'li', 'nav', 'ol', 'p', 'section', 'small', 'span', 'strong', 'sub', 'sup', 'ul',
+})
+DROPPED_ELEMENTS = frozenset({
+    'embed', 'iframe', 'math', 'noembed', 'noframes', 'noscript', 'object', 'script', 'select',
+    'style', 'svg', 'template', 'textarea', 'title', 'xmp',
+})
+# Attributes kept by sanitize(), besides data-* and aria-*
+ALLOWED_ATTRIBUTES = frozenset({
+    'alt', 'class', 'decoding', 'fetchpriority', 'height', 'href', 'id', 'lang', 'loading',
+    'rel', 'src', 'style', 'target', 'title', 'width',
+})
+URL_ATTRIBUTES = frozenset({'href', 'src'})
+SAFE_SCHEMES = frozenset({'http', 'https', 'mailto'})
+URL_SCHEME_RE = re.compile(r'^([a-z][a-z0-9+.-]*):')
+
+DOCS = DocCache(cache_dir=None)
+
+
+class WorkIndex:
+    """Display order and card metadata of every work (the SPA's worksIndex)."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.by_id = {entry['id']: entry for entry in entries}
+        self.position = {entry['id']: i for i, entry in enumerate(entries)}
+
+    def neighbours(self, work_id):
+        """(prev, next) index entries, None at the ends (neighboursOf())"""
+        i = self.position.get(work_id, -1)
+        prev = self.entries[i - 1] if i > 0 else None
+        next_ = self.entries[i + 1] if 0 <= i < len(self.entries) - 1 else None
+        return prev, next_
+
+    def related(self, work, limit=RELATED_LIMIT):
+        """Index entries for the Related band (relatedWorksFor())"""
+        picked = []
+
+        def take(work_id):
+            if work_id == work.get('id') or any(entry['id'] == work_id for entry in picked):
+                return
+            if work_id in self.by_id:
+                picked.append(self.by_id[work_id])
+
+        prev, next_ = self.neighbours(work.get('id'))
+        neighbour_ids = {entry['id'] for entry in (prev, next_) if entry}
+
+        # Older data kept an HTML string in `related`; only a list of ids counts
+        if isinstance(work.get('related'), list):
+            for work_id in work['related']:
+                take(work_id)
+
+        here = self.position.get(work.get('id'), -1)
+        same_category = sorted(
+            (entry for entry in self.entries
+             if entry.get('category') == work.get('category') and entry['id'] != work.get('id')),
+            key=lambda entry: abs(self.position[entry['id']] - here))
+        for candidate in same_category:
+            if len(picked) >= limit:
+                break
+            if candidate['id'] not in neighbour_ids:
+                take(candidate['id'])
+        for candidate in same_category:
+            if len(picked) >= limit:
+                break
+            take(candidate['id'])
+        return picked[:limit]
+
+
+def _text(value):
+    """A value as the template literal would print it"""
+    return '' if value is None else str(value)
+
+
+def _attr(value):
+    return html.escape(_text(value), quote=True)
+
+
+def browse_strip_html(work, index):
+    """Prev/next links and the Related band (browseStripHtml())"""
+    prev, next_ = index.neighbours(work.get('id'))
+    related = index.related(work)
+
+    def arrow(entry, direction):
+        if not entry:
+            return '<span class="work-nav-slot"></span>'
+        title = _text(entry.get('title'))
+        label = f'← {title}' if direction == 'prev' else f'{title} →'
+        return (f'<a class="work-nav-link work-nav-{direction}" href="#{_attr(entry["id"])}" '
+                f'data-work-id="{_attr(entry["id"])}">\n'
+                f'              <span class="work-nav-title">{label}</span>\n'
+                f'              <span class="work-nav-year">{_text(entry.get("year"))}</span>\n'
+                f'            </a>')
+
+    def card(entry):
+        thumb = entry.get('thumbnail')
+        size = (f' width="{entry["width"]}" height="{entry["height"]}"'
+                if entry.get('width') and entry.get('height') else '')
+        image = (f'<img src="{_attr(thumb)}" alt="{_attr(entry.get("title"))}"{size} loading="lazy">'
+                 if thumb else '<span class="related-card-noimg"></span>')
+        return (f'<a class="related-card" href="#{_attr(entry["id"])}" data-work-id="{_attr(entry["id"])}">\n'
+                f'              {image}\n'
+                f'              <span class="related-card-year">{_text(entry.get("year"))}</span>\n'
+                f'              <span class="related-card-title">{_text(entry.get("title"))}</span>\n'
+                f'            </a>')
+
+    band = ''
+    if related:
+        band = ('<section class="related-works" aria-label="Related works">\n'
+                '                <h2 class="related-works-heading">Related</h2>\n'
+                '                <div class="related-works-grid">\n'
+                f'                    {"".join(card(entry) for entry in related)}\n'
+                '                </div>\n'
+                '            </section>')
+    return ('\n'
+            '            <nav class="work-nav" aria-label="Previous and next work">\n'
+            f'                {arrow(prev, "prev")}\n'
+            f'                {arrow(next_, "next")}\n'
+            '            </nav>\n'
+            f'            {band}')
+
+
+def detail_html(work, index):
+    """Content of the work's detail view (the template of createDetailView())"""
+    title = _text(work.get('title'))
+    slides = ''.join(
+        '\n'
+        '                    <div class="swiper-slide">\n'
+        '                        <div class="img_w2">\n'
+        f'                            <img src="{_attr(image)}" alt="{_attr(f"{title} {i + 1}")}" loading="lazy">\n'
+        '                        </div>\n'
+        '                    </div>'
+        for i, image in enumerate(work.get('images') or []))
+
+    rows = []
+    for field, label in DETAIL_ROWS:
+        if work.get(field):
+            rows.append(f'<dt>{label}</dt>\n'
+                        '                <dd>\n'
+                        f'                    {work[field]}\n'
+                        '                </dd>\n'
+                        '                <br>')
+    description = ''
+    if work.get('description'):
+        description = ('<p>\n'
+                       f'                    {work["description"]}\n'
+                       '                </p>')
+    reading = f' [{work["reading"]}]' if work.get('reading') else ''
+
+    return ('            <div class="fixed-header-area">\n'
+            '                <h1>\n'
+            '                    <a href="#" class="breadcrumb-works">Works</a><span class="breadcrumb-sep"> / </span><span class="work-title-animated"></span>\n'
+            '                </h1>\n'
+            '                <hr>\n'
+            '                <p class="work-header-metadata">\n'
+            '                    <span class="list work-year-animated">----</span> | <span class="list work-category-animated">----</span>\n'
+            '                </p>\n'
+            '            </div>\n'
+            '\n'
+            '            <div class="swiper-container" style="opacity: 0;">\n'
+            '                <div class="swiper-wrapper">\n'
+            f'{slides}\n'
+            '                </div>\n'
+            '                <div class="swiper-button-prev"></div>\n'
+            '                <div class="swiper-button-next"></div>\n'
+            '            </div>\n'
+            '            <hr>\n'
+            '\n'
+            '            <h3>\n'
+            f'                {title}{reading}\n'
+            '            </h3>\n'
+            '            <div id="content_in" class="work-content-animated">\n'
+            f'                {description}\n'
+            '\n'
+            '                <dl>\n'
+            + ''.join(f'                {row}\n' for row in rows) +
+            '                </dl>\n'
+            '\n'
+            '            </div>\n'
+            '            <hr class="final-hr-1" style="opacity: 0;">\n'
+            f'            {browse_strip_html(work, index)}\n'
+            '            <hr class="final-hr-2" style="opacity: 0;">\n'
+            '            <br>\n')
+
+
+def head_json(head):
+    """The head as the SPA applies it: JSON-LD already serialized, safe inside <script>"""
+    data = {'title': head['title'], 'meta': head['meta'],
+            'jsonld': json.dumps(head['jsonld'], ensure_ascii=False, indent=2)}
+    return json.dumps(data, ensure_ascii=False).replace('<', '\\u003c')
+
+
+def view_html(work, index, head):
+    """
+    The work's <div id="work-detail-view">: its head, then the cleaned view.
+
+    Returns (markup, removed) as sanitize() does.
+    """
+    attrs = [('data-work-id', work.get('id')), ('data-title', work.get('title')), ('data-year', work.get('year')),
+             ('data-category', work.get('category')), ('data-image-count', len(work.get('images') or []))]
+    attr_text = ''.join(f' {name}="{_attr(value)}"' for name, value in attrs)
+    content, removed = sanitize(detail_html(work, index))
+    content, _, _ = apply_policy(DOCS.parse(content), f"{DATA_DIR_NAME}/{DETAIL_DIR_NAME}/{work.get('id')}.html")
+    return (f'<div id="work-detail-view"{attr_text}>\n'
+            f'            <script type="application/json" class="work-head">{head_json(head)}</script>\n'
+            f'{content}'
+            '</div>\n'), removed
+
+
+def _meta_tag(attr, key, content):
+    content = html.escape(content, quote=False).replace('"', '&quot;')
+    return f'<meta {attr}="{key}" content="{content}">'
+
+
+def update_page(doc, head):
+    """
+    A work's page with its title, meta tags and JSON-LD from head.
+
+    Meta tags and JSON-LD the page has are replaced where they stand;
+    missing ones follow its last og:/twitter: tag (or open the <head>).
+    Returns None when the page has no <head>.
+    """
+    tags = doc.all_tags
+    head_open = doc.first('head')
+    head_close = doc.first('head', closing=True)
+    if head_open is None or head_close is None:
+        return None
+    edits = []
+    wanted = {(attr, key): content for attr, key, content in head['meta']}
+    anchor = head_open
+    jsonld_span = None
+    title_open = doc.first('title')
+    title_close = doc.first('title', closing=True)
+    if title_open and title_close:
+        edits.append((title_open.end, title_close.start, html.escape(head['title'], quote=False)))
+    for index, tag in enumerate(tags):
+        if tag.start > head_close.start:
+            break
+        if tag.closing:
+            continue
+        if tag.name == 'meta':
+            for attr in ('name', 'property'):
+                key = tag.get(attr)
+                if key and key.startswith(('og:', 'twitter:')):
+                    anchor = tag
+                if (attr, key) in wanted:
+                    edits.append((tag.start, tag.end, _meta_tag(attr, key, wanted.pop((attr, key)))))
+        elif tag.name == 'script' and tag.get('id') == JSONLD_ID:
+            close = next((t for t in tags[index + 1:] if t.closing and t.name == 'script'), tag)
+            jsonld_span = (tag.start, close.end)
+    text = doc.text
+    line_start = text.rfind('\n', 0, anchor.start) + 1
+    indent = text[line_start:anchor.start]
+    indent = indent if not indent.strip() else ''
+    if anchor is head_open:
+        indent += '    '
+    jsonld = json.dumps(head['jsonld'], ensure_ascii=False, indent=2).replace('</', '<\\/')
+    jsonld = jsonld.replace('\n', '\n' + indent)
+    script = f'<script type="application/ld+json" id="{JSONLD_ID}">\n{indent}{jsonld}\n{indent}</script>'
+    added = [_meta_tag(attr, key, content) for (attr, key), content in wanted.items()]
+    if jsonld_span:
+        edits.append((*jsonld_span, script))
+    else:
+        added.append(script)
+    if added:
+        edits.append((anchor.end, anchor.end, ''.join(f'\n{indent}{piece}' for piece in added)))
+    return doc.splice(edits)
+
+
+def safe_url(value):
+    """True for relative, #, http(s) and mailto URLs, judged after decoding entities"""
+    url = re.sub(r'[\s\x00-\x1f]', '', html.unescape(value)).lower()
+    match = URL_SCHEME_RE.match(url)
+    return match is None or match.group(1) in SAFE_SCHEMES
+
+
+def kept_attribute(name, value):
+    if name not in ALLOWED_ATTRIBUTES and not name.startswith(('data-', 'aria-')):
+        return False
+    return name not in URL_ATTRIBUTES or (value is not None and safe_url(value))
+
+
+def sanitize(markup):
+    """
+    Markup reduced to ALLOWED_ELEMENTS and ALLOWED_ATTRIBUTES.
+
+    Kept tags are written out again from their parsed attributes and stray
+    '<' / '>' in text are escaped, so nothing the scanner split differently
+    from a browser survives as markup.
+
+    Returns (markup, removed) where removed counts the elements and
+    attributes dropped.
+    """
+    doc = DOCS.parse(markup)
+    tags = doc.all_tags
+    events = sorted([(tag.start, tag.end, tag) for tag in tags]
+                    + [(start, end, None) for start, end in doc.comments], key=lambda event: event[0])
+    pieces = []
+    removed = 0
+    pos = 0
+    for start, end, tag in events:
+        if start < pos:
+            continue
+        pieces.append(markup[pos:start].replace('<', '&lt;').replace('>', '&gt;'))
+        pos = end
+        if tag is None:
+            continue
+        if tag.name in DROPPED_ELEMENTS:
+            if not tag.closing:
+                close = next((t for t in tags if t.start > tag.start and t.closing and t.name == tag.name), None)
+                pos = close.end if close else len(markup)
+                removed += 1
+            continue
+        if tag.name not in ALLOWED_ELEMENTS:
+            removed += not tag.closing
+            continue
+        if tag.closing:
+            pieces.append(f'</{tag.name}>')
+            continue
+        kept = [(name, value) for name, value in tag.attrs if kept_attribute(name, value)]
+        removed += len(tag.attrs) - len(kept)
+        # Attribute values are kept as written (entities and all)
+        attr_text = ''.join(f' {name}' if value is None else f' {name}="{value.replace(chr(34), "&quot;")}"'
+                            for name, value in kept)
+        pieces.append(f'<{tag.name}{attr_text}{"/>" if doc.raw(tag).endswith("/>") else ">"}')
+    pieces.append(markup[pos:].replace('<', '&lt;').replace('>', '&gt;'))
+    return ''.join(pieces), removed
+
+
+def render_job(job):
+    """
+    Render one work; runs in a worker process when --jobs > 1.
+
+    Args:
+        job (tuple): (work id, path of its JSON, index entries)
+
+    Returns:
+        tuple: (work id, fragment or None, head or None, removed count, error or None)
+    """
+    work_id, json_path, entries = job
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            work = json.load(f)
+    except (OSError, ValueError) as e:
+        return work_id, None, None, 0, f'{type(e).__name__}: {e}'
+    work.setdefault('id', work_id)
+    head = work_head(work)
+    fragment, removed = view_html(work, WorkIndex(entries), head)
+    return work_id, fragment, head, removed, None
+
+
+def run_jobs(jobs, workers):
+    """render_job over jobs, in parallel when workers > 1; results in job order"""
+    if workers <= 1 or len(jobs) <= 1:
+        return [render_job(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render_job, jobs, chunksize=chunksize))
+
+
+def dependency_key(work_id, json_sha, index):
+    """Hash of everything a work's fragment is built from"""
+    entry = index.by_id[work_id]
+    prev, next_ = index.neighbours(work_id)
+    digest = hashlib.sha256()
+    digest.update(f'{RENDER_VERSION}\0{json_sha}\0'.encode('utf-8'))
+    # related() reads the work's `related` ids from its JSON (covered by json_sha)
+    # and the category and order of the index, so every shown entry is hashed
+    shown = [entry, prev, next_] + [other for other in index.entries
+                                     if other.get('category') == entry.get('category')]
+    digest.update(json.dumps(shown, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def fragment_path(work_id, fragment):
+    digest = hashlib.sha256(fragment.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    return f'{DETAIL_DIR_NAME}/{work_id}.{digest}.html'
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != RENDER_VERSION:
+        return {}
+    return cache.get('works', {})
+
+
+def stale_fragments(detail_dir, keep):
+    """Fragments in detail_dir that are not in keep (names relative to works-data/)"""
+    stale = []
+    if not detail_dir.is_dir():
+        return stale
+    with os.scandir(detail_dir) as it:
+        for entry in it:
+            rel = f'{DETAIL_DIR_NAME}/{entry.name}'
+            if FRAGMENT_NAME_RE.match(entry.name) and rel not in keep and entry.is_file():
+                stale.append(rel)
+    return sorted(stale)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Prerender the Works SPA detail view of every work')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='number of worker processes (0 = one per CPU core, default)')
+    parser.add_argument('--force', action='store_true', help='render every work again')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if a fragment or the manifest is out of date')
+    parser.add_argument('--json', metavar='PATH', help='write the per-work report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    start = time.perf_counter()
+
+    data_dir = root / DATA_DIR_NAME
+    detail_dir = data_dir / DETAIL_DIR_NAME
+    inventory = load_inventory(root)
+    index = WorkIndex(load_index(data_dir))
+    cache_path = root / CACHE_FILE
+    cache = {} if args.force else load_cache(cache_path)
+
+    rows = {}
+    jobs = []
+    keys = {}
+    errors = []
+    manifest = {}
+    new_cache = {}
+    pages = {}
+    for entry in index.entries:
+        work_id = entry['id']
+        json_rel = f'{DATA_DIR_NAME}/{work_id}.json'
+        if json_rel not in inventory.entries:
+            errors.append((work_id, f'{json_rel} not found'))
+            continue
+        keys[work_id] = dependency_key(work_id, inventory.sha256(json_rel), index)
+        page_rel = f"{PAGES_DIR_NAME}/{entry['filename']}" if entry.get('filename') else None
+        if page_rel in inventory.entries:
+            pages[work_id] = page_rel
+        page_sha = inventory.sha256(pages[work_id]) if work_id in pages else None
+        cached = cache.get(work_id)
+        if (cached and cached['key'] == keys[work_id] and cached.get('page') == page_sha
+                and (data_dir / cached['file']).is_file()):
+            manifest[work_id] = cached['file']
+            new_cache[work_id] = cached
+            rows[work_id] = {'id': work_id, 'file': cached['file'], 'status': 'cached'}
+            continue
+        jobs.append((work_id, str(root / json_rel), index.entries))
+
+    if workers > 1 and len(jobs) > 1:
+        print(f"Rendering {len(jobs)} works with {workers} worker processes...\n")
+    rendered = {}
+    page_texts = {}
+    for work_id, fragment, head, removed, error in run_jobs(jobs, workers):
+        if error:
+            errors.append((work_id, error))
+            continue
+        rendered[work_id] = fragment
+        manifest[work_id] = fragment_path(work_id, fragment)
+        rows[work_id] = {'id': work_id, 'file': manifest[work_id], 'bytes': len(fragment.encode('utf-8')),
+                         'removed': removed, 'status': 'rendered'}
+        page_sha = None
+        if work_id in pages:
+            doc = DOCS.load(root / pages[work_id])
+            page_text = update_page(doc, head)
+            if page_text is None:
+                errors.append((work_id, f'{pages[work_id]} has no <head>'))
+            else:
+                page_texts[work_id] = (doc.text, page_text)
+                page_sha = hashlib.sha256(page_text.encode('utf-8')).hexdigest()
+                rows[work_id]['page'] = pages[work_id]
+        new_cache[work_id] = {'key': keys[work_id], 'file': manifest[work_id], 'page': page_sha}
+
+    manifest = {work_id: manifest[work_id] for work_id in index.position if work_id in manifest}
+    manifest_text = json.dumps({'version': MANIFEST_VERSION, 'works': manifest},
+                               ensure_ascii=False, indent=2) + '\n'
+    manifest_path = detail_dir / MANIFEST_NAME
+
+    if args.check:
+        outdated = []
+        for work_id, fragment in rendered.items():
+            path = data_dir / manifest[work_id]
+            if not path.is_file() or path.read_text(encoding='utf-8') != fragment:
+                outdated.append(manifest[work_id])
+        for rel in outdated:
+            print(f"✗ {DATA_DIR_NAME}/{rel} missing")
+        for work_id, (old_text, page_text) in page_texts.items():
+            if old_text != page_text:
+                outdated.append(pages[work_id])
+                print(f"✗ {pages[work_id]}: meta tags out of date")
+        stale = bool(outdated or errors)
+        if not manifest_path.is_file() or manifest_path.read_text(encoding='utf-8') != manifest_text:
+            print(f"✗ {DATA_DIR_NAME}/{DETAIL_DIR_NAME}/{MANIFEST_NAME} out of date")
+            stale = True
+        for work_id, message in errors:
+            print(f"✗ {work_id}: {message}")
+        print(f"\n{'✗ Prerendered works out of date (run prerender_works.py)' if stale else '✓ Prerendered works up to date'}")
+        sys.exit(1 if stale else 0)
+
+    with ChangeAwareWriter('prerender_works') as writer:
+        if rendered:
+            detail_dir.mkdir(parents=True, exist_ok=True)
+        for work_id, fragment in rendered.items():
+            rows[work_id]['status'] = writer.write_text(data_dir / manifest[work_id], fragment)
+        for work_id, (_, page_text) in page_texts.items():
+            rows[work_id]['page_status'] = writer.write_text(root / pages[work_id], page_text)
+        manifest_status = writer.write_text(manifest_path, manifest_text)
+        summary = writer.summary()
+    stale = stale_fragments(detail_dir, set(manifest.values()))
+    for rel in stale:
+        (data_dir / rel).unlink()
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(cache_path, (json.dumps({'version': RENDER_VERSION, 'works': new_cache},
+                                               indent=2, sort_keys=True) + '\n').encode('utf-8'))
+    inventory.save()
+    seconds = time.perf_counter() - start
+
+    for work_id in index.position:
+        row = rows.get(work_id)
+        if not row or row['status'] == 'cached':
+            continue
+        mark = '-' if row['status'] == 'unchanged' and row.get('page_status', 'unchanged') == 'unchanged' else '✓'
+        note = f", {row['removed']} unsafe item(s) removed" if row['removed'] else ''
+        page = f"; {row['page']} {row['page_status']}" if 'page' in row else ''
+        print(f"{mark} {work_id} → {row['file']} ({row['bytes']:,} bytes{note}) {row['status']}{page}")
+    for rel in stale:
+        print(f"✗ removed stale {DATA_DIR_NAME}/{rel}")
+    for work_id, message in errors:
+        print(f"✗ {work_id}: {message}")
+
+    print(f"\nSUMMARY:")
+    print(f"  Works: {len(index.entries)} ({len(rendered)} rendered, "
+          f"{sum(1 for row in rows.values() if row['status'] == 'cached')} cached)")
+    print(f"  Work pages: {len(pages)} "
+          f"({sum(1 for row in rows.values() if row.get('page_status') in ('created', 'updated'))} updated)")
+    print(f"  Stale fragments removed: {len(stale)}")
+    print(f"  Manifest: {manifest_status}")
+    print(f"  Errors: {len(errors)}")
+    print(f"  Files: {summary}")
+    print(f"  Time: {seconds:.2f}s")
+
+    if args.json:
+        report = {'works': [rows[work_id] for work_id in index.position if work_id in rows],
+                  'removed': stale, 'errors': [{'id': work_id, 'error': message} for work_id, message in errors],
+                  'seconds': round(seconds, 4)}
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Find the CSS rules no page can use and write stylesheets without them.
+
+common.css, style_2.css and images.css are shared by every page, and each
+page uses only part of them; some of their selectors only ever match markup
+that js/works-spa.js generates (.related-card, .swiper-slide, ...). This
+analyzer collects what the site can produce:
+
+- the class names, ids, tag names and attribute names of every element in
+  every HTML page (includes/ too) and in the markup of JSON string values
+  (works-data fields the SPA renders as HTML)
+- every word in the string, template and regex literals of every script
+  (js/, vendor libraries and inline <script>s), so classes written by
+  element.className = '...', classList.add('...') or HTML template strings
+  count as used; a word just before a ${...} in a template (work-nav-${dir})
+  is a prefix that every class starting with it matches
+- the allowlist (scripts/css-allowlist.txt) for names built any other way
+
+A selector is dead when one of the class names, ids, tags or attributes it
+requires (outside :not()) is never produced. Dead selectors are dropped
+from their rule's selector list, rules left without selectors are dropped,
+then @media blocks left empty and unused @keyframes/@font-face. State
+pseudo-classes (:hover, ...) never make a selector dead.
+
+The pruned stylesheets are written, minified, to css/pruned/ under the
+names of their sources (css/*.css); bundle_css.py builds the pages'
+bundles from them. The report lists every dead rule and the bytes saved
+per stylesheet.
+
+Usage:
+    python3 prune_css.py [--allowlist PATH] [--list] [--check] [--json PATH]
+
+--list prints every dead selector; --check writes nothing and exits with 1
+when css/pruned/ is out of date.
+"""
+
+import argparse
+import fnmatch
+import json
+import posixpath
+import re
+import sys
+import time
+from pathlib import Path
+
+from sitetools.cssrules import (AtRule, Rule, drop_unreferenced, parse_stylesheet, rebase_urls, serialize,
+                               split_selectors)
+from sitetools.doccache import DocCache
+from sitetools.inventory import load_inventory
+from sitetools.minify import JSMinifyError, js_strings, minify_css
+from sitetools.selectors import Selector, build_tree
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ALLOWLIST = Path(__file__).resolve().parent / 'css-allowlist.txt'
+
+SOURCE_DIR = 'css'
+OUTPUT_DIR = 'css/pruned'
+
+# Top-level directories that are in the repository but not part of the site
+NOT_SHIPPED = ('scripts/', 'docs/', 'dev/', '.vscode/')
+
+# Elements a browser creates even when the markup leaves them out
+IMPLIED_TAGS = frozenset({'html', 'head', 'body', 'tbody'})
+
+WORD_RE = re.compile(r'-?[A-Za-z_][-\w]*')
+TEMPLATE_PREFIX_RE = re.compile(r'(-?[A-Za-z_][-\w]*-)\$\{')
+INLINE_SCRIPT_RE = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+QUOTED_RE = re.compile(r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|`(?:[^`\\]|\\.)*`', re.DOTALL)
+
+
+class Usage:
+    """Names the site's markup and scripts can produce."""
+
+    def __init__(self):
+        self.classes = set()
+        self.ids = set()
+        self.tags = set(IMPLIED_TAGS)
+        self.attrs = set()
+        self.words = set()          # from scripts: may be a class, id, tag or attribute
+        self.prefixes = set()       # from templates: 'work-nav-' in `work-nav-${dir}`
+        self.allow = []             # (kind, glob) from the allowlist
+
+    def add_tree(self, root):
+        for element in root.iter():
+            if element.name == '#document':
+                continue
+            self.tags.add(element.name)
+            self.attrs.update(element.attrs)
+            self.classes.update(element.classes)
+            if element.id:
+                self.ids.add(element.id)
+
+    def add_script(self, text):
+        try:
+            literals = js_strings(text)
+        except JSMinifyError:
+            # Unbalanced source: fall back to anything that looks quoted
+            literals = QUOTED_RE.findall(text)
+        for literal in literals:
+            self.words.update(WORD_RE.findall(literal))
+            if literal.startswith('`'):
+                self.prefixes.update(TEMPLATE_PREFIX_RE.findall(literal))
+
+    def _allowed(self, kind, name):
+        return any(k == kind and fnmatch.fnmatchcase(name, pattern) for k, pattern in self.allow)
+
+    def has(self, kind, name):
+        """True when a name of kind ('class', 'id', 'tag', 'attr') can occur"""
+        found = {'class': self.classes, 'id': self.ids, 'tag': self.tags, 'attr': self.attrs}[kind]
+        if name in found or name in self.words or self._allowed(kind, name):
+            return True
+        if kind in ('class', 'id'):
+            return any(name.startswith(prefix) for prefix in self.prefixes)
+        return False
+
+
+def load_allowlist(path):
+    """
+    (kind, glob) entries: '.name' for classes, '#name' for ids, '[name]' for
+    attributes, a bare word for tags; '//' starts a comment
+    """
+    entries = []
+    try:
+        lines = Path(path).read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return entries
+    for line in lines:
+        line = line.split('//', 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith('.'):
+            entries.append(('class', line[1:]))
+        elif line.startswith('#'):
+            entries.append(('id', line[1:]))
+        elif line.startswith('[') and line.endswith(']'):
+            entries.append(('attr', line[1:-1].lower()))
+        else:
+            entries.append(('tag', line.lower()))
+    return entries
+
+
+def requirements(selector):
+    """
+    Alternatives of (kind, name) sets a selector needs; it can match when
+    every name of at least one alternative can occur
+    """
+    alternatives = []
+    for chain in selector.chains:
+        options = [set()]
+        for _, compound in chain:
+            needed = set()
+            if compound.tag:
+                needed.add(('tag', compound.tag))
+            if compound.id:
+                needed.add(('id', compound.id))
+            needed.update(('class', name) for name in compound.classes)
+            needed.update(('attr', name) for name, op, value, insensitive in compound.attrs)
+            options = [option | needed for option in options]
+            for name, argument in compound.pseudos:
+                if name in ('is', 'where', 'matches', '-webkit-any', '-moz-any'):
+                    inner = requirements(argument)
+                    options = [option | extra for option in options for extra in inner]
+                elif name == 'has':
+                    inner = [needs for chain in argument
+                             for needs in requirements(_ChainSelector(chain))]
+                    options = [option | extra for option in options for extra in inner]
+        alternatives.extend(options)
+    return alternatives
+
+
+class _ChainSelector:
+    """A single compiled chain posing as a Selector (for :has() arguments)"""
+
+    def __init__(self, chain):
+        self.chains = [chain]
+
+
+def selector_alive(text, usage):
+    try:
+        selector = Selector(text)
+    except ValueError:
+        return True
+    return any(all(usage.has(kind, name) for kind, name in needs) for needs in requirements(selector))
+
+
+def prune(nodes, usage, dead, context=''):
+    """nodes without dead selectors and rules; dead collects (context, selector)"""
+    kept = []
+    for node in nodes:
+        if isinstance(node, Rule):
+            selectors = split_selectors(node.prelude)
+            alive = [text for text in selectors if selector_alive(text, usage)]
+            dead.extend((context, text) for text in selectors if text not in alive)
+            if alive:
+                prelude = node.prelude if len(alive) == len(selectors) else ','.join(alive)
+                kept.append(Rule(prelude, node.body))
+        elif isinstance(node, AtRule) and node.children is not None:
+            children = prune(node.children, usage, dead, node.prelude)
+            if children:
+                kept.append(node._replace(children=children))
+        else:
+            kept.append(node)
+    return kept
+
+
+def collect_usage(root, inventory, allowlist):
+    usage = Usage()
+    usage.allow = allowlist
+    docs = DocCache()
+    pages = 0
+    scripts = 0
+    for rel in inventory.rel_paths('html'):
+        if rel.startswith(NOT_SHIPPED):
+            continue
+        doc = docs.load(root / rel)
+        usage.add_tree(build_tree(doc))
+        for script in INLINE_SCRIPT_RE.findall(doc.text):
+            usage.add_script(script)
+        for tag in doc.all_tags:
+            for name, value in tag.attrs:
+                if name.startswith('on') and value:
+                    usage.add_script(value)
+        pages += 1
+    for rel in inventory.rel_paths('js'):
+        if rel.startswith(NOT_SHIPPED) or posixpath.dirname(rel) == 'js/min':
+            continue
+        usage.add_script((root / rel).read_text(encoding='utf-8', errors='replace'))
+        scripts += 1
+    for rel in inventory.rel_paths('json'):
+        if rel.startswith(NOT_SHIPPED):
+            continue
+        try:
+            with open(root / rel, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for fragment in markup_strings(data):
+            usage.add_tree(build_tree(docs.parse(fragment)))
+    return usage, pages, scripts
+
+
+def markup_strings(value):
+    """Strings holding markup anywhere in a JSON value (works-data fields the SPA renders)"""
+    if isinstance(value, str):
+        if '<' in value:
+            yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from markup_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from markup_strings(item)
+
+
+def stylesheets(inventory):
+    """Sorted rel paths of the source stylesheets (css/*.css)"""
+    return sorted(rel for rel in inventory.rel_paths('css') if posixpath.dirname(rel) == SOURCE_DIR)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Drop CSS rules that no page or script can use')
+    parser.add_argument('--allowlist', type=Path, default=DEFAULT_ALLOWLIST,
+                        help='names to keep even when unused (default: scripts/css-allowlist.txt)')
+    parser.add_argument('--list', action='store_true', help='print every dead selector')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if css/pruned/ is out of date')
+    parser.add_argument('--json', metavar='PATH', help='write the report (with every dead rule) as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    allowlist = load_allowlist(args.allowlist)
+    usage, page_count, script_count = collect_usage(root, inventory, allowlist)
+
+    rows = []
+    stale = []
+    with ChangeAwareWriter('prune_css') as writer:
+        for rel in stylesheets(inventory):
+            source = (root / rel).read_text(encoding='utf-8')
+            dead = []
+            nodes = parse_stylesheet(source)
+            pruned = drop_unreferenced(prune(nodes, usage, dead))
+            full = minify_css(serialize(nodes))
+            output = f'{OUTPUT_DIR}/{posixpath.basename(rel)}'
+            data = minify_css(rebase_urls(serialize(pruned), SOURCE_DIR, OUTPUT_DIR))
+            if args.check:
+                path = root / output
+                current = path.read_text(encoding='utf-8') if path.is_file() else None
+                status = 'unchanged' if current == data else 'stale'
+                if status == 'stale':
+                    stale.append(output)
+            else:
+                (root / output).parent.mkdir(parents=True, exist_ok=True)
+                status = writer.write_text(root / output, data)
+            rows.append({'stylesheet': rel, 'output': output, 'bytes': len(full.encode('utf-8')),
+                         'pruned_bytes': len(data.encode('utf-8')), 'status': status,
+                         'dead': [{'media': context or None, 'selector': text} for context, text in dead]})
+        summary = writer.summary()
+    inventory.save()
+    seconds = time.perf_counter() - start
+
+    for row in rows:
+        saved = row['bytes'] - row['pruned_bytes']
+        mark = '✗' if row['status'] == 'stale' else '-' if row['status'] == 'unchanged' else '✓'
+        print(f"{mark} {row['stylesheet']}: {len(row['dead'])} dead selector(s), {row['bytes']:,} → "
+              f"{row['pruned_bytes']:,} bytes (-{saved / row['bytes'] * 100 if row['bytes'] else 0:.0f}%) "
+              f"{row['status']}")
+        shown = row['dead'] if args.list else row['dead'][:5]
+        for entry in shown:
+            print(f"    {entry['selector']}" + (f"   (in {entry['media']})" if entry['media'] else ''))
+        if len(row['dead']) > len(shown):
+            print(f"    ... {len(row['dead']) - len(shown)} more (--list shows all)")
+
+    total = sum(row['bytes'] for row in rows)
+    pruned_total = sum(row['pruned_bytes'] for row in rows)
+    print(f"\nSUMMARY:")
+    print(f"  Usage: {page_count} pages, {script_count} scripts, {len(allowlist)} allowlist entries")
+    print(f"  Stylesheets: {len(rows)}")
+    print(f"  Dead selectors: {sum(len(row['dead']) for row in rows)}")
+    print(f"  Size (minified): {total:,} → {pruned_total:,} bytes "
+          f"(saves {(total - pruned_total) / total * 100 if total else 0:.0f}%)")
+    if args.check:
+        print(f"  Out of date: {len(stale)}")
+    else:
+        print(f"  Files: {summary}")
+    print(f"  Time: {seconds:.2f}s")
+    if args.check:
+        print(f"\n{'✗ css/pruned/ out of date (run prune_css.py)' if stale else '✓ css/pruned/ up to date'}")
+
+    if args.json:
+        report = {'stylesheets': rows, 'bytes': total, 'pruned_bytes': pruned_total, 'seconds': round(seconds, 4)}
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+    sys.exit(1 if stale else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,18 @@ import os
 import re
 from pathlib import Path
 
-def remove_align_attributes(html_content):
+from sitetools.doccache import DocCache
+from sitetools.inventory import site_files
+from sitetools.writer import ChangeAwareWriter
+
+DOCS = DocCache()
+
+WRITER = ChangeAwareWriter('remove_deprecated_attrs')
+
+DIV_ALIGN_CENTER = r'<div align=["\']center["\']>'
+ALIGN_ATTR = r'\s+align=["\'][^"\']*["\']'
+
+def remove_align_attributes(html_content, doc=None):
     """
     Remove align attributes from HTML tags.
 
@@ -18,33 +29,40 @@ def remove_align_attributes(html_content):
 
     Args:
         html_content (str): HTML content
+        doc (ParsedDoc): Parsed page from the shared cache, if already loaded
 
     Returns:
         tuple: (modified_content, count_of_changes)
     """
-    count = 0
-
-    # First, handle <div align="center"> that has no class attribute
-    # Replace with <div class="center-container">
-    def replace_div_align_no_class(match):
-        nonlocal count
-        count += 1
-        return '<div class="center-container">'
-
-    pattern1 = r'<div align=["\']center["\']>'
-    modified_content = re.sub(pattern1, replace_div_align_no_class, html_content)
+    if doc is None:
+        doc = DOCS.parse(html_content)
 
-    # Then, remove align attributes from tags that already have classes
-    # (like <div class="img_wrap" align="center">)
-    def replace_align_with_class(match):
-        nonlocal count
-        count += 1
-        return ''
-
-    pattern2 = r'\s+align=["\'][^"\']*["\']'
-    modified_content = re.sub(pattern2, replace_align_with_class, modified_content)
-
-    return modified_content, count
+    count = 0
+    edits = []
+
+    # Only tags that actually carry an align attribute are rewritten
+    for tag in doc.all_tags:
+        if tag.closing or not tag.has('align'):
+            continue
+        raw = doc.raw(tag)
+
+        # First, handle <div align="center"> that has no class attribute
+        # Replace with <div class="center-container">
+        if re.fullmatch(DIV_ALIGN_CENTER, raw):
+            count += 1
+            edits.append((tag.start, tag.end, '<div class="center-container">'))
+            continue
+
+        # Then, remove align attributes from tags that already have classes
+        # (like <div class="img_wrap" align="center">)
+        modified, removed = re.subn(ALIGN_ATTR, '', raw)
+        if removed:
+            count += removed
+            edits.append((tag.start, tag.end, modified))
+
+    if not edits:
+        return html_content, 0
+    return doc.splice(edits), count
 
 def process_html_file(file_path):
     """
@@ -57,14 +75,11 @@ def process_html_file(file_path):
         int: Number of attributes removed
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        modified_content, count = remove_align_attributes(content)
+        doc = DOCS.load(file_path)
+        modified_content, count = remove_align_attributes(doc.text, doc)
 
         if count > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(modified_content)
+            WRITER.write_text(file_path, modified_content)
             print(f"✓ {file_path}: Removed {count} align attributes")
         else:
             print(f"- {file_path}: No deprecated attributes found")
@@ -82,15 +97,8 @@ def main():
     # Get current directory
     root_dir = Path('.')
 
-    # Find all HTML files
-    html_files = list(root_dir.rglob('*.html'))
-
-    # Exclude certain directories
-    excluded_dirs = {'.git', 'node_modules', 'Conversation_Summary'}
-    html_files = [
-        f for f in html_files
-        if not any(excluded in f.parts for excluded in excluded_dirs)
-    ]
+    # Find all HTML files (the site inventory already skips .git, node_modules, ...)
+    html_files = site_files('html', root_dir)
 
     print(f"Found {len(html_files)} HTML files\n")
 
@@ -108,6 +116,7 @@ def main():
     print(f"  Total files processed: {len(html_files)}")
     print(f"  Files modified: {modified_files}")
     print(f"  Total attributes removed: {total_changes}")
+    print(f"  Parse cache: {DOCS.summary()}")
     print(f"{'='*60}")
 
     print(f"\nNote: Most align='center' attributes were redundant as:")
@@ -115,5 +124,7 @@ def main():
     print(f"  - Parent containers already handle centering")
     print(f"  - CSS text-align is inherited from parent divs")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
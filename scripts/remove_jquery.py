@@ -13,29 +13,71 @@ import os
 import re
 from pathlib import Path
 
-def remove_jquery_from_file(filepath):
-    """Remove jQuery script tags from a single HTML file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+from sitetools.doccache import DocCache
+from sitetools.inventory import site_files
+from sitetools.writer import ChangeAwareWriter
+
+DOCS = DocCache()
+
+WRITER = ChangeAwareWriter('remove_jquery')
+
+JQUERY_CDN_PREFIX = 'https://ajax.googleapis.com/ajax/libs/jquery/'
+SAMPLE_JS_SRCS = {'../js/sample.js', 'js/sample.js'}
+
+def references_jquery(doc):
+    """True when the parsed page loads jQuery or sample.js"""
+    for script in doc.tags('script'):
+        src = script.get('src') or ''
+        if src.startswith(JQUERY_CDN_PREFIX) or src in SAMPLE_JS_SRCS:
+            return True
+    return False
+
+def remove_jquery(html_content, doc=None):
+    """
+    Remove jQuery script tags from HTML content.
+
+    Args:
+        html_content (str): HTML content
+        doc (ParsedDoc): Parsed page from the shared cache, if already loaded
 
-    original_content = content
+    Returns:
+        tuple: (modified_content, count_of_removed_tags)
+    """
+    if doc is None:
+        doc = DOCS.parse(html_content)
+
+    # Most pages no longer load jQuery; skip them without running the patterns
+    if not references_jquery(doc):
+        return html_content, 0
+
+    content = html_content
+    count = 0
 
     # Pattern 1: jQuery CDN script tag (with possible variations)
     jquery_cdn_pattern = r'\s*<!-- jQuery -->\s*\n\s*<script src="https://ajax\.googleapis\.com/ajax/libs/jquery/[^"]+"></script>\s*\n'
-    content = re.sub(jquery_cdn_pattern, '', content)
+    content, removed = re.subn(jquery_cdn_pattern, '', content)
+    count += removed
 
     # Pattern 2: sample.js script tag
     sample_js_pattern = r'\s*<script type="text/javascript" src="\.\.\/js\/sample\.js"></script>\s*\n'
-    content = re.sub(sample_js_pattern, '', content)
+    content, removed = re.subn(sample_js_pattern, '', content)
+    count += removed
 
     # Also handle case without ../ prefix (for files in root or different structure)
     sample_js_pattern_alt = r'\s*<script type="text/javascript" src="js\/sample\.js"></script>\s*\n'
-    content = re.sub(sample_js_pattern_alt, '', content)
+    content, removed = re.subn(sample_js_pattern_alt, '', content)
+    count += removed
+
+    return content, count
+
+def remove_jquery_from_file(filepath):
+    """Remove jQuery script tags from a single HTML file."""
+    doc = DOCS.load(filepath)
+    content, count = remove_jquery(doc.text, doc)
 
     # Write back only if changes were made
-    if content != original_content:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    if count > 0:
+        WRITER.write_text(filepath, content)
         return True
     return False
 
@@ -43,12 +85,8 @@ def main():
     # Get project root (parent of scripts/ directory)
     project_root = Path(__file__).parent.parent
 
-    # Find all HTML files
-    html_files = list(project_root.glob('**/*.html'))
-
-    # Exclude node_modules and other unnecessary directories
-    excluded_dirs = {'node_modules', '.git', 'Conversation_Summary'}
-    html_files = [f for f in html_files if not any(ex in f.parts for ex in excluded_dirs)]
+    # Find all HTML files (the site inventory already skips .git, node_modules, ...)
+    html_files = site_files('html', project_root)
 
     modified_count = 0
 
@@ -65,6 +103,9 @@ def main():
     print()
     print(f"Summary: Modified {modified_count} files")
     print(f"Estimated bundle size reduction: ~90KB (jQuery removed)")
+    print(f"Parse cache: {DOCS.summary()}")
+
+    WRITER.close()
 
 if __name__ == '__main__':
     main()
@@ -7,6 +7,11 @@ Cleans up WIP page transition implementation.
 import re
 from pathlib import Path
 
+from sitetools.inventory import site_files
+from sitetools.writer import ChangeAwareWriter
+
+WRITER = ChangeAwareWriter('remove_page_transitions')
+
 def remove_page_transitions(html_content):
     """
     Remove page-transitions.css and page-transitions.js references.
@@ -48,8 +53,7 @@ def process_html_file(file_path):
         modified_content, count = remove_page_transitions(content)
 
         if count > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(modified_content)
+            WRITER.write_text(file_path, modified_content)
             print(f"✓ {file_path}: Removed {count} references")
         else:
             print(f"- {file_path}: No page transition references found")
@@ -67,18 +71,12 @@ def main():
     # Get current directory
     root_dir = Path('.')
 
-    # Find all HTML files
-    html_files = list(root_dir.rglob('*.html'))
+    # Find all HTML files (the site inventory already skips .git, node_modules, ...)
+    html_files = site_files('html', root_dir)
 
-    # Exclude certain directories
-    excluded_dirs = {'.git', 'node_modules', 'Conversation_Summary'}
+    # Exclude certain files
     excluded_files = {'menu-content.html'}
-
-    html_files = [
-        f for f in html_files
-        if not any(excluded in f.parts for excluded in excluded_dirs)
-        and f.name not in excluded_files
-    ]
+    html_files = [f for f in html_files if f.name not in excluded_files]
 
     print(f"Found {len(html_files)} HTML files\n")
 
@@ -103,5 +101,7 @@ def main():
     print(f"  - js/page-transitions.js (deleted)")
     print(f"  - All HTML references cleaned up")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
@@ -15,7 +15,7 @@ from pathlib import Path
 
 def generate_sitemap():
     """Generate sitemap.xml from works-data and static pages."""
-    project_root = Path(__file__).parent.parent
+    project_root = Path(__file__).resolve().parent.parent.parent
     index_file = project_root / 'works-data' / 'index.json'
 
     # Load works data
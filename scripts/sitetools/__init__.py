@@ -0,0 +1,6 @@
+"""
+Shared helpers for the site maintenance and build scripts.
+
+Scripts in scripts/ import this package directly; scripts in subdirectories
+add scripts/ to sys.path first.
+"""
@@ -0,0 +1,254 @@
+"""
+Stylesheets as a list of rules, for tools that keep or drop whole rules.
+
+parse_stylesheet() splits a stylesheet into style rules and at-rules.
+Grouping at-rules (@media, @supports, @layer, @container, ...) hold their
+own list of rules; the others (@font-face, @keyframes, @page, ...) keep
+their block as text, and statements (@import, @charset) have none.
+serialize() turns a (filtered) list back into CSS. Comments are dropped;
+everything else, including strings and url()s, is kept byte for byte.
+
+Usage:
+    from sitetools.cssrules import parse_stylesheet, serialize, split_selectors
+
+    for node in parse_stylesheet(css):
+        if isinstance(node, Rule):
+            selectors = split_selectors(node.prelude)
+"""
+
+import posixpath
+import re
+from collections import namedtuple
+
+# At-rules whose block is a list of rules
+GROUPING_AT_RULES = frozenset({
+    '@media', '@supports', '@layer', '@container', '@document', '@-moz-document', '@scope',
+    '@starting-style',
+})
+
+ANIMATION_PROPERTY_RE = re.compile(r'(?:^|;)\s*animation(?:-name)?\s*:([^;]*)', re.IGNORECASE)
+FONT_PROPERTY_RE = re.compile(r'(?:^|;)\s*font(?:-family)?\s*:([^;]*)', re.IGNORECASE)
+KEYFRAMES_NAME_RE = re.compile(r'@(?:-[a-z]+-)?keyframes\s+["\']?([-\w]+)', re.IGNORECASE)
+FONT_FAMILY_RE = re.compile(r'font-family\s*:\s*["\']?([^;"\']+)', re.IGNORECASE)
+
+URL_RE = re.compile(r'''url\(\s*(?:"([^"]*)"|'([^']*)'|([^)\s]*))\s*\)''', re.IGNORECASE)
+
+
+class Rule(namedtuple('Rule', ['prelude', 'body'])):
+    """A style rule: selector list text and declaration text."""
+
+    __slots__ = ()
+
+
+class AtRule(namedtuple('AtRule', ['name', 'prelude', 'children', 'body'])):
+    """
+    An at-rule.
+
+    name is lower-case with its '@', prelude the full text before the block
+    (name included), children a list of nodes for grouping rules, body the
+    block text for the others; both are None for statements like @import.
+    """
+
+    __slots__ = ()
+
+
+def _skip_string(text, i):
+    """Offset just past the string starting at text[i]"""
+    quote = text[i]
+    i += 1
+    while i < len(text):
+        ch = text[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == quote or ch == '\n':
+            return i + 1
+        i += 1
+    return i
+
+
+def strip_comments(text):
+    """text without /* ... */ comments (strings are respected)"""
+    pieces = []
+    pos = 0
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch in '"\'':
+            i = _skip_string(text, i)
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end = len(text) if end < 0 else end + 2
+            pieces.append(text[pos:i])
+            pieces.append(' ')
+            pos = i = end
+        else:
+            i += 1
+    pieces.append(text[pos:])
+    return ''.join(pieces)
+
+
+def _block_end(text, i):
+    """Offset of the '}' matching the '{' at text[i]"""
+    depth = 0
+    while i < len(text):
+        ch = text[i]
+        if ch in '"\'':
+            i = _skip_string(text, i)
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(text)
+
+
+def _parse_block(text):
+    nodes = []
+    i = 0
+    while i < len(text):
+        # Prelude: up to the next '{' or ';' outside strings and parentheses
+        start = i
+        parens = 0
+        while i < len(text):
+            ch = text[i]
+            if ch in '"\'':
+                i = _skip_string(text, i)
+                continue
+            if ch == '(':
+                parens += 1
+            elif ch == ')':
+                parens = max(0, parens - 1)
+            elif parens == 0 and ch in '{;}':
+                break
+            i += 1
+        prelude = text[start:i].strip()
+        if i >= len(text):
+            break
+        if text[i] in ';}':
+            if prelude.startswith('@'):
+                nodes.append(AtRule(_at_name(prelude), prelude, None, None))
+            i += 1
+            continue
+
+        end = _block_end(text, i)
+        body = text[i + 1:end]
+        if prelude.startswith('@'):
+            name = _at_name(prelude)
+            if name in GROUPING_AT_RULES:
+                nodes.append(AtRule(name, prelude, _parse_block(body), None))
+            else:
+                nodes.append(AtRule(name, prelude, None, body.strip()))
+        elif prelude:
+            nodes.append(Rule(prelude, body.strip()))
+        i = end + 1
+    return nodes
+
+
+def _at_name(prelude):
+    match = re.match(r'@[-\w]+', prelude)
+    return match.group(0).lower() if match else prelude
+
+
+def parse_stylesheet(text):
+    """List of Rule and AtRule nodes of a stylesheet"""
+    return _parse_block(strip_comments(text))
+
+
+def serialize(nodes):
+    """CSS text of a list of nodes"""
+    pieces = []
+    for node in nodes:
+        if isinstance(node, Rule):
+            pieces.append(f'{node.prelude}{{{node.body}}}')
+        elif node.children is not None:
+            pieces.append(f'{node.prelude}{{{serialize(node.children)}}}')
+        elif node.body is not None:
+            pieces.append(f'{node.prelude}{{{node.body}}}')
+        else:
+            pieces.append(f'{node.prelude};')
+    return ''.join(pieces)
+
+
+def split_selectors(prelude):
+    """Selector list text split at its top-level commas"""
+    selectors = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(prelude):
+        ch = prelude[i]
+        if ch in '"\'':
+            i = _skip_string(prelude, i)
+            continue
+        if ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth = max(0, depth - 1)
+        elif ch == ',' and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+        i += 1
+    selectors.append(prelude[start:].strip())
+    return [selector for selector in selectors if selector]
+
+
+def _declarations(nodes):
+    for node in nodes:
+        if isinstance(node, Rule):
+            yield node.body
+        elif node.children is not None:
+            yield from _declarations(node.children)
+
+
+def drop_unreferenced(nodes):
+    """
+    nodes without the @keyframes and @font-face blocks that none of their
+    style rules refers to (and without grouping rules left empty)
+    """
+    animations = set()
+    fonts = set()
+    for body in _declarations(nodes):
+        for value in ANIMATION_PROPERTY_RE.findall(body):
+            animations.update(re.findall(r'[-\w]+', value))
+        for value in FONT_PROPERTY_RE.findall(body):
+            fonts.update(part.strip().strip('"\'').lower() for part in value.split(','))
+
+    def keep(nodes):
+        result = []
+        for node in nodes:
+            if isinstance(node, AtRule) and node.children is not None:
+                children = keep(node.children)
+                if children:
+                    result.append(node._replace(children=children))
+                continue
+            if isinstance(node, AtRule) and node.name.endswith('keyframes'):
+                match = KEYFRAMES_NAME_RE.match(node.prelude)
+                if not match or match.group(1) not in animations:
+                    continue
+            if isinstance(node, AtRule) and node.name == '@font-face':
+                match = FONT_FAMILY_RE.search(node.body or '')
+                if not match or match.group(1).strip().lower() not in fonts:
+                    continue
+            result.append(node)
+        return result
+
+    return keep(nodes)
+
+
+def rebase_urls(css, from_dir, to_dir):
+    """
+    Rewrite relative url()s written for a stylesheet in from_dir so they work
+    from to_dir (both site-relative directories)
+    """
+    def rebase(match):
+        url = next(group for group in match.groups() if group is not None)
+        if not url or url.startswith(('data:', '#', '/')) or '://' in url:
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(from_dir, url))
+        return f'url("{posixpath.relpath(target, to_dir or ".")}")'
+
+    return URL_RE.sub(rebase, css)
@@ -0,0 +1,296 @@
+"""
+Parsed-document cache shared by the HTML maintenance scripts.
+
+Each page is tokenized once into a compact list of tags (name, offsets,
+attributes) and comment spans. The result is keyed by the SHA-256 of the
+page content, kept in an in-memory LRU, and pickled under .cache/parsed-html/
+so a later run (of any script) only re-parses pages whose content changed.
+transform_html.py prunes the pickles that no longer match any page.
+
+Each script keeps one module-level instance (DOCS = DocCache()); the
+scripts share their parsed pages through .cache/parsed-html/.
+
+Usage:
+    from sitetools.doccache import DocCache
+
+    docs = DocCache()
+    doc = docs.load(path)
+    for img in doc.tags('img'):
+        if img.get('loading') is None:
+            ...
+"""
+
+import hashlib
+import pickle
+import re
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+from sitetools.htmlscan import TagScanner
+from sitetools.writer import atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_DIR = BASE_DIR / '.cache' / 'parsed-html'
+
+# Bump when the stored representation changes; older entries are re-parsed
+FORMAT_VERSION = 1
+
+TAG_NAME_RE = re.compile(r'<(/?)([A-Za-z][A-Za-z0-9:-]*)')
+ATTR_RE = re.compile(r'''([^\s"'<>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?''')
+
+# Elements whose content is raw text: tag-like text inside them is not markup
+RAW_TEXT_ELEMENTS = {'script', 'style'}
+
+
+class Tag(namedtuple('Tag', ['name', 'start', 'end', 'closing', 'attrs'])):
+    """
+    One tag of a parsed page.
+
+    name is lower-case, start/end are offsets into the page text, closing is
+    True for '</name>' and attrs is a tuple of (name, value) pairs in source
+    order (value is None for bare attributes such as 'defer').
+    """
+
+    __slots__ = ()
+
+    def get(self, attr, default=None):
+        """Value of the first attribute called attr"""
+        for name, value in self.attrs:
+            if name == attr:
+                return value
+        return default
+
+    def has(self, attr):
+        return any(name == attr for name, _ in self.attrs)
+
+
+def parse_attrs(raw, name_end):
+    """Parse the attributes of a raw start tag, starting after its name"""
+    attrs = []
+    body = raw[name_end:].rstrip('>').rstrip('/')
+    for match in ATTR_RE.finditer(body):
+        value = match.group(2)
+        if value is None:
+            value = match.group(3)
+        if value is None:
+            value = match.group(4)
+        attrs.append((match.group(1).lower(), value))
+    return tuple(attrs)
+
+
+def tokenize(text):
+    """
+    Tokenize a page into (tags, comments).
+
+    tags is a list of plain tuples in Tag field order; comments is a list of
+    (start, end) spans. Tag-like text inside <script> and <style> is skipped.
+    """
+    scanner = TagScanner(text)
+    tags = []
+    raw_text_end = None
+
+    for match in scanner:
+        raw = match.group()
+        name_match = TAG_NAME_RE.match(raw)
+        if not name_match:
+            continue
+        closing = name_match.group(1) == '/'
+        name = name_match.group(2).lower()
+
+        if raw_text_end is not None:
+            if not (closing and name == raw_text_end):
+                continue
+            raw_text_end = None
+
+        attrs = () if closing else parse_attrs(raw, name_match.end())
+        tags.append((name, match.start(), match.end(), closing, attrs))
+
+        if not closing and name in RAW_TEXT_ELEMENTS and not raw.endswith('/>'):
+            raw_text_end = name
+
+    comments = list(zip(scanner._comment_starts, scanner._comment_ends))
+    return tags, comments
+
+
+class ParsedDoc:
+    """A page's text together with its cached tags and comment spans."""
+
+    def __init__(self, text, sha256, tags, comments, path=None):
+        self.text = text
+        self.sha256 = sha256
+        self.path = path
+        self._tags = tags
+        self._wrapped = None
+        self.comments = comments
+
+    @property
+    def all_tags(self):
+        if self._wrapped is None:
+            self._wrapped = [Tag._make(tag) for tag in self._tags]
+        return self._wrapped
+
+    def tags(self, name=None, closing=False):
+        """Start tags (or closing tags) called name, or all of them if name is None"""
+        return [tag for tag in self.all_tags
+                if tag.closing == closing and (name is None or tag.name == name)]
+
+    def first(self, name, closing=False):
+        for tag in self.all_tags:
+            if tag.name == name and tag.closing == closing:
+                return tag
+        return None
+
+    def raw(self, tag):
+        """Source text of a tag"""
+        return self.text[tag.start:tag.end]
+
+    def comment_texts(self):
+        """Body of every comment, without '<!--' and '-->'"""
+        return [self.text[start + 4:end - 3] for start, end in self.comments]
+
+    def splice(self, edits):
+        """
+        Apply (start, end, replacement) edits to the page text.
+
+        Edits must not overlap; they are applied in offset order so a script
+        can collect them from tags() and rewrite the page in one pass.
+        """
+        pieces = []
+        pos = 0
+        for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+            pieces.append(self.text[pos:start])
+            pieces.append(replacement)
+            pos = end
+        pieces.append(self.text[pos:])
+        return ''.join(pieces)
+
+    def without_comments(self):
+        """Page text with every comment removed"""
+        return self.splice((start, end, '') for start, end in self.comments)
+
+
+class DocCache:
+    """
+    Content-addressed cache of parsed pages.
+
+    Args:
+        cache_dir (Path): Where parsed pages are pickled; None keeps the
+            cache in memory only.
+        max_entries (int): How many parsed pages to keep in memory.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=256):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.parses = 0
+
+    def load(self, path):
+        """Read a file and return its ParsedDoc"""
+        path = Path(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        return self.parse(text, path)
+
+    def parse(self, text, path=None):
+        """Return the ParsedDoc for text, parsing only on a full cache miss"""
+        sha256 = hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+        entry = self._memory.get(sha256)
+        if entry is not None:
+            self._memory.move_to_end(sha256)
+            self.memory_hits += 1
+        else:
+            entry = self._read_disk(sha256)
+            if entry is not None:
+                self.disk_hits += 1
+            else:
+                entry = tokenize(text)
+                self.parses += 1
+                self._write_disk(sha256, entry)
+            self._remember(sha256, entry)
+
+        tags, comments = entry
+        return ParsedDoc(text, sha256, tags, comments, path)
+
+    def forget(self, text):
+        """Drop the in-memory entry for text (e.g. after rewriting a file)"""
+        sha256 = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        self._memory.pop(sha256, None)
+
+    def prune(self, paths):
+        """
+        Delete pickled entries that match none of the given pages.
+
+        Every rewrite leaves the parse of the page's previous content behind,
+        so a run over the whole site passes all its pages here afterwards.
+        Returns the number of entries removed.
+        """
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return 0
+        keep = set()
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    keep.add(hashlib.sha256(f.read().encode('utf-8')).hexdigest())
+            except (OSError, UnicodeDecodeError):
+                continue
+
+        removed = 0
+        for shard in self.cache_dir.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry_path in shard.glob('*.pickle'):
+                if entry_path.stem not in keep:
+                    try:
+                        entry_path.unlink()
+                        removed += 1
+                    except OSError:
+                        pass
+            try:
+                shard.rmdir()  # only succeeds once the shard is empty
+            except OSError:
+                pass
+        return removed
+
+    def summary(self):
+        return (f"parsed {self.parses}, memory hits {self.memory_hits}, "
+                f"disk hits {self.disk_hits}")
+
+    def _remember(self, sha256, entry):
+        self._memory[sha256] = entry
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _entry_path(self, sha256):
+        return self.cache_dir / sha256[:2] / f"{sha256}.pickle"
+
+    def _read_disk(self, sha256):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._entry_path(sha256), 'rb') as f:
+                version, entry = pickle.load(f)
+            if version != FORMAT_VERSION:
+                return None
+            tags, comments = entry
+        except (OSError, EOFError, AttributeError, ImportError, IndexError,
+                TypeError, ValueError, pickle.UnpicklingError):
+            # Truncated, foreign or old-format pickles are plain misses
+            return None
+        return tags, comments
+
+    def _write_disk(self, sha256, entry):
+        if self.cache_dir is None:
+            return
+        path = self._entry_path(sha256)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic, so a concurrent reader never sees half a pickle
+            atomic_write_bytes(path, pickle.dumps((FORMAT_VERSION, entry),
+                                                  protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            # The cache is an optimisation; a read-only tree just means re-parsing
+            pass
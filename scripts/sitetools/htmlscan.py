@@ -0,0 +1,80 @@
+"""
+Single-pass tag scanner for the site's HTML pages.
+
+The maintenance scripts match literal markup such as '<dt>Credit</dt>' or
+'<div id="content_in">' after stripping comments with
+re.sub(r'<!--.*?-->', '', html). This scanner works at that same level
+instead of building a DOM: one left-to-right pass splits the page into
+comments and '<...>' tags, and text between two tags can be sliced out with
+the comments already removed.
+"""
+
+import bisect
+import re
+
+# Tag body: anything between '<' and the next '>' that contains no other '<'.
+# Tags never contain '<', so every literal the scripts search for that starts
+# with '<' and ends with '>' is always seen as exactly one tag.
+ANY_TAG = r'[^<>]*'
+
+# Comments are matched as '<' + '!--...--' + '>' so the pattern starts with a
+# literal '<', which lets the regex engine skip straight to the next candidate.
+TOKEN_TEMPLATE = r'<(?:(!--.*?--)|{tags})>'
+
+
+class TagScanner:
+    """
+    Iterate over the tags of an HTML string, skipping comments.
+
+    Each tag is yielded as its re.Match object: tag.group() is the raw tag
+    text and tag.start() / tag.end() its offsets. Building a tuple per tag
+    would double the cost of a scan on large pages.
+
+    Comment positions are recorded while scanning, so clean() can return any
+    already-scanned span of the page with its comments removed.
+
+    Args:
+        text (str): HTML content
+        tags (str): Regex for the tag bodies to report. Callers that only
+            care about a few tags pass a narrower pattern; everything else is
+            left in the text between tags, where it still shows up as '<'.
+    """
+
+    def __init__(self, text, tags=ANY_TAG):
+        self.text = text
+        # re caches compiled patterns, so repeated scanners cost nothing extra
+        self._token_re = re.compile(TOKEN_TEMPLATE.format(tags=tags), re.DOTALL)
+        self._comment_starts = []
+        self._comment_ends = []
+        # _comment_total[i]: combined length of the first i comments
+        self._comment_total = [0]
+
+    def __iter__(self):
+        for match in self._token_re.finditer(self.text):
+            if match.group(1) is not None:
+                self._comment_starts.append(match.start())
+                self._comment_ends.append(match.end())
+                self._comment_total.append(self._comment_total[-1] + match.end() - match.start())
+                continue
+            yield match
+
+    def clean(self, start, end):
+        """Return text[start:end] with comments removed."""
+        lo = bisect.bisect_left(self._comment_starts, start)
+        hi = bisect.bisect_left(self._comment_starts, end)
+        if lo == hi:
+            return self.text[start:end]
+
+        pieces = []
+        pos = start
+        for i in range(lo, hi):
+            pieces.append(self.text[pos:self._comment_starts[i]])
+            pos = self._comment_ends[i]
+        pieces.append(self.text[pos:end])
+        return ''.join(pieces)
+
+    def is_empty(self, start, end):
+        """True when text[start:end] is empty once comments are removed"""
+        lo = bisect.bisect_left(self._comment_starts, start)
+        hi = bisect.bisect_left(self._comment_starts, end)
+        return self._comment_total[hi] - self._comment_total[lo] == end - start
@@ -0,0 +1,269 @@
+"""
+Loading policy for the images of a page: loading, decoding, fetchpriority.
+
+Marking every <img> loading="lazy" also delays the images a visitor sees
+first, the page's LCP candidates, until layout has run. Their position is
+predictable from the page structure, so each image is placed by the first
+rule that matches it:
+
+- portrait: a slide of the About page's photo carousel
+- swiper:   a slide of a Swiper carousel (work detail views)
+- grid:     a thumbnail block (.img_wrap) of the works grid
+- related:  a card of a Related band
+- default:  anything else; the page's first image counts as above the fold
+
+and gets one of these levels:
+
+- lead:     loading="eager" fetchpriority="high" -- the first slide, the
+            first grid block, or the first image of a page without either
+- eager:    loading="eager" -- the rest of the first grid row
+- lazy:     loading="lazy"
+- deferred: no loading attribute; the image has data-src and
+            js/lazy-load-images.js sets its src when it scrolls into view
+
+Every image is decoded off the main thread (decoding="async"). The lead
+image of a page with a <head> is also preloaded with
+<link rel="preload" as="image" data-image-policy>, so the request starts
+before the parser reaches the <img>.
+
+Usage:
+    from sitetools.imagepolicy import apply_policy
+
+    new_text, decisions, preload = apply_policy(doc, page_rel)
+    for decision in decisions:
+        print(decision.rule, decision.position, decision.src, decision.summary())
+"""
+
+import html
+from collections import namedtuple
+
+# Grid blocks in the first row at desktop width (.img_wrap is 30% wide);
+# generate_works_grid.py uses the same count
+GRID_ROW = 3
+
+PRELOAD_MARKER = 'data-image-policy'
+
+# level -> (loading, fetchpriority)
+LEVELS = {
+    'lead': ('eager', 'high'),
+    'eager': ('eager', None),
+    'lazy': ('lazy', None),
+    'deferred': (None, None),
+}
+
+VOID_ELEMENTS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+                           'meta', 'param', 'source', 'track', 'wbr'})
+
+# Content the visitor never sees as an image of the page
+HIDDEN_ELEMENTS = frozenset({'noscript', 'template'})
+
+
+class Decision(namedtuple('Decision', ['tag', 'src', 'rule', 'position', 'level'])):
+    """
+    The policy for one <img>.
+
+    tag is the image's Tag, src its real URL (data-src for deferred images),
+    rule the name of the rule that placed it, position its index among the
+    images that rule counts (slides, grid blocks, ...) and level one of
+    LEVELS.
+    """
+
+    __slots__ = ()
+
+    @property
+    def loading(self):
+        return LEVELS[self.level][0]
+
+    @property
+    def fetchpriority(self):
+        return LEVELS[self.level][1]
+
+    def summary(self):
+        pieces = [f'loading={self.loading}'] if self.loading else ['loading by script']
+        if self.fetchpriority:
+            pieces.append(f'fetchpriority={self.fetchpriority}')
+        return ' '.join(pieces)
+
+
+class ImageContext:
+    """Where an <img> sits: the structure the rules look at."""
+
+    def __init__(self, page_rel, tag, classes, counters, index):
+        self.page_rel = page_rel
+        self.tag = tag
+        self.classes = classes
+        self.index = index
+        self.slide = counters['slide'] if 'swiper-slide' in classes else None
+        self.grid = counters['grid'] if 'img_wrap' in classes else None
+        self.deferred = tag.has('data-src')
+
+    @property
+    def section(self):
+        return self.page_rel.split('/', 1)[0] if '/' in self.page_rel else ''
+
+
+def _carousel(ctx):
+    return ctx.slide, 'lead' if ctx.slide == 0 else 'lazy'
+
+
+def _grid(ctx):
+    if ctx.grid == 0:
+        level = 'lead'
+    elif ctx.grid < GRID_ROW:
+        level = 'eager'
+    else:
+        level = 'deferred' if ctx.deferred else 'lazy'
+    return ctx.grid, level
+
+
+def _default(ctx):
+    if ctx.deferred:
+        return ctx.index, 'deferred'
+    return ctx.index, 'lead' if ctx.index == 0 else 'lazy'
+
+
+# (name, matches(ctx), place(ctx) -> (position, level)); the first match wins
+RULES = (
+    ('portrait', lambda ctx: ctx.section == 'about' and ctx.slide is not None, _carousel),
+    ('swiper', lambda ctx: ctx.slide is not None, _carousel),
+    ('grid', lambda ctx: ctx.grid is not None, _grid),
+    ('related', lambda ctx: 'related-card' in ctx.classes, lambda ctx: (ctx.index, 'lazy')),
+    ('default', lambda ctx: True, _default),
+)
+
+
+def decide(doc, page_rel):
+    """Decision for every visible <img> of a page, in document order"""
+    stack = []  # (name, classes) of open elements
+    counters = {'slide': -1, 'grid': -1}
+    decisions = []
+    hidden = 0
+    for tag in doc.all_tags:
+        if tag.closing:
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == tag.name:
+                    if tag.name in HIDDEN_ELEMENTS:
+                        hidden = max(0, hidden - 1)
+                    del stack[depth:]
+                    break
+            continue
+        classes = set((tag.get('class') or '').split())
+        if 'swiper-container' in classes or 'swiper' in classes:
+            counters['slide'] = -1
+        if 'swiper-slide' in classes:
+            counters['slide'] += 1
+        if 'img_wrap' in classes:
+            counters['grid'] += 1
+        if tag.name in HIDDEN_ELEMENTS:
+            hidden += 1
+        if tag.name == 'img':
+            if hidden:
+                continue
+            inherited = set().union(*(entry[1] for entry in stack)) if stack else set()
+            ctx = ImageContext(page_rel, tag, inherited | classes, counters, len(decisions))
+            for name, matches, place in RULES:
+                if matches(ctx):
+                    position, level = place(ctx)
+                    break
+            src = tag.get('data-src') if ctx.deferred else tag.get('src')
+            decisions.append(Decision(tag, src or '', name, position, level))
+            continue
+        if tag.name not in VOID_ELEMENTS and not doc.raw(tag).endswith('/>'):
+            stack.append((tag.name, classes))
+    return decisions
+
+
+def lcp_candidate(decisions):
+    """The decision worth a preload: the first lead image with a fetchable src"""
+    for decision in decisions:
+        if decision.level == 'lead' and decision.src and not decision.src.startswith('data:'):
+            return decision
+    return None
+
+
+def _attr_text(name, value):
+    if value is None:
+        return f' {name}'
+    return f' {name}="{value.replace(chr(34), "&quot;")}"'
+
+
+def image_tag(doc, decision):
+    """The <img> with the decision's attributes; others keep their order and text"""
+    tag = decision.tag
+    wanted = {'loading': decision.loading, 'fetchpriority': decision.fetchpriority, 'decoding': 'async'}
+    pieces = []
+    for name, value in tag.attrs:
+        if name in wanted:
+            value = wanted.pop(name)
+            if value is None:
+                continue
+        pieces.append(_attr_text(name, value))
+    for name, value in wanted.items():
+        if value is not None:
+            pieces.append(_attr_text(name, value))
+    end = '/>' if doc.raw(tag).endswith('/>') else '>'
+    return f'<{tag.name}{"".join(pieces)}{end}'
+
+
+def preload_tag(decision):
+    href = html.escape(decision.src, quote=True)
+    return f'<link rel="preload" as="image" href="{href}" fetchpriority="high" {PRELOAD_MARKER}>'
+
+
+def apply_policy(doc, page_rel):
+    """
+    Page text with the policy applied.
+
+    Returns (text, decisions, preload) where preload is the LCP decision
+    that got a <link rel="preload"> (None for pages without a <head>).
+    """
+    decisions = decide(doc, page_rel)
+    edits = []
+    for decision in decisions:
+        new_tag = image_tag(doc, decision)
+        if new_tag != doc.raw(decision.tag):
+            edits.append((decision.tag.start, decision.tag.end, new_tag))
+
+    preload = None
+    head_open = doc.first('head')
+    head_close = doc.first('head', closing=True)
+    if head_open and head_close:
+        candidate = lcp_candidate(decisions)
+        existing = [tag for tag in doc.tags('link')
+                    if tag.has(PRELOAD_MARKER) and tag.start < head_close.start]
+        for tag in existing[1:]:
+            edits.append((tag.start, tag.end, ''))
+        if candidate:
+            preload = candidate
+            link = preload_tag(candidate)
+            if existing:
+                if doc.raw(existing[0]) != link:
+                    edits.append((existing[0].start, existing[0].end, link))
+            else:
+                edits.append(_insert_in_head(doc, head_open, head_close, link))
+        elif existing:
+            edits.append((existing[0].start, existing[0].end, ''))
+
+    text = doc.splice(edits) if edits else doc.text
+    return text, decisions, preload
+
+
+def _insert_in_head(doc, head_open, head_close, markup):
+    """Edit placing markup on its own line before the page's first stylesheet"""
+    anchor = head_close
+    for tag in doc.all_tags:
+        if tag.start <= head_open.start or tag.closing:
+            continue
+        if tag.start >= head_close.start:
+            break
+        if tag.name in ('style', 'noscript') or (tag.name == 'link' and tag.get('rel') == 'stylesheet'):
+            anchor = tag
+            break
+    text = doc.text
+    line_start = text.rfind('\n', 0, anchor.start) + 1
+    indent = text[line_start:anchor.start]
+    if indent.strip():
+        return anchor.start, anchor.start, markup
+    if anchor is head_close:
+        return line_start, line_start, f'{indent}    {markup}\n'
+    return anchor.start, anchor.start, f'{markup}\n{indent}'
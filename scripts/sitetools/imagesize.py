@@ -0,0 +1,83 @@
+"""
+Intrinsic size of an image file, read from its header.
+
+The format is sniffed from the first bytes rather than the extension (some
+files under image/ are JPEGs named .webp). PNG, GIF and WebP keep the size
+in the first 30 bytes; for JPEG the segments are walked with seeks until the
+first SOF marker, so large EXIF blocks are skipped without being read.
+
+Usage:
+    from sitetools.imagesize import image_size
+
+    size = image_size(path)   # (width, height) or None
+"""
+
+import struct
+
+HEADER_BYTES = 32
+
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...);
+# 0xC4 (DHT), 0xC8 (JPG) and 0xCC (DAC) share the range but aren't frames
+SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_size(f):
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            # Standalone markers carry no length
+            continue
+        if marker == 0xD9:
+            return None
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>HH', data[1:5])
+            return width, height
+        f.seek(length - 2, 1)
+
+
+def _webp_size(header):
+    chunk = header[12:16]
+    if chunk == b'VP8 ' and len(header) >= 30:
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(header) >= 25:
+        bits = struct.unpack('<I', header[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(header) >= 30:
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return width, height
+    return None
+
+
+def image_size(path):
+    """(width, height) of a PNG, JPEG, GIF or WebP file; None if unknown or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_BYTES)
+            if header.startswith(b'\x89PNG\r\n\x1a\n') and len(header) >= 24:
+                return struct.unpack('>II', header[16:24])
+            if header[:6] in (b'GIF87a', b'GIF89a') and len(header) >= 10:
+                return struct.unpack('<HH', header[6:10])
+            if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+                return _webp_size(header)
+            if header[:2] == b'\xff\xd8':
+                return _jpeg_size(f)
+    except (OSError, struct.error):
+        return None
+    return None
@@ -0,0 +1,186 @@
+"""
+Persistent inventory of the site's files.
+
+The tree is walked once with os.scandir, pruning tool and history
+directories (.git, node_modules, ...) before descending into them. Every
+file is recorded with its size, mtime and (computed only when asked for) its
+SHA-256. The inventory is saved to .cache/inventory.json; the next refresh
+re-stats the tree and keeps each stored hash as long as the file's size and
+mtime are unchanged.
+
+Usage:
+    from sitetools.inventory import site_files
+
+    for html_file in site_files('html', Path('.')):
+        ...
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from sitetools.writer import atomic_write_bytes
+
+# Bump when the stored format changes; older inventories are rebuilt
+FORMAT_VERSION = 1
+
+# Directories that are never part of the site
+EXCLUDED_DIRS = frozenset({
+    '.git', 'node_modules', 'Conversation_Summary', '.claude', '.cache', '__pycache__',
+})
+
+KIND_SUFFIXES = {
+    'html': ('.html',),
+    'css': ('.css',),
+    'js': ('.js',),
+    'json': ('.json',),
+    'image': ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.svg', '.ico'),
+}
+
+
+def file_kind(rel_path):
+    """Kind of a file from its suffix, or None for anything else"""
+    suffix = os.path.splitext(rel_path)[1].lower()
+    for kind, suffixes in KIND_SUFFIXES.items():
+        if suffix in suffixes:
+            return kind
+    return None
+
+
+class SiteInventory:
+    """
+    Files under root, keyed by their '/'-separated path relative to root.
+
+    Args:
+        root (Path): Site root; paths returned by files() are root / rel.
+        cache_path (Path): Where the inventory is saved (default
+            root/.cache/inventory.json).
+    """
+
+    def __init__(self, root, cache_path=None):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else self.root / '.cache' / 'inventory.json'
+        # rel path -> [size, mtime_ns, sha256 or None]
+        self.entries = {}
+        self.added = []
+        self.changed = []
+        self.removed = []
+        self._dirty = False
+
+    def load(self):
+        """Read the saved inventory; a missing or stale file means an empty one"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get('version') == FORMAT_VERSION:
+            self.entries = data.get('files', {})
+        return self
+
+    def save(self):
+        """Write the inventory if a refresh or a new hash changed it"""
+        if not self._dirty:
+            return
+        data = {'version': FORMAT_VERSION, 'files': self.entries}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.cache_path, json.dumps(
+                data, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+            self._dirty = False
+        except OSError:
+            # Read-only checkout: the inventory simply isn't reused next time
+            pass
+
+    def _scan(self):
+        """Walk the tree once; returns rel path -> (size, mtime_ns)"""
+        found = {}
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                it = os.scandir(self.root / rel_dir if rel_dir else self.root)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDED_DIRS:
+                            stack.append(rel)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        found[rel] = (stat.st_size, stat.st_mtime_ns)
+        return found
+
+    def refresh(self):
+        """
+        Bring the inventory up to date with the tree.
+
+        Hashes of files whose size and mtime are unchanged are kept. The
+        paths that were added, changed or removed are left in self.added,
+        self.changed and self.removed.
+        """
+        found = self._scan()
+        self.added = []
+        self.changed = []
+        self.removed = sorted(rel for rel in self.entries if rel not in found)
+
+        entries = {}
+        for rel, (size, mtime_ns) in found.items():
+            old = self.entries.get(rel)
+            if old is None:
+                self.added.append(rel)
+                entries[rel] = [size, mtime_ns, None]
+            elif old[0] != size or old[1] != mtime_ns:
+                self.changed.append(rel)
+                entries[rel] = [size, mtime_ns, None]
+            else:
+                entries[rel] = old
+
+        self.added.sort()
+        self.changed.sort()
+        if self.added or self.changed or self.removed:
+            self._dirty = True
+        self.entries = entries
+        return self
+
+    def rel_paths(self, kind=None):
+        """Sorted rel paths, optionally only those of one kind"""
+        return sorted(rel for rel in self.entries
+                      if kind is None or file_kind(rel) == kind)
+
+    def files(self, kind=None):
+        """Sorted Paths (root / rel), optionally only those of one kind"""
+        return [self.root / rel for rel in self.rel_paths(kind)]
+
+    def size(self, rel):
+        return self.entries[rel][0]
+
+    def mtime_ns(self, rel):
+        return self.entries[rel][1]
+
+    def sha256(self, rel):
+        """SHA-256 of a file, computed on first use and kept until it changes"""
+        entry = self.entries[rel]
+        if entry[2] is None:
+            sha = hashlib.sha256()
+            with open(self.root / rel, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            entry[2] = sha.hexdigest()
+            self._dirty = True
+        return entry[2]
+
+
+def load_inventory(root):
+    """Load, refresh and save the inventory of root"""
+    inventory = SiteInventory(root).load().refresh()
+    inventory.save()
+    return inventory
+
+
+def site_files(kind, root):
+    """Sorted Paths of every file of one kind ('html', 'css', 'json', ...) under root"""
+    return load_inventory(root).files(kind)
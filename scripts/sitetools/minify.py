@@ -0,0 +1,413 @@
+"""
+Conservative CSS and JavaScript minifiers in plain Python.
+
+Both work on a token stream rather than on raw regexes, so the contents of
+strings, url()s, regex literals and template literals are copied through
+untouched. Licence comments (/*! ... */) are kept.
+
+CSS: comments and insignificant whitespace go, the last ';' of each block
+is dropped, and declaration values are shortened: 0px -> 0 (outside calc()
+and the like), 0.50 -> .5, #ffffff -> #fff, and four-value box shorthands
+(margin: 0 1px 0 1px -> margin:0 1px). Custom properties keep their value
+as written.
+
+JavaScript: comments go and whitespace is reduced to what separates tokens.
+A line break is kept wherever automatic semicolon insertion could depend on
+it, so the output does not rely on the source having every semicolon.
+Identifiers are never renamed.
+
+Usage:
+    from sitetools.minify import minify_css, minify_js
+
+    css = minify_css(source_text)
+"""
+
+import re
+
+# ---------------------------------------------------------------------------
+# CSS
+# ---------------------------------------------------------------------------
+
+CSS_TOKEN_RE = re.compile(r'''
+    (?P<comment>/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<url>url\(\s*[^'")\s][^)]*\))
+  | (?P<space>\s+)
+''', re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+# Placeholders for protected text; \x00 never occurs in a stylesheet
+PLACEHOLDER = '\x00{}\x00'
+PLACEHOLDER_RE = re.compile('\x00(\\d+)\x00')
+
+# Whitespace next to these characters carries no meaning
+CSS_TIGHT_RE = re.compile(r'\s*([{};,>~])\s*')
+
+DECLARATION_RE = re.compile(r'(?<=[{;])([-\w]+):([^;{}]+)(?=[;}])')
+
+LENGTH_UNITS = ('px', 'em', 'rem', 'ex', 'ch', 'vw', 'vh', 'vmin', 'vmax',
+                'cm', 'mm', 'in', 'pt', 'pc', 'q')
+ZERO_LENGTH_RE = re.compile(r'(?<![\w.#-])(-?)0+(?:\.0+)?(?:%s)(?![\w%%])' % '|'.join(LENGTH_UNITS),
+                            re.IGNORECASE)
+NUMBER_RE = re.compile(r'(?<![\w.#-])(-?)(\d*)\.(\d+)(?![\d.])')
+HEX_COLOR_RE = re.compile(r'#([0-9a-fA-F]{6})(?![0-9a-fA-F])')
+
+# Four-value shorthands that can drop repeated sides
+BOX_PROPERTIES = frozenset({
+    'margin', 'padding', 'inset', 'border-width', 'border-style', 'border-color',
+    'scroll-margin', 'scroll-padding',
+})
+
+# Properties where a unitless zero means something else (or is invalid)
+KEEP_ZERO_UNITS = frozenset({'flex', 'flex-basis', 'line-height'})
+
+
+def _short_number(match):
+    sign, whole, fraction = match.groups()
+    whole = whole.lstrip('0')
+    fraction = fraction.rstrip('0')
+    if not fraction:
+        return sign + (whole or '0')
+    return f'{sign}{whole}.{fraction}'
+
+
+def _short_hex(match):
+    digits = match.group(1).lower()
+    if digits[0] == digits[1] and digits[2] == digits[3] and digits[4] == digits[5]:
+        return '#' + digits[0] + digits[2] + digits[4]
+    return '#' + digits
+
+
+def _short_box(parts):
+    """Drop the sides of a 1-4 value box shorthand that repeat another side"""
+    if len(parts) == 4 and parts[1] == parts[3]:
+        parts = parts[:3]
+    if len(parts) == 3 and parts[0] == parts[2]:
+        parts = parts[:2]
+    if len(parts) == 2 and parts[0] == parts[1]:
+        parts = parts[:1]
+    return parts
+
+
+def _minify_value(prop, value):
+    important = ''
+    if value.lower().replace(' ', '').endswith('!important'):
+        value = value[:value.rfind('!')].rstrip()
+        important = '!important'
+
+    value = NUMBER_RE.sub(_short_number, value)
+    if '(' not in value and prop not in KEEP_ZERO_UNITS:
+        value = ZERO_LENGTH_RE.sub(lambda m: '0', value)
+    value = HEX_COLOR_RE.sub(_short_hex, value)
+    if prop in BOX_PROPERTIES and '(' not in value and '/' not in value:
+        value = ' '.join(_short_box(value.split(' ')))
+    return value + important
+
+
+def _tighten_plus(css):
+    """Drop the spaces around '+' combinators (but not in calc() and the like)"""
+    if ' + ' not in css:
+        return css
+    pieces = []
+    depth = 0
+    pos = 0
+    for i, ch in enumerate(css):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth = max(0, depth - 1)
+        elif ch == '+' and depth == 0 and css[i - 1:i + 2] == ' + ':
+            pieces.append(css[pos:i - 1])
+            pieces.append('+')
+            pos = i + 2
+    pieces.append(css[pos:])
+    return ''.join(pieces)
+
+
+def minify_css(text):
+    """Minified stylesheet text"""
+    protected = []
+    pieces = []
+    pos = 0
+    for match in CSS_TOKEN_RE.finditer(text):
+        pieces.append(text[pos:match.start()])
+        pos = match.end()
+        kind = match.lastgroup
+        token = match.group(0)
+        if kind == 'comment':
+            if token.startswith('/*!'):
+                protected.append(token)
+                pieces.append(PLACEHOLDER.format(len(protected) - 1))
+            else:
+                # A comment between two words still separates them
+                pieces.append(' ')
+        elif kind == 'space':
+            pieces.append(' ')
+        else:
+            if kind == 'url':
+                token = 'url(' + token[4:-1].strip() + ')'
+            protected.append(token)
+            pieces.append(PLACEHOLDER.format(len(protected) - 1))
+    pieces.append(text[pos:])
+    css = re.sub(r' +', ' ', ''.join(pieces))
+
+    css = CSS_TIGHT_RE.sub(r'\1', css)
+    css = re.sub(r': ', ':', css)
+    css = re.sub(r' ?! ?important', '!important', css, flags=re.IGNORECASE)
+    css = re.sub(r'\( ', '(', css)
+    css = re.sub(r' \)', ')', css)
+
+    def declaration(match):
+        prop, value = match.group(1), match.group(2).strip()
+        if prop.startswith('--'):
+            return f'{prop}:{value}'
+        return f'{prop}:{_minify_value(prop.lower(), value)}'
+
+    css = _tighten_plus(css)
+    css = DECLARATION_RE.sub(declaration, css)
+    css = re.sub(r';+}', '}', css)
+    css = re.sub(r';;+', ';', css)
+    css = css.strip()
+
+    return PLACEHOLDER_RE.sub(lambda m: protected[int(m.group(1))], css)
+
+
+# ---------------------------------------------------------------------------
+# JavaScript
+# ---------------------------------------------------------------------------
+
+# After these keywords a '/' starts a regex literal, not a division
+REGEX_KEYWORDS = frozenset({
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+})
+
+# After these punctuators a '/' starts a regex literal
+REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+
+JS_WHITESPACE = frozenset(' \t\r\n\f\v\u00a0\ufeff\u2028\u2029')
+JS_LINE_BREAKS = frozenset('\r\n\u2028\u2029')
+
+# A line break after one of these punctuators can never end a statement
+NO_ASI_BEFORE = set('{([,;:=*/%&|^!~?<>.')
+# ... nor before one of these
+NO_ASI_AFTER = set(')]},;:.?=*%&|^<>')
+
+PUNCTUATORS = sorted([
+    '>>>=', '...', '===', '!==', '**=', '<<=', '>>=', '>>>', '&&=', '||=', '??=',
+    '=>', '==', '!=', '<=', '>=', '&&', '||', '??', '?.', '++', '--', '+=', '-=',
+    '*=', '/=', '%=', '&=', '|=', '^=', '<<', '>>', '**',
+], key=len, reverse=True)
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch in '_$\\' or ord(ch) > 127
+
+
+class JSMinifyError(ValueError):
+    """The source ended inside a string, comment, regex or template literal."""
+
+
+class _JSScanner:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def _quoted(self, quote):
+        text, i = self.text, self.pos + 1
+        while i < len(text):
+            ch = text[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == quote:
+                return i + 1
+            if ch == '\n':
+                break
+            i += 1
+        raise JSMinifyError(f'unterminated string at offset {self.pos}')
+
+    def _template_end(self, start):
+        """Offset just past the template literal starting at start (a backtick)"""
+        text, i = self.text, start + 1
+        while i < len(text):
+            ch = text[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == '`':
+                return i + 1
+            if ch == '$' and text.startswith('${', i):
+                i = self._expression_end(i + 2)
+                continue
+            i += 1
+        raise JSMinifyError(f'unterminated template literal at offset {start}')
+
+    def _expression_end(self, i):
+        """Offset just past the '}' closing a ${ expression starting at i"""
+        text = self.text
+        depth = 0
+        while i < len(text):
+            ch = text[i]
+            if ch in '"\'':
+                saved, self.pos = self.pos, i
+                i = self._quoted(ch)
+                self.pos = saved
+                continue
+            if ch == '`':
+                i = self._template_end(i)
+                continue
+            if text.startswith('//', i):
+                newline = text.find('\n', i)
+                i = len(text) if newline < 0 else newline
+                continue
+            if text.startswith('/*', i):
+                end = text.find('*/', i + 2)
+                if end < 0:
+                    break
+                i = end + 2
+                continue
+            if ch == '{':
+                depth += 1
+            elif ch == '}':
+                if depth == 0:
+                    return i + 1
+                depth -= 1
+            i += 1
+        raise JSMinifyError(f'unterminated template expression at offset {i}')
+
+    def _regex_end(self):
+        text, i = self.text, self.pos + 1
+        in_class = False
+        while i < len(text):
+            ch = text[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == '\n':
+                break
+            if in_class:
+                if ch == ']':
+                    in_class = False
+            elif ch == '[':
+                in_class = True
+            elif ch == '/':
+                i += 1
+                while i < len(text) and _is_word_char(text[i]):
+                    i += 1
+                return i
+            i += 1
+        raise JSMinifyError(f'unterminated regex literal at offset {self.pos}')
+
+    def tokens(self):
+        """
+        Yield (kind, text, newline_before) for every token.
+
+        kind is 'word', 'string' (strings, templates, regexes), 'punct' or
+        'comment' (licence comments only; others are dropped).
+        """
+        text = self.text
+        newline = False
+        previous = None     # (kind, text) of the last significant token
+        while self.pos < len(text):
+            ch = text[self.pos]
+            if ch in JS_WHITESPACE:
+                if ch in JS_LINE_BREAKS:
+                    newline = True
+                self.pos += 1
+                continue
+            if text.startswith('//', self.pos):
+                end = text.find('\n', self.pos)
+                self.pos = len(text) if end < 0 else end
+                continue
+            if text.startswith('/*', self.pos):
+                end = text.find('*/', self.pos + 2)
+                if end < 0:
+                    raise JSMinifyError(f'unterminated comment at offset {self.pos}')
+                comment = text[self.pos:end + 2]
+                self.pos = end + 2
+                if comment.startswith('/*!'):
+                    yield 'comment', comment, newline
+                    newline = True
+                elif '\n' in comment:
+                    newline = True
+                continue
+
+            start = self.pos
+            if ch in '"\'':
+                self.pos = self._quoted(ch)
+                kind = 'string'
+            elif ch == '`':
+                self.pos = self._template_end(start)
+                kind = 'string'
+            elif ch == '/' and (previous is None
+                                or (previous[0] == 'punct' and previous[1][-1] in REGEX_AFTER
+                                    and previous[1] not in ('++', '--'))
+                                or (previous[0] == 'word' and previous[1] in REGEX_KEYWORDS)):
+                self.pos = self._regex_end()
+                kind = 'string'
+            elif _is_word_char(ch) or (ch == '.' and text[self.pos + 1:self.pos + 2].isdigit()):
+                i = self.pos + 1
+                while i < len(text):
+                    c = text[i]
+                    if _is_word_char(c) or c == '.' and ch.isdigit():
+                        i += 1
+                    elif c in '+-' and ch.isdigit() and text[i - 1] in 'eE' and not text[start:i].startswith(('0x', '0X')):
+                        i += 1
+                    else:
+                        break
+                self.pos = i
+                kind = 'word'
+            else:
+                for punct in PUNCTUATORS:
+                    if text.startswith(punct, self.pos):
+                        # 'a?.5:b' is a conditional, not optional chaining
+                        if punct == '?.' and text[self.pos + 2:self.pos + 3].isdigit():
+                            continue
+                        self.pos += len(punct)
+                        break
+                else:
+                    self.pos += 1
+                kind = 'punct'
+
+            token = text[start:self.pos]
+            yield kind, token, newline
+            newline = False
+            previous = (kind, token)
+
+
+def _needs_space(left, right):
+    """True when left and right would merge into other tokens without a space"""
+    a, b = left[-1], right[0]
+    if _is_word_char(a) and _is_word_char(b):
+        return True
+    if a in '+-' and b in '+-':
+        return True
+    if a == '/' and b in '/*':
+        return True
+    # '1 .toString()' and '1. .x' must not become '1.toString()'
+    if a.isdigit() and b == '.' or a == '.' and b.isdigit():
+        return True
+    return False
+
+
+def js_strings(text):
+    """String, template and regex literals of a script, in source order"""
+    return [token for kind, token, newline in _JSScanner(text).tokens() if kind == 'string']
+
+
+def minify_js(text):
+    """Minified script text; raises JSMinifyError on unterminated tokens"""
+    out = []
+    last = None
+    for kind, token, newline in _JSScanner(text).tokens():
+        if last is not None:
+            if kind == 'comment' or last[0] == 'comment':
+                out.append('\n')
+            elif newline and not (last[0] == 'punct' and last[1][-1] in NO_ASI_BEFORE
+                                  or kind == 'punct' and token[0] in NO_ASI_AFTER):
+                out.append('\n')
+            elif _needs_space(last[1], token):
+                out.append(' ')
+        out.append(token)
+        last = (kind, token)
+    return ''.join(out) + ('\n' if out else '')
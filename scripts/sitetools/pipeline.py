@@ -0,0 +1,112 @@
+"""
+Single-read/single-write pipeline for HTML rewrite passes.
+
+A pass is a function (html_content, path, doc) -> (html_content, count) that
+returns the rewritten page and how many changes it made. The pipeline reads a
+page once, runs the selected passes in order on the in-memory text (reusing
+the cached parse until a pass changes the text), and writes the page at most
+once. Pages are independent, so they are spread over worker processes.
+
+Workers write through sitetools.writer.atomic_write_bytes; the caller adds
+each FileResult to its ChangeAwareWriter (record()) so the run is journaled
+and batched fsyncs happen once in the main process.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sitetools.doccache import DocCache
+from sitetools.writer import atomic_write_bytes
+
+# One cache per process; parses are shared between processes through .cache/
+DOCS = DocCache()
+
+
+class TransformPass:
+    """
+    A named rewrite step.
+
+    Args:
+        name (str): Name used on the command line and in the report
+        func (callable): (html_content, path, doc) -> (html_content, count).
+            Must be a module-level function so it can be sent to workers.
+        description (str): One line for --list
+        skip_names (tuple): File names the pass never touches
+    """
+
+    def __init__(self, name, func, description, skip_names=()):
+        self.name = name
+        self.func = func
+        self.description = description
+        self.skip_names = frozenset(skip_names)
+
+    def applies_to(self, path):
+        return path.name not in self.skip_names
+
+
+class FileResult:
+    """Outcome of running the pipeline on one page."""
+
+    def __init__(self, path):
+        self.path = path
+        self.counts = {}
+        self.seconds = {}
+        self.written = False
+        self.bytes_written = 0
+        self.error = None
+
+
+def transform_file(passes, path, write=True, fsync=False):
+    """Run passes over one page; read once, write at most once (atomically)"""
+    result = FileResult(path)
+    try:
+        doc = DOCS.load(path)
+        original = text = doc.text
+
+        for transform in passes:
+            if not transform.applies_to(path):
+                continue
+            if doc.text is not text:
+                # The previous pass rewrote the page; later passes see its output
+                doc = DOCS.parse(text, path)
+            start = time.perf_counter()
+            text, count = transform.func(text, path, doc)
+            result.seconds[transform.name] = time.perf_counter() - start
+            result.counts[transform.name] = count
+
+        if text != original and write:
+            data = text.encode('utf-8')
+            atomic_write_bytes(path, data, fsync=fsync)
+            result.written = True
+            result.bytes_written = len(data)
+
+    except Exception as e:
+        result.error = str(e)
+
+    return result
+
+
+def _transform_job(job):
+    passes, path, write, fsync = job
+    return transform_file(passes, path, write, fsync)
+
+
+def run_pipeline(passes, paths, workers=1, write=True, fsync=False):
+    """
+    Run passes over every path and return FileResults in path order.
+
+    workers: number of processes; 0 means one per CPU core.
+    fsync: sync each file before its rename (for 'each' mode).
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    jobs = [(passes, path, write, fsync) for path in paths]
+
+    if workers <= 1 or len(jobs) <= 1:
+        return [_transform_job(job) for job in jobs]
+
+    # Results come back in submission order, so the report stays deterministic
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_transform_job, jobs, chunksize=chunksize))
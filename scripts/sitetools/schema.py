@@ -0,0 +1,178 @@
+"""
+Field checks compiled from works-data/SCHEMA.md.
+
+SCHEMA.md lists every field as a bullet of the form
+
+    - **`name`** (type): description
+
+under "必須フィールド" (required) or "任意フィールド" (optional). The type is
+one or more of `string`, `array of strings` and `array of work id`, joined
+by `|`, optionally with `null`. A trailing `, 省略可` means the key may be
+left out altogether; every other field must be present (optional ones as
+null, not as an empty string).
+
+compile_schema() turns the bullets into one check function per field, so
+validating a work is a loop over prepared closures instead of re-reading
+the schema. Unknown type expressions are a SchemaError: a schema edit the
+validator does not understand should fail the build, not pass silently.
+
+Usage:
+    from sitetools.schema import load_schema
+
+    schema = load_schema(Path('works-data/SCHEMA.md'))
+    errors, warnings, related = schema.validate(work_data)
+"""
+
+import re
+from pathlib import Path
+
+FIELD_RE = re.compile(r'^- \*\*`(\w+)`\*\* \(([^)]*)\)')
+
+SECTIONS = {
+    '必須フィールド': True,    # required
+    '任意フィールド': False,   # optional
+}
+
+OMITTABLE_FLAG = '省略可'
+
+
+class SchemaError(ValueError):
+    """SCHEMA.md could not be compiled"""
+
+
+def _is_string(value):
+    return type(value) is str
+
+
+def _is_string_array(value):
+    return type(value) is list and all(type(item) is str for item in value)
+
+
+# Type expression -> (predicate, description, holds work ids)
+TYPES = {
+    'string': (_is_string, 'a string', False),
+    'array of strings': (_is_string_array, 'an array of strings', False),
+    'array of work id': (_is_string_array, 'an array of work ids', True),
+    'array of work ids': (_is_string_array, 'an array of work ids', True),
+}
+
+
+class Field:
+    """One compiled field: name, flags and its check function."""
+
+    def __init__(self, name, required, omittable, nullable, check, references):
+        self.name = name
+        self.required = required
+        self.omittable = omittable
+        self.nullable = nullable
+        self.check = check
+        self.references = references
+
+
+def compile_field(name, type_expr, required):
+    """Build the Field for one bullet of SCHEMA.md"""
+    parts = [part.strip() for part in type_expr.split(',')]
+    flags = parts[1:]
+    unknown_flags = [flag for flag in flags if flag != OMITTABLE_FLAG]
+    if unknown_flags:
+        raise SchemaError(f"{name}: unknown flag(s) {', '.join(unknown_flags)}")
+    omittable = OMITTABLE_FLAG in flags
+
+    alternatives = [alt.strip() for alt in parts[0].split('|')]
+    nullable = 'null' in alternatives
+    types = [alt for alt in alternatives if alt != 'null']
+    if not types:
+        raise SchemaError(f"{name}: no type besides null")
+    unknown = [alt for alt in types if alt not in TYPES]
+    if unknown:
+        raise SchemaError(f"{name}: unknown type {' | '.join(unknown)!r}")
+
+    predicates = [TYPES[alt][0] for alt in types]
+    expected = ' or '.join(TYPES[alt][1] for alt in types) + (' or null' if nullable else '')
+    references = any(TYPES[alt][2] for alt in types)
+
+    # Specialised for the common single-type case: one call per value
+    if len(predicates) == 1:
+        predicate = predicates[0]
+    else:
+        def predicate(value):
+            return any(test(value) for test in predicates)
+
+    def check(value):
+        """Error message for value, or None when it is valid"""
+        if value is None:
+            return None if nullable else f"{name} must be {expected}, got null"
+        if not predicate(value):
+            return f"{name} must be {expected}, got {type(value).__name__}"
+        if value == '' or value == []:
+            return (f"{name} is empty; use null" if nullable
+                    else f"{name} must not be empty")
+        return None
+
+    return Field(name, required, omittable, nullable, check, references)
+
+
+class Schema:
+    """Compiled SCHEMA.md: an ordered list of Fields."""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.names = frozenset(field.name for field in fields)
+        self.reference_fields = [field.name for field in fields if field.references]
+
+    def validate(self, work):
+        """
+        Check one work's JSON object.
+
+        Returns:
+            tuple: (errors, warnings, references) where references maps each
+            work-id field (e.g. 'related') to the ids it lists
+        """
+        if type(work) is not dict:
+            return [f"top level must be an object, got {type(work).__name__}"], [], {}
+
+        errors = []
+        references = {}
+        for field in self.fields:
+            if field.name not in work:
+                if not field.omittable:
+                    errors.append(f"missing field '{field.name}'"
+                                  + ('' if field.required else ' (use null when it does not apply)'))
+                continue
+            value = work[field.name]
+            message = field.check(value)
+            if message:
+                errors.append(message)
+            elif field.references and value:
+                references[field.name] = value
+
+        warnings = [f"field '{name}' is not in SCHEMA.md" for name in work if name not in self.names]
+        return errors, warnings, references
+
+
+def parse_schema(text):
+    """Compile the field bullets of SCHEMA.md text into a Schema"""
+    fields = []
+    required = None
+    for line in text.splitlines():
+        if line.startswith('## '):
+            required = next((flag for title, flag in SECTIONS.items() if title in line), None)
+            continue
+        if required is None:
+            continue
+        match = FIELD_RE.match(line)
+        if match:
+            fields.append(compile_field(match.group(1), match.group(2), required))
+
+    if not fields:
+        raise SchemaError('no field definitions found')
+    names = [field.name for field in fields]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise SchemaError(f"field(s) defined twice: {', '.join(duplicates)}")
+    return Schema(fields)
+
+
+def load_schema(path):
+    with open(Path(path), 'r', encoding='utf-8') as f:
+        return parse_schema(f.read())
@@ -0,0 +1,514 @@
+"""
+Element tree of a parsed page and a CSS selector matcher over it.
+
+build_tree() turns the tags of a sitetools.doccache.ParsedDoc into a light
+element tree (void elements and the usual implied end tags of <p>, <li>,
+<option>, <tr> and <td> are handled; stray end tags are ignored).
+Selector compiles a selector and tests it against elements.
+
+Supported: type, universal, #id, .class, attribute selectors (all
+operators, with the i flag), the four combinators, structural
+pseudo-classes (:root, :first-child, :nth-child(an+b), :only-of-type,
+:empty, ...), :not(), :is(), :where() and :has(). Pseudo-elements match
+their originating element.
+
+State pseudo-classes (:hover, :focus, :checked, ...) depend on the caller:
+with dynamic=True they are assumed to be able to match (what a rule
+pruner needs); with dynamic=False they match only what the static markup
+says (:checked and :disabled from their attributes, nothing for :hover),
+which is what a first paint looks like. Anything the matcher does not
+understand matches, so callers keep rather than drop such rules.
+
+Usage:
+    from sitetools.selectors import Selector, build_tree
+
+    root = build_tree(doc)
+    selector = Selector('.img_wrap > a img')
+    hits = [el for el in root.iter() if selector.matches(el)]
+"""
+
+import re
+
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr',
+})
+
+# Opening one of these closes an open <p>
+CLOSES_P = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'details', 'div', 'dl', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'main', 'menu', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'ul',
+})
+
+# element -> elements whose start implicitly ends it
+IMPLIED_END = {
+    'li': frozenset({'li'}),
+    'option': frozenset({'option', 'optgroup'}),
+    'tr': frozenset({'tr'}),
+    'td': frozenset({'td', 'th', 'tr'}),
+    'th': frozenset({'td', 'th', 'tr'}),
+    'dt': frozenset({'dt', 'dd'}),
+    'dd': frozenset({'dt', 'dd'}),
+}
+
+# State pseudo-classes; see the module docstring
+DYNAMIC_PSEUDOS = frozenset({
+    'hover', 'focus', 'focus-visible', 'focus-within', 'active', 'visited', 'target',
+    'target-within', 'checked', 'indeterminate', 'disabled', 'enabled', 'valid', 'invalid',
+    'user-invalid', 'user-valid', 'placeholder-shown', 'autofill', '-webkit-autofill',
+    'open', 'popover-open', 'modal', 'fullscreen', 'playing', 'paused', 'default',
+    'required', 'optional', 'read-only', 'read-write', 'in-range', 'out-of-range', 'defined',
+})
+
+# Pseudo-classes the matcher evaluates exactly from the markup
+KNOWN_PSEUDOS = frozenset({
+    'root', 'scope', 'empty', 'first-child', 'last-child', 'only-child', 'first-of-type',
+    'last-of-type', 'only-of-type', 'nth-child', 'nth-last-child', 'nth-of-type',
+    'nth-last-of-type', 'link', 'any-link', 'has',
+})
+
+# Pseudo-elements written with a single colon (CSS 2)
+LEGACY_PSEUDO_ELEMENTS = frozenset({'before', 'after', 'first-line', 'first-letter'})
+
+
+class Element:
+    """One element: name, attributes and its place in the tree."""
+
+    __slots__ = ('name', 'attrs', 'parent', 'children', 'order', 'start')
+
+    def __init__(self, name, attrs=None, parent=None, order=0, start=0):
+        self.name = name
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children = []
+        self.order = order      # position in document order
+        self.start = start      # offset of the start tag in the page
+
+    @property
+    def id(self):
+        return self.attrs.get('id')
+
+    @property
+    def classes(self):
+        return (self.attrs.get('class') or '').split()
+
+    def iter(self):
+        """This element and its descendants in document order"""
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(element.children))
+
+    def siblings(self):
+        return self.parent.children if self.parent is not None else [self]
+
+    def __repr__(self):
+        return f'<{self.name}{"#" + self.id if self.id else ""}>'
+
+
+def build_tree(doc):
+    """
+    Element tree of a ParsedDoc.
+
+    Returns the document node (name '#document'); its children are the
+    top-level elements, normally just <html>.
+    """
+    document = Element('#document')
+    stack = [document]
+    order = 0
+    for tag in doc.all_tags:
+        name = tag.name
+        if name.startswith('!') or name.startswith('?'):
+            continue
+        if tag.closing:
+            for depth in range(len(stack) - 1, 0, -1):
+                if stack[depth].name == name:
+                    del stack[depth:]
+                    break
+            continue
+
+        current = stack[-1].name
+        if current == 'p' and name in CLOSES_P:
+            stack.pop()
+        elif current in IMPLIED_END and name in IMPLIED_END[current]:
+            stack.pop()
+
+        order += 1
+        element = Element(name, dict(reversed(tag.attrs)), stack[-1], order, tag.start)
+        stack[-1].children.append(element)
+        if name not in VOID_ELEMENTS and not doc.raw(tag).endswith('/>'):
+            stack.append(element)
+    return document
+
+
+# ---------------------------------------------------------------------------
+# Selector parsing
+# ---------------------------------------------------------------------------
+
+IDENT = r'-?(?:[_a-zA-Z]|[^\x00-\x7f]|\\.)(?:[-\w]|[^\x00-\x7f]|\\.)*'
+TOKEN_RE = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<combinator>[>+~])
+  | (?P<universal>(?:\*|[-\w]*)\|)?\*
+  | (?P<type>%(ident)s)
+  | \#(?P<id>(?:[-\w]|[^\x00-\x7f]|\\.)+)
+  | \.(?P<cls>%(ident)s)
+  | \[\s*(?P<attr>[-\w:|]+)\s*(?:(?P<op>[~|^$*]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\s\]]+))\s*(?P<flag>[iIsS])?\s*)?\]
+  | ::?(?P<pseudo>[-\w]+)
+''' % {'ident': IDENT}, re.VERBOSE)
+
+TOKEN_KINDS = ('space', 'combinator', 'universal', 'type', 'id', 'cls', 'attr', 'pseudo')
+
+NTH_RE = re.compile(r'^\s*(?:(?P<even>even)|(?P<odd>odd)|(?P<a>[+-]?\d*)n\s*(?:(?P<sign>[+-])\s*(?P<b>\d+))?|(?P<only>[+-]?\d+))\s*$',
+                    re.IGNORECASE)
+
+
+def _unescape(ident):
+    return re.sub(r'\\(.)', r'\1', ident)
+
+
+def _split_top(text, separator=','):
+    parts, depth, start = [], 0, 0
+    quote = None
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+            continue
+        if ch in '"\'':
+            quote = ch
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _closing_paren(text, i):
+    """Offset of the ')' matching the '(' at text[i]"""
+    depth = 0
+    quote = None
+    for j in range(i, len(text)):
+        ch = text[j]
+        if quote:
+            if ch == quote:
+                quote = None
+            continue
+        if ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return j
+    raise ValueError('unbalanced parentheses')
+
+
+class _Compound:
+    __slots__ = ('tag', 'id', 'classes', 'attrs', 'pseudos')
+
+    def __init__(self):
+        self.tag = None
+        self.id = None
+        self.classes = []
+        self.attrs = []         # (name, op, value, case-insensitive)
+        self.pseudos = []       # (name, argument or None)
+
+
+def _parse_nth(argument):
+    """(a, b, 'of' selector or None) of an an+b argument, or None"""
+    of = None
+    match = re.match(r'^(.*?)\s+of\s+(.+)$', argument, re.IGNORECASE | re.DOTALL)
+    if match:
+        argument, of = match.group(1), Selector(match.group(2))
+    nth = NTH_RE.match(argument)
+    if not nth:
+        return None
+    if nth.group('even'):
+        return 2, 0, of
+    if nth.group('odd'):
+        return 2, 1, of
+    if nth.group('only') is not None:
+        return 0, int(nth.group('only')), of
+    a = nth.group('a')
+    a = 1 if a in ('', '+') else -1 if a == '-' else int(a)
+    b = int(nth.group('b') or 0) * (-1 if nth.group('sign') == '-' else 1)
+    return a, b, of
+
+
+def _parse_complex(text):
+    """
+    Compile one complex selector.
+
+    Returns a list of (combinator, compound) from left to right; the first
+    combinator is None, or the leading combinator of a relative selector.
+    """
+    chain = []
+    compound = None
+    combinator = None
+    pending_space = False
+    i = 0
+    while i < len(text):
+        match = TOKEN_RE.match(text, i)
+        if not match:
+            raise ValueError(f'cannot parse selector {text!r}')
+        # lastgroup would name an inner group ('dq', 'flag', ...) for attributes
+        kind = next(name for name in TOKEN_KINDS if match.group(name) is not None) if text[i] != '*' else 'universal'
+        if kind == 'space':
+            pending_space = True
+            i = match.end()
+            continue
+        if kind == 'combinator':
+            combinator = match.group('combinator')
+            pending_space = False
+            compound = None
+            i = match.end()
+            continue
+        if compound is None or pending_space:
+            if compound is not None and combinator is None:
+                combinator = ' '
+            compound = _Compound()
+            chain.append((combinator, compound))
+            combinator = None
+        pending_space = False
+
+        if kind == 'universal':
+            pass
+        elif kind == 'type':
+            compound.tag = match.group('type').lower()
+        elif kind == 'id':
+            compound.id = _unescape(match.group('id'))
+        elif kind == 'cls':
+            compound.classes.append(_unescape(match.group('cls')))
+        elif kind == 'attr':
+            value = next((match.group(g) for g in ('dq', 'sq', 'bare') if match.group(g) is not None), None)
+            compound.attrs.append((match.group('attr').lower(), match.group('op'), value,
+                                   (match.group('flag') or '').lower() == 'i'))
+        else:
+            name = match.group('pseudo').lower()
+            end = match.end()
+            argument = None
+            if end < len(text) and text[end] == '(':
+                close = _closing_paren(text, end)
+                argument = text[end + 1:close]
+                end = close + 1
+            if text.startswith('::', i) or name in LEGACY_PSEUDO_ELEMENTS:
+                pass        # pseudo-elements match their originating element
+            else:
+                compound.pseudos.append(_compile_pseudo(name, argument))
+            i = end
+            continue
+        i = match.end()
+    if combinator is not None and compound is None and chain:
+        raise ValueError(f'dangling combinator in {text!r}')
+    if not chain and combinator is not None:
+        raise ValueError(f'empty selector {text!r}')
+    return chain
+
+
+def _compile_pseudo(name, argument):
+    if name in ('not', 'is', 'where', 'matches', '-webkit-any', '-moz-any'):
+        return name, Selector(argument)
+    if name == 'has':
+        return name, [_parse_relative(part) for part in _split_top(argument)]
+    if name.startswith('nth-'):
+        nth = _parse_nth(argument or '')
+        return (name, nth) if nth else ('?', None)
+    return name, argument
+
+
+def _parse_relative(text):
+    text = text.strip()
+    combinator = ' '
+    if text[:1] in '>+~':
+        combinator, text = text[0], text[1:]
+    chain = _parse_complex(text)
+    chain[0] = (combinator, chain[0][1])
+    return chain
+
+
+class Selector:
+    """
+    A compiled selector list.
+
+    Args:
+        text (str): Selector list, e.g. 'a:hover, .nav > li'
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.chains = [_parse_complex(part) for part in _split_top(text)]
+
+    def matches(self, element, dynamic=True):
+        return any(_match_chain(chain, len(chain) - 1, element, dynamic) for chain in self.chains)
+
+    def uncertain(self, dynamic=True):
+        """True when a pseudo-class in the list is only assumed to match"""
+        for chain in self.chains:
+            for _, compound in chain:
+                for name, argument in compound.pseudos:
+                    if name in ('is', 'where', 'matches', '-webkit-any', '-moz-any', 'not'):
+                        if argument.uncertain(dynamic):
+                            return True
+                    elif name not in KNOWN_PSEUDOS and (dynamic or name not in DYNAMIC_PSEUDOS):
+                        return True
+        return False
+
+
+def _match_chain(chain, index, element, dynamic, scope=None):
+    """
+    True when chain[:index + 1] matches with chain[index] on element.
+
+    scope (a set of element ids) pins the leftmost compound for :has().
+    """
+    compound = chain[index][1]
+    if not _match_compound(compound, element, dynamic):
+        return False
+    if index == 0:
+        return scope is None or id(element) in scope
+    previous = chain[index][0]
+    if previous == '>':
+        parent = element.parent
+        return parent is not None and parent.name != '#document' and _match_chain(chain, index - 1, parent, dynamic, scope)
+    if previous == ' ':
+        ancestor = element.parent
+        while ancestor is not None and ancestor.name != '#document':
+            if _match_chain(chain, index - 1, ancestor, dynamic, scope):
+                return True
+            ancestor = ancestor.parent
+        return False
+    siblings = element.siblings()
+    position = siblings.index(element)
+    if previous == '+':
+        return position > 0 and _match_chain(chain, index - 1, siblings[position - 1], dynamic, scope)
+    return any(_match_chain(chain, index - 1, sibling, dynamic, scope) for sibling in siblings[:position])
+
+
+def _attr_matches(element, name, op, value, insensitive):
+    actual = element.attrs.get(name)
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if insensitive:
+        actual, value = actual.lower(), value.lower()
+    if op == '=':
+        return actual == value
+    if op == '~=':
+        return value in actual.split()
+    if op == '|=':
+        return actual == value or actual.startswith(value + '-')
+    if not value:
+        return False
+    if op == '^=':
+        return actual.startswith(value)
+    if op == '$=':
+        return actual.endswith(value)
+    return value in actual
+
+
+def _nth_position(element, of_type=False, last=False, of=None, dynamic=True):
+    siblings = [s for s in element.siblings()
+                if (not of_type or s.name == element.name) and (of is None or of.matches(s, dynamic))]
+    if element not in siblings:
+        return None
+    position = siblings.index(element)
+    return len(siblings) - position if last else position + 1
+
+
+def _nth_matches(a, b, position):
+    if position is None:
+        return False
+    if a == 0:
+        return position == b
+    return (position - b) % a == 0 and (position - b) // a >= 0
+
+
+def _match_compound(compound, element, dynamic):
+    if compound.tag is not None and compound.tag != element.name:
+        return False
+    if compound.id is not None and element.id != compound.id:
+        return False
+    if compound.classes:
+        classes = element.classes
+        if any(cls not in classes for cls in compound.classes):
+            return False
+    for name, op, value, insensitive in compound.attrs:
+        if not _attr_matches(element, name, op, value, insensitive):
+            return False
+    for name, argument in compound.pseudos:
+        if not _match_pseudo(name, argument, element, dynamic):
+            return False
+    return True
+
+
+def _match_pseudo(name, argument, element, dynamic):
+    if name in ('is', 'where', 'matches', '-webkit-any', '-moz-any'):
+        return argument.matches(element, dynamic)
+    if name == 'not':
+        # A part that "may match" would turn into "never matches": stay inclusive
+        if argument.uncertain(dynamic):
+            return True
+        return not argument.matches(element, dynamic)
+    if name == 'has':
+        return any(_has(chain, element, dynamic) for chain in argument)
+    if name == 'root':
+        return element.name == 'html'
+    if name == 'scope':
+        return element.name == 'html'
+    if name == 'empty':
+        return not element.children
+    if name in ('first-child', 'last-child', 'only-child', 'first-of-type', 'last-of-type', 'only-of-type'):
+        of_type = name.endswith('of-type')
+        first = _nth_position(element, of_type) == 1
+        last = _nth_position(element, of_type, last=True) == 1
+        return {'first': first, 'last': last, 'only': first and last}[name.split('-', 1)[0]]
+    if name in ('nth-child', 'nth-last-child', 'nth-of-type', 'nth-last-of-type'):
+        a, b, of = argument
+        position = _nth_position(element, name.endswith('of-type'), 'last' in name, of, dynamic)
+        return _nth_matches(a, b, position)
+    if name in ('link', 'any-link'):
+        return element.name in ('a', 'area') and 'href' in element.attrs
+    if name in DYNAMIC_PSEUDOS:
+        if dynamic:
+            return True
+        if name == 'checked':
+            return 'checked' in element.attrs or 'selected' in element.attrs
+        if name == 'disabled':
+            return 'disabled' in element.attrs
+        if name == 'enabled':
+            return 'disabled' not in element.attrs
+        if name in ('required', 'optional'):
+            return ('required' in element.attrs) == (name == 'required')
+        if name in ('placeholder-shown', 'default', 'defined', 'read-write', 'valid', 'in-range'):
+            return True
+        return False
+    # :lang(), :dir(), vendor pseudo-classes, ...: keep whatever uses them
+    return True
+
+
+def _has(chain, anchor, dynamic):
+    """True when the relative selector chain matches starting from anchor"""
+    combinator = chain[0][0]
+    if combinator == '>':
+        candidates = anchor.children
+    elif combinator == ' ':
+        candidates = list(anchor.iter())[1:]
+    else:
+        siblings = anchor.siblings()
+        following = siblings[siblings.index(anchor) + 1:]
+        candidates = following[:1] if combinator == '+' else following
+    if len(chain) == 1:
+        return any(_match_compound(chain[0][1], el, dynamic) for el in candidates)
+    # Longer chains: match anywhere below the anchor's parent, with the
+    # leftmost compound pinned to one of the candidates
+    region = anchor.parent if combinator in '+~' and anchor.parent is not None else anchor
+    scope = set(map(id, candidates))
+    return any(_match_chain(chain, len(chain) - 1, el, dynamic, scope) for el in region.iter())
@@ -0,0 +1,124 @@
+"""
+Share metadata of a work: the meta tags and JSON-LD a page about it carries.
+
+js/works-spa.js used to assemble these in the browser on every navigation
+(updateMetaTags() and addStructuredData()). They only depend on the work's
+JSON, so they are built here once: prerender_works.py embeds them in each
+prerendered detail view and writes them into the work's page under works/,
+which is what link unfurlers and crawlers fetch.
+
+Descriptions are the plain text (tags dropped, entities decoded) of the
+work's description, cut at DESCRIPTION_LIMIT characters with '…'. URLs are
+absolute; paths in the work JSON are relative to works/.
+
+Usage:
+    from sitetools.workmeta import work_head
+
+    head = work_head(work)
+    head['title']    # 'Clear File Vase - Ryo Simon'
+    head['meta']     # [('name', 'description', '...'), ('property', 'og:title', '...'), ...]
+    head['jsonld']   # the CreativeWork object
+"""
+
+import html
+import posixpath
+import re
+
+SITE_URL = 'https://ryo-simon-mf.github.io'
+SITE_NAME = 'Ryo Simon'
+
+# Characters of plain text kept in description tags
+DESCRIPTION_LIMIT = 157
+
+CREATOR = {
+    "@type": "Person",
+    "name": "Ryo Simon",
+    "alternateName": "Ryo Nishikado",
+    "url": SITE_URL,
+}
+KEYWORDS = ["interactive art", "creative coding", "media art"]
+
+TAG_RE = re.compile(r'<[^>]*>')
+SPACE_RE = re.compile(r'\s+')
+
+
+def plain_text(markup):
+    """
+    Markup reduced to text: tags dropped, entities decoded, whitespace collapsed.
+
+    The result is plain text; callers escape it for the context they write
+    it into (attribute value, JSON), so '&amp;' must not survive here.
+    """
+    text = html.unescape(TAG_RE.sub(' ', markup or ''))
+    return SPACE_RE.sub(' ', text).strip()
+
+
+def short_description(markup):
+    text = plain_text(markup)
+    if len(text) <= DESCRIPTION_LIMIT:
+        return text
+    return text[:DESCRIPTION_LIMIT].rstrip() + '…'
+
+
+def absolute_url(path):
+    """Absolute URL of a path as written in works/ (URLs are kept)"""
+    if '://' in path:
+        return path
+    return f"{SITE_URL}/{posixpath.normpath(posixpath.join('works', path))}"
+
+
+def work_url(work_id):
+    return f"{SITE_URL}/works/works.html#{work_id}"
+
+
+def structured_data(work):
+    """schema.org CreativeWork of a work"""
+    data = {
+        "@context": "https://schema.org",
+        "@type": "CreativeWork",
+        "name": work.get('title'),
+        "creator": CREATOR,
+        "dateCreated": work.get('year'),
+        "description": plain_text(work.get('description')),
+        "image": absolute_url(work['thumbnail']) if work.get('thumbnail') else '',
+        "url": work_url(work['id']),
+        "keywords": [work.get('category')] + KEYWORDS,
+        "genre": work.get('category'),
+    }
+    if work.get('tools'):
+        data["tool"] = plain_text(work['tools'])
+    if work.get('award'):
+        data["award"] = plain_text(work['award'])
+    return data
+
+
+def head_tags(work):
+    """(attribute, key, content) of each meta tag, in page order"""
+    title = f"{work.get('title')} - {SITE_NAME}"
+    description = short_description(work.get('description')) if work.get('description') else None
+    image = absolute_url(work['thumbnail']) if work.get('thumbnail') else None
+
+    tags = []
+    if description:
+        tags.append(('name', 'description', description))
+    tags.append(('property', 'og:title', title))
+    if description:
+        tags.append(('property', 'og:description', description))
+    tags.append(('property', 'og:url', work_url(work['id'])))
+    if image:
+        tags.append(('property', 'og:image', image))
+    tags.append(('name', 'twitter:title', title))
+    if description:
+        tags.append(('name', 'twitter:description', description))
+    if image:
+        tags.append(('name', 'twitter:image', image))
+    return tags
+
+
+def work_head(work):
+    """Page title, meta tags and JSON-LD of a work"""
+    return {
+        'title': f"{work.get('title')} - {SITE_NAME}",
+        'meta': head_tags(work),
+        'jsonld': structured_data(work),
+    }
@@ -0,0 +1,384 @@
+"""
+Streaming extractor for works/*.html detail pages.
+
+Reads a page once with TagScanner and recognises the same markup that the
+regex extractor in extract_works_to_json.py searches for. Each section is
+emitted as soon as its closing tag has been seen. Matching follows the regex
+rules exactly: the first '<h1...>' up to '</h1>', the swiper container up to
+the '</div>' followed by the swiper buttons, the first '</div>' after
+'<div id="content_in">', and '<dt>Label</dt>' / '<dd>...</dd>' pairs. For
+well-formed markup the JSON it produces is therefore byte-identical to
+extract_work_data_regex().
+
+Malformed markup is outside that guarantee. The regex path strips every
+comment before matching and lets a pattern such as '<img[^>]+' run over
+anything up to the next '>', while TagScanner tokenises tags and comments in
+document order. A '<' inside a tag (<img src=".." al<p>t="">) or a '<!--'
+opened inside a tag therefore splits differently, and the two extractors can
+disagree. The works/*.html pages and the pages bench_extract.py builds are
+well-formed, which is what its parity check covers.
+"""
+
+import re
+
+from sitetools.htmlscan import TagScanner
+
+SWIPER_OPEN = '<div class="swiper-container">'
+CONTENT_IN_OPEN = '<div id="content_in">'
+
+# Lookahead used once per '</div>' inside the swiper: the container ends at the
+# first '</div>' followed by whitespace (or comments) and a swiper button. The
+# comment body may not contain '-->', or backtracking could run a comment on
+# into the next one.
+SWIPER_END_RE = re.compile(r'(?:\s|<!--(?:[^-]|-(?!->))*-->)*<div class="swiper-button')
+IMG_SRC_RE = re.compile(r'<img[^>]+src="([^"]+)"')
+
+# Only the tags the extractor reacts to are reported by the scanner. Any other
+# tag stays in the text between two reported tags, where its '<' breaks
+# adjacency (label text, '\s*' gaps) exactly as it would for the regexes.
+WORK_TAGS = (r'/(?:h1|div|p|dt|dd|a)|h1[^<>]*|img[^<>]*|p|dt|dd'
+             r'|div (?:class="swiper-container"|id="content_in")')
+
+# <dt> labels inside content_in and the JSON field each one fills
+DT_FIELDS = {
+    'Link': 'link',
+    'Exhibition': 'exhibition',
+    'Award': 'award',
+    'Paper': 'paper',
+    'Grants': 'grants',
+    'Co-create with': 'collaborators',
+    'Performers': 'performers',
+    'Download': 'download',
+    'Citation': 'citation',
+    'Related': 'related',
+}
+
+
+def clean_html_whitespace(html_content):
+    """
+    Collapse whitespace runs to a single space and drop spaces around <br>.
+
+    Same result as the three re.sub() passes of the regex extractor: once
+    every run is a single space, only ' <br>' and '<br> ' are left to fix.
+    """
+    if not html_content:
+        return html_content
+
+    cleaned = ' '.join(html_content.split())
+    return cleaned.replace(' <br>', '<br>').replace('<br> ', '<br>')
+
+
+def clean_title(title_raw):
+    """Strip tags from the <h1> content"""
+    return re.sub(r'<[^>]+>', '', title_raw).strip()
+
+
+def clean_description(desc):
+    """Clean the first <p> of content_in; returns None when nothing is left"""
+    # Remove ONLY plain <a> tags (no attributes), preserve <a href="..." class="...">
+    desc = re.sub(r'<a>([^<]*)</a>', r'\1', desc)
+    # Remove empty <dd></dd> tags
+    desc = re.sub(r'<dd>\s*</dd>', '', desc)
+    desc = clean_html_whitespace(desc)
+    return desc or None
+
+
+def clean_credit(credit_html):
+    """Clean the <dd> that follows <dt>Credit</dt>"""
+    credit_html = credit_html.strip()
+    credit_html = re.sub(r'<a>([^<]*)</a>', r'\1', credit_html)
+    # Remove trailing <br> tags
+    credit_html = re.sub(r'<br>\s*$', '', credit_html)
+    return clean_html_whitespace(credit_html)
+
+
+def clean_tools(tools_html):
+    """Reduce the Tool <dd> to plain text; returns None when empty"""
+    tools = re.sub(r'<[^>]+>', '', tools_html.strip()).strip()
+    tools = re.sub(r'\s+', ' ', tools).strip()
+    return tools or None
+
+
+def clean_dd_list(dd_list):
+    """Combine every <dd> under one <dt> into a single HTML string"""
+    combined_dd = '<br>'.join(dd.strip() for dd in dd_list)
+    dd_clean = re.sub(r'<a>([^<]*)</a>', r'\1', combined_dd)
+    dd_clean = re.sub(r'<br>\s*$', '', dd_clean)
+    return clean_html_whitespace(dd_clean)
+
+
+class _DtLabel:
+    """
+    Match '<dt>LABEL</dt>' and '<dt>LABEL</a></dt>' across tags.
+
+    Only '<dt>', '</a>' and '</dt>' need to be fed: any other tag in between
+    leaves a '<' in the label text, which rejects the match just as the
+    regex '<dt>([^<]+?)(?:</a>)?</dt>' would.
+    """
+
+    def __init__(self, scanner):
+        self._scanner = scanner
+        self._open = None    # end offset of the last '<dt>' or '</a>'
+        self._label = None   # label text once '</a>' has been consumed
+
+    def feed(self, tag):
+        """Return (label, closed_with_a) when the tag completes a match"""
+        raw = tag.group()
+        if self._open is not None:
+            gap = self._scanner.clean(self._open, tag.start())
+            if self._label is None:
+                if gap and '<' not in gap:
+                    if raw == '</dt>':
+                        self._open = None
+                        return gap, False
+                    if raw == '</a>':
+                        self._label = gap
+                        self._open = tag.end()
+                        return None
+            elif raw == '</dt>' and not gap:
+                label = self._label
+                self._open = self._label = None
+                return label, True
+            self._open = self._label = None
+
+        if raw == '<dt>':
+            self._open = tag.end()
+        return None
+
+
+class _LabeledDd:
+    """
+    First '<dt>LABEL</dt>\\s*<dd>(.+?)</dd>' anywhere in the page.
+
+    dt_matched() is called for every matching label; feed() sees '<dd>' and
+    '</dd>' tags and returns the raw <dd> content once it closes.
+    """
+
+    def __init__(self, scanner):
+        self._scanner = scanner
+        self._after_dt = None
+        self._dd_open = None
+        self.done = False
+
+    def dt_matched(self, tag):
+        if self._dd_open is None:
+            self._after_dt = tag.end()
+
+    def feed(self, tag):
+        if self._dd_open is not None:
+            if tag.group() == '</dd>' and not self._scanner.is_empty(self._dd_open, tag.start()):
+                self.done = True
+                return self._scanner.clean(self._dd_open, tag.start())
+        elif self._after_dt is not None and tag.group() == '<dd>':
+            after_dt = self._after_dt
+            self._after_dt = None
+            # Anything but whitespace between </dt> and <dd> (including another
+            # tag) breaks the '\s*' in the pattern
+            if not self._scanner.clean(after_dt, tag.start()).strip():
+                self._dd_open = tag.end()
+        return None
+
+
+class _DtSections:
+    """Split content_in on <dt> labels and collect every <dd> under each label."""
+
+    def __init__(self, scanner):
+        self._scanner = scanner
+        self._label = None
+        self._dds = []
+        self._dd_open = None
+        self.sections = {}
+
+    def _flush(self):
+        if self._label is not None and self._dds:
+            field = DT_FIELDS.get(self._label.strip())
+            if field:
+                self.sections[field] = clean_dd_list(self._dds)
+
+    def start(self, label):
+        self._flush()
+        self._label = label
+        self._dds = []
+        self._dd_open = None
+
+    def feed(self, tag):
+        if self._label is None:
+            return
+        if self._dd_open is None:
+            if tag.group() == '<dd>':
+                self._dd_open = tag.end()
+        elif tag.group() == '</dd>' and not self._scanner.is_empty(self._dd_open, tag.start()):
+            self._dds.append(self._scanner.clean(self._dd_open, tag.start()))
+            self._dd_open = None
+
+    def close(self):
+        self._flush()
+        return self.sections
+
+
+def iter_sections(text):
+    """
+    Yield (field, value) pairs from a work page in a single pass.
+
+    Fields: 'title', 'images', 'first_image', 'description', 'credit',
+    'tools' and the DT_FIELDS values. Fields that are absent are not yielded.
+    """
+    scanner = TagScanner(text, WORK_TAGS)
+    dt_label = _DtLabel(scanner)
+    credit = _LabeledDd(scanner)
+    tools = _LabeledDd(scanner)
+
+    title_open = None
+    title_done = False
+    first_image_done = False
+
+    swiper_open = None
+    swiper_done = False
+    swiper_imgs = []
+
+    content_open = None
+    content_done = False
+    p_open = None
+    p_done = False
+    description = None
+    p_end_seen = False
+    dt_sections = None
+
+    for tag in scanner:
+        raw = tag.group()
+        in_content = content_open is not None and not content_done
+
+        if raw == '<dd>' or raw == '</dd>':
+            if not credit.done:
+                value = credit.feed(tag)
+                if value is not None:
+                    yield 'credit', clean_credit(value)
+            if not tools.done:
+                value = tools.feed(tag)
+                if value is not None:
+                    yield 'tools', clean_tools(value)
+            if in_content:
+                dt_sections.feed(tag)
+
+        elif raw == '<dt>' or raw == '</dt>' or raw == '</a>':
+            matched = dt_label.feed(tag)
+            if matched is not None:
+                label, closed_with_a = matched
+                if label == 'Credit' and not closed_with_a:
+                    credit.dt_matched(tag)
+                elif label == 'Tool':
+                    tools.dt_matched(tag)
+                if in_content:
+                    dt_sections.start(label)
+
+        elif raw == '</div>':
+            # Swiper: the first </div> followed by a swiper button closes it
+            if (swiper_open is not None and not swiper_done
+                    and SWIPER_END_RE.match(text, tag.end())
+                    and not scanner.is_empty(swiper_open, tag.start())):
+                swiper_done = True
+                images = []
+                last_end = swiper_open
+                for match in swiper_imgs:
+                    if match.start() >= last_end and match.end() <= tag.start():
+                        images.append(match.group(1))
+                        last_end = match.end()
+                yield 'images', images
+
+            # content_in ends at its first </div>; without one the regex finds
+            # no description or sections at all, so they are only emitted here
+            if in_content and not scanner.is_empty(content_open, tag.start()):
+                content_done = True
+                if description:
+                    yield 'description', description
+                for field, value in dt_sections.close().items():
+                    yield field, value
+
+        elif raw == '<p>' or raw == '</p>':
+            if not in_content:
+                continue
+            if not p_done:
+                if p_open is None:
+                    if raw == '<p>':
+                        p_open = tag.end()
+                elif raw == '</p>' and not scanner.is_empty(p_open, tag.start()):
+                    p_done = True
+                    description = clean_description(scanner.clean(p_open, tag.start()))
+            if raw == '</p>' and not p_end_seen:
+                # <dt>/<dd> sections are only read after the first </p>
+                p_end_seen = True
+                dt_sections = _DtSections(scanner)
+
+        elif raw.startswith('<img'):
+            in_swiper = swiper_open is not None and not swiper_done
+            if first_image_done and not in_swiper:
+                continue
+            match = IMG_SRC_RE.match(text, tag.start())
+            if match:
+                if not first_image_done:
+                    first_image_done = True
+                    yield 'first_image', match.group(1)
+                if in_swiper:
+                    swiper_imgs.append(match)
+
+        elif raw == '</h1>':
+            if title_open is not None and not title_done:
+                title_done = True
+                yield 'title', clean_title(scanner.clean(title_open, tag.start()))
+
+        elif raw.startswith('<h1'):
+            if title_open is None:
+                title_open = tag.end()
+
+        elif raw == SWIPER_OPEN:
+            if swiper_open is None:
+                swiper_open = tag.end()
+
+        elif raw == CONTENT_IN_OPEN:
+            if content_open is None:
+                content_open = tag.end()
+                # Until a </p> shows up the whole block is split on <dt>
+                dt_sections = _DtSections(scanner)
+
+
+def extract_work(text, work_id, category):
+    """Build the works-data JSON dict for one page"""
+    sections = dict(iter_sections(text))
+
+    title = sections.get('title', work_id)
+
+    images = sections.get('images', [])
+    if images:
+        thumbnail = images[0]
+    else:
+        thumbnail = sections.get('first_image', f"../image/{work_id}/thumb.jpg")
+        images = [thumbnail]
+
+    description = sections.get('description')
+
+    year = "2024"
+    year_match = re.search(r'20\d{2}', description or '')
+    if year_match:
+        year = year_match.group()
+
+    return {
+        "id": work_id,
+        "title": title,
+        "category": category,
+        "year": year,
+        "thumbnail": thumbnail,
+        "images": images,
+        "description": description,
+        "credit": sections.get('credit'),
+        "tools": sections.get('tools'),
+        "link": sections.get('link'),
+        "exhibition": sections.get('exhibition'),
+        "award": sections.get('award'),
+        "paper": sections.get('paper'),
+        "grants": sections.get('grants'),
+        "collaborators": sections.get('collaborators'),
+        "performers": sections.get('performers'),
+        "download": sections.get('download'),
+        "citation": sections.get('citation'),
+        "related": sections.get('related')
+    }
@@ -0,0 +1,243 @@
+"""
+Change-aware, atomic file writer with a run journal.
+
+write_text()/write_bytes() leave a file alone when it already holds the same
+content (compared by size, then SHA-256). Otherwise the data goes to a temp
+file in the same directory, which is then renamed over the target, so an
+interrupted run never leaves a truncated page behind.
+
+fsync is optional: 'each' syncs every file before its rename, 'batch' syncs
+all written files (and their directories) once in close(), 'none' leaves it
+to the OS.
+
+Every run appends one line to .cache/write-journal.jsonl with the files it
+created or updated and the bytes written; read_journal() and changed_paths()
+read it back, e.g. to see what a pipeline run touched. The journal is capped:
+once it reaches JOURNAL_MAX_BYTES it is renamed to write-journal.1.jsonl
+(replacing the previous one) and a new one is started, so at most two
+generations are kept.
+
+Usage:
+    from sitetools.writer import ChangeAwareWriter
+
+    with ChangeAwareWriter('my_script') as writer:
+        status = writer.write_text(path, text)   # 'created', 'updated' or 'unchanged'
+"""
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+JOURNAL_PATH = BASE_DIR / '.cache' / 'write-journal.jsonl'
+JOURNAL_MAX_BYTES = 1024 * 1024
+
+FSYNC_MODES = ('none', 'each', 'batch')
+
+# New files get the same permissions open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def journal_key(path):
+    """Path as recorded in the journal: relative to the repo when inside it"""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def same_content(path, data):
+    """True when path exists and holds exactly data"""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, 'rb') as f:
+            existing = f.read()
+    except FileNotFoundError:
+        return False
+    return hashlib.sha256(existing).digest() == hashlib.sha256(data).digest()
+
+
+def _fsync_path(path, directory=False):
+    flags = os.O_RDONLY | (getattr(os, 'O_DIRECTORY', 0) if directory else 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Some filesystems (and Windows directories) don't support it
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path, data, fsync=False):
+    """Write data to path through a temp file and rename; keeps the file's mode"""
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if fsync:
+        _fsync_path(path.parent, directory=True)
+
+
+class ChangeAwareWriter:
+    """
+    Write files only when their content changes, atomically, and journal the run.
+
+    Args:
+        tool (str): Name recorded in the journal (usually the script name)
+        fsync (str): 'none', 'each' or 'batch'
+        journal_path (Path): Where runs are appended; None disables the journal
+    """
+
+    def __init__(self, tool, fsync='none', journal_path=JOURNAL_PATH):
+        if fsync not in FSYNC_MODES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_MODES)}")
+        self.tool = tool
+        self.fsync = fsync
+        self.journal_path = Path(journal_path) if journal_path else None
+        self.started = time.time()
+        self.files = []          # [{'path', 'status', 'bytes'}] for written files
+        self.unchanged = 0
+        self.bytes_written = 0
+        self._pending_sync = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def write_text(self, path, text, encoding='utf-8'):
+        return self.write_bytes(path, text.encode(encoding))
+
+    def write_bytes(self, path, data):
+        """
+        Write data unless path already holds it.
+
+        Returns:
+            str: 'created', 'updated' or 'unchanged'
+        """
+        path = Path(path)
+        if same_content(path, data):
+            self.unchanged += 1
+            return 'unchanged'
+
+        status = 'updated' if path.exists() else 'created'
+        atomic_write_bytes(path, data, fsync=self.fsync == 'each')
+        self.record(path, status, len(data))
+        return status
+
+    def record(self, path, status, nbytes):
+        """
+        Add a write done elsewhere (e.g. by a worker process) to this run.
+
+        Unchanged files only count towards the summary; written ones are
+        journaled and, in 'batch' mode, synced in close().
+        """
+        if status == 'unchanged':
+            self.unchanged += 1
+            return
+        self.files.append({'path': journal_key(path), 'status': status, 'bytes': nbytes})
+        self.bytes_written += nbytes
+        if self.fsync == 'batch':
+            self._pending_sync.append(Path(path))
+
+    def summary(self):
+        return (f"{len(self.files)} written ({self.bytes_written:,} bytes), "
+                f"{self.unchanged} unchanged")
+
+    def close(self):
+        """Run batched fsyncs and append this run to the journal"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._pending_sync:
+            directories = set()
+            for path in self._pending_sync:
+                _fsync_path(path)
+                directories.add(path.parent)
+            for directory in sorted(directories):
+                _fsync_path(directory, directory=True)
+            self._pending_sync = []
+
+        if self.journal_path is None or not self.files:
+            return
+        entry = {
+            'tool': self.tool,
+            'started': round(self.started, 3),
+            'finished': round(time.time(), 3),
+            'bytes_written': self.bytes_written,
+            'unchanged': self.unchanged,
+            'files': self.files,
+        }
+        try:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            if (self.journal_path.exists()
+                    and self.journal_path.stat().st_size >= JOURNAL_MAX_BYTES):
+                os.replace(self.journal_path, rotated_journal(self.journal_path))
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        except OSError:
+            pass
+
+
+def rotated_journal(journal_path):
+    """Where the previous generation of a journal is kept"""
+    journal_path = Path(journal_path)
+    return journal_path.with_name(journal_path.stem + '.1' + journal_path.suffix)
+
+
+def read_journal(journal_path=JOURNAL_PATH):
+    """All journaled runs still kept (both generations), oldest first; unreadable lines are skipped"""
+    runs = []
+    for path in (rotated_journal(journal_path), Path(journal_path)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        runs.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+    return runs
+
+
+def changed_paths(since=0.0, journal_path=JOURNAL_PATH):
+    """Journal paths created or updated by runs that finished after `since` (a timestamp)"""
+    paths = set()
+    for run in read_journal(journal_path):
+        if run.get('finished', 0.0) > since:
+            paths.update(item['path'] for item in run.get('files', []))
+    return paths
@@ -15,6 +15,10 @@ import json
 import re
 from pathlib import Path
 
+from sitetools.writer import ChangeAwareWriter
+
+WRITER = ChangeAwareWriter('standardize_link_separators')
+
 def standardize_link_separator(link_html):
     """Standardize link separators in HTML string."""
     if not link_html:
@@ -50,12 +54,10 @@ def process_json_file(filepath):
     if standardized_link != original_link:
         data['link'] = standardized_link
 
-        # Write back with proper formatting
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write('\n')  # Add trailing newline
-
-        return True
+        # Write back with proper formatting (and a trailing newline); files
+        # whose serialized bytes come out identical are not rewritten
+        text = json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+        return WRITER.write_text(filepath, text) != 'unchanged'
 
     return False
 
@@ -81,5 +83,7 @@ def main():
     print(f"Summary: Modified {modified_count} files")
     print(f"All link separators now use ' / ' (space-slash-space)")
 
+    WRITER.close()
+
 if __name__ == '__main__':
     main()
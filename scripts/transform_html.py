@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Run the HTML rewrite scripts as passes of one pipeline.
+
+Each page is read once, the selected passes run in order on the in-memory
+text, and the page is written back at most once. Pages are processed in
+parallel with --jobs. The report shows, per pass, how many files and changes
+it produced and the time it spent.
+
+Usage:
+    python3 scripts/transform_html.py                 # default passes
+    python3 scripts/transform_html.py image_policy comments --jobs 4
+    python3 scripts/transform_html.py --dry-run       # report only
+    python3 scripts/transform_html.py --list
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from sitetools.inventory import site_files
+from sitetools.imagepolicy import apply_policy
+from sitetools.pipeline import DOCS, TransformPass, run_pipeline
+from sitetools.writer import FSYNC_MODES, ChangeAwareWriter
+
+from add_common_css import add_common_css
+from add_page_transitions import add_page_transitions
+from remove_deprecated_attrs import remove_align_attributes
+from remove_jquery import remove_jquery
+from maintenance.cleanup_comments import clean_comments
+from maintenance.improve_accessibility import improve_accessibility
+
+
+# Adapters: every pass takes (html_content, path, doc) and returns
+# (html_content, count_of_changes)
+
+def deprecated_attrs_pass(html_content, path, doc):
+    return remove_align_attributes(html_content, doc)
+
+
+def image_policy_pass(html_content, path, doc):
+    new_content, _, _ = apply_policy(doc, Path(path).as_posix())
+    return new_content, int(new_content != html_content)
+
+
+def accessibility_pass(html_content, path, doc):
+    html_content, changes = improve_accessibility(html_content, doc)
+    return html_content, len(changes)
+
+
+def comments_pass(html_content, path, doc):
+    cleaned_content, removed_count, _ = clean_comments(html_content, doc)
+    return cleaned_content, removed_count
+
+
+def jquery_pass(html_content, path, doc):
+    return remove_jquery(html_content, doc)
+
+
+def common_css_pass(html_content, path, doc):
+    new_content, _ = add_common_css(html_content, doc)
+    return new_content, int(new_content != html_content)
+
+
+def page_transitions_pass(html_content, path, doc):
+    html_content, changes = add_page_transitions(html_content, path, doc)
+    return html_content, len(changes)
+
+
+PASSES = [
+    TransformPass('deprecated_attrs', deprecated_attrs_pass,
+                  'Replace/remove deprecated align attributes'),
+    TransformPass('image_policy', image_policy_pass,
+                  'Set loading/decoding/fetchpriority of <img> tags by position'),
+    TransformPass('accessibility', accessibility_pass,
+                  'Add alt text, replace <s>, add navigation role'),
+    TransformPass('comments', comments_pass,
+                  'Remove commented-out code and empty comments'),
+    TransformPass('jquery', jquery_pass,
+                  'Remove jQuery and sample.js script tags'),
+    TransformPass('common_css', common_css_pass,
+                  'Add common.css before style_2.css',
+                  skip_names=('index.html',)),
+    TransformPass('page_transitions', page_transitions_pass,
+                  'Add page transition CSS/JS (archived feature)',
+                  skip_names=('menu-content.html',)),
+]
+
+PASSES_BY_NAME = {transform.name: transform for transform in PASSES}
+
+# page_transitions belongs to a removed feature and only runs when named
+DEFAULT_PASSES = ['deprecated_attrs', 'image_policy', 'accessibility',
+                  'comments', 'jquery', 'common_css']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Run HTML rewrite passes with a single read/write per file.')
+    parser.add_argument('passes', nargs='*', metavar='PASS',
+                        help=f"passes to run in order (default: {' '.join(DEFAULT_PASSES)})")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes (0 = one per CPU core, default 1)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='report changes without writing files')
+    parser.add_argument('--fsync', choices=FSYNC_MODES, default='none',
+                        help="sync written files: after 'each' write, once in a 'batch' at the end, or 'none' (default)")
+    parser.add_argument('--list', action='store_true',
+                        help='list available passes and exit')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.passes if name not in PASSES_BY_NAME]
+    if unknown:
+        parser.error(f"unknown pass(es): {', '.join(unknown)} (see --list)")
+    if args.jobs < 0:
+        parser.error('--jobs must be 0 or a positive number')
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if args.list:
+        for transform in PASSES:
+            marker = '*' if transform.name in DEFAULT_PASSES else ' '
+            print(f"{marker} {transform.name:<18} {transform.description}")
+        print("\n* = runs by default")
+        return
+
+    passes = [PASSES_BY_NAME[name] for name in (args.passes or DEFAULT_PASSES)]
+    html_files = site_files('html', Path('.'))
+
+    print(f"Running {len(passes)} pass(es) over {len(html_files)} HTML files: "
+          f"{', '.join(transform.name for transform in passes)}\n")
+
+    writer = ChangeAwareWriter('transform_html', fsync=args.fsync)
+
+    start = time.perf_counter()
+    results = run_pipeline(passes, html_files, workers=args.jobs,
+                           write=not args.dry_run, fsync=args.fsync == 'each')
+
+    written = 0
+    errors = 0
+    for result in results:
+        if result.error:
+            errors += 1
+            print(f"✗ {result.path}: Error - {result.error}")
+            continue
+        if result.written:
+            written += 1
+            writer.record(result.path, 'updated', result.bytes_written)
+        changed = {name: count for name, count in result.counts.items() if count}
+        if changed:
+            summary = ', '.join(f"{name} {count}" for name, count in changed.items())
+            print(f"✓ {result.path}: {summary}")
+
+    print(f"\n{'='*60}")
+    print(f"{'Pass':<18} {'Files':>6} {'Changes':>8} {'Time (ms)':>10}")
+    for transform in passes:
+        counts = [result.counts.get(transform.name, 0) for result in results]
+        seconds = sum(result.seconds.get(transform.name, 0.0) for result in results)
+        print(f"{transform.name:<18} {sum(1 for c in counts if c):>6} "
+              f"{sum(counts):>8} {seconds * 1000:>10.2f}")
+    # Batched fsyncs (if any) and the journal entry happen here
+    writer.close()
+    # Rewritten pages leave the parse of their old content behind
+    pruned = DOCS.prune(html_files)
+    wall = time.perf_counter() - start
+
+    print(f"{'='*60}")
+    print(f"  Files read: {len(results)}")
+    print(f"  Files written: {written}{' (dry run)' if args.dry_run else ''}"
+          f" ({writer.bytes_written:,} bytes)")
+    print(f"  Errors: {errors}")
+    print(f"  Parse cache: pruned {pruned} stale entries")
+    print(f"  Wall time: {wall:.2f}s")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
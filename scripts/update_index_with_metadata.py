@@ -1,68 +1,325 @@
 #!/usr/bin/env python3
 """
-Update index.json to include year and category metadata.
+Update index.json with the metadata the works grid and SPA need.
 
-This allows thumbnail overlays without loading all work JSON files.
+Every work gets id, title, year and category (for the thumbnail overlays),
+its page filename (kept from the current index.json), and for its cards:
+thumbnail path, the thumbnail's intrinsic width/height, image count and the
+total byte size of its local images. The SPA then never has to scan the DOM
+or fetch a work's JSON to draw a card.
+
+works-data/index.columns.json carries the same data column by column, with
+year and category stored once per distinct value, so it stays small with
+thousands of works.
+
+For very large catalogues, --shard also writes works-data/index/: a
+directory.json with the counts and file names, head.json with the first
+--head works in display order, and per-category shards of --shard-size works
+(index/<category>-000.json, ...). Both are packed like index.columns.json,
+with an extra `position` column (the work's place in the display order).
+The SPA then renders after fetching two small files, however long the
+catalogue is, and pulls the shards in the background. Once enabled,
+sharding is redone on every run with the settings kept in directory.json;
+--no-shard removes the shards again.
+
+Runs are incremental: .cache/index-metadata.json keeps each work's entry
+together with the SHA-256 of its JSON and the size/mtime of its images (from
+the site inventory). Works whose JSON and images are unchanged are not
+re-read.
+
+Usage:
+    python3 update_index_with_metadata.py [--shard [--head N] [--shard-size N] | --no-shard]
 """
 
+import argparse
 import json
+import os
+import posixpath
 from pathlib import Path
 
+from sitetools.imagesize import image_size
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+# Bump when entries are computed differently, so cached ones are rebuilt
+METADATA_VERSION = 1
+
+# Key order of index.json entries; also the columns of index.columns.json
+INDEX_KEYS = ['id', 'title', 'year', 'category', 'filename',
+              'thumbnail', 'width', 'height', 'imageCount', 'bytes']
+
+# Few distinct values: stored as {values, codes} in index.columns.json
+DICTIONARY_COLUMNS = ('year', 'category')
+
+# Sharded index (--shard): works-data/index/
+SHARD_DIR_NAME = 'index'
+SHARD_DIRECTORY = 'directory.json'
+SHARD_KEYS = INDEX_KEYS + ['position']
+DEFAULT_HEAD = 60
+DEFAULT_SHARD_SIZE = 500
+
+INDEX_DESCRIPTION = ('Work order for portfolio display with title, year and category metadata '
+                     'for thumbnail overlays, plus thumbnail, size and image count for cards.')
+
+
+def site_path(image_path):
+    """Repo-relative path of an image referenced from works/, or None for URLs"""
+    if '://' in image_path or image_path.startswith('data:'):
+        return None
+    return posixpath.normpath(posixpath.join('works', image_path))
+
+
+def image_signature(inventory, rels):
+    """[rel, size, mtime_ns] for each local image (None when missing)"""
+    return [[rel, *inventory.entries[rel][:2]] if rel in inventory.entries else [rel, None, None]
+            for rel in rels]
+
+
+def build_entry(work_id, work_data, inventory, project_root):
+    """Card metadata of one work (everything but filename)"""
+    thumbnail = work_data.get('thumbnail') or ''
+    images = work_data.get('images') or []
+
+    local = []
+    for path in [thumbnail] + images:
+        rel = site_path(path) if path else None
+        if rel and rel not in local:
+            local.append(rel)
+
+    thumb_rel = site_path(thumbnail) if thumbnail else None
+    size = image_size(project_root / thumb_rel) if thumb_rel in inventory.entries else None
+
+    return {
+        'id': work_id,
+        'title': work_data.get('title', ''),
+        'year': work_data.get('year', ''),
+        'category': work_data.get('category', ''),
+        'thumbnail': thumbnail or None,
+        'width': size[0] if size else None,
+        'height': size[1] if size else None,
+        'imageCount': len(images),
+        'bytes': sum(inventory.size(rel) for rel in local if rel in inventory.entries),
+    }, local
+
+
+def build_columns(entries, keys=INDEX_KEYS):
+    """The index as one array per key; DICTIONARY_COLUMNS as {values, codes}"""
+    columns = {}
+    for key in keys:
+        values = [entry.get(key) for entry in entries]
+        if key in DICTIONARY_COLUMNS:
+            distinct = list(dict.fromkeys(values))
+            code = {value: i for i, value in enumerate(distinct)}
+            columns[key] = {'values': distinct, 'codes': [code[value] for value in values]}
+        else:
+            columns[key] = values
+    return {'version': 1, 'count': len(entries), 'columns': columns}
+
+
+def build_shards(entries, head, shard_size):
+    """
+    Split the index into a head page and per-category shards.
+
+    Returns:
+        tuple: (directory dict, {file name: packed columns})
+    """
+    rows = [dict(entry, position=position) for position, entry in enumerate(entries)]
+    files = {'head.json': build_columns(rows[:head], SHARD_KEYS)}
+
+    by_category = {}
+    for row in rows:
+        by_category.setdefault(row['category'] or 'none', []).append(row)
+
+    categories = {}
+    for category, category_rows in by_category.items():
+        shards = []
+        for start in range(0, len(category_rows), shard_size):
+            name = f'{category}-{start // shard_size:03d}.json'
+            files[name] = build_columns(category_rows[start:start + shard_size], SHARD_KEYS)
+            shards.append(f'{SHARD_DIR_NAME}/{name}')
+        categories[category] = {'count': len(category_rows), 'shards': shards}
+
+    directory = {
+        'version': 1,
+        'count': len(rows),
+        'head': {'file': f'{SHARD_DIR_NAME}/head.json', 'count': min(head, len(rows))},
+        'shardSize': shard_size,
+        'categories': categories,
+    }
+    return directory, files
+
+
+def load_shard_settings(shard_dir):
+    """(head, shard size) of an existing sharded index, or None"""
+    try:
+        with open(shard_dir / SHARD_DIRECTORY, 'r', encoding='utf-8') as f:
+            directory = json.load(f)
+        return directory['head']['count'], directory['shardSize']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def remove_shards(shard_dir, keep=()):
+    """Delete shard files not in keep (and the directory once it is empty)"""
+    removed = 0
+    if not shard_dir.is_dir():
+        return removed
+    with os.scandir(shard_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.json') and entry.name not in keep and entry.is_file():
+                os.unlink(entry.path)
+                removed += 1
+    if not keep and not any(shard_dir.iterdir()):
+        shard_dir.rmdir()
+    return removed
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != METADATA_VERSION:
+        return {}
+    return cache.get('works', {})
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Update works-data/index.json with work metadata')
+    shard = parser.add_mutually_exclusive_group()
+    shard.add_argument('--shard', action='store_true',
+                       help='also write the sharded index in works-data/index/')
+    shard.add_argument('--no-shard', action='store_true',
+                       help='remove works-data/index/ (sharding stays on once enabled otherwise)')
+    parser.add_argument('--head', type=int, default=None,
+                        help=f'works in the head page of the sharded index (default {DEFAULT_HEAD})')
+    parser.add_argument('--shard-size', type=int, default=None,
+                        help=f'works per category shard (default {DEFAULT_SHARD_SIZE})')
+    args = parser.parse_args()
+    for name in ('head', 'shard_size'):
+        value = getattr(args, name)
+        if value is not None and value < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+    return args
+
+
 def main():
+    args = parse_args()
     project_root = Path(__file__).parent.parent
     works_data_dir = project_root / 'works-data'
     index_file = works_data_dir / 'index.json'
+    columns_file = works_data_dir / 'index.columns.json'
+    shard_dir = works_data_dir / SHARD_DIR_NAME
+    cache_file = project_root / '.cache' / 'index-metadata.json'
+
+    # Sharding: explicit settings win, otherwise keep what directory.json says
+    shard_settings = None if args.no_shard else load_shard_settings(shard_dir)
+    if args.shard or (shard_settings and (args.head or args.shard_size)):
+        previous_head, previous_size = shard_settings or (DEFAULT_HEAD, DEFAULT_SHARD_SIZE)
+        shard_settings = (args.head or previous_head, args.shard_size or previous_size)
 
     # Load current index.json
     with open(index_file, 'r', encoding='utf-8') as f:
         index_data = json.load(f)
 
-    # Handle both old and new formats
+    # Handle both old and new formats; filenames only exist in the new one
     if 'works' in index_data:
         work_order = [w['id'] for w in index_data['works']]
+        filenames = {w['id']: w['filename'] for w in index_data['works'] if w.get('filename')}
     else:
         work_order = index_data['order']
+        filenames = {}
 
+    inventory = load_inventory(project_root)
+    cache = load_cache(cache_file)
+    new_cache = {}
     works_with_metadata = []
+    reused = 0
 
     print(f"Processing {len(work_order)} works...")
     print()
 
     # Load each work's metadata
     for work_id in work_order:
-        work_file = works_data_dir / f'{work_id}.json'
+        rel = f'works-data/{work_id}.json'
 
-        if not work_file.exists():
+        if rel not in inventory.entries:
             print(f"⚠ Warning: {work_id}.json not found, skipping")
             continue
 
-        with open(work_file, 'r', encoding='utf-8') as f:
-            work_data = json.load(f)
-
-        work_metadata = {
-            'id': work_id,
-            'title': work_data.get('title', ''),
-            'year': work_data.get('year', ''),
-            'category': work_data.get('category', '')
-        }
+        json_sha256 = inventory.sha256(rel)
+        cached = cache.get(work_id)
+        if (cached and cached['json_sha256'] == json_sha256
+                and cached['images'] == image_signature(inventory, [image[0] for image in cached['images']])):
+            entry = cached['entry']
+            new_cache[work_id] = cached
+            reused += 1
+        else:
+            with open(project_root / rel, 'r', encoding='utf-8') as f:
+                work_data = json.load(f)
+            entry, local = build_entry(work_id, work_data, inventory, project_root)
+            new_cache[work_id] = {
+                'json_sha256': json_sha256,
+                'images': image_signature(inventory, local),
+                'entry': entry,
+            }
 
+        work_metadata = dict(entry, filename=filenames.get(work_id))
+        work_metadata = {key: work_metadata[key] for key in INDEX_KEYS
+                         if key != 'filename' or work_metadata[key]}
         works_with_metadata.append(work_metadata)
         print(f"✓ {work_id}: {work_metadata['year']} / {work_metadata['title']}")
 
     # Update index.json structure
     new_index = {
         'works': works_with_metadata,
-        'description': 'Work order for portfolio display with title, year and category metadata for thumbnail overlays.'
+        'description': INDEX_DESCRIPTION
     }
+    columns = build_columns(works_with_metadata)
+
+    # Write updated index files (atomically, and only if their bytes change)
+    with ChangeAwareWriter('update_index_with_metadata') as writer:
+        status = writer.write_text(index_file, json.dumps(new_index, indent=2, ensure_ascii=False) + '\n')
+        columns_status = writer.write_text(
+            columns_file, json.dumps(columns, ensure_ascii=False, separators=(',', ':')) + '\n')
 
-    # Write updated index.json
-    with open(index_file, 'w', encoding='utf-8') as f:
-        json.dump(new_index, f, indent=2, ensure_ascii=False)
-        f.write('\n')
+        shard_files = {}
+        if shard_settings:
+            directory, shard_files = build_shards(works_with_metadata, *shard_settings)
+            shard_files[SHARD_DIRECTORY] = directory
+            shard_dir.mkdir(exist_ok=True)
+            for name, data in shard_files.items():
+                writer.write_text(shard_dir / name,
+                                  json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n')
+        removed_shards = remove_shards(shard_dir, keep=shard_files)
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(cache_file, json.dumps(
+            {'version': METADATA_VERSION, 'works': new_cache},
+            ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    except OSError:
+        pass
+    inventory.save()
 
     print()
-    print(f"✅ Updated index.json with metadata for {len(works_with_metadata)} works")
-    print(f"File size: {index_file.stat().st_size} bytes")
+    if status == 'unchanged':
+        print(f"- index.json already up to date ({len(works_with_metadata)} works)")
+    else:
+        print(f"✅ Updated index.json with metadata for {len(works_with_metadata)} works")
+    print(f"{'-' if columns_status == 'unchanged' else '✅'} index.columns.json {columns_status}")
+    if shard_settings:
+        categories = directory['categories']
+        print(f"Sharded index: head of {directory['head']['count']} works, "
+              f"{sum(len(c['shards']) for c in categories.values())} shard(s) of up to "
+              f"{directory['shardSize']} in {len(categories)} categories"
+              + (f", {removed_shards} stale file(s) removed" if removed_shards else ''))
+    elif removed_shards:
+        print(f"Removed the sharded index ({removed_shards} files)")
+    print(f"Reused: {reused} works (JSON and images unchanged), rebuilt: {len(works_with_metadata) - reused}")
+    print(f"File size: {index_file.stat().st_size} bytes "
+          f"(columns: {columns_file.stat().st_size} bytes)")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Works Data Schema Validation
+Validates works-data/*.json and index.json against works-data/SCHEMA.md
+
+The schema is compiled once (sitetools.schema) into per-field checks, then
+every work file is read, checked and dropped in a single pass; only its id,
+index metadata and related ids are kept for the cross-file checks:
+
+- every file's id matches its file name
+- every id in index.json has a file, and every file is listed (no orphans)
+- index.json title/year/category match the work files
+- every id in `related` exists (and is not the work itself)
+
+Usage:
+    python3 scripts/validation/validate_works_data.py [--strict] [--json PATH] [--root DIR]
+    python3 scripts/validation/validate_works_data.py --self-check
+
+--self-check runs the per-file checks on malformed copies of
+works-data/_template.json (SELF_CHECKS) and fails unless each one is
+reported as an error for the expected field, without the validator
+crashing.
+
+Warnings (fields missing from SCHEMA.md, unusual image paths) don't fail
+the run unless --strict is given. The exit status is 1 when there are errors.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from sitetools.schema import SchemaError, load_schema  # noqa: E402
+from sitetools.writer import atomic_write_bytes  # noqa: E402
+
+BASE_DIR = SCRIPTS_DIR.parent
+
+# Files in works-data/ that are not works
+INDEX_NAME = 'index.json'
+SKIP_PREFIXES = ('_', '.', 'index.')    # _template.json, .extract-cache.json, index.columns.json
+
+# Index fields copied from the work files by update_index_with_metadata.py
+INDEX_METADATA = ('title', 'year', 'category')
+
+IMAGE_PREFIXES = ('../image/', 'https://', 'http://')
+
+TEMPLATE_NAME = '_template.json'
+SELF_CHECK_ID = 'self-check'
+
+# (description, field, malformed value); each must give an error naming the field
+SELF_CHECKS = (
+    ('images is a string', 'images', '../image/self-check/1.webp'),
+    ('images is an object', 'images', {'src': '../image/self-check/1.webp'}),
+    ('images holds a non-string', 'images', ['../image/self-check/1.webp', 2]),
+    ('thumbnail is a number', 'thumbnail', 1),
+    ('thumbnail is a list', 'thumbnail', ['../image/self-check/1.webp']),
+)
+
+
+class Report:
+    """Errors and warnings per file, in the order they were found."""
+
+    def __init__(self):
+        self.files = {}
+
+    def _entry(self, name):
+        return self.files.setdefault(name, {'errors': [], 'warnings': []})
+
+    def error(self, name, message):
+        self._entry(name)['errors'].append(message)
+
+    def warning(self, name, message):
+        self._entry(name)['warnings'].append(message)
+
+    def count(self, kind):
+        return sum(len(entry[kind]) for entry in self.files.values())
+
+
+def work_file_names(data_dir):
+    """Sorted work JSON file names in works-data/"""
+    with os.scandir(data_dir) as it:
+        return sorted(entry.name for entry in it
+                      if entry.name.endswith('.json')
+                      and not entry.name.startswith(SKIP_PREFIXES) and entry.is_file())
+
+
+def image_paths(work):
+    """The string thumbnail and image paths of a work; malformed fields are skipped"""
+    images = work.get('images')
+    candidates = [work.get('thumbnail')] + (images if type(images) is list else [])
+    return [path for path in candidates if type(path) is str and path]
+
+
+def check_work(name, work, schema, report):
+    """
+    Validate one parsed work file.
+
+    Returns:
+        dict: {'file', 'meta', 'references'} for the cross-file checks, or
+        None when the top level is not an object
+    """
+    errors, warnings, references = schema.validate(work)
+    for message in errors:
+        report.error(name, message)
+    for message in warnings:
+        report.warning(name, message)
+    if type(work) is not dict:
+        return None
+
+    work_id = work.get('id')
+    if type(work_id) is str and work_id != name[:-len('.json')]:
+        report.error(name, f"id '{work_id}' does not match the file name")
+
+    for path in image_paths(work):
+        if not path.startswith(IMAGE_PREFIXES):
+            report.warning(name, f"image path '{path}' is neither ../image/... nor an absolute URL")
+
+    return {
+        'file': name,
+        'meta': {key: work.get(key) for key in INDEX_METADATA},
+        'references': references,
+    }
+
+
+def validate_works(data_dir, schema, report):
+    """
+    Validate every work file in one pass.
+
+    Returns:
+        dict: work id -> {'file', 'meta', 'references'} for the cross-file checks
+    """
+    works = {}
+    for name in work_file_names(data_dir):
+        try:
+            with open(data_dir / name, 'rb') as f:
+                work = json.loads(f.read())
+        except ValueError as e:
+            report.error(name, f"invalid JSON: {e}")
+            continue
+
+        record = check_work(name, work, schema, report)
+        if record is not None:
+            works[name[:-len('.json')]] = record
+    return works
+
+
+def self_check(data_dir, schema):
+    """
+    Run check_work on each SELF_CHECKS case.
+
+    Returns:
+        list: (description, problem) of the cases that crashed or were not
+        reported as an error for their field
+    """
+    with open(data_dir / TEMPLATE_NAME, 'rb') as f:
+        template = json.loads(f.read())
+    template['id'] = SELF_CHECK_ID
+    failures = []
+    for description, field, value in SELF_CHECKS:
+        work = dict(template, **{field: value})
+        report = Report()
+        try:
+            check_work(f'{SELF_CHECK_ID}.json', work, schema, report)
+        except Exception as e:
+            failures.append((description, f'crashed: {type(e).__name__}: {e}'))
+            continue
+        errors = report.files.get(f'{SELF_CHECK_ID}.json', {}).get('errors', [])
+        if not any(message.startswith(field) for message in errors):
+            failures.append((description, f'no error for {field} (got {errors or "none"})'))
+    return failures
+
+
+def load_index(data_dir, report):
+    """Index entries as (id, metadata or None); None when index.json is unusable"""
+    try:
+        with open(data_dir / INDEX_NAME, 'rb') as f:
+            index_data = json.loads(f.read())
+    except FileNotFoundError:
+        report.error(INDEX_NAME, 'index.json not found')
+        return None
+    except ValueError as e:
+        report.error(INDEX_NAME, f"invalid JSON: {e}")
+        return None
+
+    if type(index_data) is dict and type(index_data.get('works')) is list:
+        entries = []
+        for position, entry in enumerate(index_data['works']):
+            if type(entry) is not dict or type(entry.get('id')) is not str:
+                report.error(INDEX_NAME, f"works[{position}] must be an object with a string id")
+                continue
+            entries.append((entry['id'], entry))
+        return entries
+    if type(index_data) is dict and type(index_data.get('order')) is list:
+        entries = []
+        for position, work_id in enumerate(index_data['order']):
+            if type(work_id) is not str:
+                report.error(INDEX_NAME, f"order[{position}] must be a string id")
+                continue
+            entries.append((work_id, None))
+        return entries
+
+    report.error(INDEX_NAME, "index.json must have a 'works' array or an 'order' array")
+    return None
+
+
+def cross_check(works, index_entries, report):
+    """Checks that need every file: index coverage, orphans, related ids"""
+    if index_entries is not None:
+        listed = set()
+        for work_id, entry in index_entries:
+            if work_id in listed:
+                report.error(INDEX_NAME, f"'{work_id}' is listed more than once")
+                continue
+            listed.add(work_id)
+            work = works.get(work_id)
+            if work is None:
+                report.error(INDEX_NAME, f"'{work_id}' has no works-data/{work_id}.json")
+                continue
+            if entry is None:
+                continue
+            stale = [key for key in INDEX_METADATA if key in entry and entry[key] != work['meta'][key]]
+            if stale:
+                report.error(INDEX_NAME, f"'{work_id}' {'/'.join(stale)} "
+                                         f"{'differs' if len(stale) == 1 else 'differ'} from {work['file']} "
+                                         f"(run update_index_with_metadata.py)")
+
+        for work_id, work in works.items():
+            if work_id not in listed:
+                report.error(work['file'], "orphan: not listed in index.json")
+
+    for work_id, work in works.items():
+        for field, ids in work['references'].items():
+            seen = set()
+            for ref in ids:
+                if ref == work_id:
+                    report.error(work['file'], f"{field} lists the work itself")
+                elif ref not in works:
+                    report.error(work['file'], f"{field} id '{ref}' does not exist")
+                elif ref in seen:
+                    report.error(work['file'], f"{field} lists '{ref}' twice")
+                seen.add(ref)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Validate works-data against works-data/SCHEMA.md')
+    parser.add_argument('--strict', action='store_true', help='treat warnings as errors')
+    parser.add_argument('--json', metavar='PATH', help='write the report as JSON')
+    parser.add_argument('--self-check', action='store_true',
+                        help='check that malformed fields are reported, not crashed on')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root containing works-data/ (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    data_dir = args.root.resolve() / 'works-data'
+    start = time.perf_counter()
+
+    try:
+        schema = load_schema(data_dir / 'SCHEMA.md')
+    except (OSError, SchemaError) as e:
+        print(f"✗ Cannot compile works-data/SCHEMA.md: {e}")
+        sys.exit(1)
+
+    if args.self_check:
+        failures = self_check(data_dir, schema)
+        for description, problem in failures:
+            print(f"✗ {description}: {problem}")
+        print(f"\nSUMMARY:")
+        print(f"  Cases: {len(SELF_CHECKS)}")
+        print(f"  Failed: {len(failures)}")
+        print(f"\n{'✗ Self-check failed' if failures else '✓ Malformed fields are reported'}")
+        sys.exit(1 if failures else 0)
+
+    report = Report()
+    works = validate_works(data_dir, schema, report)
+    cross_check(works, load_index(data_dir, report), report)
+    seconds = time.perf_counter() - start
+
+    for name in sorted(report.files):
+        entry = report.files[name]
+        print(f"✗ {name}" if entry['errors'] else f"⚠ {name}")
+        for message in entry['errors']:
+            print(f"    error: {message}")
+        for message in entry['warnings']:
+            print(f"    warning: {message}")
+
+    error_count = report.count('errors')
+    warning_count = report.count('warnings')
+    failed = error_count > 0 or (args.strict and warning_count > 0)
+
+    print(f"\nSUMMARY:")
+    print(f"  Schema fields: {len(schema.fields)}")
+    print(f"  Work files: {len(works)}")
+    print(f"  Errors: {error_count}")
+    print(f"  Warnings: {warning_count}{' (fail with --strict)' if args.strict else ''}")
+    print(f"  Time: {seconds * 1000:.0f} ms")
+    print(f"\n{'✗ Validation failed' if failed else '✓ works-data matches SCHEMA.md'}")
+
+    if args.json:
+        summary = {'files': len(works), 'errors': error_count, 'warnings': warning_count,
+                   'strict': args.strict, 'passed': not failed, 'seconds': round(seconds, 4)}
+        data = json.dumps({'summary': summary, 'files': report.files}, ensure_ascii=False, indent=2)
+        atomic_write_bytes(Path(args.json), (data + '\n').encode('utf-8'))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
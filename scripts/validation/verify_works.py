@@ -2,15 +2,43 @@
 # -*- coding: utf-8 -*-
 """
 Works Data Verification Script
-Compares JSON data with HTML files for all 33 works
+Compares JSON data with HTML files for every work in works-data/index.json
+
+Each page is read once by the single-pass extractor that produced the JSON
+(sitetools.workpage), and every check compares one of its fields. Works are
+verified in parallel worker processes, and results can be written as JSON
+and JUnit XML for CI.
+
+Checks per work: title, images, description, credit, tools and link (every
+other detail-list section: Link, Exhibition, Award, ...), plus 'files' when
+the JSON, the HTML page or its mapping is missing.
+
+Usage:
+    python3 scripts/validation/verify_works.py [--jobs N] [--changed]
+        [--json PATH] [--junit PATH] [--root DIR]
+
+--changed only re-verifies works whose page or JSON changed since the last
+run (tracked in .cache/verify-works.json); the others keep their previous
+result. The exit status is 1 when any work has errors.
 """
 
+import argparse
 import json
-import re
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from html.parser import HTMLParser
 
-# ID to HTML filename mapping
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from sitetools.inventory import load_inventory  # noqa: E402
+from sitetools.workpage import DT_FIELDS, clean_html_whitespace, iter_sections  # noqa: E402
+from sitetools.writer import atomic_write_bytes  # noqa: E402
+
+# ID to HTML filename mapping, for index.json files without 'filename'
 ID_TO_HTML = {
     'toki-shirube': 'toki-shirube.html',
     'inochinokodou': 'inochinokodou.html',
@@ -45,284 +73,292 @@ ID_TO_HTML = {
     'colorboxes': 'colorboxes.html',
 }
 
-BASE_DIR = Path('/Users/ryosimon/Documents/Homepage/ryo-simon-mf.github.io')
-WORKS_DATA_DIR = BASE_DIR / 'works-data'
-WORKS_HTML_DIR = BASE_DIR / 'works'
-
-def remove_html_comments(text):
-    """Remove HTML comments from text"""
-    return re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
-
-def normalize_whitespace(text):
-    """Normalize whitespace: collapse multiple spaces/newlines to single space"""
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
-
-def extract_text_content(html):
-    """Extract text content from HTML, preserving <br> and basic structure"""
-    # Remove comments first
-    html = remove_html_comments(html)
-    # Keep <br> tags as markers
-    html = re.sub(r'<br\s*/?\s*>', '<BR_MARKER>', html, flags=re.IGNORECASE)
-    # Remove other tags
-    text = re.sub(r'<[^>]+>', '', html)
-    # Restore <br> as actual tag
-    text = text.replace('<BR_MARKER>', '<br>')
-    return normalize_whitespace(text)
-
-def extract_h1_title(html_content):
-    """Extract <h1> title from HTML, removing comments"""
-    html_content = remove_html_comments(html_content)
-    match = re.search(r'<h1[^>]*>(.*?)</h1>', html_content, re.DOTALL | re.IGNORECASE)
-    if match:
-        return normalize_whitespace(extract_text_content(match.group(1)))
-    return None
-
-def extract_swiper_images(html_content):
-    """Extract all image paths from swiper-wrapper, excluding commented-out images"""
-    html_content = remove_html_comments(html_content)
-
-    # Find swiper-wrapper section
-    wrapper_match = re.search(r'<div class="swiper-wrapper">(.*?)</div>', html_content, re.DOTALL | re.IGNORECASE)
-    if not wrapper_match:
-        return []
-
-    wrapper_html = wrapper_match.group(1)
-
-    # Extract all img src paths
-    img_pattern = r'<img\s+src="([^"]+)"'
-    images = re.findall(img_pattern, wrapper_html, re.IGNORECASE)
-
-    return images
-
-def extract_content_description(html_content):
-    """Extract description from <div id="content_in"><p>...</p>"""
-    html_content = remove_html_comments(html_content)
-
-    # Find content_in div
-    match = re.search(r'<div\s+id="content_in"[^>]*>(.*?)</div>', html_content, re.DOTALL | re.IGNORECASE)
-    if not match:
-        return None
-
-    content_div = match.group(1)
-
-    # Extract <p> content, preserving <br> and <dd> tags
-    p_match = re.search(r'<p[^>]*>(.*?)</p>', content_div, re.DOTALL | re.IGNORECASE)
-    if not p_match:
-        return None
-
-    p_content = p_match.group(1)
-
-    # Preserve <br> tags
-    p_content = re.sub(r'<br\s*/?\s*>', '<br>', p_content, flags=re.IGNORECASE)
-    # Preserve <dd> tags (both opening and closing)
-    p_content = re.sub(r'<dd\s*>', '<dd>', p_content, flags=re.IGNORECASE)
-    p_content = re.sub(r'</dd\s*>', '</dd>', p_content, flags=re.IGNORECASE)
-
-    # Remove other tags
-    allowed_tags = ['<br>', '<dd>', '</dd>']
-    temp_markers = {
-        '<br>': '___BR_MARKER___',
-        '<dd>': '___DD_OPEN___',
-        '</dd>': '___DD_CLOSE___'
-    }
-
-    for tag, marker in temp_markers.items():
-        p_content = p_content.replace(tag, marker)
-
-    # Remove all other HTML tags
-    p_content = re.sub(r'<[^>]+>', '', p_content)
-
-    # Restore allowed tags
-    for tag, marker in temp_markers.items():
-        p_content = p_content.replace(marker, tag)
-
-    return normalize_whitespace(p_content)
+BASE_DIR = SCRIPTS_DIR.parent
 
-def extract_dt_dd_sections(html_content):
-    """Extract all <dt><dd> sections from HTML"""
-    html_content = remove_html_comments(html_content)
+CHECKS = ('files', 'title', 'images', 'description', 'credit', 'tools', 'link')
 
-    sections = {}
+# Bump when a check changes, so --changed doesn't reuse stale results
+VERIFIER_VERSION = 2
+STATE_FILE = Path('.cache') / 'verify-works.json'
 
-    # Find all <dt> tags and their corresponding <dd> tags
-    dt_pattern = r'<dt[^>]*>(.*?)</dt>\s*<dd[^>]*>(.*?)</dd>'
-    matches = re.findall(dt_pattern, html_content, re.DOTALL | re.IGNORECASE)
+# Sections of the detail list compared by the 'link' check (every <dt> but Credit and Tool)
+SECTION_FIELDS = tuple(DT_FIELDS.values())
 
-    for dt_content, dd_content in matches:
-        dt_text = normalize_whitespace(extract_text_content(dt_content))
-        dd_text = extract_text_content(dd_content).strip()
+def same_html(json_value, html_value):
+    """Equal once both are whitespace-normalized the way the extractor cleans them"""
+    if not json_value and not html_value:
+        return True
+    if not isinstance(json_value, str) or html_value is None:
+        return False
+    return clean_html_whitespace(json_value.strip()) == html_value
 
-        # Normalize whitespace but preserve structure
-        dd_text = normalize_whitespace(dd_text)
+def verify_work(work_id, html_filename, base_dir=BASE_DIR):
+    """
+    Verify a single work's JSON against its HTML.
 
-        sections[dt_text] = dd_text
+    The page is read in one pass by sitetools.workpage, the extractor that
+    wrote the JSON, and its fields are compared with the JSON's.
 
-    return sections
-
-def verify_work(work_id):
-    """Verify a single work's JSON against its HTML"""
+    Returns:
+        dict: {'id', 'html', 'errors'} where every error is
+        {'check': one of CHECKS, 'message': str}
+    """
+    errors = []
     results = {
         'id': work_id,
-        'errors': []
+        'html': html_filename,
+        'errors': errors
     }
+    check = 'files'
+
+    def fail(message):
+        errors.append({'check': check, 'message': message})
 
     # Load JSON
-    json_path = WORKS_DATA_DIR / f'{work_id}.json'
+    json_path = base_dir / 'works-data' / f'{work_id}.json'
     if not json_path.exists():
-        results['errors'].append(f"JSON file not found: {json_path}")
+        fail(f"JSON file not found: {json_path}")
         return results
 
     with open(json_path, 'r', encoding='utf-8') as f:
         json_data = json.load(f)
 
     # Load HTML
-    html_filename = ID_TO_HTML.get(work_id)
     if not html_filename:
-        results['errors'].append(f"No HTML filename mapping for ID: {work_id}")
+        fail(f"No HTML filename mapping for ID: {work_id}")
         return results
 
-    html_path = WORKS_HTML_DIR / html_filename
+    html_path = base_dir / 'works' / html_filename
     if not html_path.exists():
-        results['errors'].append(f"HTML file not found: {html_path}")
+        fail(f"HTML file not found: {html_path}")
         return results
 
     with open(html_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
+        html_sections = dict(iter_sections(f.read()))
 
     # 1. Verify title
-    html_title = extract_h1_title(html_content)
+    check = 'title'
+    html_title = html_sections.get('title')
     json_title = json_data.get('title', '')
     if html_title != json_title:
-        results['errors'].append(f"title: JSON='{json_title}' vs HTML='{html_title}'")
+        fail(f"title: JSON='{json_title}' vs HTML='{html_title}'")
 
     # 2. Verify images
-    html_images = extract_swiper_images(html_content)
-    json_images = json_data.get('images', [])
+    check = 'images'
+    html_images = html_sections.get('images', [])
+    json_images = json_data.get('images') or []
     if html_images != json_images:
         missing_in_json = set(html_images) - set(json_images)
         extra_in_json = set(json_images) - set(html_images)
         if missing_in_json:
-            results['errors'].append(f"images: Missing in JSON: {missing_in_json}")
+            fail(f"images: Missing in JSON: {missing_in_json}")
         if extra_in_json:
-            results['errors'].append(f"images: Extra in JSON: {extra_in_json}")
+            fail(f"images: Extra in JSON: {extra_in_json}")
         if set(html_images) == set(json_images) and html_images != json_images:
-            results['errors'].append(f"images: Order mismatch")
+            fail(f"images: Order mismatch")
 
     # 3. Verify description
-    html_desc = extract_content_description(html_content)
-    json_desc = json_data.get('description', '')
-    if html_desc != json_desc:
-        results['errors'].append(f"description: Mismatch")
-        results['errors'].append(f"  JSON: '{json_desc}'")
-        results['errors'].append(f"  HTML: '{html_desc}'")
-
-    # 4. Extract dt/dd sections from HTML
-    html_sections = extract_dt_dd_sections(html_content)
-
-    # 5. Verify credit
-    json_credit = json_data.get('credit')
-    html_credit = html_sections.get('Credit')
-    if json_credit is None:
-        if html_credit is not None:
-            results['errors'].append(f"credit: JSON is null but HTML has: '{html_credit}'")
-    else:
-        if html_credit is None:
-            results['errors'].append(f"credit: JSON has '{json_credit}' but HTML has no Credit section")
-        elif json_credit != html_credit:
-            results['errors'].append(f"credit: JSON='{json_credit}' vs HTML='{html_credit}'")
-
-    # 6. Verify tools
-    json_tools = json_data.get('tools')
-    html_tool = html_sections.get('Tool')
-    if json_tools is None:
-        if html_tool is not None:
-            results['errors'].append(f"tools: JSON is null but HTML has: '{html_tool}'")
-    else:
-        if html_tool is None:
-            results['errors'].append(f"tools: JSON has '{json_tools}' but HTML has no Tool section")
-        elif json_tools != html_tool:
-            results['errors'].append(f"tools: JSON='{json_tools}' vs HTML='{html_tool}'")
-
-    # 7. Verify link sections
-    json_link = json_data.get('link')
-
-    # Collect all non-Credit, non-Tool sections from HTML
-    link_sections = {}
-    for dt_key, dd_value in html_sections.items():
-        if dt_key not in ['Credit', 'Tool']:
-            link_sections[dt_key] = dd_value
-
-    if json_link is None:
-        if link_sections:
-            results['errors'].append(f"link: JSON is null but HTML has sections: {list(link_sections.keys())}")
-    else:
-        if not link_sections:
-            results['errors'].append(f"link: JSON has data but HTML has no link sections")
-        else:
-            # json_link could be a string or a dict
-            if isinstance(json_link, str):
-                # If it's a string, treat as single "Link" section
-                if len(link_sections) > 1:
-                    results['errors'].append(f"link: JSON is string but HTML has multiple sections: {list(link_sections.keys())}")
-                elif 'Link' in link_sections:
-                    if normalize_whitespace(json_link) != normalize_whitespace(link_sections['Link']):
-                        results['errors'].append(f"link: Mismatch")
-                        results['errors'].append(f"  JSON: '{json_link}'")
-                        results['errors'].append(f"  HTML: '{link_sections['Link']}'")
-                elif link_sections:
-                    # HTML has different section name
-                    html_key = list(link_sections.keys())[0]
-                    if normalize_whitespace(json_link) != normalize_whitespace(link_sections[html_key]):
-                        results['errors'].append(f"link: JSON is string, HTML section '{html_key}' mismatch")
-            elif isinstance(json_link, dict):
-                # Compare link sections
-                for key, value in json_link.items():
-                    if key not in link_sections:
-                        results['errors'].append(f"link.{key}: In JSON but not in HTML")
-                    elif normalize_whitespace(str(value)) != normalize_whitespace(link_sections[key]):
-                        results['errors'].append(f"link.{key}: Mismatch")
-                        results['errors'].append(f"  JSON: '{value}'")
-                        results['errors'].append(f"  HTML: '{link_sections[key]}'")
-
-                for key in link_sections.keys():
-                    if key not in json_link:
-                        results['errors'].append(f"link.{key}: In HTML but not in JSON (value: '{link_sections[key]}')")
+    check = 'description'
+    html_desc = html_sections.get('description')
+    json_desc = json_data.get('description')
+    if not same_html(json_desc, html_desc):
+        fail(f"description: Mismatch")
+        fail(f"  JSON: '{json_desc}'")
+        fail(f"  HTML: '{html_desc}'")
+
+    # 4. Verify credit and tools
+    for check, label in (('credit', 'Credit'), ('tools', 'Tool')):
+        json_value = json_data.get(check)
+        html_value = html_sections.get(check)
+        if json_value is None:
+            if html_value is not None:
+                fail(f"{check}: JSON is null but HTML has: '{html_value}'")
+        elif html_value is None:
+            fail(f"{check}: JSON has '{json_value}' but HTML has no {label} section")
+        elif not same_html(json_value, html_value):
+            fail(f"{check}: JSON='{json_value}' vs HTML='{html_value}'")
+
+    # 5. Verify the other detail-list sections (Link, Exhibition, Award, ...)
+    check = 'link'
+    for field in SECTION_FIELDS:
+        json_value = json_data.get(field)
+        html_value = html_sections.get(field)
+        # `related` holds work ids now; only the older HTML string is comparable
+        if field == 'related' and isinstance(json_value, list):
+            continue
+        if json_value is None:
+            if html_value is not None:
+                fail(f"{field}: JSON is null but HTML has: '{html_value}'")
+        elif html_value is None:
+            fail(f"{field}: JSON has data but HTML has no section for it")
+        elif not same_html(json_value, html_value):
+            fail(f"{field}: Mismatch")
+            fail(f"  JSON: '{json_value}'")
+            fail(f"  HTML: '{html_value}'")
 
     return results
 
-def main():
-    # Load work order
-    with open(WORKS_DATA_DIR / 'index.json', 'r', encoding='utf-8') as f:
+def _verify_job(job):
+    work_id, html_filename, base_dir = job
+    return verify_work(work_id, html_filename, base_dir)
+
+def run_checks(jobs, workers):
+    """Verify (work_id, html_filename, base_dir) jobs; results come back in job order"""
+    if workers <= 1 or len(jobs) <= 1:
+        return [_verify_job(job) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_verify_job, jobs, chunksize=chunksize))
+
+def load_work_list(base_dir):
+    """(work_id, html_filename) pairs in display order, from either index.json format"""
+    with open(base_dir / 'works-data' / 'index.json', 'r', encoding='utf-8') as f:
         index_data = json.load(f)
 
-    work_ids = index_data['order']
+    if 'works' in index_data:
+        entries = [(w['id'], w.get('filename')) for w in index_data['works']]
+    else:
+        entries = [(work_id, None) for work_id in index_data['order']]
+
+    # Pages outside the table (e.g. generated catalogues) are named after their id
+    return [(work_id, filename or ID_TO_HTML.get(work_id, f'{work_id}.html'))
+            for work_id, filename in entries]
+
+def load_state(path):
+    """Previous per-work hashes and results; empty when missing or outdated"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('verifier_version') != VERIFIER_VERSION:
+        return {}
+    return state.get('works', {})
+
+def save_state(path, works):
+    state = {'verifier_version': VERIFIER_VERSION, 'works': works}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, json.dumps(state, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    except OSError:
+        pass
+
+def source_hashes(inventory, work_id, html_filename):
+    """SHA-256 of the work's page and JSON (None when missing), via the site inventory"""
+    hashes = []
+    for rel in (f'works/{html_filename}' if html_filename else None,
+                f'works-data/{work_id}.json'):
+        hashes.append(inventory.sha256(rel) if rel in inventory.entries else None)
+    return hashes
+
+def write_json_report(path, results, summary):
+    report = {'summary': summary, 'works': results}
+    atomic_write_bytes(Path(path), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+def write_junit_report(path, results, seconds):
+    """One <testcase> per work and check; checks after a 'files' failure are skipped"""
+    suite = ET.Element('testsuite', name='verify_works', time=f'{seconds:.3f}')
+    tests = failures = skipped = 0
+
+    for result in results:
+        by_check = {}
+        for error in result['errors']:
+            by_check.setdefault(error['check'], []).append(error['message'])
+
+        for check in CHECKS:
+            tests += 1
+            case = ET.SubElement(suite, 'testcase', classname=f"works.{result['id']}", name=check)
+            if check in by_check:
+                failures += 1
+                messages = by_check[check]
+                failure = ET.SubElement(case, 'failure', message=messages[0])
+                failure.text = '\n'.join(messages)
+            elif check != 'files' and 'files' in by_check:
+                skipped += 1
+                ET.SubElement(case, 'skipped')
+
+    suite.set('tests', str(tests))
+    suite.set('failures', str(failures))
+    suite.set('skipped', str(skipped))
+    suite.set('errors', '0')
+    data = ET.tostring(ET.ElementTree(suite).getroot(), encoding='utf-8', xml_declaration=True)
+    atomic_write_bytes(Path(path), data + b'\n')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Verify works-data/*.json against works/*.html')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes (0 = one per CPU core, default 1)')
+    parser.add_argument('--changed', action='store_true',
+                        help='only re-verify works whose page or JSON changed since the last run')
+    parser.add_argument('--json', metavar='PATH', help='write results as JSON')
+    parser.add_argument('--junit', metavar='PATH', help='write results as JUnit XML')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root containing works/ and works-data/ (default: this repository)')
+    return parser.parse_args()
 
-    print(f"Verifying {len(work_ids)} works...\n")
+def main():
+    args = parse_args()
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    base_dir = args.root.resolve()
+    start = time.perf_counter()
+
+    work_list = load_work_list(base_dir)
+    inventory = load_inventory(base_dir)
+    state_path = base_dir / STATE_FILE
+    previous = load_state(state_path) if args.changed else {}
+
+    hashes = {}
+    cached = {}
+    jobs = []
+    for work_id, html_filename in work_list:
+        hashes[work_id] = source_hashes(inventory, work_id, html_filename)
+        entry = previous.get(work_id)
+        if (entry and entry.get('html') == html_filename
+                and [entry.get('html_sha256'), entry.get('json_sha256')] == hashes[work_id]):
+            cached[work_id] = {'id': work_id, 'html': html_filename, 'errors': entry['errors']}
+        else:
+            jobs.append((work_id, html_filename, base_dir))
+    inventory.save()
+
+    verified = {result['id']: result for result in run_checks(jobs, workers)}
+    all_results = [verified.get(work_id) or cached[work_id] for work_id, _ in work_list]
+
+    save_state(state_path, {
+        result['id']: {
+            'html': result['html'],
+            'html_sha256': hashes[result['id']][0],
+            'json_sha256': hashes[result['id']][1],
+            'errors': result['errors'],
+        }
+        for result in all_results
+    })
+    seconds = time.perf_counter() - start
+
+    print(f"Verifying {len(work_list)} works...\n")
     print("=" * 80)
 
-    all_results = []
     perfect_count = 0
     error_count = 0
 
-    for work_id in work_ids:
-        result = verify_work(work_id)
-        all_results.append(result)
-
+    for result in all_results:
+        work_id = result['id']
         if result['errors']:
             error_count += 1
             print(f"\n✗ [{work_id}]: {len(result['errors'])} issue(s)")
             for error in result['errors']:
-                print(f"  {error}")
+                print(f"  {error['message']}")
         else:
             perfect_count += 1
             print(f"✓ [{work_id}]: Perfect match")
 
     print("\n" + "=" * 80)
     print(f"\nSUMMARY:")
-    print(f"  Total works: {len(work_ids)}")
+    print(f"  Total works: {len(work_list)}")
     print(f"  Perfect match: {perfect_count}")
     print(f"  With errors: {error_count}")
+    print(f"  Verified: {len(jobs)} ({len(cached)} unchanged, previous result reused)")
+    print(f"  Time: {seconds * 1000:.0f} ms with {workers} worker(s)")
 
     if error_count > 0:
         print(f"\n\nWorks with errors:")
@@ -330,5 +366,20 @@ def main():
             if result['errors']:
                 print(f"  - {result['id']}")
 
+    summary = {
+        'total': len(work_list),
+        'passed': perfect_count,
+        'failed': error_count,
+        'verified': len(jobs),
+        'reused': len(cached),
+        'seconds': round(seconds, 4),
+    }
+    if args.json:
+        write_json_report(args.json, all_results, summary)
+    if args.junit:
+        write_junit_report(args.junit, all_results, seconds)
+
+    sys.exit(1 if error_count else 0)
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Train a shared compression dictionary for works-data JSON and compress against it.
+
+Every work file has the same keys from SCHEMA.md and much the same link and
+credit markup, so most of a compressed work file is boilerplate that every
+file repeats. A dictionary holding that boilerplate lets each file compress
+to little more than its own text.
+
+Training follows the idea of zstd's COVER trainer, in plain Python: count in
+how many sample works each 8-byte sequence occurs, cut every work (pretty and
+minified, as the SPA fetches both the files and bundle_works_data.py's
+bundles) into the runs made of sequences seen in at least two works, and
+fill the dictionary with the runs that score highest (length x frequency).
+The best runs go last, closest to the data, where deflate and zstd reach
+them most cheaply. The result is a raw-content dictionary: the preset
+dictionary (zdict) for zlib and a dictionary for zstd as is.
+
+Outputs (both git-ignored):
+- works-data/dictionary/works.dict   the dictionary
+- <file>.json.dcz next to each work file and bundle, when the zstd command is
+  available: zstd -19 against the dictionary, in the dictionary-compressed
+  format of Compression Dictionary Transport (a header with the dictionary's
+  SHA-256, then the zstd frame)
+
+This only pays off on a host that speaks Compression Dictionary Transport:
+one that offers the dictionary (Use-As-Dictionary, and the
+<link rel="compression-dictionary"> on works.html) and answers
+Available-Dictionary with the .dcz files. scripts/dev/serve.py does all of
+that locally. GitHub Pages does none of it, so the published site ships
+neither the dictionary nor the link and its per-work fetches are unchanged;
+build and deploy the outputs only for a host that serves them.
+
+Retraining is incremental. Training uses a sample of at most --sample works;
+.cache/works-dictionary.json remembers it, and new or changed works join it
+(the oldest members leave). Nothing is retrained while the sample is
+unchanged. A retrained dictionary only replaces the current one when it
+shrinks the sample by at least --min-gain, because a new dictionary
+invalidates every .dcz file and the copy browsers already hold; --retrain
+forces it. Files whose source and dictionary are unchanged are not
+recompressed.
+
+The report compares standalone compression (deflate level 9 and, with the
+zstd command, zstd -19) with compression against the dictionary, per file
+and in total, and says after how many fetches the dictionary has paid for
+its own download.
+
+Usage:
+    python3 works_dictionary.py [--size BYTES] [--sample N] [--min-gain FRACTION] [--retrain] [--json PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+from sitetools.inventory import load_inventory
+from sitetools.writer import ChangeAwareWriter, atomic_write_bytes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DICTIONARY_PATH = Path('works-data') / 'dictionary' / 'works.dict'
+STATE_FILE = Path('.cache') / 'works-dictionary.json'
+TRAINER_VERSION = 1
+
+# zlib only looks 32 KiB back, so a larger preset dictionary is never used
+ZLIB_WINDOW = 32 * 1024
+DEFAULT_SIZE = 16 * 1024
+DEFAULT_SAMPLE = 400
+DEFAULT_MIN_GAIN = 0.02
+
+# Sequence length the frequencies are counted on, and the longest run kept
+KGRAM = 8
+MAX_RUN = 400
+
+# Compression Dictionary Transport: zstd with an external dictionary
+DCZ_SUFFIX = '.dcz'
+DCZ_MAGIC = b'\x5e\x2a\x4d\x18\x20\x00\x00\x00'
+ZSTD_COMMAND = ['zstd', '-19', '--quiet']
+
+
+def variants(data):
+    """The file as stored and minified (the form bundles carry it in)"""
+    forms = [data]
+    try:
+        minified = json.dumps(json.loads(data), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if minified != data:
+            forms.append(minified)
+    except ValueError:
+        pass
+    return forms
+
+
+def train(samples, size):
+    """
+    Build a dictionary of at most size bytes from sample file contents.
+
+    A sequence seen in a single work is that work's own content and never
+    makes it in; runs of shared sequences are scored by length x how many
+    works share them.
+    """
+    forms = [variants(data) for data in samples]
+
+    frequency = {}
+    for work_forms in forms:
+        seen = set()
+        for form in work_forms:
+            seen.update(form[i:i + KGRAM] for i in range(len(form) - KGRAM + 1))
+        for kgram in seen:
+            frequency[kgram] = frequency.get(kgram, 0) + 1
+
+    scores = {}
+    for work_forms in forms:
+        for form in work_forms:
+            i, end = 0, len(form) - KGRAM + 1
+            while i < end:
+                if frequency[form[i:i + KGRAM]] < 2:
+                    i += 1
+                    continue
+                j, score = i, 0
+                while j < end and frequency[form[j:j + KGRAM]] >= 2:
+                    score += frequency[form[j:j + KGRAM]]
+                    j += 1
+                run = form[i:j + KGRAM - 1]
+                if len(run) <= MAX_RUN and score > scores.get(run, 0):
+                    scores[run] = score
+                i = j
+
+    chosen = []
+    used = 0
+    for run, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+        if used > size - KGRAM:
+            break
+        if used + len(run) > size:
+            continue
+        # A run already inside a chosen one adds nothing
+        if any(run in other for other in chosen):
+            continue
+        chosen.append(run)
+        used += len(run)
+
+    # Most valuable last: closest to the data being compressed
+    return b''.join(reversed(chosen))
+
+
+def deflate_size(data, zdict=None):
+    options = {'zdict': zdict[-ZLIB_WINDOW:]} if zdict else {}
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, **options)
+    return len(compressor.compress(data) + compressor.flush())
+
+
+def zstd_batch(root, rels, dictionary_path=None):
+    """
+    Compress many files with one zstd process (one process per file costs
+    more than the compression itself).
+
+    Returns:
+        dict: rel -> zstd frame
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        file_list = Path(tmp) / 'files.txt'
+        file_list.write_text(''.join(rel + '\n' for rel in rels), encoding='utf-8')
+        command = ZSTD_COMMAND + ['--force', '--filelist', str(file_list), '--output-dir-mirror', tmp]
+        if dictionary_path:
+            command += ['-D', str(dictionary_path)]
+        subprocess.run(command, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        return {rel: (Path(tmp) / (rel + '.zst')).read_bytes() for rel in rels}
+
+
+def corpus_files(root, inventory):
+    """Work files listed in index.json, and bundles: the files the SPA fetches"""
+    with open(root / 'works-data' / 'index.json', 'r', encoding='utf-8') as f:
+        index_data = json.load(f)
+    ids = [w['id'] for w in index_data['works']] if 'works' in index_data else index_data['order']
+    works = [f'works-data/{work_id}.json' for work_id in ids
+             if f'works-data/{work_id}.json' in inventory.entries]
+    bundles = [rel for rel in inventory.rel_paths('json')
+               if rel.startswith('works-data/bundles/') and not rel.endswith('/manifest.json')]
+    return works, bundles
+
+
+def update_sample(previous, works, changed, limit):
+    """
+    Training sample: the previous one minus works that are gone or changed,
+    plus the changed and new works; the oldest members leave beyond limit.
+    A first sample is spread evenly over the display order.
+    """
+    if not previous:
+        step = max(1, len(works) / limit)
+        return [works[int(i * step)] for i in range(min(limit, len(works)))]
+    present = set(works)
+    sample = [rel for rel in previous if rel in present and rel not in changed]
+    sample += [rel for rel in works if rel in changed]
+    return sample[-limit:]
+
+
+def remove_orphans(root, keep):
+    """Delete .dcz files in works-data/ (and bundles/) whose source is gone"""
+    removed = 0
+    for directory in (root / 'works-data', root / 'works-data' / 'bundles'):
+        if not directory.is_dir():
+            continue
+        for path in directory.glob('*' + DCZ_SUFFIX):
+            if path.relative_to(root).as_posix()[:-len(DCZ_SUFFIX)] not in keep:
+                path.unlink()
+                removed += 1
+    return removed
+
+
+def load_state(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != TRAINER_VERSION:
+        return {}
+    return state
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Train a shared dictionary for works-data JSON')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE,
+                        help=f'dictionary size in bytes (default {DEFAULT_SIZE}; zlib uses at most {ZLIB_WINDOW})')
+    parser.add_argument('--sample', type=int, default=DEFAULT_SAMPLE,
+                        help=f'works to train on at most (default {DEFAULT_SAMPLE})')
+    parser.add_argument('--min-gain', type=float, default=DEFAULT_MIN_GAIN,
+                        help=f'replace the dictionary only if it saves this fraction more (default {DEFAULT_MIN_GAIN})')
+    parser.add_argument('--retrain', action='store_true', help='retrain and replace the dictionary regardless')
+    parser.add_argument('--json', metavar='PATH', help='write the ratio report as JSON')
+    parser.add_argument('--root', type=Path, default=BASE_DIR,
+                        help='site root containing works-data/ (default: this repository)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.size < 256 or args.sample < 2:
+        print('✗ --size must be at least 256 bytes and --sample at least 2')
+        sys.exit(1)
+    root = args.root.resolve()
+    start = time.perf_counter()
+
+    inventory = load_inventory(root)
+    works, bundles = corpus_files(root, inventory)
+    if len(works) < 2:
+        print('✗ Need at least two work files listed in works-data/index.json')
+        sys.exit(1)
+
+    state_path = root / STATE_FILE
+    state = load_state(state_path)
+    previous_files = state.get('files', {})
+    hashes = {rel: inventory.sha256(rel) for rel in works + bundles}
+    changed = {rel for rel in works if previous_files.get(rel, {}).get('sha256') != hashes[rel]}
+
+    # Train on the sample when it changed (or when asked)
+    dictionary_file = root / DICTIONARY_PATH
+    current = dictionary_file.read_bytes() if dictionary_file.is_file() else None
+    sample = update_sample(state.get('sample', []), works, changed, args.sample)
+    decision = 'kept'
+    dictionary = current
+    if current is None or args.retrain or sample != state.get('sample'):
+        sample_data = [(root / rel).read_bytes() for rel in sample]
+        candidate = train(sample_data, args.size)
+        if current is None:
+            dictionary, decision = candidate, 'created'
+        elif args.retrain:
+            dictionary, decision = candidate, 'retrained'
+        elif candidate != current:
+            old_total = sum(deflate_size(data, current) for data in sample_data)
+            new_total = sum(deflate_size(data, candidate) for data in sample_data)
+            if new_total <= old_total * (1 - args.min_gain):
+                dictionary, decision = candidate, 'retrained'
+            else:
+                decision = f'kept (a retrained one saves {1 - new_total / old_total:.1%}, below --min-gain)'
+
+    zstd_available = shutil.which(ZSTD_COMMAND[0]) is not None
+    dictionary_sha = hashlib.sha256(dictionary).hexdigest()
+    files = {}
+    stale = []
+    for rel in works + bundles:
+        entry = previous_files.get(rel)
+        if (entry and entry['sha256'] == hashes[rel] and entry['dictionary'] == dictionary_sha
+                and ('zstd' in entry) == zstd_available
+                and (not zstd_available or (root / (rel + DCZ_SUFFIX)).is_file())):
+            files[rel] = entry
+        else:
+            files[rel] = None
+            stale.append(rel)
+
+    with ChangeAwareWriter('works_dictionary') as writer:
+        dictionary_file.parent.mkdir(parents=True, exist_ok=True)
+        writer.write_bytes(dictionary_file, dictionary)
+        if zstd_available and stale:
+            standalone = zstd_batch(root, stale)
+            with_dictionary = zstd_batch(root, stale, dictionary_file)
+        for rel in stale:
+            data = (root / rel).read_bytes()
+            entry = {'sha256': hashes[rel], 'dictionary': dictionary_sha, 'bytes': len(data),
+                     'deflate': deflate_size(data), 'deflate_dict': deflate_size(data, dictionary)}
+            if zstd_available:
+                entry['zstd'] = len(standalone[rel])
+                entry['zstd_dict'] = len(with_dictionary[rel])
+                writer.write_bytes(root / (rel + DCZ_SUFFIX),
+                                   DCZ_MAGIC + bytes.fromhex(dictionary_sha) + with_dictionary[rel])
+            files[rel] = entry
+        summary = writer.summary()
+    removed = remove_orphans(root, files)
+
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(state_path, json.dumps(
+            {'version': TRAINER_VERSION, 'sample': sample, 'files': files},
+            separators=(',', ':')).encode('utf-8'))
+    except OSError:
+        pass
+    inventory.save()
+    seconds = time.perf_counter() - start
+
+    columns = ['deflate', 'deflate_dict'] + (['zstd', 'zstd_dict'] if zstd_available else [])
+    totals = {column: sum(entry[column] for entry in files.values()) for column in ['bytes'] + columns}
+    for rel, entry in files.items():
+        line = (f"  {rel}: {entry['bytes']:,} → deflate {entry['deflate']:,} / "
+                f"{entry['deflate_dict']:,} with dictionary")
+        if zstd_available:
+            line += f", zstd {entry['zstd']:,} / {entry['zstd_dict']:,}"
+        print(line)
+
+    def ratio(column):
+        return f"{totals[column]:,} bytes ({totals['bytes'] / totals[column]:.1f}x)"
+
+    # The dictionary is downloaded once (itself compressed) and then saves on every fetch
+    dictionary_download = deflate_size(dictionary)
+    saved_per_fetch = (totals['deflate'] - totals['deflate_dict']) / len(files)
+    print(f"\nSUMMARY:")
+    print(f"  Dictionary: {len(dictionary):,} bytes ({dictionary_download:,} compressed), {decision}")
+    print(f"  Training sample: {len(sample)} works ({len(changed)} new or changed)")
+    print(f"  Files: {len(works)} works + {len(bundles)} bundles, {totals['bytes']:,} bytes, "
+          f"{len(stale)} recompressed")
+    print(f"  deflate: {ratio('deflate')} standalone, {ratio('deflate_dict')} with the dictionary")
+    if zstd_available:
+        print(f"  zstd: {ratio('zstd')} standalone, {ratio('zstd_dict')} with the dictionary")
+    else:
+        print(f"  zstd: command not found, no .dcz files written")
+    if saved_per_fetch > 0:
+        print(f"  Saves {saved_per_fetch:,.0f} bytes per fetch; pays for its download after "
+              f"{dictionary_download / saved_per_fetch:.1f} fetches")
+    print(f"  Written: {summary}, {removed} orphaned .dcz removed")
+    print(f"  Time: {seconds:.2f}s")
+
+    if args.json:
+        report = {'dictionary': {'bytes': len(dictionary), 'compressed': dictionary_download,
+                                 'sha256': dictionary_sha, 'decision': decision},
+                  'sample': len(sample), 'files': files, 'totals': totals, 'seconds': round(seconds, 4)}
+        atomic_write_bytes(Path(args.json), (json.dumps(report, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+
+if __name__ == '__main__':
+    main()